@@ -64,10 +64,23 @@ datasets from the redis pipeline:
     ``redis-cli`` and a query of ``keys *`` or
     ``keys <TICKER>_*`` on large deployments.
 
+**Quiet Backtests**
+
+Every dataset node logs the ``process`` inputs, the buy and
+sell orders and rebuilds the ``self.debug_msg`` breadcrumbs
+several times. Long backtests can skip building these strings
+with ``BaseAlgo(quiet=True)`` or ``export ALGO_QUIET=1``. Errors
+are always logged and the node messages come back if the
+``analysis_engine.algo`` logger is set to ``DEBUG``.
+
 **Supported environment variables**
 
 ::
 
+    # set to 1 to skip the per-node info logs and
+    # debug_msg breadcrumbs during backtests
+    export ALGO_QUIET=0
+
     # to show debug, trace logging please export ``SHARED_LOG_CFG``
     # to a debug logger json file. To turn on debugging for this
     # library, you can export this variable to the repo's
@@ -77,20 +90,29 @@ datasets from the redis pipeline:
 
 import os
 import json
+import logging
 import pandas as pd
 import analysis_engine.consts as ae_consts
 import analysis_engine.utils as ae_utils
 import analysis_engine.build_trade_history_entry as history_utils
+import analysis_engine.trade_history_recorder as history_recorder
+import analysis_engine.position_ledger as position_ledger
 import analysis_engine.build_buy_order as buy_utils
 import analysis_engine.build_sell_order as sell_utils
 import analysis_engine.publish as publish
 import analysis_engine.build_publish_request as build_publish_request
 import analysis_engine.load_dataset as load_dataset
+import analysis_engine.columnar_dataset as columnar_dataset
+import analysis_engine.vectorized_backtest as vectorized_backtest
 import analysis_engine.indicators.indicator_processor as ind_processor
 import spylunking.log.setup_logging as log_utils
 
 log = log_utils.build_colorized_logger(name=__name__)
 
+ALGO_QUIET = ae_consts.ev(
+    'ALGO_QUIET',
+    '0') == '1'
+
 
 class BaseAlgo:
     """BaseAlgo
@@ -230,6 +252,13 @@ class BaseAlgo:
             dataset_type=ae_consts.SA_DATASET_TYPE_ALGO_READY,
             serialize_datasets=ae_consts.DEFAULT_SERIALIZED_DATASETS,
             raise_on_err=False,
+            publish_load_nodes=False,
+            uses_data=None,
+            lazy_datasets=None,
+            vectorized=False,
+            signal_dataset='daily',
+            compact_history=None,
+            quiet=None,
             **kwargs):
         """__init__
 
@@ -398,6 +427,34 @@ class BaseAlgo:
         :param serialize_datasets: optional - list of dataset names to
             deserialize in the dataset
             (default is ``ae_consts.DEFAULT_SERIALIZED_DATASETS``)
+        :param uses_data: optional - list of dataset names
+            ``self.process()`` uses (like ``['daily']``).
+            ``load_from_dataset`` only sets the ``self.df_*``
+            member variables for these datasets, the indicators'
+            ``uses_data`` datasets and ``daily`` (the others are
+            empty). The full node is still passed to
+            ``self.process()`` as ``dataset``.
+            (default is ``None`` for loading all datasets)
+        :param lazy_datasets: optional - bool for converting each
+            dataset in an external algorithm-ready dataset on first
+            access instead of when it is loaded (see
+            ``analysis_engine.prepare_dict_for_algo``)
+            (default is ``LAZY_DATASETS`` which is ``False``)
+        :param vectorized: optional - bool for running
+            ``self.handle_data()`` with the vectorized backtest
+            engine if the algorithm derives ``self.build_signals()``
+            (see ``analysis_engine.vectorized_backtest``).
+            ``False`` runs the slower loop mode
+            (``self.process_signals()``) for each node
+            (default is ``False``)
+        :param signal_dataset: optional - dataset name passed to
+            ``self.build_signals()`` and used for order prices
+            (default is ``daily``)
+        :param compact_history: optional - bool for storing the
+            trade history in a columnar
+            ``analysis_engine.trade_history_recorder.TradeHistoryRecorder``
+            instead of a list of dictionaries
+            (default is ``ALGO_COMPACT_HISTORY`` which is ``False``)
         :param encoding: optional - string for data encoding
 
         **(Optional) Publishing arguments**
@@ -417,9 +474,19 @@ class BaseAlgo:
         :param publish_report: boolean - toggle publishing
             any generated datasets to s3 and redis
             (default ``True``)
+        :param publish_load_nodes: boolean - toggle calling
+            ``self.load_from_dataset()`` for each node while
+            building the published datasets (for derived
+            algorithms that need the member variables while
+            converting a node)
+            (default ``False``)
 
         **Debugging arguments**
 
+        :param quiet: optional - bool for skipping the per-node
+            info logs and ``self.debug_msg`` breadcrumbs in the
+            backtest loop unless the logger is set to ``DEBUG``
+            (default is ``ALGO_QUIET`` which is ``False``)
         :param raise_on_err: optional - boolean for
             unittests and developing algorithms with the
             ``analysis_engine.run_algo.run_algo`` helper.
@@ -479,10 +546,13 @@ class BaseAlgo:
         self.sell_hold_units = 20
         self.spread_exp_date = None
         self.last_close = None
-        self.order_history = []
+        self.compact_history = compact_history
+        if self.compact_history is None:
+            self.compact_history = history_recorder.COMPACT_HISTORY
+        self.order_history = self.build_order_history()
         self.config_file = config_file
         self.config_dict = config_dict
-        self.positions = {}
+        self.ledger = position_ledger.PositionLedger()
         self.created_date = ae_utils.utc_now_str()
         self.created_buy = False
         self.should_buy = False
@@ -496,6 +566,11 @@ class BaseAlgo:
         self.trailing_stop_loss = None
 
         self.last_handle_data = None
+        # serialized datasets for each (ticker, node index) in
+        # self.last_handle_data shared by the create_*_dataset
+        # methods
+        self.serialized_nodes = {}
+        self.publish_load_nodes = publish_load_nodes
         self.last_ds_id = None
         self.last_ds_date = None
         self.last_ds_data = None
@@ -518,6 +593,14 @@ class BaseAlgo:
         self.df_pricing = pd.DataFrame([{}])
         self.empty_pd = pd.DataFrame([{}])
         self.empty_pd_str = ae_consts.EMPTY_DF_STR
+        self.uses_data = uses_data
+        self.lazy_datasets = lazy_datasets
+        self.vectorized = vectorized
+        self.signal_dataset = signal_dataset
+        # signal rows seen so far for each ticker in the loop mode
+        self.signal_frames = {}
+        # per-node history from the last vectorized run
+        self.history_df = None
 
         self.note = None
         self.debug_msg = ''
@@ -525,6 +608,10 @@ class BaseAlgo:
         self.verbose = ae_consts.ev(
             'AE_DEBUG',
             '1') == '1'
+        self.quiet = quiet
+        if self.quiet is None:
+            self.quiet = ALGO_QUIET
+        self.log_nodes = self.is_node_logging_enabled()
 
         self.publish_to_slack = publish_to_slack
         self.publish_to_s3 = publish_to_s3
@@ -896,12 +983,27 @@ class BaseAlgo:
                     config_dict=self.config_dict,
                     label='{}-prc'.format(
                         self.name),
-                    verbose=self.verbose)
+                    verbose=self.verbose,
+                    quiet=self.quiet)
         # if use new or existing
 
         return self.iproc
     # end of get_indicator_processor
 
+    def is_node_logging_enabled(
+            self):
+        """is_node_logging_enabled
+
+        ``True`` if the backtest loop should build the per-node
+        info logs and ``self.debug_msg`` breadcrumbs. Quiet
+        algorithms only build them when the logger is set
+        to ``DEBUG``.
+        """
+        return (
+            not self.quiet or
+            log.isEnabledFor(logging.DEBUG))
+    # end of is_node_logging_enabled
+
     def process(
             self,
             algo_id,
@@ -965,31 +1067,32 @@ class BaseAlgo:
                 }
         """
 
-        log.info(
-            'process - ticker={} balance={} owned={} date={} '
-            'high={} low={} open={} close={} vol={} '
-            'comm={} '
-            'buy_str={} buy_risk={} '
-            'sell_str={} sell_risk={} '
-            'num_buys={} num_sells={} '
-            'id={}'.format(
-                self.ticker,
-                self.balance,
-                self.num_owned,
-                self.trade_date,
-                self.latest_high,
-                self.latest_low,
-                self.latest_open,
-                self.latest_close,
-                self.latest_volume,
-                self.commission,
-                self.buy_strength,
-                self.buy_risk,
-                self.sell_strength,
-                self.sell_risk,
-                len(self.buys),
-                len(self.sells),
-                algo_id))
+        if self.log_nodes:
+            log.info(
+                'process - ticker={} balance={} owned={} date={} '
+                'high={} low={} open={} close={} vol={} '
+                'comm={} '
+                'buy_str={} buy_risk={} '
+                'sell_str={} sell_risk={} '
+                'num_buys={} num_sells={} '
+                'id={}'.format(
+                    self.ticker,
+                    self.balance,
+                    self.num_owned,
+                    self.trade_date,
+                    self.latest_high,
+                    self.latest_low,
+                    self.latest_open,
+                    self.latest_close,
+                    self.latest_volume,
+                    self.commission,
+                    self.buy_strength,
+                    self.buy_risk,
+                    self.sell_strength,
+                    self.sell_risk,
+                    len(self.buys),
+                    len(self.sells),
+                    algo_id))
 
         # flip these on to sell/buy
         # buys will not FILL if there's not enough funds to buy
@@ -997,10 +1100,11 @@ class BaseAlgo:
         self.should_sell = False
         self.should_buy = False
 
-        log.info(
-            '{} - ready with process has df_daily rows={}'.format(
-                self.name,
-                len(self.df_daily.index)))
+        if self.log_nodes:
+            log.info(
+                '{} - ready with process has df_daily rows={}'.format(
+                    self.name,
+                    len(self.df_daily.index)))
 
         """
         Want to iterate over daily pricing data
@@ -1099,7 +1203,8 @@ class BaseAlgo:
                 s3_region_name=self.dsload_s3_region_name,
                 s3_secure=self.dsload_s3_secure,
                 compress=self.dsload_compress,
-                encoding=self.dsload_redis_encoding)
+                encoding=self.dsload_redis_encoding,
+                lazy=self.lazy_datasets)
             if self.loaded_dataset:
                 self.debug_msg = (
                     'external load SUCCESS - s3={}:{}/{}'.format(
@@ -1133,7 +1238,8 @@ class BaseAlgo:
                 redis_serializer=self.dsload_redis_serializer,
                 redis_encoding=self.dsload_redis_encoding,
                 compress=self.dsload_compress,
-                encoding=self.dsload_redis_encoding)
+                encoding=self.dsload_redis_encoding,
+                lazy=self.lazy_datasets)
             if self.loaded_dataset:
                 self.debug_msg = (
                     'external load SUCCESS - redis={}:{}/{}'.format(
@@ -1158,7 +1264,9 @@ class BaseAlgo:
                 self.loaded_dataset = load_dataset.load_dataset(
                     path_to_file=self.dsload_output_file,
                     compress=self.dsload_compress,
-                    encoding=self.extract_redis_encoding)
+                    encoding=self.extract_redis_encoding,
+                    lazy=self.lazy_datasets,
+                    tickers=self.tickers)
                 if self.loaded_dataset:
                     self.debug_msg = (
                         'external load SUCCESS - file={}'.format(
@@ -1334,82 +1442,9 @@ class BaseAlgo:
         by implementing this method in the derived class.
         """
 
-        log.info('algo-ready - create start')
-
-        data_for_tickers = self.get_supported_tickers_in_data(
-            data=self.last_handle_data)
-
-        num_tickers = len(data_for_tickers)
-        if num_tickers > 0:
-            self.debug_msg = (
-                '{} handle - tickers={}'.format(
-                    self.name,
-                    json.dumps(data_for_tickers)))
-
-        output_record = {}
-        for ticker in data_for_tickers:
-            if ticker not in output_record:
-                output_record[ticker] = []
-            num_ticker_datasets = len(self.last_handle_data[ticker])
-            cur_idx = 1
-            for idx, node in enumerate(self.last_handle_data[ticker]):
-                track_label = self.build_progress_label(
-                    progress=cur_idx,
-                    total=num_ticker_datasets)
-                algo_id = 'ticker={} {}'.format(
-                    ticker,
-                    track_label)
-                log.info(
-                    '{} convert - {} - ds={}'.format(
-                        self.name,
-                        algo_id,
-                        node['date']))
-
-                new_node = {
-                    'id': node['id'],
-                    'date': node['date'],
-                    'data': {}
-                }
-
-                # parse the dataset node and set member variables
-                self.debug_msg = (
-                    '{} START - convert load dataset id={}'.format(
-                        ticker,
-                        node.get('id', 'missing-id')))
-                self.load_from_dataset(
-                    ds_data=node)
-                for ds_key in node['data']:
-                    empty_ds = self.empty_pd_str
-                    data_val = node['data'][ds_key]
-                    if ds_key not in new_node['data']:
-                        new_node['data'][ds_key] = empty_ds
-                    self.debug_msg = (
-                        'convert node={} ds_key={}'.format(
-                            node,
-                            ds_key))
-                    if hasattr(data_val, 'to_json'):
-                        new_node['data'][ds_key] = data_val.to_json(
-                            orient='records',
-                            date_format='iso')
-                    else:
-                        if not data_val:
-                            new_node['data'][ds_key] = empty_ds
-                        else:
-                            new_node['data'][ds_key] = json.dumps(
-                                data_val)
-                    # if/else
-                # for all dataset values in data
-                self.debug_msg = (
-                    '{} END - convert load dataset id={}'.format(
-                        ticker,
-                        node.get('id', 'missing-id')))
-
-                output_record[ticker].append(new_node)
-                cur_idx += 1
-            # end for all self.last_handle_data[ticker]
-        # end of converting dataset
+        log.info('report - create start')
 
-        return output_record
+        return self.build_serialized_dataset()
     # end of create_report_dataset
 
     def publish_trade_history_dataset(
@@ -1569,80 +1604,7 @@ class BaseAlgo:
 
         log.info('history - create start')
 
-        data_for_tickers = self.get_supported_tickers_in_data(
-            data=self.last_handle_data)
-
-        num_tickers = len(data_for_tickers)
-        if num_tickers > 0:
-            self.debug_msg = (
-                '{} handle - tickers={}'.format(
-                    self.name,
-                    json.dumps(data_for_tickers)))
-
-        output_record = {}
-        for ticker in data_for_tickers:
-            if ticker not in output_record:
-                output_record[ticker] = []
-            num_ticker_datasets = len(self.last_handle_data[ticker])
-            cur_idx = 1
-            for idx, node in enumerate(self.last_handle_data[ticker]):
-                track_label = self.build_progress_label(
-                    progress=cur_idx,
-                    total=num_ticker_datasets)
-                algo_id = 'ticker={} {}'.format(
-                    ticker,
-                    track_label)
-                log.info(
-                    '{} convert - {} - ds={}'.format(
-                        self.name,
-                        algo_id,
-                        node['date']))
-
-                new_node = {
-                    'id': node['id'],
-                    'date': node['date'],
-                    'data': {}
-                }
-
-                # parse the dataset node and set member variables
-                self.debug_msg = (
-                    '{} START - convert load dataset id={}'.format(
-                        ticker,
-                        node.get('id', 'missing-id')))
-                self.load_from_dataset(
-                    ds_data=node)
-                for ds_key in node['data']:
-                    empty_ds = self.empty_pd_str
-                    data_val = node['data'][ds_key]
-                    if ds_key not in new_node['data']:
-                        new_node['data'][ds_key] = empty_ds
-                    self.debug_msg = (
-                        'convert node={} ds_key={}'.format(
-                            node,
-                            ds_key))
-                    if hasattr(data_val, 'to_json'):
-                        new_node['data'][ds_key] = data_val.to_json(
-                            orient='records',
-                            date_format='iso')
-                    else:
-                        if not data_val:
-                            new_node['data'][ds_key] = empty_ds
-                        else:
-                            new_node['data'][ds_key] = json.dumps(
-                                data_val)
-                    # if/else
-                # for all dataset values in data
-                self.debug_msg = (
-                    '{} END - convert load dataset id={}'.format(
-                        ticker,
-                        node.get('id', 'missing-id')))
-
-                output_record[ticker].append(new_node)
-                cur_idx += 1
-            # end for all self.last_handle_data[ticker]
-        # end of converting dataset
-
-        return output_record
+        return self.build_serialized_dataset()
     # end of create_history_dataset
 
     def publish_input_dataset(
@@ -1651,7 +1613,10 @@ class BaseAlgo:
         """publish_input_dataset
 
         publish input datasets to caches (redis), archives
-        (minio s3), a local file (``output_file``) and slack
+        (minio s3), a local file (``output_file``) and slack.
+        An ``output_file`` ending with ``/`` (or an existing
+        directory) is written in the columnar format from
+        ``analysis_engine.columnar_dataset``
 
         :param kwargs: keyword argument dictionary
         :return: tuple: ``status``, ``output_file``
@@ -1719,6 +1684,23 @@ class BaseAlgo:
 
         output_record = self.create_algorithm_ready_dataset()
 
+        # directories get the columnar on-disk format
+        if columnar_dataset.is_columnar_path(output_file):
+            status = columnar_dataset.write_columnar_dataset(
+                algo_dataset=output_record,
+                output_dir=output_file)
+            log.info(
+                'input publish - columnar - {} - {} - tickers={} '
+                'dir={}'.format(
+                    ae_consts.get_status(status=status),
+                    self.name,
+                    self.tickers,
+                    output_file))
+            if status != ae_consts.SUCCESS:
+                return status
+            output_file = None
+        # end of writing a columnar dataset
+
         if output_file or s3_enabled or redis_enabled or slack_enabled:
             log.info(
                 'input build json - {} - tickers={}'.format(
@@ -1788,18 +1770,24 @@ class BaseAlgo:
         return status
     # end of publish_input_dataset
 
-    def create_algorithm_ready_dataset(
+    def build_serialized_dataset(
             self):
-        """create_algorithm_ready_dataset
-
-        Create the ``Algorithm-Ready`` dataset
-        during the ``self.publish_input_dataset()`` member method.
-        Inherited Algorithm classes can derive how they build a
-        custom ``Algorithm-Ready`` dataset before publishing
-        by implementing this method in the derived class.
+        """build_serialized_dataset
+
+        Build the algorithm-ready dictionary for
+        ``self.last_handle_data`` with every dataset serialized
+        as a json string. Each node's datasets are serialized
+        once per ``handle_data`` run and reused by
+        ``create_algorithm_ready_dataset``,
+        ``create_history_dataset`` and ``create_report_dataset``.
+
+        ``self.load_from_dataset()`` is only called for each node
+        if ``self.publish_load_nodes`` is ``True`` (for derived
+        algorithms that need the member variables while
+        converting a node).
         """
-
-        log.info('algo-ready - create start')
+        if not self.last_handle_data:
+            return {}
 
         data_for_tickers = self.get_supported_tickers_in_data(
             data=self.last_handle_data)
@@ -1824,57 +1812,89 @@ class BaseAlgo:
                 algo_id = 'ticker={} {}'.format(
                     ticker,
                     track_label)
-                log.info(
+                log.debug(
                     '{} convert - {} - ds={}'.format(
                         self.name,
                         algo_id,
                         node['date']))
 
-                new_node = {
-                    'id': node['id'],
-                    'date': node['date'],
-                    'data': {}
-                }
-
-                # parse the dataset node and set member variables
-                self.debug_msg = (
-                    '{} START - convert load dataset id={}'.format(
-                        ticker,
-                        node.get('id', 'missing-id')))
-                self.load_from_dataset(
-                    ds_data=node)
-                for ds_key in node['data']:
-                    empty_ds = self.empty_pd_str
-                    data_val = node['data'][ds_key]
-                    if ds_key not in new_node['data']:
-                        new_node['data'][ds_key] = empty_ds
+                if self.publish_load_nodes:
                     self.debug_msg = (
-                        'convert node={} ds_key={}'.format(
-                            node,
-                            ds_key))
-                    if hasattr(data_val, 'to_json'):
-                        new_node['data'][ds_key] = data_val.to_json(
-                            orient='records',
-                            date_format='iso')
-                    else:
-                        if not data_val:
-                            new_node['data'][ds_key] = empty_ds
-                        else:
-                            new_node['data'][ds_key] = json.dumps(
-                                data_val)
-                    # if/else
-                # for all dataset values in data
+                        '{} START - convert load dataset id={}'.format(
+                            ticker,
+                            node.get('id', 'missing-id')))
+                    self.load_from_dataset(
+                        ds_data=node)
+
+                node_key = (
+                    ticker,
+                    idx)
+                serialized_data = self.serialized_nodes.get(
+                    node_key,
+                    None)
+                if serialized_data is None:
+                    serialized_data = self.serialize_node_data(
+                        node=node)
+                    self.serialized_nodes[node_key] = serialized_data
                 self.debug_msg = (
                     '{} END - convert load dataset id={}'.format(
                         ticker,
                         node.get('id', 'missing-id')))
 
-                output_record[ticker].append(new_node)
+                output_record[ticker].append({
+                    'id': node['id'],
+                    'date': node['date'],
+                    'data': dict(serialized_data)
+                })
                 cur_idx += 1
             # end for all self.last_handle_data[ticker]
         # end of converting dataset
 
         return output_record
+    # end of build_serialized_dataset
+
+    def serialize_node_data(
+            self,
+            node):
+        """serialize_node_data
+
+        Serialize each dataset in a node to a json string
+        (``DataFrame.to_json(orient='records')``) and return
+        the new ``data`` dictionary
+
+        :param node: dataset node dictionary with keys:
+            ``id``, ``date`` and ``data``
+        """
+        serialized_data = {}
+        for ds_key in node['data']:
+            empty_ds = self.empty_pd_str
+            data_val = node['data'][ds_key]
+            serialized_data[ds_key] = empty_ds
+            if hasattr(data_val, 'to_json'):
+                serialized_data[ds_key] = data_val.to_json(
+                    orient='records',
+                    date_format='iso')
+            elif data_val:
+                serialized_data[ds_key] = json.dumps(
+                    data_val)
+        # for all dataset values in data
+        return serialized_data
+    # end of serialize_node_data
+
+    def create_algorithm_ready_dataset(
+            self):
+        """create_algorithm_ready_dataset
+
+        Create the ``Algorithm-Ready`` dataset
+        during the ``self.publish_input_dataset()`` member method.
+        Inherited Algorithm classes can derive how they build a
+        custom ``Algorithm-Ready`` dataset before publishing
+        by implementing this method in the derived class.
+        """
+
+        log.info('algo-ready - create start')
+
+        return self.build_serialized_dataset()
     # end of create_algorithm_ready_dataset
 
     def get_ticker_positions(
@@ -1882,33 +1902,50 @@ class BaseAlgo:
             ticker):
         """get_ticker_positions
 
-        get the current positions for a ticker and
-        returns a tuple:
-        ``num_owned (integer), buys (list), sells (list)```
+        get the current position for a ticker from the
+        position ledger and returns a tuple:
+        ``num_owned (integer), num_buys (integer),
+        num_sells (integer)`` (``num_owned`` is ``None``
+        before the first filled order)
 
         .. code-block:: python
 
-            num_owned, buys, sells = self.get_ticker_positions(
+            num_owned, num_buys, num_sells = self.get_ticker_positions(
                 ticker=ticker)
 
         :param ticker: ticker to lookup
         """
-        buys = None
-        sells = None
+        position = self.ledger.positions.get(
+            ticker,
+            None)
+        if position is None:
+            return None, 0, 0
         num_owned = None
-        if ticker in self.positions:
-            num_owned = self.positions[ticker].get(
-                'shares',
-                None)
-            buys = self.positions[ticker].get(
-                'buys',
-                [])
-            sells = self.positions[ticker].get(
-                'sells',
-                [])
-        return num_owned, buys, sells
+        if position.num_buys or position.num_sells:
+            num_owned = position.shares
+        return num_owned, position.num_buys, position.num_sells
     # end of get_ticker_positions
 
+    def get_positions(
+            self):
+        """get_positions
+
+        get a dictionary of tickers with filled orders to
+        their ``shares``, ``num_buys`` and ``num_sells``
+        from the position ledger
+        """
+        positions = {}
+        for ticker, position in self.ledger.positions.items():
+            if not position.num_buys and not position.num_sells:
+                continue
+            positions[ticker] = {
+                'shares': position.shares,
+                'num_buys': position.num_buys,
+                'num_sells': position.num_sells
+            }
+        return positions
+    # end of get_positions
+
     def get_trade_history_node(
                 self):
         """get_trade_history_node
@@ -1994,23 +2031,41 @@ class BaseAlgo:
     # end of get_name
 
     def get_result(self):
-        """get_result"""
+        """get_result
+
+        build the results dictionary. ``history`` is always a
+        list of dictionaries. With ``compact_history`` the
+        ``TradeHistoryRecorder`` is also returned under
+        ``history_recorder``.
+        """
 
         self.debug_msg = (
             'building results')
         finished_date = ae_utils.utc_now_str()
+        history = self.order_history
+        if hasattr(self.order_history, 'to_records'):
+            history = self.order_history.to_records()
+            log.info(
+                '{} history - rows={} columns={} bytes={}'.format(
+                    self.name,
+                    len(self.order_history),
+                    len(self.order_history.names),
+                    self.order_history.get_memory_usage()))
         self.result = {
             'name': self.name,
             'created': self.created_date,
             'updated': finished_date,
-            'open_positions': self.positions,
+            'open_positions': self.get_positions(),
+            'positions_summary': self.ledger.get_summary(),
             'buys': self.get_buys(),
             'sells': self.get_sells(),
             'num_processed': len(self.order_history),
-            'history': self.order_history,
+            'history': history,
             'balance': self.balance,
             'commission': self.commission
         }
+        if history is not self.order_history:
+            self.result['history_recorder'] = self.order_history
 
         return self.result
     # end of get_result
@@ -2051,14 +2106,26 @@ class BaseAlgo:
 
         :param ticker: ticker to lookup
         """
-        num_owned = 0
-        if ticker in self.positions:
-            num_owned = self.positions[ticker].get(
-                'shares',
-                None)
-        return num_owned
+        return self.ledger.get_shares(
+            ticker=ticker)
     # end of get_owned_shares
 
+    def get_position_summary(
+            self,
+            ticker=None):
+        """get_position_summary
+
+        get the share count, cost basis, realized and unrealized
+        P&L and order counts from the position ledger
+        (see ``analysis_engine.position_ledger``)
+
+        :param ticker: optional - ticker to lookup (default
+            is a dictionary for all tickers)
+        """
+        return self.ledger.get_summary(
+            ticker=ticker)
+    # end of get_position_summary
+
     def create_buy_order(
             self,
             ticker,
@@ -2086,12 +2153,13 @@ class BaseAlgo:
         """
         close = row['close']
         dataset_date = row['date']
-        log.info(
-            '{} - buy start {}@{} - shares={}'.format(
-                self.name,
-                ticker,
-                close,
-                shares))
+        if self.log_nodes:
+            log.info(
+                '{} - buy start {}@{} - shares={}'.format(
+                    self.name,
+                    ticker,
+                    close,
+                    shares))
         new_buy = None
 
         order_details = row
@@ -2121,38 +2189,32 @@ class BaseAlgo:
                 prev_shares = 0
             prev_bal = self.balance
             if new_buy['status'] == ae_consts.TRADE_FILLED:
-                if ticker in self.positions:
-                    self.positions[ticker]['shares'] += int(
-                        new_buy['shares'])
-                    self.positions[ticker]['buys'].append(
-                        new_buy)
-                    (self.num_owned,
-                     self.num_buys,
-                     self.num_sells) = self.get_ticker_positions(
-                        ticker=ticker)
+                position = self.ledger.positions.get(
+                    ticker,
+                    None)
+                if position is not None and (
+                        position.num_buys or position.num_sells):
                     self.created_buy = True
-                else:
-                    self.positions[ticker] = {
-                        'shares': new_buy['shares'],
-                        'buys': [
-                            new_buy
-                        ],
-                        'sells': []
-                    }
                 self.balance = new_buy['balance']
-                log.info(
-                    '{} - buy end {}@{} {} shares={} cost={} bal={} '
-                    'prev_shares={} prev_bal={}'.format(
-                        self.name,
-                        ticker,
-                        close,
-                        ae_consts.get_status(status=new_buy['status']),
-                        new_buy['shares'],
-                        new_buy['buy_price'],
-                        self.balance,
-                        prev_shares,
-                        prev_bal))
+                self.ledger.record_buy(
+                    order=new_buy)
+                if self.log_nodes:
+                    log.info(
+                        '{} - buy end {}@{} {} shares={} cost={} bal={} '
+                        'prev_shares={} prev_bal={}'.format(
+                            self.name,
+                            ticker,
+                            close,
+                            ae_consts.get_status(
+                                status=new_buy['status']),
+                            new_buy['shares'],
+                            new_buy['buy_price'],
+                            self.balance,
+                            prev_shares,
+                            prev_bal))
             else:
+                self.ledger.record_failed(
+                    ticker=ticker)
                 log.error(
                     '{} - buy failed {}@{} {} shares={} cost={} '
                     'bal={} '.format(
@@ -2210,11 +2272,12 @@ class BaseAlgo:
         """
         close = row['close']
         dataset_date = row['date']
-        log.info(
-            '{} - sell start {}@{}'.format(
-                self.name,
-                ticker,
-                close))
+        if self.log_nodes:
+            log.info(
+                '{} - sell start {}@{}'.format(
+                    self.name,
+                    ticker,
+                    close))
         new_sell = None
         order_details = row
         if hasattr(row, 'to_json'):
@@ -2243,38 +2306,32 @@ class BaseAlgo:
                 prev_shares = 0
             prev_bal = self.balance
             if new_sell['status'] == ae_consts.TRADE_FILLED:
-                if ticker in self.positions:
-                    self.positions[ticker]['shares'] += int(
-                        new_sell['shares'])
-                    self.positions[ticker]['sells'].append(
-                        new_sell)
-                    (self.num_owned,
-                     self.num_buys,
-                     self.num_sells) = self.get_ticker_positions(
-                        ticker=ticker)
+                position = self.ledger.positions.get(
+                    ticker,
+                    None)
+                if position is not None and (
+                        position.num_buys or position.num_sells):
                     self.created_sell = True
-                else:
-                    self.positions[ticker] = {
-                        'shares': new_sell['shares'],
-                        'buys': [],
-                        'sells': [
-                            new_sell
-                        ]
-                    }
                 self.balance = new_sell['balance']
-                log.info(
-                    '{} - sell end {}@{} {} shares={} cost={} bal={} '
-                    'prev_shares={} prev_bal={}'.format(
-                        self.name,
-                        ticker,
-                        close,
-                        ae_consts.get_status(status=new_sell['status']),
-                        num_owned,
-                        new_sell['sell_price'],
-                        self.balance,
-                        prev_shares,
-                        prev_bal))
+                self.ledger.record_sell(
+                    order=new_sell)
+                if self.log_nodes:
+                    log.info(
+                        '{} - sell end {}@{} {} shares={} cost={} bal={} '
+                        'prev_shares={} prev_bal={}'.format(
+                            self.name,
+                            ticker,
+                            close,
+                            ae_consts.get_status(
+                                status=new_sell['status']),
+                            num_owned,
+                            new_sell['sell_price'],
+                            self.balance,
+                            prev_shares,
+                            prev_bal))
             else:
+                self.ledger.record_failed(
+                    ticker=ticker)
                 log.error(
                     '{} - sell failed {}@{} {} shares={} cost={} '
                     'bal={} '.format(
@@ -2350,6 +2407,53 @@ class BaseAlgo:
         return data_for_tickers
     # end of get_supported_tickers_in_data
 
+    def get_load_datasets(
+            self):
+        """get_load_datasets
+
+        Get the set of dataset names ``load_from_dataset``
+        reads from each node: ``daily`` (for the latest
+        prices), the ``uses_data`` datasets for
+        ``self.process()`` and the datasets the configured
+        indicators use. Returns ``None`` to load all datasets
+        if ``uses_data`` is not set.
+        """
+        if self.uses_data is None:
+            return None
+        load_datasets = set(self.uses_data)
+        load_datasets.add('daily')
+        if self.iproc and hasattr(self.iproc, 'get_uses_datasets'):
+            load_datasets.update(
+                self.iproc.get_uses_datasets())
+        return load_datasets
+    # end of get_load_datasets
+
+    def get_dataset_df(
+            self,
+            name,
+            load_datasets=None,
+            default=None):
+        """get_dataset_df
+
+        Get a dataset from the current node's ``data`` or the
+        ``default`` (``self.empty_pd``) if it is missing or
+        not in ``load_datasets``
+
+        :param name: dataset name
+        :param load_datasets: optional - set of dataset
+            names to load (``None`` loads all)
+        :param default: optional - value for missing datasets
+        """
+        use_default = default
+        if use_default is None:
+            use_default = self.empty_pd
+        if load_datasets is not None and name not in load_datasets:
+            return use_default
+        return self.ds_data.get(
+            name,
+            use_default)
+    # end of get_dataset_df
+
     def load_from_dataset(
             self,
             ds_data):
@@ -2384,6 +2488,11 @@ class BaseAlgo:
             ``redis-cli`` to verify the values are in
             memory.
 
+        .. note:: With ``uses_data`` set, only the datasets from
+            ``self.get_load_datasets()`` are read from the node
+            (and converted if the node is lazy). The other
+            member variables are an empty ``pd.DataFrame([])``.
+
         :param ds_data: extracted, structured
             dataset from redis
         """
@@ -2405,48 +2514,50 @@ class BaseAlgo:
         self.ds_data = self.ds_data.get(
             'data',
             'missing-DATA')
-        self.df_daily = self.ds_data.get(
-            'daily',
-            self.empty_pd)
-        self.df_minute = self.ds_data.get(
-            'minute',
-            self.empty_pd)
-        self.df_stats = self.ds_data.get(
-            'stats',
-            self.empty_pd)
-        self.df_peers = self.ds_data.get(
-            'peers',
-            self.empty_pd)
-        self.df_financials = self.ds_data.get(
-            'financials',
-            self.empty_pd)
-        self.df_earnings = self.ds_data.get(
-            'earnings',
-            self.empty_pd)
-        self.df_dividends = self.ds_data.get(
-            'dividends',
-            self.empty_pd)
-        self.df_quote = self.ds_data.get(
-            'quote',
-            self.empty_pd)
-        self.df_company = self.ds_data.get(
-            'company',
-            self.empty_pd)
-        self.df_iex_news = self.ds_data.get(
-            'news1',
-            self.empty_pd)
-        self.df_yahoo_news = self.ds_data.get(
-            'news',
-            self.empty_pd)
-        self.df_calls = self.ds_data.get(
-            'calls',
-            self.empty_pd)
-        self.df_puts = self.ds_data.get(
-            'puts',
-            self.empty_pd)
-        self.df_pricing = self.ds_data.get(
-            'pricing',
-            {})
+        load_datasets = self.get_load_datasets()
+        self.df_daily = self.get_dataset_df(
+            name='daily',
+            load_datasets=load_datasets)
+        self.df_minute = self.get_dataset_df(
+            name='minute',
+            load_datasets=load_datasets)
+        self.df_stats = self.get_dataset_df(
+            name='stats',
+            load_datasets=load_datasets)
+        self.df_peers = self.get_dataset_df(
+            name='peers',
+            load_datasets=load_datasets)
+        self.df_financials = self.get_dataset_df(
+            name='financials',
+            load_datasets=load_datasets)
+        self.df_earnings = self.get_dataset_df(
+            name='earnings',
+            load_datasets=load_datasets)
+        self.df_dividends = self.get_dataset_df(
+            name='dividends',
+            load_datasets=load_datasets)
+        self.df_quote = self.get_dataset_df(
+            name='quote',
+            load_datasets=load_datasets)
+        self.df_company = self.get_dataset_df(
+            name='company',
+            load_datasets=load_datasets)
+        self.df_iex_news = self.get_dataset_df(
+            name='news1',
+            load_datasets=load_datasets)
+        self.df_yahoo_news = self.get_dataset_df(
+            name='news',
+            load_datasets=load_datasets)
+        self.df_calls = self.get_dataset_df(
+            name='calls',
+            load_datasets=load_datasets)
+        self.df_puts = self.get_dataset_df(
+            name='puts',
+            load_datasets=load_datasets)
+        self.df_pricing = self.get_dataset_df(
+            name='pricing',
+            load_datasets=load_datasets,
+            default={})
 
         self.latest_min = None
         self.backtest_date = self.ds_date
@@ -2560,9 +2671,50 @@ class BaseAlgo:
         self.loaded_dataset = None
         self.last_history_dict = None
         self.last_handle_data = None
-        self.order_history = []
+        self.serialized_nodes = {}
+        self.signal_frames = {}
+        self.history_df = None
+        self.order_history = self.build_order_history()
+        if self.iproc:
+            self.iproc.reset_state()
     # end of reset_for_next_run
 
+    def close_indicator_processor(
+            self):
+        """close_indicator_processor
+
+        release the indicator processor's thread pool at the
+        end of a run (custom processors without a ``close``
+        method are left alone)
+        """
+        if self.iproc and hasattr(self.iproc, 'close'):
+            self.iproc.close()
+    # end of close_indicator_processor
+
+    def build_order_history(
+            self):
+        """build_order_history
+
+        build an empty trade history: a
+        ``TradeHistoryRecorder`` if ``self.compact_history``
+        is set else a list of dictionaries
+        """
+        if self.compact_history:
+            return history_recorder.TradeHistoryRecorder()
+        return []
+    # end of build_order_history
+
+    def get_history_df(
+            self):
+        """get_history_df
+
+        get the trade history as a ``pd.DataFrame``
+        """
+        if hasattr(self.order_history, 'to_df'):
+            return self.order_history.to_df()
+        return pd.DataFrame(self.order_history)
+    # end of get_history_df
+
     def handle_data(
             self,
             data):
@@ -2606,11 +2758,16 @@ class BaseAlgo:
                     ]
                 }
 
+            or an iterator of ``(ticker, node)`` tuples (like
+            ``analysis_engine.stream_algo_dataset``) which is
+            processed with ``self.handle_data_stream()``
         """
 
-        self.debug_msg = (
-            '{} handle - start'.format(
-                self.name))
+        self.log_nodes = self.is_node_logging_enabled()
+        if self.log_nodes:
+            self.debug_msg = (
+                '{} handle - start'.format(
+                    self.name))
 
         if self.loaded_dataset:
             log.info(
@@ -2622,11 +2779,29 @@ class BaseAlgo:
                     self.dsload_redis_key))
             data = self.loaded_dataset
 
+        if not isinstance(data, dict):
+            self.handle_data_stream(
+                stream=data)
+            return
+        # end of consuming a stream of nodes
+
+        if self.has_signals():
+            if self.vectorized:
+                self.handle_data_vectorized(
+                    data=data)
+                return
+            log.info(
+                '{} - running build_signals in the loop mode - '
+                'use vectorized=True for the faster vectorized '
+                'backtest engine'.format(
+                    self.name))
+        # end of vectorized backtesting
+
         data_for_tickers = self.get_supported_tickers_in_data(
             data=data)
 
         num_tickers = len(data_for_tickers)
-        if num_tickers > 0:
+        if num_tickers > 0 and self.log_nodes:
             self.debug_msg = (
                 '{} handle - tickers={}'.format(
                     self.name,
@@ -2642,92 +2817,376 @@ class BaseAlgo:
                 algo_id = 'ticker={} {}'.format(
                     ticker,
                     track_label)
-                log.info(
-                    '{} handle - {} - id={} ds={}'.format(
-                        self.name,
-                        algo_id,
-                        node['id'],
-                        node['date']))
+                self.handle_node(
+                    ticker=ticker,
+                    node=node,
+                    algo_id=algo_id)
+                cur_idx += 1
+        # for all supported tickers
 
-                self.ticker = ticker
-                self.prev_bal = self.balance
-                self.prev_num_owned = self.num_owned
+        # store the last handle dataset
+        self.last_handle_data = data
+        self.serialized_nodes = {}
+        self.close_indicator_processor()
 
-                (self.num_owned,
-                 self.num_buys,
-                 self.num_sells) = self.get_ticker_positions(
-                    ticker=ticker)
+        if self.log_nodes:
+            self.debug_msg = (
+                '{} handle - end tickers={}'.format(
+                    self.name,
+                    num_tickers))
 
-                # parse the dataset node and set member variables
-                self.debug_msg = (
-                    '{} START - load dataset id={}'.format(
-                        ticker,
-                        node.get('id', 'missing-id')))
-                self.load_from_dataset(
-                    ds_data=node)
-                self.debug_msg = (
-                    '{} END - load dataset id={}'.format(
-                        ticker,
-                        node.get('id', 'missing-id')))
+    # end of handle_data
 
-                """
-                Indicator Processor
-                """
-                if self.iproc:
-                    self.debug_msg = (
-                        '{} START - indicator processing'.format(
-                            ticker))
-                    self.iproc.process(
-                        algo_id=algo_id,
-                        ticker=self.ticker,
-                        dataset=node)
-                    self.debug_msg = (
-                        '{} END - indicator processing'.format(
-                            ticker))
-                # end of indicator processing
-
-                # thinking this could be a separate celery task
-                # to increase horizontal scaling to crunch
-                # datasets faster like:
-                # http://jsatt.com/blog/class-based-celery-tasks/
-                self.debug_msg = (
-                    '{} START - process id={}'.format(
-                        ticker,
-                        node.get('id', 'missing-id')))
-                self.process(
-                    algo_id=algo_id,
-                    ticker=self.ticker,
-                    dataset=node)
-                self.debug_msg = (
-                    '{} END - process id={}'.format(
-                        ticker,
-                        node.get('id', 'missing-id')))
+    def handle_data_stream(
+            self,
+            stream):
+        """handle_data_stream
+
+        process an iterator of ``(ticker, node)`` tuples (like
+        ``analysis_engine.stream_algo_dataset.stream_algo_dataset``)
+        one node at a time so only the current node is in memory.
+        Nodes for tickers this algorithm does not support are
+        skipped. The nodes are not kept, so
+        ``self.publish_input_dataset()`` has no algorithm-ready
+        dataset to publish after a stream.
+
+        :param stream: iterator of ``(ticker, node)`` tuples
+            where each ``node`` has the same structure as the
+            nodes in ``handle_data``
+        """
+        if self.log_nodes:
+            self.debug_msg = (
+                '{} handle stream - start'.format(
+                    self.name))
+
+        num_nodes = 0
+        for ticker, node in stream:
+            if ticker not in self.tickers:
+                continue
+            num_nodes += 1
+            algo_id = 'ticker={} node={}'.format(
+                ticker,
+                num_nodes)
+            self.handle_node(
+                ticker=ticker,
+                node=node,
+                algo_id=algo_id)
+        # for all nodes in the stream
+
+        self.last_handle_data = None
+        self.serialized_nodes = {}
+        self.close_indicator_processor()
+
+        if self.log_nodes:
+            self.debug_msg = (
+                '{} handle stream - end nodes={}'.format(
+                    self.name,
+                    num_nodes))
+    # end of handle_data_stream
+
+    def handle_node(
+            self,
+            ticker,
+            node,
+            algo_id):
+        """handle_node
+
+        load one dataset node, run the indicators and
+        ``self.process()`` and record the trade history
+
+        :param ticker: ticker symbol
+        :param node: dataset node dictionary with keys:
+            ``id``, ``date`` and ``data``
+        :param algo_id: algorithm progress label for the logs
+        """
+        log_nodes = self.log_nodes
+        node_id = node.get('id', 'missing-id')
+        if log_nodes:
+            log.info(
+                '{} handle - {} - id={} ds={}'.format(
+                    self.name,
+                    algo_id,
+                    node['id'],
+                    node['date']))
+
+        self.ticker = ticker
+        self.prev_bal = self.balance
+        self.prev_num_owned = self.num_owned
+
+        (self.num_owned,
+         self.num_buys,
+         self.num_sells) = self.get_ticker_positions(
+            ticker=ticker)
 
-                # always record the trade history for
-                # analysis/review using: myalgo.get_result()
+        # parse the dataset node and set member variables
+        if log_nodes:
+            self.debug_msg = (
+                '{} START - load dataset id={}'.format(
+                    ticker,
+                    node_id))
+        self.load_from_dataset(
+            ds_data=node)
+        if log_nodes:
+            self.debug_msg = (
+                '{} END - load dataset id={}'.format(
+                    ticker,
+                    node_id))
+        self.ledger.mark(
+            ticker=ticker,
+            price=self.trade_price)
+
+        """
+        Indicator Processor
+        """
+        if self.iproc:
+            if log_nodes:
                 self.debug_msg = (
-                    '{} START - history id={}'.format(
-                        ticker,
-                        node.get('id', 'missing-id')))
-                self.last_history_dict = self.get_trade_history_node()
-                if self.last_history_dict:
-                    self.order_history.append(self.last_history_dict)
+                    '{} START - indicator processing'.format(
+                        ticker))
+            self.iproc.process(
+                algo_id=algo_id,
+                ticker=self.ticker,
+                dataset=node)
+            if log_nodes:
                 self.debug_msg = (
-                    '{} END - history id={}'.format(
-                        ticker,
-                        node.get('id', 'missing-id')))
+                    '{} END - indicator processing'.format(
+                        ticker))
+        # end of indicator processing
+
+        # thinking this could be a separate celery task
+        # to increase horizontal scaling to crunch
+        # datasets faster like:
+        # http://jsatt.com/blog/class-based-celery-tasks/
+        if log_nodes:
+            self.debug_msg = (
+                '{} START - process id={}'.format(
+                    ticker,
+                    node_id))
+        if self.has_signals():
+            self.process_signals(
+                algo_id=algo_id,
+                ticker=self.ticker,
+                dataset=node)
+        else:
+            self.process(
+                algo_id=algo_id,
+                ticker=self.ticker,
+                dataset=node)
+        if log_nodes:
+            self.debug_msg = (
+                '{} END - process id={}'.format(
+                    ticker,
+                    node_id))
 
-                cur_idx += 1
+        # always record the trade history for
+        # analysis/review using: myalgo.get_result()
+        if log_nodes:
+            self.debug_msg = (
+                '{} START - history id={}'.format(
+                    ticker,
+                    node_id))
+        self.last_history_dict = self.get_trade_history_node()
+        if self.last_history_dict:
+            self.order_history.append(self.last_history_dict)
+        if log_nodes:
+            self.debug_msg = (
+                '{} END - history id={}'.format(
+                    ticker,
+                    node_id))
+    # end of handle_node
+
+    def handle_data_vectorized(
+            self,
+            data):
+        """handle_data_vectorized
+
+        backtest all nodes for each supported ticker with
+        ``self.build_signals()`` and NumPy array operations
+        instead of calling ``self.process()`` for each node (see
+        ``analysis_engine.vectorized_backtest``). The orders,
+        balance and positions match the loop mode. The per-node
+        history is stored in ``self.history_df`` and appended to
+        ``self.order_history`` with the loop mode's history
+        columns (the columns the engine does not track are
+        ``None``, see ``analysis_engine.vectorized_backtest``).
+
+        :param data: dictionary of dataset nodes for each ticker
+            with the same structure as ``self.handle_data()``
+        """
+        if self.log_nodes:
+            self.debug_msg = (
+                '{} handle vectorized - start'.format(
+                    self.name))
+
+        data_for_tickers = self.get_supported_tickers_in_data(
+            data=data)
+
+        history_dfs = []
+        for ticker in data_for_tickers:
+            nodes = data[ticker]
+            if not nodes:
+                continue
+            self.ticker = ticker
+            if not self.starting_close:
+                # set the starting close from the first node
+                # like the loop mode
+                self.load_from_dataset(
+                    ds_data=nodes[0])
+            history_df = vectorized_backtest.run_vectorized_ticker(
+                algo=self,
+                ticker=ticker,
+                nodes=nodes,
+                dataset_name=self.signal_dataset)
+            history_dfs.append(history_df)
+            self.order_history.extend(
+                history_df.to_dict('records'))
+
+            # leave the member variables on the last node
+            # like the loop mode
+            self.prev_bal = history_df['prev_balance'].iloc[-1]
+            self.prev_num_owned = history_df['prev_num_owned'].iloc[-1]
+            self.load_from_dataset(
+                ds_data=nodes[-1])
+            self.ledger.mark(
+                ticker=ticker,
+                price=self.trade_price)
+            (self.num_owned,
+             self.num_buys,
+             self.num_sells) = self.get_ticker_positions(
+                ticker=ticker)
         # for all supported tickers
 
-        # store the last handle dataset
+        if history_dfs:
+            self.history_df = pd.concat(
+                history_dfs,
+                ignore_index=True)
+
         self.last_handle_data = data
+        self.serialized_nodes = {}
+        self.close_indicator_processor()
 
-        self.debug_msg = (
-            '{} handle - end tickers={}'.format(
-                self.name,
-                num_tickers))
+        if self.log_nodes:
+            self.debug_msg = (
+                '{} handle vectorized - end tickers={}'.format(
+                    self.name,
+                    len(data_for_tickers)))
+    # end of handle_data_vectorized
 
-    # end of handle_data
+    def build_signals(
+            self,
+            ticker,
+            df):
+        """build_signals
+
+        Derive this method to return ``buy`` and ``sell``
+        boolean columns (as a ``pd.DataFrame`` or dictionary)
+        with one value per row in ``df``. Algorithms that derive
+        this method place orders from the signals instead of
+        calling ``self.process()``: on each row sell all shares
+        on a ``sell`` signal or buy the max number of shares on a
+        ``buy`` signal if no shares are owned.
+
+        Signals must only use the current and previous rows
+        because the loop mode calls this method with the rows
+        seen so far and ``vectorized=True`` calls it once with
+        all rows.
+
+        :param ticker: ticker symbol
+        :param df: ``pd.DataFrame`` of the ``self.signal_dataset``
+            rows with at least ``date`` and ``close`` columns
+        """
+        return None
+    # end of build_signals
+
+    def has_signals(
+            self):
+        """has_signals
+
+        return ``True`` if the algorithm derives
+        ``self.build_signals()``
+        """
+        return type(self).build_signals is not BaseAlgo.build_signals
+    # end of has_signals
+
+    def process_signals(
+            self,
+            algo_id,
+            ticker,
+            dataset):
+        """process_signals
+
+        loop mode for ``self.build_signals()`` - add the node's
+        ``self.signal_dataset`` rows to the rows seen so far,
+        build the signals and place the orders for the node's
+        rows
+
+        .. warning:: this is the slow reference path: the
+            signals are rebuilt from all rows seen so far on
+            every node (``O(N^2)`` over a backtest). It runs
+            with ``vectorized=False`` (the default) and for nodes
+            from ``self.handle_data_stream()`` which cannot be
+            vectorized without loading every node. Use
+            ``vectorized=True`` for long backtests.
+
+        :param algo_id: string - algo identifier label for
+            debugging datasets during specific dates
+        :param ticker: string - ticker
+        :param dataset: dataset node dictionary with keys:
+            ``id``, ``date`` and ``data``
+        """
+        rows = vectorized_backtest.get_signal_rows(
+            node=dataset,
+            dataset_name=self.signal_dataset)
+        if rows is None:
+            return
+        prev_df = self.signal_frames.get(
+            ticker,
+            None)
+        if prev_df is None:
+            signal_df = rows.reset_index(drop=True)
+        else:
+            signal_df = pd.concat(
+                [prev_df, rows],
+                ignore_index=True,
+                sort=False)
+        self.signal_frames[ticker] = signal_df
+
+        num_rows = len(signal_df.index)
+        buy, sell = vectorized_backtest.get_signal_arrays(
+            signals=self.build_signals(
+                ticker=ticker,
+                df=signal_df),
+            num_rows=num_rows)
+        start_row = num_rows - len(rows.index)
+        dates = signal_df['date'].tolist()
+        closes = signal_df['close'].tolist()
+        for row_idx in range(start_row, num_rows):
+            row = {
+                'date': dates[row_idx],
+                'close': closes[row_idx]
+            }
+            if sell[row_idx] and self.get_owned_shares(ticker=ticker):
+                self.create_sell_order(
+                    ticker=ticker,
+                    row=row,
+                    reason=vectorized_backtest.SELL_REASON)
+            elif buy[row_idx] and not self.get_owned_shares(
+                    ticker=ticker):
+                self.create_buy_order(
+                    ticker=ticker,
+                    row=row,
+                    reason=vectorized_backtest.BUY_REASON)
+        # end of for all new rows
+
+        self.should_buy = bool(buy[start_row:].any())
+        self.should_sell = bool(sell[start_row:].any())
+        log.debug(
+            '{} signals - {} rows={} buy={} sell={}'.format(
+                self.name,
+                algo_id,
+                num_rows,
+                self.should_buy,
+                self.should_sell))
+    # end of process_signals
 
 # end of BaseAlgo
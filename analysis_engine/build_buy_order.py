@@ -2,6 +2,7 @@
 Helper for creating a buy order
 """
 
+import logging
 from analysis_engine.consts import TRADE_OPEN
 from analysis_engine.consts import TRADE_NOT_ENOUGH_FUNDS
 from analysis_engine.consts import TRADE_FILLED
@@ -112,12 +113,13 @@ def build_buy_order(
         'version': version
     }
 
-    log.debug(
-        '{} {} buy {} order={}'.format(
-            ticker,
-            date,
-            get_status(status=order_dict['status']),
-            ppj(order_dict)))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            '{} {} buy {} order={}'.format(
+                ticker,
+                date,
+                get_status(status=order_dict['status']),
+                ppj(order_dict)))
 
     return order_dict
 # end of build_buy_order
@@ -0,0 +1,292 @@
+"""
+Build a ``pandas.DataFrame`` directly from the raw bytes of
+a cached dataset without round-tripping through Python objects
+and ``pd.read_json`` twice.
+
+Cached datasets are stored in Redis as a json-serialized
+``df.to_json(orient='records')`` string, so the slow path is:
+
+::
+
+    bytes -> decode -> json.loads -> str -> pd.read_json -> DataFrame
+
+This module parses the bytes with the fastest available json
+library (``orjson`` then ``ujson`` then ``json``) and builds the
+DataFrame column-by-column, then applies the same date and dtype
+coercion rules ``pd.read_json`` uses for ``orient='records'``.
+
+Binary columnar datasets (``arrow`` or ``parquet`` from
+``analysis_engine.df_serializers``) are detected and loaded
+without any json parsing.
+
+**Supported environment variables**
+
+::
+
+    # use the previous pd.read_json path for all decodes
+    export DF_DECODE_MODE=read_json
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import json
+import numpy as np
+import pandas as pd
+import analysis_engine.df_serializers as df_serializers
+from spylunking.log.setup_logging import build_colorized_logger
+from analysis_engine.consts import ev
+
+try:
+    import orjson as fast_json
+except Exception:
+    try:
+        import ujson as fast_json
+    except Exception:
+        fast_json = json
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+# orjson parses utf-8 bytes without decoding them to a str first
+FAST_JSON_BYTES = fast_json.__name__ == 'orjson'
+
+DF_DECODE_MODE = ev(
+    'DF_DECODE_MODE',
+    'fast')
+
+# ``pd.read_json`` ignores epoch values before this
+# (one year in seconds) when converting date columns
+MIN_STAMP = 31536000
+STAMP_UNITS = (
+    's',
+    'ms',
+    'us',
+    'ns')
+
+
+def loads(
+        data,
+        encoding='utf-8'):
+    """loads
+
+    Parse json ``str`` or ``bytes`` with the fastest available
+    json library
+
+    :param data: json ``str`` or ``bytes``
+    :param encoding: encoding for ``bytes`` data
+    """
+    if isinstance(data, bytes):
+        is_utf8 = encoding.lower().replace('-', '') == 'utf8'
+        if not (is_utf8 and FAST_JSON_BYTES):
+            data = data.decode(encoding)
+    return fast_json.loads(data)
+# end of loads
+
+
+def is_default_date_col(
+        col):
+    """is_default_date_col
+
+    Return ``True`` if ``pd.read_json`` would convert
+    the column ``col`` to dates by default
+
+    :param col: column name
+    """
+    if not isinstance(col, str):
+        return False
+    col_lower = col.lower()
+    return (
+        col_lower.endswith('_at') or
+        col_lower.endswith('_time') or
+        col_lower == 'modified' or
+        col_lower == 'date' or
+        col_lower == 'datetime' or
+        col_lower.startswith('timestamp'))
+# end of is_default_date_col
+
+
+def convert_date_col(
+        data):
+    """convert_date_col
+
+    Convert a date column like ``pd.read_json`` and return
+    the new ``pandas.Series`` or ``None`` if the column
+    is not convertible
+
+    :param data: ``pandas.Series``
+    """
+    if not len(data):
+        return None
+
+    new_data = data
+    if new_data.dtype == 'object':
+        try:
+            new_data = data.astype('int64')
+        except Exception:
+            pass
+
+    if issubclass(new_data.dtype.type, np.number):
+        in_range = (
+            pd.isnull(new_data.values) |
+            (new_data > MIN_STAMP))
+        if not in_range.all():
+            return None
+        for date_unit in STAMP_UNITS:
+            try:
+                return pd.to_datetime(
+                    new_data,
+                    errors='raise',
+                    unit=date_unit)
+            except ValueError:
+                continue
+            except Exception:
+                break
+        return None
+
+    try:
+        return pd.to_datetime(
+            new_data,
+            errors='raise')
+    except Exception:
+        return None
+# end of convert_date_col
+
+
+def convert_col(
+        data):
+    """convert_col
+
+    Coerce a column's dtype like ``pd.read_json``: object
+    columns become ``float64`` if possible and integral
+    floats become ``int64``
+
+    :param data: ``pandas.Series``
+    """
+    if data.dtype == 'object':
+        try:
+            data = data.astype('float64')
+        except Exception:
+            pass
+
+    if (len(data) and
+            (data.dtype == 'float' or data.dtype == 'object')):
+        try:
+            new_data = data.astype('int64')
+            if (new_data == data).all():
+                data = new_data
+        except Exception:
+            pass
+
+    return data
+# end of convert_col
+
+
+def convert_records_to_df(
+        records):
+    """convert_records_to_df
+
+    Build a ``pandas.DataFrame`` from a list of record
+    dictionaries (``orient='records'``) by building each
+    column once instead of inferring types row-by-row
+
+    :param records: list of dictionaries
+    """
+    if not records:
+        return pd.DataFrame()
+
+    columns = list(records[0].keys())
+    known = set(columns)
+    for record in records:
+        if len(record) != len(columns) or record.keys() - known:
+            for key in record:
+                if key not in known:
+                    known.add(key)
+                    columns.append(key)
+    # end of collecting all column names in order
+
+    if not columns:
+        return pd.DataFrame(
+            index=range(len(records)))
+
+    col_data = {}
+    for col in columns:
+        values = [
+            record.get(col, None)
+            for record in records
+        ]
+        series = pd.Series(values)
+        converted = None
+        if is_default_date_col(col):
+            converted = convert_date_col(series)
+        if converted is None:
+            converted = convert_col(series)
+        col_data[col] = converted
+    # end of for all columns
+
+    return pd.DataFrame(
+        col_data,
+        columns=columns)
+# end of convert_records_to_df
+
+
+def build_df_from_bytes(
+        raw_data,
+        encoding='utf-8',
+        orient='records',
+        mode=None):
+    """build_df_from_bytes
+
+    Build a ``pandas.DataFrame`` from the raw bytes of a
+    cached dataset. Returns ``None`` if there is no data.
+
+    :param raw_data: raw ``bytes`` (or ``str``) from redis
+    :param encoding: format of the encoded key in redis
+    :param orient: use the same orient value as
+                   the ``to_json(orient='records')`` used
+                   to serialize the DataFrame
+    :param mode: ``fast`` (default) or ``read_json`` for the
+                 previous ``json.loads`` + ``pd.read_json`` path
+    """
+    if not raw_data:
+        return None
+
+    # binary columnar datasets (see analysis_engine.df_serializers)
+    if df_serializers.get_columnar_format(raw_data):
+        return df_serializers.deserialize_df(raw_data)
+
+    use_mode = mode if mode else DF_DECODE_MODE
+    if use_mode == 'read_json' or orient != 'records':
+        if isinstance(raw_data, bytes):
+            raw_data = raw_data.decode(encoding)
+        data = json.loads(raw_data)
+        if not data:
+            return None
+        if not isinstance(data, str):
+            data = json.dumps(data)
+        return pd.read_json(
+            data,
+            orient=orient)
+    # end of previous decode path
+
+    data = loads(
+        raw_data,
+        encoding=encoding)
+    if not data:
+        return None
+
+    # datasets are json-serialized DataFrame json strings
+    if isinstance(data, str):
+        data = loads(data)
+
+    if isinstance(data, dict):
+        data = [data]
+
+    return convert_records_to_df(
+        records=data)
+# end of build_df_from_bytes
@@ -16,16 +16,14 @@ Debug redis calls with:
 
 """
 
-import redis
-import pandas as pd
 import analysis_engine.build_result as build_result
-import analysis_engine.get_data_from_redis_key as redis_get
+import analysis_engine.build_df_from_bytes as df_utils
+import analysis_engine.redis_pool as redis_pool
 from spylunking.log.setup_logging import build_colorized_logger
 from analysis_engine.consts import SUCCESS
 from analysis_engine.consts import NOT_RUN
 from analysis_engine.consts import ERR
 from analysis_engine.consts import ev
-from analysis_engine.consts import ppj
 
 log = build_colorized_logger(
     name=__name__)
@@ -99,70 +97,47 @@ def build_df_from_redis(
                     use_host,
                     use_port,
                     db))
-            use_client = redis.Redis(
+            use_client = redis_pool.get_redis_client(
                 host=use_host,
                 port=use_port,
                 password=password,
                 db=db)
 
-        redis_res = redis_get.get_data_from_redis_key(
-            label=log_id,
-            client=use_client,
-            host=use_host,
-            port=use_port,
-            password=password,
-            db=db,
-            key=key,
-            expire=expire,
-            serializer='json',
-            encoding=encoding)
+        raw_data = use_client.get(
+            name=key)
 
         valid_df = False
-        if redis_res['status'] == SUCCESS:
-            data = redis_res['rec'].get(
-                'data',
-                None)
-            if data:
-                if ev('DEBUG_REDIS', '0') == '1':
-                    log.info(
-                        '{} - found key={} data={}'.format(
-                            log_id,
-                            key,
-                            ppj(data)))
-                else:
-                    log.debug(
-                        '{} - loading df from key={}'.format(
-                            log_id,
-                            key))
-                    df = pd.read_json(
-                        data,
-                        orient='records')
-                    valid_df = True
-            else:
-                log.debug(
-                    '{} key={} no data'.format(
+        if raw_data:
+            if ev('DEBUG_REDIS', '0') == '1':
+                log.info(
+                    '{} - found key={} data={}'.format(
                         log_id,
-                        key))
-            # if data
-
-            rec['data'] = df
-            rec['valid_df'] = valid_df
-
-            res = build_result.build_result(
-                status=SUCCESS,
-                err=None,
-                rec=rec)
-            return res
+                        key,
+                        raw_data))
+            log.debug(
+                '{} - loading df from key={}'.format(
+                    log_id,
+                    key))
+            df = df_utils.build_df_from_bytes(
+                raw_data=raw_data,
+                encoding=encoding,
+                orient=orient)
+            valid_df = df is not None
         else:
             log.debug(
                 '{} no data key={}'.format(
                     log_id,
                     key))
-            res = build_result.build_result(
-                status=SUCCESS,
-                err=None,
-                rec=rec)
-            return res
+        # if data
+
+        rec['data'] = df
+        rec['valid_df'] = valid_df
+
+        res = build_result.build_result(
+            status=SUCCESS,
+            err=None,
+            rec=rec)
+        return res
     except Exception as e:
         err = (
             '{} failed - build_df_from_redis data={} '
@@ -2,6 +2,7 @@
 Helper for creating a sell order
 """
 
+import logging
 from analysis_engine.consts import TRADE_OPEN
 from analysis_engine.consts import TRADE_NOT_ENOUGH_FUNDS
 from analysis_engine.consts import TRADE_NO_SHARES_TO_SELL
@@ -115,12 +116,13 @@ def build_sell_order(
         'version': version
     }
 
-    log.debug(
-        '{} {} sell {} order={}'.format(
-            ticker,
-            date,
-            get_status(status=order_dict['status']),
-            ppj(order_dict)))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            '{} {} sell {} order={}'.format(
+                ticker,
+                date,
+                get_status(status=order_dict['status']),
+                ppj(order_dict)))
 
     return order_dict
 # end of build_sell_order
@@ -4,6 +4,7 @@ as a dictionary that can be reviewed during or after an
 algorithm finishes running
 """
 
+import logging
 from analysis_engine.consts import NOT_RUN
 from analysis_engine.consts import TRADE_ERROR
 from analysis_engine.consts import TRADE_NO_SHARES_TO_SELL
@@ -451,14 +452,15 @@ def build_trade_history_entry(
     history_dict['status'] = status
     history_dict['algo_status'] = algo_status
 
-    log.debug(
-        '{} ds_id={} {} algo={} trade={} history={}'.format(
-            ticker,
-            ds_id,
-            date,
-            get_status(status=history_dict['algo_status']),
-            get_status(status=history_dict['status']),
-            ppj(history_dict)))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            '{} ds_id={} {} algo={} trade={} history={}'.format(
+                ticker,
+                ds_id,
+                date,
+                get_status(status=history_dict['algo_status']),
+                get_status(status=history_dict['status']),
+                ppj(history_dict)))
 
     return history_dict
 # end of build_trade_history_entry
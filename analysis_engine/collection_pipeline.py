@@ -0,0 +1,1055 @@
+"""
+Collection Pipeline
+===================
+
+``asyncio`` pipeline for collecting the datasets for many tickers
+in one run. ``analysis_engine.fetch.fetch`` and the
+``get_new_pricing_data`` task process one ticker at a time (Yahoo,
+then each IEX dataset, then publish), so a run over hundreds of
+tickers spends most of its time waiting on one request at a time.
+The pipeline splits the run into three stages connected by bounded
+queues:
+
+#.  **fetch** - Yahoo calls for each ticker and IEX
+    `batch calls <https://iextrading.com/developer/docs/#batch-requests>`__
+    for groups of tickers (``analysis_engine.iex.fetch_batch``).
+    Each source has its own rate limit and limit of calls
+    in flight.
+#.  **scrub** - convert and scrub the IEX responses into
+    ``pandas.DataFrame`` objects and serialize every dataset to
+    json. A ticker moves to the next stage once all of its
+    fetches are scrubbed.
+#.  **publish** - cache each dataset in Redis and archive it
+    in Minio (S3) under the same ``<ticker>_<date>_<dataset>``
+    keys as ``get_new_pricing_data`` (plus the combined
+    ``<ticker>_<date>`` key).
+
+The blocking calls in each stage run on their own thread pool so
+network, CPU and Redis/S3 I/O overlap. The bounded queues keep a
+slow stage from buffering the datasets for every ticker in memory.
+
+.. code-block:: python
+
+    import analysis_engine.collection_pipeline as collection_pipeline
+    res = collection_pipeline.run_collection_pipeline(
+        tickers=['SPY', 'AMZN', 'TSLA', 'NFLX'])
+    print(res['rec']['tickers'])
+
+Run it from the command line with the ``-C`` flag:
+
+::
+
+    fetch_new_stock_datasets.py -t SPY,AMZN,TSLA,NFLX -C
+
+or on the engine with the
+``analysis_engine.work_tasks.collect_pricing_datasets``
+task.
+
+**Supported environment variables**
+
+::
+
+    # number of concurrent workers in each stage
+    export COLLECT_FETCH_WORKERS=8
+    export COLLECT_SCRUB_WORKERS=2
+    export COLLECT_PUBLISH_WORKERS=4
+
+    # max items waiting in each queue between the stages
+    export COLLECT_QUEUE_SIZE=32
+
+    # calls started per second and calls in flight for each
+    # source (a rate of 0 is unlimited)
+    export COLLECT_IEX_RATE=20
+    export COLLECT_IEX_MAX_CONCURRENT=4
+    export COLLECT_YAHOO_RATE=2
+    export COLLECT_YAHOO_MAX_CONCURRENT=4
+
+    # max tickers in one IEX batch call - smaller groups
+    # reach the publish stage sooner
+    export COLLECT_IEX_BATCH_SYMBOLS=25
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import copy
+import time
+import asyncio
+import concurrent.futures
+import analysis_engine.build_result as build_result
+import analysis_engine.iex.fetch_batch as fetch_batch
+import analysis_engine.yahoo.get_data as yahoo_data
+import analysis_engine.work_tasks.publish_pricing_update as \
+    publisher
+from spylunking.log.setup_logging import build_colorized_logger
+from analysis_engine.consts import SUCCESS
+from analysis_engine.consts import ERR
+from analysis_engine.consts import NOT_SET
+from analysis_engine.consts import ENABLED_S3_UPLOAD
+from analysis_engine.consts import S3_ACCESS_KEY
+from analysis_engine.consts import S3_SECRET_KEY
+from analysis_engine.consts import S3_REGION_NAME
+from analysis_engine.consts import S3_ADDRESS
+from analysis_engine.consts import S3_SECURE
+from analysis_engine.consts import S3_BUCKET
+from analysis_engine.consts import ENABLED_REDIS_PUBLISH
+from analysis_engine.consts import REDIS_ADDRESS
+from analysis_engine.consts import REDIS_PASSWORD
+from analysis_engine.consts import REDIS_DB
+from analysis_engine.consts import REDIS_EXPIRE
+from analysis_engine.consts import DATASET_COLLECTION_VERSION
+from analysis_engine.consts import FETCH_MODE_ALL
+from analysis_engine.consts import FETCH_MODE_YHO
+from analysis_engine.consts import FETCH_MODE_IEX
+from analysis_engine.consts import get_status
+from analysis_engine.consts import ev
+from analysis_engine.utils import get_last_close_str
+from analysis_engine.utils import utc_now_str
+from analysis_engine.iex.consts import DEFAULT_FETCH_DATASETS
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+COLLECT_FETCH_WORKERS = int(ev(
+    'COLLECT_FETCH_WORKERS',
+    '8'))
+COLLECT_SCRUB_WORKERS = int(ev(
+    'COLLECT_SCRUB_WORKERS',
+    '2'))
+COLLECT_PUBLISH_WORKERS = int(ev(
+    'COLLECT_PUBLISH_WORKERS',
+    '4'))
+COLLECT_QUEUE_SIZE = int(ev(
+    'COLLECT_QUEUE_SIZE',
+    '32'))
+COLLECT_IEX_RATE = float(ev(
+    'COLLECT_IEX_RATE',
+    '20'))
+COLLECT_IEX_MAX_CONCURRENT = int(ev(
+    'COLLECT_IEX_MAX_CONCURRENT',
+    '4'))
+COLLECT_YAHOO_RATE = float(ev(
+    'COLLECT_YAHOO_RATE',
+    '2'))
+COLLECT_YAHOO_MAX_CONCURRENT = int(ev(
+    'COLLECT_YAHOO_MAX_CONCURRENT',
+    '4'))
+COLLECT_IEX_BATCH_SYMBOLS = int(ev(
+    'COLLECT_IEX_BATCH_SYMBOLS',
+    '25'))
+
+# ticker record field to the key suffix for each source
+YAHOO_FIELDS = [
+    ('pricing', 'pricing'),
+    ('options', 'options'),
+    ('calls', 'calls'),
+    ('puts', 'puts'),
+    ('news', 'news')
+]
+IEX_FIELDS = [
+    ('daily', 'daily'),
+    ('minute', 'minute'),
+    ('quote', 'quote'),
+    ('stats', 'stats'),
+    ('peers', 'peers'),
+    ('iex_news', 'news1'),
+    ('financials', 'financials'),
+    ('earnings', 'earnings'),
+    ('dividends', 'dividends'),
+    ('company', 'company')
+]
+
+
+class SourceLimiter:
+    """SourceLimiter
+
+    Limit the calls to one data source from the pipeline's
+    event loop: at most ``rate`` calls start each second and
+    at most ``max_concurrent`` calls are in flight
+
+    :param name: name of the source for the logs
+    :param rate: calls per second (``0`` is unlimited)
+    :param max_concurrent: max calls in flight
+    """
+
+    def __init__(
+            self,
+            name,
+            rate,
+            max_concurrent):
+        """__init__
+
+        :param name: name of the source for the logs
+        :param rate: calls per second (``0`` is unlimited)
+        :param max_concurrent: max calls in flight
+        """
+        self.name = name
+        self.interval = 0.0
+        if rate > 0:
+            self.interval = 1.0 / rate
+        self.max_concurrent = max(max_concurrent, 1)
+        self.next_time = 0.0
+        self.num_calls = 0
+        self.wait_seconds = 0.0
+        # created on first use so it belongs to
+        # the running event loop
+        self.semaphore = None
+    # end of __init__
+
+    async def acquire(
+            self):
+        """acquire
+
+        wait for a free slot and for the next start time
+        """
+        if not self.semaphore:
+            self.semaphore = asyncio.Semaphore(
+                self.max_concurrent)
+        start_time = time.time()
+        await self.semaphore.acquire()
+        try:
+            # reserve the next start time before sleeping
+            # (no await so no other worker runs in between)
+            now = asyncio.get_event_loop().time()
+            wait = self.next_time - now
+            self.next_time = max(
+                self.next_time,
+                now) + self.interval
+            if wait > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            self.semaphore.release()
+            raise
+        # end of try/ex
+        self.num_calls += 1
+        self.wait_seconds += time.time() - start_time
+    # end of acquire
+
+    def release(
+            self):
+        """release"""
+        self.semaphore.release()
+    # end of release
+
+    def get_stats(
+            self):
+        """get_stats"""
+        return {
+            'calls': self.num_calls,
+            'wait_seconds': self.wait_seconds
+        }
+    # end of get_stats
+
+# end of SourceLimiter
+
+
+def build_ticker_rec():
+    """build_ticker_rec
+
+    Build an empty record for one ticker with the
+    same keys as the ``get_new_pricing_data`` task
+    """
+    return {
+        'pricing': None,
+        'options': None,
+        'calls': None,
+        'puts': None,
+        'news': None,
+        'daily': None,
+        'minute': None,
+        'quote': None,
+        'stats': None,
+        'peers': None,
+        'iex_news': None,
+        'financials': None,
+        'earnings': None,
+        'dividends': None,
+        'company': None,
+        'exp_date': None,
+        'publish_pricing_update': None,
+        'date': utc_now_str(),
+        'updated': None,
+        'version': DATASET_COLLECTION_VERSION
+    }
+# end of build_ticker_rec
+
+
+def build_update_request(
+        work_dict,
+        ticker,
+        key,
+        data,
+        label):
+    """build_update_request
+
+    Build a ``run_publish_pricing_update`` request that
+    uses the Redis and S3 settings in the ``work_dict``
+
+    :param work_dict: pipeline request dictionary
+    :param ticker: ticker symbol
+    :param key: redis and s3 key
+    :param data: data to publish
+    :param label: log tracking label
+    """
+    return {
+        'ticker': ticker,
+        'ticker_id': work_dict.get(
+            'ticker_id',
+            None),
+        'strike': work_dict.get(
+            'strike',
+            None),
+        'contract': work_dict.get(
+            'contract',
+            'C'),
+        'data': data,
+        'label': label,
+        'celery_disabled': True,
+        's3_enabled': work_dict.get(
+            's3_enabled',
+            ENABLED_S3_UPLOAD),
+        's3_bucket': work_dict.get(
+            's3_bucket',
+            S3_BUCKET),
+        's3_key': key,
+        's3_access_key': work_dict.get(
+            's3_access_key',
+            S3_ACCESS_KEY),
+        's3_secret_key': work_dict.get(
+            's3_secret_key',
+            S3_SECRET_KEY),
+        's3_region_name': work_dict.get(
+            's3_region_name',
+            S3_REGION_NAME),
+        's3_address': work_dict.get(
+            's3_address',
+            S3_ADDRESS),
+        's3_secure': work_dict.get(
+            's3_secure',
+            S3_SECURE),
+        'redis_enabled': work_dict.get(
+            'redis_enabled',
+            ENABLED_REDIS_PUBLISH),
+        'redis_key': key,
+        'redis_address': work_dict.get(
+            'redis_address',
+            REDIS_ADDRESS),
+        'redis_password': work_dict.get(
+            'redis_password',
+            REDIS_PASSWORD),
+        'redis_db': int(work_dict.get(
+            'redis_db',
+            REDIS_DB)),
+        'redis_expire': work_dict.get(
+            'redis_expire',
+            REDIS_EXPIRE)
+    }
+# end of build_update_request
+
+
+class CollectionPipeline:
+    """CollectionPipeline
+
+    Fetch, scrub and publish the datasets for a list of
+    tickers with bounded queues between the stages. Use
+    ``run_collection_pipeline`` to run it from synchronous
+    code.
+
+    :param tickers: list of ticker symbols
+    :param work_dict: optional - dictionary with the Redis
+        and S3 settings (same keys as
+        ``analysis_engine.api_requests.build_get_new_pricing_request``)
+    :param fetch_mode: optional - ``all`` (default), ``iex``
+        or ``yahoo`` (or a ``FETCH_MODE_*`` value)
+    :param iex_datasets: optional - list of IEX fetch types
+        (default is ``DEFAULT_FETCH_DATASETS``)
+    :param label: optional - log tracking label
+    :param fetch_workers: optional - number of fetch workers
+        (default is ``COLLECT_FETCH_WORKERS``)
+    :param scrub_workers: optional - number of scrub workers
+        (default is ``COLLECT_SCRUB_WORKERS``)
+    :param publish_workers: optional - number of publish
+        workers (default is ``COLLECT_PUBLISH_WORKERS``)
+    :param queue_size: optional - max items in each queue
+        (default is ``COLLECT_QUEUE_SIZE``)
+    :param iex_limiter: optional - ``SourceLimiter`` for IEX
+    :param yahoo_limiter: optional - ``SourceLimiter`` for Yahoo
+    :param iex_base_url: optional - IEX api url (default is
+        ``analysis_engine.iex.fetch_batch.IEX_API_URL``)
+    :param iex_batch_symbols: optional - max tickers in one
+        IEX batch call (default is ``COLLECT_IEX_BATCH_SYMBOLS``)
+    """
+
+    def __init__(
+            self,
+            tickers,
+            work_dict=None,
+            fetch_mode=None,
+            iex_datasets=None,
+            label=None,
+            fetch_workers=None,
+            scrub_workers=None,
+            publish_workers=None,
+            queue_size=None,
+            iex_limiter=None,
+            yahoo_limiter=None,
+            iex_base_url=None,
+            iex_batch_symbols=None):
+        """__init__
+
+        :param tickers: list of ticker symbols
+        :param work_dict: optional - dictionary with the
+            Redis and S3 settings
+        :param fetch_mode: optional - ``all``, ``iex``
+            or ``yahoo``
+        :param iex_datasets: optional - list of IEX fetch types
+        :param label: optional - log tracking label
+        :param fetch_workers: optional - number of fetch workers
+        :param scrub_workers: optional - number of scrub workers
+        :param publish_workers: optional - number of publish
+            workers
+        :param queue_size: optional - max items in each queue
+        :param iex_limiter: optional - ``SourceLimiter`` for IEX
+        :param yahoo_limiter: optional - ``SourceLimiter``
+            for Yahoo
+        :param iex_base_url: optional - IEX api url
+        :param iex_batch_symbols: optional - max tickers in one
+            IEX batch call
+        """
+        self.tickers = []
+        for ticker in tickers:
+            ticker = str(ticker).upper()
+            if ticker and ticker not in self.tickers:
+                self.tickers.append(ticker)
+        self.work_dict = work_dict
+        if not self.work_dict:
+            self.work_dict = {}
+        self.fetch_mode = str(fetch_mode or 'all').lower()
+        if fetch_mode == FETCH_MODE_ALL:
+            self.fetch_mode = 'all'
+        elif fetch_mode == FETCH_MODE_YHO:
+            self.fetch_mode = 'yahoo'
+        elif fetch_mode == FETCH_MODE_IEX:
+            self.fetch_mode = 'iex'
+        self.iex_datasets = iex_datasets
+        if self.iex_datasets is None:
+            self.iex_datasets = DEFAULT_FETCH_DATASETS
+        self.label = label
+        if not self.label:
+            self.label = 'collect'
+        self.fetch_workers = max(
+            fetch_workers or COLLECT_FETCH_WORKERS,
+            1)
+        self.scrub_workers = max(
+            scrub_workers or COLLECT_SCRUB_WORKERS,
+            1)
+        self.publish_workers = max(
+            publish_workers or COLLECT_PUBLISH_WORKERS,
+            1)
+        self.queue_size = max(
+            queue_size or COLLECT_QUEUE_SIZE,
+            1)
+        self.iex_limiter = iex_limiter
+        if not self.iex_limiter:
+            self.iex_limiter = SourceLimiter(
+                name='iex',
+                rate=COLLECT_IEX_RATE,
+                max_concurrent=COLLECT_IEX_MAX_CONCURRENT)
+        self.yahoo_limiter = yahoo_limiter
+        if not self.yahoo_limiter:
+            self.yahoo_limiter = SourceLimiter(
+                name='yahoo',
+                rate=COLLECT_YAHOO_RATE,
+                max_concurrent=COLLECT_YAHOO_MAX_CONCURRENT)
+        self.iex_url = fetch_batch.get_batch_url(
+            base_url=iex_base_url)
+        self.iex_batch_symbols = (
+            iex_batch_symbols or COLLECT_IEX_BATCH_SYMBOLS)
+
+        self.get_yahoo = self.fetch_mode in ['all', 'yahoo']
+        self.get_iex = self.fetch_mode in ['all', 'iex']
+        if not self.get_yahoo and not self.get_iex:
+            log.error(
+                '{} - unsupported fetch_mode={}'.format(
+                    self.label,
+                    self.fetch_mode))
+
+        last_close_str = self.work_dict.get(
+            'last_close_str',
+            None)
+        if not last_close_str:
+            last_close_str = get_last_close_str()
+        self.keys = {
+            ticker: '{}_{}'.format(
+                ticker,
+                last_close_str)
+            for ticker in self.tickers
+        }
+        self.recs = {
+            ticker: build_ticker_rec()
+            for ticker in self.tickers
+        }
+        self.pending = {
+            ticker: 0
+            for ticker in self.tickers
+        }
+        self.results = {}
+        self.num_fetch_errors = 0
+        self.jobs = self.build_jobs()
+    # end of __init__
+
+    def build_jobs(
+            self):
+        """build_jobs
+
+        Build the fetch jobs as ``(source, value)`` tuples
+        where ``value`` is a ticker for ``yahoo`` and a batch
+        request for ``iex``. The jobs are ordered by the groups
+        of tickers in the IEX batch calls so the first tickers
+        are ready to publish while the rest are fetched.
+        """
+        iex_requests = []
+        if self.get_iex and self.iex_datasets:
+            iex_requests = [
+                req
+                for req in fetch_batch.build_batch_requests(
+                    tickers=self.tickers,
+                    fetch_types=self.iex_datasets,
+                    max_symbols=self.iex_batch_symbols)
+                if req['fields']
+            ]
+        groups = []
+        group_jobs = {}
+        for req in iex_requests:
+            group = tuple(req['symbols'])
+            if group not in group_jobs:
+                groups.append(group)
+                group_jobs[group] = []
+            group_jobs[group].append(('iex', req))
+        if not groups:
+            groups.append(tuple(self.tickers))
+            group_jobs[groups[0]] = []
+
+        jobs = []
+        for group in groups:
+            jobs.extend(group_jobs[group])
+            if self.get_yahoo:
+                for ticker in group:
+                    jobs.append(('yahoo', ticker))
+        for source, value in jobs:
+            if source == 'iex':
+                for ticker in value['symbols']:
+                    self.pending[ticker] += 1
+            else:
+                self.pending[value] += 1
+        return jobs
+    # end of build_jobs
+
+    def fetch_job(
+            self,
+            source,
+            value):
+        """fetch_job
+
+        blocking fetch for one job (runs on the fetch threads)
+
+        :param source: ``iex`` or ``yahoo``
+        :param value: batch request or ticker
+        """
+        if source == 'iex':
+            return fetch_batch.fetch_batch_call(
+                url=self.iex_url,
+                req=value,
+                label='{} - iex types={}'.format(
+                    self.label,
+                    value['params']['types']))
+        yahoo_req = copy.deepcopy(self.work_dict)
+        yahoo_req['ticker'] = value
+        yahoo_req['label'] = '{} - yahoo'.format(
+            self.label)
+        yahoo_req['publish_fields'] = False
+        return yahoo_data.get_data_from_yahoo(
+            work_dict=yahoo_req)
+    # end of fetch_job
+
+    def scrub_job(
+            self,
+            source,
+            value,
+            res):
+        """scrub_job
+
+        blocking conversion of a fetch result into a list of
+        ``(ticker, fields)`` tuples where ``fields`` is a
+        dictionary of ticker record keys to serialized
+        datasets (runs on the scrub threads)
+
+        :param source: ``iex`` or ``yahoo``
+        :param value: batch request or ticker
+        :param res: result from ``fetch_job``
+        """
+        if source == 'iex':
+            if res is None:
+                return [
+                    (ticker, {})
+                    for ticker in value['symbols']
+                ]
+            datasets = fetch_batch.scrub_batch_call(
+                res=res,
+                req=value,
+                label='{} - iex'.format(
+                    self.label))
+            results = []
+            for ticker in value['symbols']:
+                fields = {}
+                ticker_datasets = datasets.get(
+                    ticker,
+                    {})
+                for field in ticker_datasets:
+                    df = ticker_datasets[field]
+                    if df is None:
+                        continue
+                    rec_field = field
+                    if field == 'news':
+                        rec_field = 'iex_news'
+                    fields[rec_field] = df.to_json(
+                        orient='records',
+                        date_format='iso')
+                results.append((ticker, fields))
+            return results
+        # end of iex
+
+        if res['status'] != SUCCESS:
+            log.error(
+                '{} - failed YAHOO ticker={} status={} err={}'.format(
+                    self.label,
+                    value,
+                    get_status(status=res['status']),
+                    res['err']))
+            return [(value, {})]
+        yahoo_rec = res['rec']
+        fields = {}
+        for rec_field, _ in YAHOO_FIELDS:
+            if yahoo_rec.get(rec_field, None) is not None:
+                fields[rec_field] = yahoo_rec[rec_field]
+        return [(value, fields)]
+    # end of scrub_job
+
+    def publish_ticker(
+            self,
+            ticker):
+        """publish_ticker
+
+        blocking publish of every dataset for a ticker and
+        the combined record (runs on the publish threads)
+
+        :param ticker: ticker symbol
+        """
+        rec = self.recs[ticker]
+        key = self.keys[ticker]
+        label = '{} - ticker={}'.format(
+            self.label,
+            ticker)
+        rec['updated'] = utc_now_str()
+
+        fields = []
+        if self.get_yahoo:
+            fields.extend(YAHOO_FIELDS)
+        if self.get_iex:
+            fields.extend(IEX_FIELDS)
+        for rec_field, key_suffix in fields:
+            data = rec[rec_field]
+            if not data:
+                data = '{}'
+            try:
+                publisher.run_publish_pricing_update(
+                    work_dict=build_update_request(
+                        work_dict=self.work_dict,
+                        ticker=ticker,
+                        key='{}_{}'.format(
+                            key,
+                            key_suffix),
+                        data=data,
+                        label=label))
+            except Exception as e:
+                log.error(
+                    '{} - failed publishing field={} ex={}'.format(
+                        label,
+                        key_suffix,
+                        e))
+        # end of for all fields
+
+        update_res = publisher.run_publish_pricing_update(
+            work_dict=build_update_request(
+                work_dict=self.work_dict,
+                ticker=ticker,
+                key=key,
+                data=rec,
+                label=label))
+        rec['publish_pricing_update'] = update_res
+        return update_res.get(
+            'status',
+            NOT_SET)
+    # end of publish_ticker
+
+    async def fetch_worker(
+            self,
+            fetch_queue,
+            scrub_queue,
+            executor):
+        """fetch_worker
+
+        :param fetch_queue: queue of fetch jobs
+        :param scrub_queue: queue for the fetch results
+        :param executor: thread pool for the fetches
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            job = await fetch_queue.get()
+            if job is None:
+                break
+            source, value = job
+            limiter = self.iex_limiter
+            if source == 'yahoo':
+                limiter = self.yahoo_limiter
+            res = None
+            await limiter.acquire()
+            try:
+                res = await loop.run_in_executor(
+                    executor,
+                    self.fetch_job,
+                    source,
+                    value)
+            except Exception as e:
+                log.error(
+                    '{} - {} fetch failed with ex={}'.format(
+                        self.label,
+                        source,
+                        e))
+                if source == 'yahoo':
+                    res = build_result.build_result(
+                        status=ERR,
+                        err='{}'.format(e),
+                        rec={})
+            finally:
+                limiter.release()
+            # end of try/ex/finally
+            if res is None or (
+                    source == 'yahoo' and res['status'] != SUCCESS):
+                self.num_fetch_errors += 1
+            await scrub_queue.put((source, value, res))
+        # end of while there are jobs
+    # end of fetch_worker
+
+    async def scrub_worker(
+            self,
+            scrub_queue,
+            publish_queue,
+            executor):
+        """scrub_worker
+
+        :param scrub_queue: queue of fetch results
+        :param publish_queue: queue for the tickers
+            ready to publish
+        :param executor: thread pool for the scrubbers
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            job = await scrub_queue.get()
+            if job is None:
+                break
+            source, value, res = job
+            try:
+                results = await loop.run_in_executor(
+                    executor,
+                    self.scrub_job,
+                    source,
+                    value,
+                    res)
+            except Exception as e:
+                log.error(
+                    '{} - {} scrub failed with ex={}'.format(
+                        self.label,
+                        source,
+                        e))
+                tickers = [value]
+                if source == 'iex':
+                    tickers = value['symbols']
+                results = [
+                    (ticker, {})
+                    for ticker in tickers
+                ]
+            # end of try/ex
+
+            # merging runs on the event loop so the
+            # records and counters need no locks
+            for ticker, fields in results:
+                self.recs[ticker].update(fields)
+                self.pending[ticker] -= 1
+                if self.pending[ticker] == 0:
+                    await publish_queue.put(ticker)
+        # end of while there are fetch results
+    # end of scrub_worker
+
+    async def publish_worker(
+            self,
+            publish_queue,
+            executor):
+        """publish_worker
+
+        :param publish_queue: queue of tickers to publish
+        :param executor: thread pool for the publishers
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            ticker = await publish_queue.get()
+            if ticker is None:
+                break
+            try:
+                status = await loop.run_in_executor(
+                    executor,
+                    self.publish_ticker,
+                    ticker)
+            except Exception as e:
+                log.error(
+                    '{} - ticker={} publish failed with ex={}'.format(
+                        self.label,
+                        ticker,
+                        e))
+                status = ERR
+            # end of try/ex
+            self.results[ticker] = status
+            log.info(
+                '{} - published ticker={} status={} done={}/{}'.format(
+                    self.label,
+                    ticker,
+                    get_status(status=status),
+                    len(self.results),
+                    len(self.tickers)))
+        # end of while there are tickers
+    # end of publish_worker
+
+    async def run(
+            self):
+        """run
+
+        Run the stages until every ticker is published and
+        return a dictionary of tickers to publish statuses
+        """
+        fetch_queue = asyncio.Queue(
+            maxsize=self.queue_size)
+        scrub_queue = asyncio.Queue(
+            maxsize=self.queue_size)
+        publish_queue = asyncio.Queue(
+            maxsize=self.queue_size)
+        fetch_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.fetch_workers)
+        scrub_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.scrub_workers)
+        publish_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.publish_workers)
+
+        log.info(
+            '{} - start tickers={} fetch_jobs={} mode={} '
+            'workers fetch={} scrub={} publish={}'.format(
+                self.label,
+                len(self.tickers),
+                len(self.jobs),
+                self.fetch_mode,
+                self.fetch_workers,
+                self.scrub_workers,
+                self.publish_workers))
+
+        try:
+            fetch_tasks = [
+                asyncio.ensure_future(
+                    self.fetch_worker(
+                        fetch_queue=fetch_queue,
+                        scrub_queue=scrub_queue,
+                        executor=fetch_executor))
+                for _ in range(self.fetch_workers)
+            ]
+            scrub_tasks = [
+                asyncio.ensure_future(
+                    self.scrub_worker(
+                        scrub_queue=scrub_queue,
+                        publish_queue=publish_queue,
+                        executor=scrub_executor))
+                for _ in range(self.scrub_workers)
+            ]
+            publish_tasks = [
+                asyncio.ensure_future(
+                    self.publish_worker(
+                        publish_queue=publish_queue,
+                        executor=publish_executor))
+                for _ in range(self.publish_workers)
+            ]
+
+            # tickers without any fetches still publish
+            # an empty record
+            for ticker in self.tickers:
+                if self.pending[ticker] == 0:
+                    await publish_queue.put(ticker)
+            for job in self.jobs:
+                await fetch_queue.put(job)
+
+            # drain each stage before stopping the next
+            for _ in fetch_tasks:
+                await fetch_queue.put(None)
+            await asyncio.gather(*fetch_tasks)
+            for _ in scrub_tasks:
+                await scrub_queue.put(None)
+            await asyncio.gather(*scrub_tasks)
+            for _ in publish_tasks:
+                await publish_queue.put(None)
+            await asyncio.gather(*publish_tasks)
+        finally:
+            fetch_executor.shutdown(wait=False)
+            scrub_executor.shutdown(wait=False)
+            publish_executor.shutdown(wait=False)
+        # end of try/finally
+
+        return self.results
+    # end of run
+
+# end of CollectionPipeline
+
+
+def run_collection_pipeline(
+        tickers,
+        work_dict=None,
+        fetch_mode=None,
+        iex_datasets=None,
+        label=None,
+        fetch_workers=None,
+        scrub_workers=None,
+        publish_workers=None,
+        queue_size=None,
+        iex_base_url=None,
+        iex_batch_symbols=None):
+    """run_collection_pipeline
+
+    Run a ``CollectionPipeline`` on a new event loop and
+    return a result dictionary with ``rec`` keys:
+
+    - ``tickers`` - dictionary of tickers to publish statuses
+    - ``keys`` - dictionary of tickers to Redis and S3 keys
+    - ``num_published`` and ``num_failed`` tickers
+    - ``num_fetch_errors`` - failed Yahoo calls and IEX batch
+      calls
+    - ``limits`` - calls and seconds waited for each source
+    - ``seconds`` - time for the run
+
+    The status is ``SUCCESS`` when every ticker was published.
+
+    :param tickers: list of ticker symbols
+    :param work_dict: optional - dictionary with the Redis
+        and S3 settings (same keys as
+        ``analysis_engine.api_requests.build_get_new_pricing_request``)
+    :param fetch_mode: optional - ``all`` (default), ``iex``
+        or ``yahoo`` (or a ``FETCH_MODE_*`` value)
+    :param iex_datasets: optional - list of IEX fetch types
+        (default is ``DEFAULT_FETCH_DATASETS``)
+    :param label: optional - log tracking label
+    :param fetch_workers: optional - number of fetch workers
+        (default is ``COLLECT_FETCH_WORKERS``)
+    :param scrub_workers: optional - number of scrub workers
+        (default is ``COLLECT_SCRUB_WORKERS``)
+    :param publish_workers: optional - number of publish
+        workers (default is ``COLLECT_PUBLISH_WORKERS``)
+    :param queue_size: optional - max items in each queue
+        (default is ``COLLECT_QUEUE_SIZE``)
+    :param iex_base_url: optional - IEX api url
+    :param iex_batch_symbols: optional - max tickers in one
+        IEX batch call (default is ``COLLECT_IEX_BATCH_SYMBOLS``)
+    """
+    if not label:
+        label = 'collect'
+    rec = {
+        'tickers': {},
+        'keys': {},
+        'num_published': 0,
+        'num_failed': 0,
+        'num_fetch_errors': 0,
+        'limits': {},
+        'seconds': 0.0
+    }
+    start_time = time.time()
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        pipeline = CollectionPipeline(
+            tickers=tickers,
+            work_dict=work_dict,
+            fetch_mode=fetch_mode,
+            iex_datasets=iex_datasets,
+            label=label,
+            fetch_workers=fetch_workers,
+            scrub_workers=scrub_workers,
+            publish_workers=publish_workers,
+            queue_size=queue_size,
+            iex_base_url=iex_base_url,
+            iex_batch_symbols=iex_batch_symbols)
+        results = loop.run_until_complete(
+            pipeline.run())
+    except Exception as e:
+        err = (
+            '{} - collection pipeline failed with ex={}'.format(
+                label,
+                e))
+        log.error(err)
+        return build_result.build_result(
+            status=ERR,
+            err=err,
+            rec=rec)
+    finally:
+        loop.close()
+        asyncio.set_event_loop(None)
+    # end of try/ex/finally
+
+    rec['tickers'] = results
+    rec['keys'] = pipeline.keys
+    rec['num_published'] = len([
+        ticker
+        for ticker in results
+        if results[ticker] == SUCCESS
+    ])
+    rec['num_failed'] = len(pipeline.tickers) - rec['num_published']
+    rec['num_fetch_errors'] = pipeline.num_fetch_errors
+    rec['limits'] = {
+        'iex': pipeline.iex_limiter.get_stats(),
+        'yahoo': pipeline.yahoo_limiter.get_stats()
+    }
+    rec['seconds'] = time.time() - start_time
+
+    log.info(
+        '{} - done tickers={} published={} failed={} '
+        'fetch_errors={} seconds={:.2f}'.format(
+            label,
+            len(pipeline.tickers),
+            rec['num_published'],
+            rec['num_failed'],
+            rec['num_fetch_errors'],
+            rec['seconds']))
+
+    if rec['num_failed'] > 0:
+        return build_result.build_result(
+            status=ERR,
+            err='{} - failed publishing tickers={}'.format(
+                label,
+                [
+                    ticker
+                    for ticker in pipeline.tickers
+                    if results.get(ticker, None) != SUCCESS
+                ]),
+            rec=rec)
+    return build_result.build_result(
+        status=SUCCESS,
+        err=None,
+        rec=rec)
+# end of run_collection_pipeline
@@ -0,0 +1,613 @@
+"""
+Columnar Algorithm-Ready Datasets on Disk
+=========================================
+
+The algorithm-ready file format is one json document with every
+dataset stored as a json string, so loading any part of it means
+decoding all of it. This module stores the same data as a
+directory with one Arrow (or Parquet) file per dataset type and
+a small ``manifest.json``:
+
+::
+
+    SPY-latest/
+        manifest.json
+        daily.arrow
+        minute.arrow
+        ...
+
+Each dataset file holds the rows of every node with two extra
+columns: ``ds_ticker`` and ``ds_date`` (the node's ticker and
+date - prefixed so they do not collide with a dataset's own
+``date`` column). The manifest keeps the node ``id`` and
+``date`` for each ticker, the list of datasets and each node's
+dataset columns (an index into the dataset's ``column_sets``)
+so a load returns the same columns in the same order as the
+original frames, including columns that only hold nulls.
+
+Object columns that mix value types (like numbers and strings)
+cannot be stored in an Arrow column, so the values in those
+columns are written as strings.
+
+Loads memory-map each file, select the rows for the requested
+tickers and date range on the Arrow table and only convert those
+rows into ``pandas.DataFrame`` objects.
+
+Any ``file:`` path that is a directory with a ``manifest.json``
+is loaded as a columnar dataset by
+``analysis_engine.load_dataset.load_dataset`` (and so by
+``show_dataset``, ``restore_dataset`` and ``sa -b file:/...``).
+Publishing an algorithm-ready dataset to an ``output_file``
+ending with ``/`` (or an existing directory, like
+``sa -e file:/opt/sa/tests/datasets/algo/SPY-latest/``) writes
+the columnar format.
+
+Requires the optional ``pyarrow`` package.
+
+.. code-block:: python
+
+    import analysis_engine.columnar_dataset as columnar_dataset
+    columnar_dataset.write_columnar_dataset(
+        algo_dataset=algo.create_algorithm_ready_dataset(),
+        output_dir='/opt/sa/tests/datasets/algo/SPY-latest/')
+    ds = columnar_dataset.load_columnar_dataset(
+        path_to_dir='/opt/sa/tests/datasets/algo/SPY-latest/',
+        tickers=['SPY'],
+        start_date='2018-11-01',
+        end_date='2018-11-30')
+
+**Supported environment variables**
+
+::
+
+    # file format for new columnar datasets: arrow or parquet
+    export ALGO_COLUMNAR_FORMAT=arrow
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import os
+import json
+import pandas as pd
+import analysis_engine.df_serializers as df_serializers
+from analysis_engine.consts import SUCCESS
+from analysis_engine.consts import FAILED
+from analysis_engine.consts import DEFAULT_SERIALIZED_DATASETS
+from analysis_engine.consts import ev
+from spylunking.log.setup_logging import build_colorized_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:
+    pa = None
+    pq = None
+
+try:
+    import pyarrow.compute as pc
+except Exception:
+    pc = None
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+ALGO_COLUMNAR_FORMAT = ev(
+    'ALGO_COLUMNAR_FORMAT',
+    df_serializers.SERIALIZER_ARROW)
+
+COLUMNAR_VERSION = 2
+MANIFEST_FILE = 'manifest.json'
+TICKER_COL = 'ds_ticker'
+DATE_COL = 'ds_date'
+FILE_EXTENSIONS = {
+    df_serializers.SERIALIZER_ARROW: 'arrow',
+    df_serializers.SERIALIZER_PARQUET: 'parquet'
+}
+
+
+def is_columnar_dataset(
+        path_to_dir):
+    """is_columnar_dataset
+
+    Return ``True`` if ``path_to_dir`` is a directory holding
+    a columnar algorithm-ready dataset
+
+    :param path_to_dir: path to check
+    """
+    if not path_to_dir:
+        return False
+    return os.path.isfile(
+        os.path.join(
+            path_to_dir,
+            MANIFEST_FILE))
+# end of is_columnar_dataset
+
+
+def is_columnar_path(
+        output_file):
+    """is_columnar_path
+
+    Return ``True`` if a publish ``output_file`` should be
+    written as a columnar dataset: a path ending with ``/``
+    or an existing directory
+
+    :param output_file: publish output path
+    """
+    if not output_file:
+        return False
+    return (
+        output_file.endswith(os.sep) or
+        os.path.isdir(output_file))
+# end of is_columnar_path
+
+
+def convert_dataset_to_df(
+        value):
+    """convert_dataset_to_df
+
+    Convert a dataset value from an algorithm-ready node
+    (``pandas.DataFrame``, ``to_json(orient='records')``
+    string or dictionary) to a ``pandas.DataFrame`` or
+    ``None`` if it has no rows
+
+    :param value: dataset value
+    """
+    df = None
+    if isinstance(value, dict):
+        if value:
+            df = pd.DataFrame([value])
+    elif isinstance(value, str) and value.lstrip()[:1] == '{':
+        parsed = json.loads(value)
+        if parsed:
+            df = pd.DataFrame([parsed])
+    else:
+        df = df_serializers.convert_to_df(value)
+    if df is None or len(df.index) == 0 or len(df.columns) == 0:
+        return None
+    return df
+# end of convert_dataset_to_df
+
+
+def coerce_mixed_columns(
+        df):
+    """coerce_mixed_columns
+
+    Convert the non-null values of ``object`` columns that mix
+    value types to strings so ``pyarrow`` can store the column
+
+    :param df: ``pandas.DataFrame``
+    """
+    for column in df.columns:
+        if df[column].dtype != object:
+            continue
+        values = df[column].dropna()
+        if len(set(type(value) for value in values)) < 2:
+            continue
+        df[column] = df[column].map(
+            lambda value: value if value is None or value != value
+            else str(value))
+        log.debug(
+            'coerced mixed types in column={} to strings'.format(
+                column))
+    # end of for all columns
+    return df
+# end of coerce_mixed_columns
+
+
+def get_node_columns(
+        manifest,
+        node,
+        ds_name):
+    """get_node_columns
+
+    Get the list of columns a node's dataset was written with
+    or ``None`` for manifests without column sets
+
+    :param manifest: columnar dataset manifest
+    :param node: node from the manifest's ``nodes``
+    :param ds_name: dataset name
+    """
+    column_idx = node.get(
+        'columns',
+        {}).get(
+            ds_name,
+            None)
+    if column_idx is None:
+        return None
+    return manifest['datasets'][ds_name]['column_sets'][column_idx]
+# end of get_node_columns
+
+
+def write_table(
+        table,
+        path_to_file,
+        columnar_format):
+    """write_table
+
+    Write a ``pyarrow.Table`` to ``path_to_file`` through a
+    temporary file so readers never see a partial file
+
+    :param table: ``pyarrow.Table``
+    :param path_to_file: output path
+    :param columnar_format: ``arrow`` or ``parquet``
+    """
+    tmp_file = '{}.tmp'.format(
+        path_to_file)
+    if columnar_format == df_serializers.SERIALIZER_PARQUET:
+        pq.write_table(
+            table,
+            tmp_file,
+            compression='snappy')
+    else:
+        with pa.OSFile(tmp_file, 'wb') as sink:
+            if hasattr(pa, 'ipc') and hasattr(pa.ipc, 'new_file'):
+                writer = pa.ipc.new_file(
+                    sink,
+                    table.schema)
+            else:
+                writer = pa.RecordBatchFileWriter(
+                    sink,
+                    table.schema)
+            writer.write_table(table)
+            writer.close()
+    # end of writing the table
+    os.replace(
+        tmp_file,
+        path_to_file)
+# end of write_table
+
+
+def write_columnar_dataset(
+        algo_dataset,
+        output_dir,
+        columnar_format=None,
+        serialize_datasets=DEFAULT_SERIALIZED_DATASETS):
+    """write_columnar_dataset
+
+    Write an algorithm-ready dataset dictionary as a columnar
+    dataset directory and return ``SUCCESS`` or ``FAILED``
+
+    :param algo_dataset: algorithm-ready dataset dictionary
+        (``{ticker: [{'id', 'date', 'data'}]}``) with
+        ``pandas.DataFrame`` or serialized json datasets
+    :param output_dir: directory for the dataset files
+    :param columnar_format: optional - ``arrow`` or ``parquet``
+        (default is ``ALGO_COLUMNAR_FORMAT``)
+    :param serialize_datasets: optional - list of dataset names
+        to write
+    """
+    use_format = columnar_format
+    if not use_format:
+        use_format = ALGO_COLUMNAR_FORMAT
+    if use_format not in FILE_EXTENSIONS:
+        log.error(
+            'unsupported columnar format={} for dir={}'.format(
+                use_format,
+                output_dir))
+        return FAILED
+    if not df_serializers.is_columnar_supported():
+        log.error(
+            'writing a columnar dataset to dir={} requires '
+            'pyarrow'.format(
+                output_dir))
+        return FAILED
+
+    frames = {}
+    column_sets = {}
+    nodes = {}
+    for ticker in algo_dataset:
+        nodes[ticker] = []
+        for node in algo_dataset[ticker]:
+            node_rec = {
+                'id': node['id'],
+                'date': node['date'],
+                'columns': {}
+            }
+            nodes[ticker].append(node_rec)
+            for ds_name in node['data']:
+                if ds_name not in serialize_datasets:
+                    continue
+                if ds_name not in frames:
+                    frames[ds_name] = []
+                    column_sets[ds_name] = []
+                df = convert_dataset_to_df(
+                    node['data'][ds_name])
+                if df is None:
+                    continue
+                df = df.reset_index(
+                    drop=True)
+                columns = [str(column) for column in df.columns]
+                if columns not in column_sets[ds_name]:
+                    column_sets[ds_name].append(columns)
+                node_rec['columns'][ds_name] = column_sets[
+                    ds_name].index(columns)
+                df[TICKER_COL] = ticker
+                df[DATE_COL] = str(node['date'])
+                frames[ds_name].append(df)
+            # end of for all datasets in the node
+        # end of for all nodes
+    # end of for all tickers
+
+    os.makedirs(
+        output_dir,
+        exist_ok=True)
+    manifest = {
+        'version': COLUMNAR_VERSION,
+        'format': use_format,
+        'ticker_col': TICKER_COL,
+        'date_col': DATE_COL,
+        'datasets': {},
+        'nodes': nodes
+    }
+    for ds_name in frames:
+        ds_info = {
+            'file': None,
+            'rows': 0,
+            'column_sets': column_sets[ds_name]
+        }
+        if frames[ds_name]:
+            ds_df = coerce_mixed_columns(
+                pd.concat(
+                    frames[ds_name],
+                    ignore_index=True,
+                    sort=False))
+            ds_info['file'] = '{}.{}'.format(
+                ds_name,
+                FILE_EXTENSIONS[use_format])
+            ds_info['rows'] = len(ds_df.index)
+            try:
+                table = pa.Table.from_pandas(
+                    ds_df,
+                    preserve_index=False)
+                write_table(
+                    table=table,
+                    path_to_file=os.path.join(
+                        output_dir,
+                        ds_info['file']),
+                    columnar_format=use_format)
+            except Exception as e:
+                log.error(
+                    'failed writing dataset={} to dir={} '
+                    'ex={}'.format(
+                        ds_name,
+                        output_dir,
+                        e))
+                return FAILED
+        # end of writing a dataset with rows
+        manifest['datasets'][ds_name] = ds_info
+    # end of for all datasets
+
+    # the manifest is written last so a partially written
+    # directory is not loaded as a dataset
+    manifest_file = os.path.join(
+        output_dir,
+        MANIFEST_FILE)
+    with open('{}.tmp'.format(manifest_file), 'w') as cur_file:
+        cur_file.write(
+            json.dumps(
+                manifest,
+                indent=2))
+    os.replace(
+        '{}.tmp'.format(manifest_file),
+        manifest_file)
+
+    log.info(
+        'wrote columnar dataset dir={} format={} tickers={} '
+        'datasets={}'.format(
+            output_dir,
+            use_format,
+            list(nodes.keys()),
+            len(manifest['datasets'])))
+    return SUCCESS
+# end of write_columnar_dataset
+
+
+def load_manifest(
+        path_to_dir):
+    """load_manifest
+
+    Load the ``manifest.json`` for a columnar dataset
+
+    :param path_to_dir: columnar dataset directory
+    """
+    with open(os.path.join(path_to_dir, MANIFEST_FILE), 'r') as cur_file:
+        return json.loads(
+            cur_file.read())
+# end of load_manifest
+
+
+def read_table(
+        path_to_file,
+        columnar_format):
+    """read_table
+
+    Open a dataset file as a memory-mapped ``pyarrow.Table``
+
+    :param path_to_file: dataset file
+    :param columnar_format: ``arrow`` or ``parquet``
+    """
+    if columnar_format == df_serializers.SERIALIZER_PARQUET:
+        return pq.read_table(
+            path_to_file,
+            memory_map=True)
+    source = pa.memory_map(
+        path_to_file,
+        'r')
+    if hasattr(pa, 'ipc') and hasattr(pa.ipc, 'open_file'):
+        return pa.ipc.open_file(source).read_all()
+    return pa.RecordBatchFileReader(source).read_all()
+# end of read_table
+
+
+def slice_table(
+        table,
+        tickers,
+        dates):
+    """slice_table
+
+    Convert only the rows for ``tickers`` and ``dates``
+    to a ``pandas.DataFrame``
+
+    :param table: ``pyarrow.Table`` with the ``ds_ticker``
+        and ``ds_date`` columns
+    :param tickers: list of tickers
+    :param dates: list of node dates
+    """
+    if pc is not None and hasattr(table, 'filter'):
+        mask = pc.and_(
+            pc.is_in(
+                table.column(TICKER_COL),
+                value_set=pa.array(tickers, type=pa.string())),
+            pc.is_in(
+                table.column(DATE_COL),
+                value_set=pa.array(dates, type=pa.string())))
+        return table.filter(mask).to_pandas()
+    # end of filtering in arrow
+
+    df = table.to_pandas()
+    return df[
+        df[TICKER_COL].isin(tickers) &
+        df[DATE_COL].isin(dates)]
+# end of slice_table
+
+
+def load_columnar_dataset(
+        path_to_dir,
+        serialize_datasets=DEFAULT_SERIALIZED_DATASETS,
+        tickers=None,
+        start_date=None,
+        end_date=None):
+    """load_columnar_dataset
+
+    Load the nodes for ``tickers`` between ``start_date`` and
+    ``end_date`` from a columnar dataset directory into an
+    algorithm-ready dataset dictionary with
+    ``pandas.DataFrame`` datasets
+
+    :param path_to_dir: columnar dataset directory
+    :param serialize_datasets: optional - list of dataset names
+        to load
+    :param tickers: optional - list of tickers to load
+        (default is all tickers)
+    :param start_date: optional - first node date to load
+        (``YYYY-MM-DD`` string or ``datetime``)
+    :param end_date: optional - last node date to load
+        (``YYYY-MM-DD`` string or ``datetime``)
+    """
+    if not df_serializers.is_columnar_supported():
+        log.error(
+            'loading columnar dataset dir={} requires '
+            'pyarrow'.format(
+                path_to_dir))
+        return None
+
+    manifest = load_manifest(
+        path_to_dir=path_to_dir)
+    use_format = manifest.get(
+        'format',
+        df_serializers.SERIALIZER_ARROW)
+    use_start = str(start_date)[0:10] if start_date else None
+    use_end = str(end_date)[0:10] if end_date else None
+
+    selected = {}
+    for ticker in manifest['nodes']:
+        if tickers and ticker not in tickers:
+            continue
+        selected[ticker] = []
+        for node in manifest['nodes'][ticker]:
+            node_day = str(node['date'])[0:10]
+            if use_start and node_day < use_start:
+                continue
+            if use_end and node_day > use_end:
+                continue
+            selected[ticker].append(node)
+    # end of selecting nodes
+
+    use_tickers = [
+        ticker
+        for ticker in selected
+        if selected[ticker]
+    ]
+    use_dates = sorted(set(
+        str(node['date'])
+        for ticker in use_tickers
+        for node in selected[ticker]))
+
+    empty_pd = pd.DataFrame([{}])
+    ds_names = [
+        ds_name
+        for ds_name in manifest['datasets']
+        if ds_name in serialize_datasets
+    ]
+    node_dfs = {}
+    for ds_name in ds_names:
+        ds_file = manifest['datasets'][ds_name].get(
+            'file',
+            None)
+        if not ds_file or not use_tickers:
+            continue
+        table = read_table(
+            path_to_file=os.path.join(
+                path_to_dir,
+                ds_file),
+            columnar_format=use_format)
+        ds_df = slice_table(
+            table=table,
+            tickers=use_tickers,
+            dates=use_dates)
+        for (ticker, date), node_df in ds_df.groupby(
+                [TICKER_COL, DATE_COL],
+                sort=False):
+            node_dfs[(ticker, date, ds_name)] = node_df.drop(
+                columns=[TICKER_COL, DATE_COL]).reset_index(
+                    drop=True)
+    # end of loading each dataset file
+
+    use_data = {}
+    for ticker in use_tickers:
+        use_data[ticker] = []
+        for node in selected[ticker]:
+            new_node = {
+                'id': node['id'],
+                'date': node['date'],
+                'data': {}
+            }
+            for ds_name in ds_names:
+                node_df = node_dfs.get(
+                    (ticker, str(node['date']), ds_name),
+                    None)
+                if node_df is None:
+                    new_node['data'][ds_name] = empty_pd
+                    continue
+                columns = get_node_columns(
+                    manifest=manifest,
+                    node=node,
+                    ds_name=ds_name)
+                if columns is None:
+                    # version 1 manifests: drop the columns
+                    # other nodes added in the shared file
+                    node_df = node_df.dropna(
+                        axis=1,
+                        how='all')
+                else:
+                    node_df = node_df.reindex(
+                        columns=columns)
+                new_node['data'][ds_name] = node_df
+            use_data[ticker].append(new_node)
+    # end of building the nodes
+
+    log.info(
+        'loaded columnar dataset dir={} tickers={} nodes={} '
+        'datasets={}'.format(
+            path_to_dir,
+            use_tickers,
+            sum(len(use_data[ticker]) for ticker in use_data),
+            ds_names))
+    return use_data
+# end of load_columnar_dataset
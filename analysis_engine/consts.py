@@ -133,7 +133,8 @@ Celery Environment Variables
          'analysis_engine.work_tasks.publish_from_s3_to_redis,'
          'analysis_engine.work_tasks.publish_pricing_update,'
          'analysis_engine.work_tasks.task_screener_analysis,'
-         'analysis_engine.work_tasks.publish_ticker_aggregate_from_s3'))
+         'analysis_engine.work_tasks.publish_ticker_aggregate_from_s3,'
+         'analysis_engine.work_tasks.collect_pricing_datasets'))
     INCLUDE_TASKS = WORKER_TASKS.split(',')
 
 Supported S3 Environment Variables
@@ -416,7 +417,8 @@ WORKER_TASKS = ev(
      'analysis_engine.work_tasks.publish_pricing_update,'
      'analysis_engine.work_tasks.task_screener_analysis,'
      'analysis_engine.work_tasks.run_distributed_algorithm,'
-     'analysis_engine.work_tasks.publish_ticker_aggregate_from_s3'
+     'analysis_engine.work_tasks.publish_ticker_aggregate_from_s3,'
+     'analysis_engine.work_tasks.collect_pricing_datasets'
      ''))
 INCLUDE_TASKS = WORKER_TASKS.split(',')
 CELERY_DISABLED = ev('CELERY_DISABLED', '0') == '1'
@@ -679,6 +681,9 @@ INDICATOR_BASE_MODULE = ev(
 INDICATOR_BASE_MODULE_PATH = ev(
     'INDICATOR_BASE_MODULE_PATH',
     'analysis_engine/indicators/base_indicator.py')
+INDICATOR_BUILTIN_MODULE_PATH = ev(
+    'INDICATOR_BUILTIN_MODULE_PATH',
+    'analysis_engine/indicators/builtin_indicators.py')
 
 ########################################
 #
@@ -1037,6 +1042,24 @@ INDICATOR_USES_DATA_MAPPING = {
     'unsupported': INDICATOR_USES_DATA_UNSUPPORTED
 }
 
+# indicator uses_data value -> algorithm-ready dataset names
+INDICATOR_USES_DATA_DATASETS = {
+    INDICATOR_USES_DAILY_DATA: ['daily'],
+    INDICATOR_USES_MINUTE_DATA: ['minute'],
+    INDICATOR_USES_QUOTE_DATA: ['quote'],
+    INDICATOR_USES_STATS_DATA: ['stats'],
+    INDICATOR_USES_PEERS_DATA: ['peers'],
+    INDICATOR_USES_NEWS_DATA: ['news1', 'news'],
+    INDICATOR_USES_FINANCIAL_DATA: ['financials'],
+    INDICATOR_USES_EARNINGS_DATA: ['earnings'],
+    INDICATOR_USES_DIVIDENDS_DATA: ['dividends'],
+    INDICATOR_USES_COMPANY_DATA: ['company'],
+    INDICATOR_USES_PRICING_DATA: ['pricing'],
+    INDICATOR_USES_OPTIONS_DATA: ['calls', 'puts'],
+    INDICATOR_USES_CALLS_DATA: ['calls'],
+    INDICATOR_USES_PUTS_DATA: ['puts']
+}
+
 
 def get_indicator_type_as_int(
         val=None):
@@ -0,0 +1,373 @@
+"""
+In-process LRU Cache of Scrubbed DataFrames
+===========================================
+
+Tuning an algorithm means calling ``run_algo`` many times
+over the same tickers and dates. With the cache enabled, the
+extract paths (``analysis_engine.extract_batch_utils`` and
+``analysis_engine.extract_utils.perform_extract``) keep each
+scrubbed ``pandas.DataFrame`` in memory and skip the Redis
+fetch, decode and scrub steps on the next run.
+
+Entries are keyed by the redis key, the dataset name, the
+scrub mode and a caller-provided content ``version``. Bump
+the version (``DF_CACHE_VERSION`` or the ``run_algo``
+``extract_cache_version`` argument) after re-publishing
+datasets, or drop a ticker's entries with
+``invalidate_ticker``. Writes with
+``analysis_engine.set_data_in_redis_key`` in this process
+drop the entries for that key.
+
+The cache is bounded by the total ``memory_usage(deep=True)``
+of the cached DataFrames and evicts the least recently used
+entries first. Reads return a copy so an algorithm can not
+change a cached DataFrame.
+
+.. code-block:: python
+
+    import analysis_engine.df_cache as df_cache
+    print(df_cache.get_df_cache().get_stats())
+    df_cache.get_df_cache().invalidate_ticker('SPY')
+
+**Supported environment variables**
+
+::
+
+    # enable the cache for all extracts
+    export DF_CACHE_ENABLED=1
+
+    # max bytes of cached DataFrames (default 512 MB)
+    export DF_CACHE_MAX_BYTES=536870912
+
+    # content version for all cached datasets
+    export DF_CACHE_VERSION=1
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import collections
+import threading
+from spylunking.log.setup_logging import build_colorized_logger
+from analysis_engine.consts import ev
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+DF_CACHE_ENABLED = ev(
+    'DF_CACHE_ENABLED',
+    '0') == '1'
+DF_CACHE_MAX_BYTES = int(ev(
+    'DF_CACHE_MAX_BYTES',
+    '536870912'))
+DF_CACHE_VERSION = ev(
+    'DF_CACHE_VERSION',
+    '')
+
+DF_CACHE = None
+DF_CACHE_LOCK = threading.Lock()
+
+
+def get_df_size(
+        df):
+    """get_df_size
+
+    Get the number of bytes used by a ``pandas.DataFrame``
+
+    :param df: ``pandas.DataFrame``
+    """
+    try:
+        return int(df.memory_usage(
+            index=True,
+            deep=True).sum())
+    except Exception:
+        return 0
+# end of get_df_size
+
+
+class DataFrameCache:
+    """DataFrameCache
+
+    Thread-safe LRU cache of ``pandas.DataFrame`` objects
+    bounded by their total size in bytes
+
+    :param max_bytes: max bytes of cached DataFrames
+    """
+
+    def __init__(
+            self,
+            max_bytes=None):
+        """__init__
+
+        :param max_bytes: max bytes of cached DataFrames
+            (default is ``DF_CACHE_MAX_BYTES``)
+        """
+        self.max_bytes = max_bytes
+        if self.max_bytes is None:
+            self.max_bytes = DF_CACHE_MAX_BYTES
+        self.lock = threading.Lock()
+        # (key, name, scrub_mode, version) -> (ticker, df, num_bytes)
+        self.entries = collections.OrderedDict()
+        self.num_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    # end of __init__
+
+    def build_cache_key(
+            self,
+            key,
+            name=None,
+            scrub_mode=None,
+            version=None):
+        """build_cache_key
+
+        :param key: redis key
+        :param name: dataset name
+        :param scrub_mode: scrub mode used on the dataset
+        :param version: content version
+        """
+        use_version = version
+        if use_version is None:
+            use_version = DF_CACHE_VERSION
+        return (
+            key,
+            name,
+            scrub_mode,
+            str(use_version))
+    # end of build_cache_key
+
+    def get(
+            self,
+            key,
+            name=None,
+            scrub_mode=None,
+            version=None):
+        """get
+
+        Get a copy of the cached ``pandas.DataFrame``
+        or ``None`` on a miss
+
+        :param key: redis key
+        :param name: dataset name
+        :param scrub_mode: scrub mode used on the dataset
+        :param version: content version
+        """
+        cache_key = self.build_cache_key(
+            key=key,
+            name=name,
+            scrub_mode=scrub_mode,
+            version=version)
+        with self.lock:
+            entry = self.entries.get(
+                cache_key,
+                None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(cache_key)
+            self.hits += 1
+        return entry[1].copy()
+    # end of get
+
+    def set(
+            self,
+            key,
+            df,
+            name=None,
+            scrub_mode=None,
+            version=None,
+            ticker=None):
+        """set
+
+        Cache a ``pandas.DataFrame`` and evict the least
+        recently used entries until the cache fits in
+        ``max_bytes``. DataFrames larger than ``max_bytes``
+        are not cached.
+
+        :param key: redis key
+        :param df: ``pandas.DataFrame``
+        :param name: dataset name
+        :param scrub_mode: scrub mode used on the dataset
+        :param version: content version
+        :param ticker: ticker for ``invalidate_ticker``
+            (default is the redis key prefix before the first
+            ``_`` like ``SPY`` in ``SPY_2018-11-02_daily``)
+        """
+        if df is None:
+            return False
+        num_bytes = get_df_size(df)
+        if num_bytes > self.max_bytes:
+            log.debug(
+                'not caching key={} bytes={} max={}'.format(
+                    key,
+                    num_bytes,
+                    self.max_bytes))
+            return False
+
+        use_ticker = ticker
+        if not use_ticker:
+            use_ticker = str(key).split('_')[0]
+        cache_key = self.build_cache_key(
+            key=key,
+            name=name,
+            scrub_mode=scrub_mode,
+            version=version)
+        with self.lock:
+            old_entry = self.entries.pop(
+                cache_key,
+                None)
+            if old_entry is not None:
+                self.num_bytes -= old_entry[2]
+            self.entries[cache_key] = (
+                str(use_ticker).upper(),
+                df.copy(),
+                num_bytes)
+            self.num_bytes += num_bytes
+            while self.num_bytes > self.max_bytes and self.entries:
+                evicted = self.entries.popitem(
+                    last=False)[1]
+                self.num_bytes -= evicted[2]
+                self.evictions += 1
+        # end of adding and evicting
+
+        return True
+    # end of set
+
+    def invalidate_key(
+            self,
+            key):
+        """invalidate_key
+
+        Remove all entries for a redis key and return
+        the number of removed entries
+
+        :param key: redis key
+        """
+        return self.remove_entries(
+            lambda cache_key, entry: cache_key[0] == key)
+    # end of invalidate_key
+
+    def invalidate_ticker(
+            self,
+            ticker):
+        """invalidate_ticker
+
+        Remove all entries for a ticker and return
+        the number of removed entries
+
+        :param ticker: ticker symbol
+        """
+        use_ticker = str(ticker).upper()
+        return self.remove_entries(
+            lambda cache_key, entry: entry[0] == use_ticker)
+    # end of invalidate_ticker
+
+    def remove_entries(
+            self,
+            matches):
+        """remove_entries
+
+        :param matches: function taking ``(cache_key, entry)``
+            that returns ``True`` for entries to remove
+        """
+        with self.lock:
+            remove_keys = [
+                cache_key
+                for cache_key, entry in self.entries.items()
+                if matches(cache_key, entry)
+            ]
+            for cache_key in remove_keys:
+                entry = self.entries.pop(cache_key)
+                self.num_bytes -= entry[2]
+        return len(remove_keys)
+    # end of remove_entries
+
+    def clear(
+            self):
+        """clear
+
+        Remove all entries and reset the counters
+        """
+        with self.lock:
+            self.entries = collections.OrderedDict()
+            self.num_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    # end of clear
+
+    def get_stats(
+            self):
+        """get_stats
+
+        Get a stats dictionary with keys: ``entries``,
+        ``bytes``, ``max_bytes``, ``hits``, ``misses``
+        and ``evictions``
+        """
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.num_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+    # end of get_stats
+
+# end of DataFrameCache
+
+
+def get_df_cache():
+    """get_df_cache
+
+    Get the shared ``DataFrameCache`` for this process
+    """
+    global DF_CACHE
+    if DF_CACHE is None:
+        with DF_CACHE_LOCK:
+            if DF_CACHE is None:
+                DF_CACHE = DataFrameCache(
+                    max_bytes=DF_CACHE_MAX_BYTES)
+    return DF_CACHE
+# end of get_df_cache
+
+
+def get_enabled_df_cache(
+        enabled=None):
+    """get_enabled_df_cache
+
+    Get the shared ``DataFrameCache`` if caching is enabled
+    or ``None``
+
+    :param enabled: optional - bool to override
+        ``DF_CACHE_ENABLED``
+    """
+    use_enabled = enabled
+    if use_enabled is None:
+        use_enabled = DF_CACHE_ENABLED
+    if use_enabled is True or str(use_enabled) == '1':
+        return get_df_cache()
+    return None
+# end of get_enabled_df_cache
+
+
+def invalidate_key(
+        key):
+    """invalidate_key
+
+    Remove all cached entries for a redis key if the
+    shared cache was created in this process
+
+    :param key: redis key
+    """
+    if DF_CACHE is None:
+        return 0
+    return DF_CACHE.invalidate_key(key)
+# end of invalidate_key
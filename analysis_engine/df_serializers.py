@@ -0,0 +1,186 @@
+"""
+Binary columnar serializers for caching ``pandas.DataFrame``
+datasets in Redis
+
+By default every cached dataset is a json-serialized
+``df.to_json(orient='records')`` string. Set the ``serializer``
+(``publish_pricing_update`` and ``set_data_in_redis_key``) or
+``redis_serializer`` (``publish.publish``) argument to one of:
+
+- ``arrow`` - Arrow IPC file bytes
+- ``parquet`` - Parquet file bytes (snappy compressed)
+
+to store DataFrames as binary columnar bytes instead. Reads
+detect the format from the leading magic bytes, so existing
+json keys keep working and a Redis db can be migrated gradually.
+
+Requires the optional ``pyarrow`` package. If it is not installed,
+or a dataset is not a DataFrame (like the Yahoo pricing dictionary),
+the dataset is cached as json.
+
+**Supported environment variables**
+
+::
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import pandas as pd
+from spylunking.log.setup_logging import build_colorized_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:
+    pa = None
+    pq = None
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+SERIALIZER_JSON = 'json'
+SERIALIZER_ARROW = 'arrow'
+SERIALIZER_PARQUET = 'parquet'
+COLUMNAR_SERIALIZERS = [
+    SERIALIZER_ARROW,
+    SERIALIZER_PARQUET
+]
+
+ARROW_MAGIC = b'ARROW1'
+PARQUET_MAGIC = b'PAR1'
+
+
+def is_columnar_supported():
+    """is_columnar_supported
+
+    Return ``True`` if ``pyarrow`` is installed
+    """
+    return pa is not None
+# end of is_columnar_supported
+
+
+def get_columnar_format(
+        raw_data):
+    """get_columnar_format
+
+    Detect a binary columnar payload from its magic bytes and
+    return ``arrow``, ``parquet`` or ``None`` (json or unknown)
+
+    :param raw_data: raw bytes from redis
+    """
+    if not isinstance(raw_data, (bytes, bytearray, memoryview)):
+        return None
+    header = bytes(raw_data[:6])
+    if header == ARROW_MAGIC:
+        return SERIALIZER_ARROW
+    elif header[:4] == PARQUET_MAGIC:
+        return SERIALIZER_PARQUET
+    return None
+# end of get_columnar_format
+
+
+def convert_to_df(
+        data):
+    """convert_to_df
+
+    Convert a cache-ready dataset into a ``pandas.DataFrame``
+    or return ``None`` if it is not a DataFrame dataset.
+    Strings are treated as ``to_json(orient='records')``
+    output and parsed with ``pd.read_json`` so the cached
+    DataFrame matches what a json reader would build.
+
+    :param data: ``pandas.DataFrame`` or json string
+    """
+    if isinstance(data, pd.DataFrame):
+        return data
+    if isinstance(data, str) and data.lstrip()[:1] == '[':
+        return pd.read_json(
+            data,
+            orient='records')
+    return None
+# end of convert_to_df
+
+
+def serialize_df(
+        data,
+        serializer):
+    """serialize_df
+
+    Serialize ``data`` as binary columnar bytes or return
+    ``None`` if the caller should fall back to json
+
+    :param data: ``pandas.DataFrame`` or
+        ``to_json(orient='records')`` string
+    :param serializer: ``arrow`` or ``parquet``
+    """
+    if serializer not in COLUMNAR_SERIALIZERS:
+        return None
+    if not is_columnar_supported():
+        log.warning(
+            'serializer={} requires pyarrow - using json'.format(
+                serializer))
+        return None
+
+    df = convert_to_df(data)
+    if df is None or len(df.index) == 0:
+        return None
+
+    table = pa.Table.from_pandas(
+        df,
+        preserve_index=False)
+    sink = pa.BufferOutputStream()
+    if serializer == SERIALIZER_PARQUET:
+        pq.write_table(
+            table,
+            sink,
+            compression='snappy')
+    else:
+        if hasattr(pa, 'ipc') and hasattr(pa.ipc, 'new_file'):
+            writer = pa.ipc.new_file(
+                sink,
+                table.schema)
+        else:
+            writer = pa.RecordBatchFileWriter(
+                sink,
+                table.schema)
+        writer.write_table(table)
+        writer.close()
+    # end of writing the table
+
+    return sink.getvalue().to_pybytes()
+# end of serialize_df
+
+
+def deserialize_df(
+        raw_data):
+    """deserialize_df
+
+    Build a ``pandas.DataFrame`` from binary columnar
+    bytes created by ``serialize_df``
+
+    :param raw_data: raw bytes from redis
+    """
+    use_format = get_columnar_format(raw_data)
+    if not use_format:
+        return None
+    if not is_columnar_supported():
+        raise Exception(
+            'found {} cached data but pyarrow is '
+            'not installed'.format(
+                use_format))
+
+    reader = pa.BufferReader(raw_data)
+    if use_format == SERIALIZER_PARQUET:
+        table = pq.read_table(reader)
+    elif hasattr(pa, 'ipc') and hasattr(pa.ipc, 'open_file'):
+        table = pa.ipc.open_file(reader).read_all()
+    else:
+        table = pa.RecordBatchFileReader(reader).read_all()
+    return table.to_pandas()
+# end of deserialize_df
@@ -0,0 +1,704 @@
+"""
+
+Batched Dataset Extraction Utilities
+====================================
+
+Helpers for extracting all cached datasets for a date
+range in a single pass over one Redis connection. Instead
+of running one ``GET`` per ``<TICKER>_<DATE>_<dataset>``
+key (with a new client per key), every key for every
+requested date is built up front and fetched with pipelined
+``MGET`` calls. The raw payloads are then decoded and handed
+to the same per-dataset scrub step used by
+``analysis_engine.extract_utils.perform_extract``.
+
+Keys missing from Redis are read from the S3 archive with
+bounded concurrent ``GET`` requests and written back into
+Redis when the ``s3_req`` settings enable the S3 fallback
+(see ``analysis_engine.extract_utils.read_through_s3_keys``).
+
+With a ``cache`` (``analysis_engine.df_cache.DataFrameCache``),
+cached datasets are not fetched from Redis at all and newly
+extracted datasets are added to the cache.
+
+Supported environment variables:
+
+::
+
+    # number of keys to fetch with each MGET
+    # inside a single pipeline
+    export EXTRACT_BATCH_CHUNK_SIZE=500
+
+    # decode and scrub (ticker, date) nodes on a bounded pool
+    # of workers (0 or 1 is serial) using threads or processes
+    export EXTRACT_WORKERS=0
+    export EXTRACT_WORKER_TYPE=thread
+
+    # verbose logging in this module
+    export DEBUG_EXTRACT=1
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import concurrent.futures
+import pandas as pd
+import analysis_engine.build_df_from_bytes as df_utils
+import analysis_engine.dataset_scrub_utils as scrub_utils
+import analysis_engine.df_serializers as df_serializers
+import analysis_engine.extract_utils as extract_utils
+import analysis_engine.iex.consts as iex_consts
+import analysis_engine.yahoo.consts as yahoo_consts
+import analysis_engine.redis_pool as redis_pool
+from spylunking.log.setup_logging import build_colorized_logger
+from analysis_engine.consts import SUCCESS
+from analysis_engine.consts import FAILED
+from analysis_engine.consts import ERR
+from analysis_engine.consts import EMPTY
+from analysis_engine.consts import REDIS_ADDRESS
+from analysis_engine.consts import REDIS_PASSWORD
+from analysis_engine.consts import REDIS_DB
+from analysis_engine.consts import ev
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+EXTRACT_BATCH_CHUNK_SIZE = int(ev(
+    'EXTRACT_BATCH_CHUNK_SIZE',
+    '500'))
+EXTRACT_WORKERS = int(ev(
+    'EXTRACT_WORKERS',
+    '0'))
+EXTRACT_WORKER_TYPE = ev(
+    'EXTRACT_WORKER_TYPE',
+    'thread')
+
+# algo-ready dataset name -> (redis key field in a
+# ``api_requests.get_ds_dict`` request, datafeed type, source)
+BATCH_DATASETS = {
+    'daily': ('daily', iex_consts.DATAFEED_DAILY, 'iex'),
+    'minute': ('minute', iex_consts.DATAFEED_MINUTE, 'iex'),
+    'quote': ('quote', iex_consts.DATAFEED_QUOTE, 'iex'),
+    'stats': ('stats', iex_consts.DATAFEED_STATS, 'iex'),
+    'peers': ('peers', iex_consts.DATAFEED_PEERS, 'iex'),
+    'news1': ('news1', iex_consts.DATAFEED_NEWS, 'iex'),
+    'financials': ('financials', iex_consts.DATAFEED_FINANCIALS, 'iex'),
+    'earnings': ('earnings', iex_consts.DATAFEED_EARNINGS, 'iex'),
+    'dividends': ('dividends', iex_consts.DATAFEED_DIVIDENDS, 'iex'),
+    'company': ('company', iex_consts.DATAFEED_COMPANY, 'iex'),
+    'calls': ('options', yahoo_consts.DATAFEED_OPTIONS_YAHOO, 'yahoo'),
+    'puts': ('options', yahoo_consts.DATAFEED_OPTIONS_YAHOO, 'yahoo'),
+    'pricing': ('pricing', yahoo_consts.DATAFEED_PRICING_YAHOO, 'yahoo'),
+    'news': ('news', yahoo_consts.DATAFEED_NEWS_YAHOO, 'yahoo')
+}
+
+
+def get_batch_datasets(
+        iex_datasets=None,
+        extract_iex=True,
+        extract_yahoo=True):
+    """get_batch_datasets
+
+    Build the list of algo-ready dataset names to extract
+    using the same rules as the serial extraction in
+    ``analysis_engine.run_algo.run_algo``
+
+    :param iex_datasets: list of IEX dataset names
+        (``news`` is the IEX news dataset)
+    :param extract_iex: bool - extract all IEX datasets
+    :param extract_yahoo: bool - extract all Yahoo datasets
+    """
+    use_iex_datasets = iex_datasets
+    if not use_iex_datasets:
+        use_iex_datasets = []
+
+    datasets = []
+    for ds_name in BATCH_DATASETS:
+        source = BATCH_DATASETS[ds_name][2]
+        if source == 'iex':
+            iex_name = ds_name
+            if ds_name == 'news1':
+                iex_name = 'news'
+            if extract_iex or iex_name in use_iex_datasets:
+                datasets.append(ds_name)
+        elif extract_yahoo:
+            datasets.append(ds_name)
+    # end of for all supported datasets
+
+    return datasets
+# end of get_batch_datasets
+
+
+def build_batch_keys(
+        extract_requests,
+        datasets):
+    """build_batch_keys
+
+    Build the ordered, de-duplicated list of every redis key
+    needed to extract ``datasets`` for all ``extract_requests``
+
+    :param extract_requests: list of extract nodes built by
+        ``run_algo`` where each ``node['req']`` was created
+        with ``analysis_engine.api_requests.get_ds_dict``
+    :param datasets: list of algo-ready dataset names
+        from ``get_batch_datasets``
+    """
+    keys = []
+    seen = set()
+    for node in extract_requests:
+        req = node['req']
+        for ds_name in datasets:
+            key = req.get(
+                BATCH_DATASETS[ds_name][0],
+                None)
+            if key and key not in seen:
+                seen.add(key)
+                keys.append(key)
+    # end of for all extract requests
+
+    return keys
+# end of build_batch_keys
+
+
+def get_data_from_redis_keys(
+        keys,
+        label=None,
+        client=None,
+        address=None,
+        password=None,
+        db=None,
+        chunk_size=None):
+    """get_data_from_redis_keys
+
+    Fetch the raw (undecoded) values for all ``keys`` using
+    ``MGET`` calls queued in a single non-transactional
+    pipeline. Returns a dictionary of ``key`` to raw bytes
+    (or ``None`` if the key is missing).
+
+    :param keys: list of redis keys
+    :param label: log tracking label
+    :param client: initialized redis client
+    :param address: redis address: <host:port>
+    :param password: redis password
+    :param db: redis db
+    :param chunk_size: number of keys per ``MGET``
+        (default is ``EXTRACT_BATCH_CHUNK_SIZE``)
+    """
+    log_id = label if label else 'get-keys'
+    use_chunk_size = chunk_size
+    if not use_chunk_size:
+        use_chunk_size = EXTRACT_BATCH_CHUNK_SIZE
+
+    payloads = {}
+    if not keys:
+        return payloads
+
+    use_client = client
+    if not use_client:
+        log.debug(
+            '{} connecting to redis={}@{}'.format(
+                log_id,
+                address,
+                db))
+        use_client = redis_pool.get_redis_client(
+            address=address,
+            password=password,
+            db=db)
+    # create Redis client if not set
+
+    chunks = [
+        keys[idx:idx + use_chunk_size]
+        for idx in range(0, len(keys), use_chunk_size)
+    ]
+
+    pipe = use_client.pipeline(
+        transaction=False)
+    for chunk in chunks:
+        pipe.mget(chunk)
+    results = pipe.execute()
+
+    for chunk, values in zip(chunks, results):
+        for key, raw_data in zip(chunk, values):
+            payloads[key] = raw_data
+    # end of for all chunked MGET results
+
+    log.debug(
+        '{} fetched keys={} chunks={}'.format(
+            log_id,
+            len(keys),
+            len(chunks)))
+
+    return payloads
+# end of get_data_from_redis_keys
+
+
+def decode_payload(
+        ds_name,
+        raw_data,
+        encoding='utf-8'):
+    """decode_payload
+
+    Decode a raw redis value for an algo-ready dataset. IEX
+    datasets are decoded straight into a ``pandas.DataFrame``
+    with ``analysis_engine.build_df_from_bytes`` and Yahoo
+    datasets are decoded into their cached python objects.
+
+    :param ds_name: algo-ready dataset name
+    :param raw_data: raw bytes from redis
+    :param encoding: format of the encoded key in redis
+    """
+    if not raw_data:
+        return None
+    if (BATCH_DATASETS[ds_name][2] == 'iex' or
+            df_serializers.get_columnar_format(raw_data)):
+        return df_utils.build_df_from_bytes(
+            raw_data=raw_data,
+            encoding=encoding)
+    return df_utils.loads(
+        raw_data,
+        encoding=encoding)
+# end of decode_payload
+
+
+def convert_data_to_df(
+        ds_name,
+        data):
+    """convert_data_to_df
+
+    Convert decoded redis data for an algo-ready dataset
+    into a ``pandas.DataFrame`` the same way the
+    IEX and Yahoo ``extract_df_from_redis`` modules do
+
+    :param ds_name: algo-ready dataset name
+    :param data: decoded redis data from ``decode_payload``
+    """
+    if data is None:
+        return None
+
+    if isinstance(data, pd.DataFrame):
+        return data
+    elif ds_name in ['calls', 'puts']:
+        return pd.read_json(
+            data[ds_name],
+            orient='records')
+    elif ds_name == 'pricing':
+        return pd.DataFrame(
+            data,
+            index=[0])
+    else:
+        return pd.DataFrame(
+            data)
+# end of convert_data_to_df
+
+
+def extract_from_payload(
+        ds_name,
+        data,
+        label=None,
+        ds_id=None,
+        scrub_mode='sort-by-date'):
+    """extract_from_payload
+
+    Build and scrub the ``pandas.DataFrame`` for one
+    algo-ready dataset from its decoded redis data and
+    return a tuple of ``(status, df)``
+
+    :param ds_name: algo-ready dataset name
+    :param data: decoded redis data
+    :param label: log tracking label
+    :param ds_id: dataset identifier
+    :param scrub_mode: scrubbing mode on extraction for
+                       one-off cleanup before analysis
+    """
+    log_id = label if label else 'extract'
+    df_type = BATCH_DATASETS[ds_name][1]
+
+    if data is None:
+        return FAILED, None
+
+    try:
+        df = convert_data_to_df(
+            ds_name=ds_name,
+            data=data)
+    except Exception as e:
+        log.debug(
+            '{} - {} ds_id={} no df found ex={}'.format(
+                log_id,
+                ds_name,
+                ds_id,
+                e))
+        return EMPTY, None
+    # end of try/ex to convert to df
+
+    scrubbed_df = scrub_utils.extract_scrub_dataset(
+        label=log_id,
+        scrub_mode=scrub_mode,
+        datafeed_type=df_type,
+        msg_format='df={} date_str={}',
+        ds_id=ds_id,
+        df=df)
+
+    return SUCCESS, scrubbed_df
+# end of extract_from_payload
+
+
+def extract_node_datasets(
+        ds_id,
+        node_keys,
+        payloads,
+        label=None,
+        encoding='utf-8',
+        scrub_mode='sort-by-date',
+        verbose=False):
+    """extract_node_datasets
+
+    Decode and scrub all datasets for one ``(ticker, date)``
+    node and return its ``ticker_data`` dictionary. This is a
+    module-level function so it can run in a process pool.
+
+    :param ds_id: dataset identifier (ticker)
+    :param node_keys: list of ``(dataset name, redis key)``
+        tuples for the node
+    :param payloads: dictionary of redis key to raw bytes
+    :param label: log tracking label
+    :param encoding: format of the encoded keys in redis
+    :param scrub_mode: scrubbing mode on extraction for
+                       one-off cleanup before analysis
+    :param verbose: bool - log extract warnings
+    """
+    log_id = label if label else 'extract-batch'
+    decoded = {}  # calls and puts share the options key
+    ticker_data = {}
+    for ds_name in BATCH_DATASETS:
+        ticker_data[ds_name] = None
+
+    for ds_name, key in node_keys:
+        status = FAILED
+        try:
+            if key not in decoded:
+                decoded[key] = decode_payload(
+                    ds_name=ds_name,
+                    raw_data=payloads.get(key, None),
+                    encoding=encoding)
+            status, df = extract_from_payload(
+                ds_name=ds_name,
+                data=decoded[key],
+                label=log_id,
+                ds_id=ds_id,
+                scrub_mode=scrub_mode)
+            ticker_data[ds_name] = df
+        except Exception as e:
+            status = ERR
+            log.error(
+                '{} - {} ds_id={} failed decoding '
+                'key={} ex={}'.format(
+                    log_id,
+                    ds_name,
+                    ds_id,
+                    key,
+                    e))
+        # end of try/ex decode and scrub
+
+        if status != SUCCESS and verbose:
+            log.warning(
+                'unable to extract {}={} key={}'.format(
+                    ds_name,
+                    ds_id,
+                    key))
+    # end of for all datasets
+
+    return ticker_data
+# end of extract_node_datasets
+
+
+def extract_nodes_with_pool(
+        node_jobs,
+        workers,
+        worker_type='thread',
+        label=None,
+        encoding='utf-8',
+        scrub_mode='sort-by-date',
+        verbose=False):
+    """extract_nodes_with_pool
+
+    Run ``extract_node_datasets`` for all ``node_jobs`` on a
+    bounded thread or process pool. Results are returned in
+    the same order as ``node_jobs`` (ascending dates per
+    ticker) or ``None`` if the pool could not be used
+    (for example inside a daemonized Celery worker process).
+
+    :param node_jobs: list of ``extract_node_datasets``
+        keyword argument dictionaries
+    :param workers: max number of workers
+    :param worker_type: ``thread`` or ``process``
+    :param label: log tracking label
+    :param encoding: format of the encoded keys in redis
+    :param scrub_mode: scrubbing mode on extraction for
+                       one-off cleanup before analysis
+    :param verbose: bool - log extract warnings
+    """
+    log_id = label if label else 'extract-batch'
+    executor_class = concurrent.futures.ThreadPoolExecutor
+    if worker_type == 'process':
+        executor_class = concurrent.futures.ProcessPoolExecutor
+
+    log.debug(
+        '{} - extract nodes={} workers={} type={}'.format(
+            log_id,
+            len(node_jobs),
+            workers,
+            worker_type))
+
+    try:
+        with executor_class(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    extract_node_datasets,
+                    label=log_id,
+                    encoding=encoding,
+                    scrub_mode=scrub_mode,
+                    verbose=verbose,
+                    **job)
+                for job in node_jobs
+            ]
+            return [
+                future.result()
+                for future in futures
+            ]
+    except Exception as e:
+        log.error(
+            '{} - failed extract with workers={} type={} '
+            '- using serial extract ex={}'.format(
+                log_id,
+                workers,
+                worker_type,
+                e))
+        return None
+    # end of try/ex for the worker pool
+# end of extract_nodes_with_pool
+
+
+def extract_datasets_in_batch(
+        extract_requests,
+        datasets,
+        label=None,
+        client=None,
+        address=None,
+        password=None,
+        db=None,
+        encoding='utf-8',
+        chunk_size=None,
+        scrub_mode='sort-by-date',
+        workers=None,
+        worker_type=None,
+        s3_req=None,
+        cache=None,
+        cache_version=None,
+        verbose=False):
+    """extract_datasets_in_batch
+
+    Extract every dataset for every node in
+    ``extract_requests`` with one pipelined round trip
+    per ``chunk_size`` keys. Returns a list of
+    ``ticker_data`` dictionaries (one per node, in the same
+    order as ``extract_requests``) mapping each
+    ``analysis_engine.consts.DEFAULT_SERIALIZED_DATASETS``
+    name to a scrubbed ``pandas.DataFrame`` or ``None``
+
+    :param extract_requests: list of extract nodes built by
+        ``run_algo``
+    :param datasets: list of algo-ready dataset names
+        from ``get_batch_datasets``
+    :param label: log tracking label
+    :param client: initialized redis client
+    :param address: redis address: <host:port>
+    :param password: redis password
+    :param db: redis db
+    :param encoding: format of the encoded keys in redis
+    :param chunk_size: number of keys per ``MGET``
+    :param scrub_mode: scrubbing mode on extraction for
+                       one-off cleanup before analysis
+    :param workers: optional - number of workers for decoding
+        and scrubbing nodes concurrently
+        (default is ``EXTRACT_WORKERS`` which is serial)
+    :param worker_type: optional - ``thread`` or ``process``
+        (default is ``EXTRACT_WORKER_TYPE`` or ``thread``)
+    :param s3_req: optional - dictionary with the ``s3_*``
+        settings for reading Redis misses from the S3 archive
+        (like the ``run_algo`` extract request)
+    :param cache: optional - ``analysis_engine.df_cache``
+        ``DataFrameCache`` of scrubbed datasets
+    :param cache_version: optional - content version
+        for the ``cache`` entries
+    :param verbose: bool - log extract warnings
+    """
+    log_id = label if label else 'extract-batch'
+    use_address = address if address else REDIS_ADDRESS
+    use_password = password if password else REDIS_PASSWORD
+    use_db = db if db is not None else REDIS_DB
+
+    cached = []  # per node dictionary of dataset name to cached df
+    node_datasets = []  # per node list of dataset names to extract
+    for node in extract_requests:
+        req = node['req']
+        node_cached = {}
+        if cache is not None:
+            for ds_name in datasets:
+                key = req.get(BATCH_DATASETS[ds_name][0], None)
+                if not key:
+                    continue
+                df = cache.get(
+                    key=key,
+                    name=ds_name,
+                    scrub_mode=scrub_mode,
+                    version=cache_version)
+                if df is not None:
+                    node_cached[ds_name] = df
+        # end of checking the cache
+        cached.append(node_cached)
+        node_datasets.append([
+            ds_name
+            for ds_name in datasets
+            if ds_name not in node_cached
+        ])
+    # end of for all nodes
+
+    keys = []
+    seen = set()
+    for node, use_datasets in zip(extract_requests, node_datasets):
+        for key in build_batch_keys(
+                extract_requests=[node],
+                datasets=use_datasets):
+            if key not in seen:
+                seen.add(key)
+                keys.append(key)
+    # end of building the keys that are not cached
+
+    log.debug(
+        '{} - START - nodes={} datasets={} keys={} '
+        'redis={}@{}'.format(
+            log_id,
+            len(extract_requests),
+            len(datasets),
+            len(keys),
+            use_address,
+            use_db))
+
+    payloads = {}
+    try:
+        payloads = get_data_from_redis_keys(
+            keys=keys,
+            label=log_id,
+            client=client,
+            address=use_address,
+            password=use_password,
+            db=use_db,
+            chunk_size=chunk_size)
+    except Exception as e:
+        log.error(
+            '{} - failed batch extract from '
+            'redis={}@{} keys={} ex={}'.format(
+                log_id,
+                use_address,
+                use_db,
+                len(keys),
+                e))
+    # end of try/ex extract from redis
+
+    missing_keys = [
+        key
+        for key in keys
+        if not payloads.get(key, None)
+    ]
+    if (missing_keys and s3_req and
+            extract_utils.is_s3_fallback_enabled(s3_req)):
+        s3_payloads = extract_utils.read_through_s3_keys(
+            keys=missing_keys,
+            work_dict=s3_req,
+            label=log_id,
+            redis_client=client)
+        for key in missing_keys:
+            if s3_payloads.get(key, None):
+                payloads[key] = s3_payloads[key]
+        log.debug(
+            '{} - redis misses={} found in s3={}'.format(
+                log_id,
+                len(missing_keys),
+                len([k for k in s3_payloads if s3_payloads[k]])))
+    # end of reading redis misses from s3
+
+    node_jobs = []
+    for node, use_datasets in zip(extract_requests, node_datasets):
+        req = node['req']
+        node_keys = [
+            (ds_name, req.get(BATCH_DATASETS[ds_name][0], None))
+            for ds_name in use_datasets
+        ]
+        node_jobs.append({
+            'ds_id': node['ticker'],
+            'node_keys': node_keys,
+            'payloads': {
+                key: payloads.get(key, None)
+                for ds_name, key in node_keys
+            }
+        })
+    # end of building the decode and scrub jobs for each node
+
+    use_workers = workers if workers else EXTRACT_WORKERS
+    use_worker_type = worker_type if worker_type else EXTRACT_WORKER_TYPE
+    ticker_data_list = None
+    if use_workers > 1 and len(node_jobs) > 1:
+        ticker_data_list = extract_nodes_with_pool(
+            node_jobs=node_jobs,
+            workers=use_workers,
+            worker_type=use_worker_type,
+            label=log_id,
+            encoding=encoding,
+            scrub_mode=scrub_mode,
+            verbose=verbose)
+    # end of using a worker pool
+
+    if ticker_data_list is None:
+        ticker_data_list = [
+            extract_node_datasets(
+                label=log_id,
+                encoding=encoding,
+                scrub_mode=scrub_mode,
+                verbose=verbose,
+                **job)
+            for job in node_jobs
+        ]
+    # end of serial decode and scrub
+
+    num_cached = 0
+    if cache is not None:
+        for node_idx, ticker_data in enumerate(ticker_data_list):
+            node = extract_requests[node_idx]
+            for ds_name in node_datasets[node_idx]:
+                if ticker_data[ds_name] is not None:
+                    cache.set(
+                        key=node['req'][BATCH_DATASETS[ds_name][0]],
+                        df=ticker_data[ds_name],
+                        name=ds_name,
+                        scrub_mode=scrub_mode,
+                        version=cache_version,
+                        ticker=node['ticker'])
+            ticker_data.update(cached[node_idx])
+            num_cached += len(cached[node_idx])
+    # end of updating the cache
+
+    log.debug(
+        '{} - END - nodes={} keys={} found={} cached={}'.format(
+            log_id,
+            len(extract_requests),
+            len(keys),
+            len([k for k in payloads if payloads[k]]),
+            num_cached))
+
+    return ticker_data_list
+# end of extract_datasets_in_batch
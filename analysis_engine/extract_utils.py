@@ -9,6 +9,17 @@ to ignore the source of the dataset (IEX vs Yahoo) and
 perform the extract and load operations without
 knowledge of the underlying dataset.
 
+Redis is checked first. If the key was evicted (or never
+cached), S3 is enabled and the S3 fallback was turned on
+(``s3_fallback`` on the request - set by the
+``extract_s3_fallback`` argument of
+``analysis_engine.run_algo.run_algo`` and
+``analysis_engine.run_custom_algo.run_custom_algo`` - or
+``EXTRACT_S3_FALLBACK=1``),
+the archived dataset is read from the S3 bucket and written
+back into Redis (read-through). The fallback is off by default
+because every miss costs an S3 ``GET``.
+
 Supported environment variables:
 
 ::
@@ -22,6 +33,15 @@ Supported environment variables:
     # verbose logging for just S3 operations in this module
     export DEBUG_S3_EXTRACT=1
 
+    # on a Redis miss, read the archived dataset from S3
+    # (off by default, requires s3_enabled on the extract request)
+    export EXTRACT_S3_FALLBACK=1
+
+    # write datasets read from S3 back into Redis
+    # with this expiration in seconds (0 = no expiration)
+    export EXTRACT_S3_CACHE=1
+    export EXTRACT_S3_CACHE_EXPIRE=86400
+
     # to show debug, trace logging please export ``SHARED_LOG_CFG``
     # to a debug logger json file. To turn on debugging for this
     # library, you can export this variable to the repo's
@@ -31,7 +51,11 @@ Supported environment variables:
 """
 
 import analysis_engine.build_df_from_redis as build_df
+import analysis_engine.build_df_from_bytes as df_utils
+import analysis_engine.df_cache as df_cache
 import analysis_engine.dataset_scrub_utils as scrub_utils
+import analysis_engine.redis_pool as redis_pool
+import analysis_engine.s3_pool as s3_pool
 from spylunking.log.setup_logging import build_colorized_logger
 from analysis_engine.consts import SUCCESS
 from analysis_engine.consts import FAILED
@@ -55,6 +79,153 @@ log = build_colorized_logger(
     name=__name__)
 
 
+EXTRACT_S3_FALLBACK = ev(
+    'EXTRACT_S3_FALLBACK',
+    '0') == '1'
+EXTRACT_S3_CACHE = ev(
+    'EXTRACT_S3_CACHE',
+    '1') == '1'
+EXTRACT_S3_CACHE_EXPIRE = int(ev(
+    'EXTRACT_S3_CACHE_EXPIRE',
+    '86400'))
+
+
+def is_s3_fallback_enabled(
+        work_dict):
+    """is_s3_fallback_enabled
+
+    Return ``True`` if a Redis miss should be read
+    from the S3 archive for this extract request
+
+    :param work_dict: incoming work request dictionary
+    """
+    s3_enabled = work_dict.get(
+        's3_enabled',
+        ENABLED_S3_UPLOAD)
+    s3_fallback = work_dict.get(
+        's3_fallback',
+        EXTRACT_S3_FALLBACK)
+    return (
+        (s3_enabled is True or str(s3_enabled) == '1') and
+        (s3_fallback is True or str(s3_fallback) == '1'))
+# end of is_s3_fallback_enabled
+
+
+def read_through_s3_keys(
+        keys,
+        work_dict,
+        label=None,
+        redis_client=None,
+        s3_keys=None):
+    """read_through_s3_keys
+
+    Download the raw bytes for redis ``keys`` that missed from
+    the S3 archive (with bounded concurrent ``GET`` requests)
+    and write the found payloads back into Redis. Returns a
+    dictionary of redis ``key`` to raw bytes (or ``None``).
+
+    :param keys: list of redis keys that were not in Redis
+    :param work_dict: extract request dictionary with the
+        ``s3_*``, ``redis_*`` and optional ``s3_cache``,
+        ``s3_cache_expire`` and ``s3_workers`` values
+    :param label: log tracking label
+    :param redis_client: optional - initialized redis client
+        for writing the found payloads back
+    :param s3_keys: optional - dictionary of redis key to S3
+        key (by default the S3 key is the redis key)
+    """
+    log_id = label if label else 'extract-s3'
+    use_s3_keys = s3_keys if s3_keys else {}
+    s3_bucket = work_dict.get(
+        's3_bucket',
+        S3_BUCKET)
+    s3_cache = work_dict.get(
+        's3_cache',
+        EXTRACT_S3_CACHE)
+    s3_cache_expire = int(work_dict.get(
+        's3_cache_expire',
+        EXTRACT_S3_CACHE_EXPIRE))
+
+    key_map = {}
+    for key in keys:
+        key_map[use_s3_keys.get(key, key)] = key
+
+    s3_payloads = s3_pool.get_data_from_s3_keys(
+        keys=list(key_map.keys()),
+        bucket=s3_bucket,
+        label=log_id,
+        address=work_dict.get(
+            's3_address',
+            S3_ADDRESS),
+        access_key=work_dict.get(
+            's3_access_key',
+            S3_ACCESS_KEY),
+        secret_key=work_dict.get(
+            's3_secret_key',
+            S3_SECRET_KEY),
+        region_name=work_dict.get(
+            's3_region_name',
+            S3_REGION_NAME),
+        secure=work_dict.get(
+            's3_secure',
+            S3_SECURE),
+        workers=work_dict.get(
+            's3_workers',
+            None))
+
+    payloads = {}
+    for s3_key, key in key_map.items():
+        payloads[key] = s3_payloads.get(s3_key, None)
+    found = [
+        key
+        for key in payloads
+        if payloads[key]
+    ]
+
+    log.debug(
+        '{} - s3={} read-through keys={} found={}'.format(
+            log_id,
+            s3_bucket,
+            len(keys),
+            len(found)))
+
+    if not found or not (s3_cache is True or str(s3_cache) == '1'):
+        return payloads
+
+    try:
+        use_client = redis_client
+        if not use_client:
+            use_client = redis_pool.get_redis_client(
+                address=work_dict.get(
+                    'redis_address',
+                    REDIS_ADDRESS),
+                password=work_dict.get(
+                    'redis_password',
+                    REDIS_PASSWORD),
+                db=work_dict.get(
+                    'redis_db',
+                    REDIS_DB))
+        pipe = use_client.pipeline(
+            transaction=False)
+        for key in found:
+            pipe.set(
+                key,
+                payloads[key],
+                ex=s3_cache_expire if s3_cache_expire > 0 else None)
+        pipe.execute()
+    except Exception as e:
+        log.error(
+            '{} - failed caching s3 datasets in '
+            'redis keys={} ex={}'.format(
+                log_id,
+                len(found),
+                e))
+    # end of try/ex writing back into redis
+
+    return payloads
+# end of read_through_s3_keys
+
+
 def perform_extract(
         df_type,
         df_str,
@@ -63,10 +234,18 @@ def perform_extract(
         scrub_mode='sort-by-date'):
     """perform_extract
 
-    Helper for extracting from Redis or S3
+    Helper for extracting from Redis or S3. On a Redis miss
+    the dataset is read from ``s3_bucket`` (with the
+    ``s3_key`` or the ``redis_key``) when ``s3_enabled`` and
+    ``s3_fallback`` (``EXTRACT_S3_FALLBACK``) are set, and
+    written back into Redis unless ``s3_cache`` is ``False``.
+
+    When ``df_cache`` (``DF_CACHE_ENABLED``) is set, the scrubbed
+    DataFrame is served from and stored in the in-process
+    ``analysis_engine.df_cache`` using the ``df_cache_version``.
 
     :param df_type: datafeed type enum
-    :param ds_str: dataset string name
+    :param df_str: dataset string name
     :param work_dict: incoming work request dictionary
     :param dataset_id_key: configurable dataset identifier
                            key for tracking scrubbing and
@@ -159,6 +338,29 @@ def perform_extract(
                 s3_region_name,
                 s3_secure))
 
+    cache = df_cache.get_enabled_df_cache(
+        enabled=work_dict.get(
+            'df_cache',
+            None))
+    cache_version = work_dict.get(
+        'df_cache_version',
+        None)
+    if cache:
+        cached_df = cache.get(
+            key=redis_key,
+            name=df_str,
+            scrub_mode=scrub_mode,
+            version=cache_version)
+        if cached_df is not None:
+            log.debug(
+                '{} - {} ds_id={} cache hit key={}'.format(
+                    label,
+                    df_str,
+                    ds_id,
+                    redis_key))
+            return SUCCESS, cached_df
+    # end of checking the in-process cache
+
     extract_res = None
     try:
         extract_res = build_df.build_df_from_redis(
@@ -180,15 +382,14 @@ def perform_extract(
                 e))
     # end of try/ex extract from redis
 
-    if not extract_res:
-        return status, None
-
-    valid_df = (
-        extract_res['status'] == SUCCESS
-        and extract_res['rec']['valid_df'])
-
-    if not valid_df:
-        if ev('DEBUG_S3_EXTRACT', '0') == '1':
+    extract_df = None
+    if extract_res:
+        valid_df = (
+            extract_res['status'] == SUCCESS
+            and extract_res['rec']['valid_df'])
+        if valid_df:
+            extract_df = extract_res['rec']['data']
+        elif ev('DEBUG_S3_EXTRACT', '0') == '1':
             log.error(
                 '{} - {} ds_id={} invalid df '
                 'status={} extract_res={}'.format(
@@ -197,9 +398,38 @@ def perform_extract(
                     ds_id,
                     get_status(status=extract_res['status']),
                     extract_res))
-        return status, None
+    # end of checking the redis extract
 
-    extract_df = extract_res['rec']['data']
+    if extract_df is None and is_s3_fallback_enabled(work_dict):
+        use_s3_key = s3_key
+        if 's3_key' not in work_dict:
+            use_s3_key = redis_key
+        try:
+            raw_data = read_through_s3_keys(
+                keys=[redis_key],
+                work_dict=work_dict,
+                label=label,
+                s3_keys={
+                    redis_key: use_s3_key
+                })[redis_key]
+            extract_df = df_utils.build_df_from_bytes(
+                raw_data=raw_data)
+        except Exception as e:
+            extract_df = None
+            log.error(
+                '{} - {} - ds_id={} failed extract from '
+                's3={}/{} ex={}'.format(
+                    label,
+                    df_str,
+                    ds_id,
+                    s3_bucket,
+                    use_s3_key,
+                    e))
+        # end of try/ex extract from s3
+    # end of reading through to s3 on a redis miss
+
+    if extract_df is None:
+        return status, None
 
     log.debug(
         '{} - {} ds_id={} extract scrub={}'.format(
@@ -218,5 +448,14 @@ def perform_extract(
 
     status = SUCCESS
 
+    if cache:
+        cache.set(
+            key=redis_key,
+            df=scrubbed_df,
+            name=df_str,
+            scrub_mode=scrub_mode,
+            version=cache_version,
+            ticker=ds_id)
+
     return status, scrubbed_df
 # end of perform_extract
@@ -7,6 +7,7 @@ import json
 import analysis_engine.work_tasks.get_new_pricing_data as price_utils
 import analysis_engine.iex.extract_df_from_redis as iex_extract_utils
 import analysis_engine.yahoo.extract_df_from_redis as yahoo_extract_utils
+import analysis_engine.collection_pipeline as collection_pipeline
 from analysis_engine.consts import get_status
 from analysis_engine.consts import SUCCESS
 from analysis_engine.consts import FAILED
@@ -41,6 +42,7 @@ def fetch(
         broker_url=None,
         result_backend=None,
         label=None,
+        use_pipeline=False,
         verbose=False):
     """fetch
 
@@ -132,6 +134,13 @@ def fetch(
         (default is ``redis://0.0.0.0:6379/14``)
     :param label: tracking log label
 
+    **(Optional) Collection pipeline**
+
+    :param use_pipeline: bool - fetch, scrub and publish all
+        ``tickers`` concurrently with
+        ``analysis_engine.collection_pipeline`` in this process
+        instead of one ticker at a time (default is ``False``)
+
     **(Optional) Debugging**
 
     :param verbose: bool - show fetch warnings
@@ -252,6 +261,7 @@ def fetch(
                 label,
                 num_tickers))
 
+    pipeline_reqs = []
     for ticker in use_tickers:
 
         ticker_key = '{}_{}'.format(
@@ -283,6 +293,10 @@ def fetch(
         fetch_req['redis_address'] = redis_address
         fetch_req['s3_address'] = s3_address
 
+        if use_pipeline:
+            pipeline_reqs.append(fetch_req)
+            continue
+
         log.info(
             '{} - fetching ticker={} last_close={} '
             'redis_address={} s3_address={}'.format(
@@ -313,6 +327,34 @@ def fetch(
         # end of if worked or not
     # end for all tickers to fetch
 
+    if pipeline_reqs:
+        pipeline_req = dict(pipeline_reqs[0])
+        pipeline_req['last_close_str'] = last_close_str
+        collect_res = collection_pipeline.run_collection_pipeline(
+            tickers=use_tickers,
+            work_dict=pipeline_req,
+            fetch_mode=fetch_mode,
+            iex_datasets=iex_datasets,
+            label=label)
+        ticker_statuses = collect_res['rec']['tickers']
+        ticker_keys = collect_res['rec']['keys']
+        for fetch_req in pipeline_reqs:
+            use_ticker = str(fetch_req['ticker']).upper()
+            if ticker_statuses.get(use_ticker, None) == SUCCESS:
+                fetch_req['base_key'] = ticker_keys[use_ticker]
+                extract_records.append(fetch_req)
+            else:
+                log.warning(
+                    '{} - failed collecting ticker={} data '
+                    'status={}'.format(
+                        label,
+                        fetch_req['ticker'],
+                        get_status(status=ticker_statuses.get(
+                            use_ticker,
+                            FAILED))))
+        # end of for all pipeline tickers
+    # end of if using the collection pipeline
+
     """
     Extract Datasets
     """
@@ -10,6 +10,7 @@ import requests
 import bs4
 import pandas as pd
 import analysis_engine.build_result as req_utils
+import analysis_engine.http_session as http_session
 from spylunking.log.setup_logging import build_colorized_logger
 from analysis_engine.utils import get_last_close_str
 from analysis_engine.consts import NOT_RUN
@@ -81,7 +82,7 @@ def fetch_tickers_from_screener(
                 label,
                 url))
 
-        response = requests.get(url)
+        response = http_session.get(url)
 
         if response.status_code != requests.codes.ok:
             err = (
@@ -16,8 +16,9 @@ Debug redis calls with:
 """
 
 import json
-import redis
 import analysis_engine.build_result as build_result
+import analysis_engine.df_serializers as df_serializers
+import analysis_engine.redis_pool as redis_pool
 from spylunking.log.setup_logging import build_colorized_logger
 from analysis_engine.consts import SUCCESS
 from analysis_engine.consts import NOT_RUN
@@ -50,8 +51,10 @@ def get_data_from_redis_key(
     :param db: not used yet - redis db
     :param key: not used yet - redis key
     :param expire: not used yet - redis expire
-    :param serializer: not used yet - support for future
-                       pickle objects in redis
+    :param serializer: ``json`` (default) - binary columnar
+                       ``arrow`` and ``parquet`` DataFrames are
+                       detected automatically and returned as
+                       a ``pandas.DataFrame``
     :param encoding: format of the encoded key in redis
     """
 
@@ -79,7 +82,7 @@ def get_data_from_redis_key(
                     host,
                     port,
                     db))
-            use_client = redis.Redis(
+            use_client = redis_pool.get_redis_client(
                 host=host,
                 port=port,
                 password=password,
@@ -96,27 +99,39 @@ def get_data_from_redis_key(
             name=key)
 
         if raw_data:
-            log.debug(
-                '{} decoding key={} encoding={}'.format(
-                    log_id,
-                    key,
-                    encoding))
-            decoded_data = raw_data.decode(encoding)
-
-            log.debug(
-                '{} deserial key={} serializer={}'.format(
-                    log_id,
-                    key,
-                    serializer))
-
-            if serializer == 'json':
-                data = json.loads(decoded_data)
-            elif serializer == 'df':
-                data = decoded_data
+            columnar_format = df_serializers.get_columnar_format(
+                raw_data)
+            if columnar_format:
+                log.debug(
+                    '{} deserial key={} format={}'.format(
+                        log_id,
+                        key,
+                        columnar_format))
+                data = df_serializers.deserialize_df(
+                    raw_data)
             else:
-                data = decoded_data
+                log.debug(
+                    '{} decoding key={} encoding={}'.format(
+                        log_id,
+                        key,
+                        encoding))
+                decoded_data = raw_data.decode(encoding)
+
+                log.debug(
+                    '{} deserial key={} serializer={}'.format(
+                        log_id,
+                        key,
+                        serializer))
+
+                if serializer == 'json':
+                    data = json.loads(decoded_data)
+                elif serializer == 'df':
+                    data = decoded_data
+                else:
+                    data = decoded_data
+            # end of if binary columnar or json
 
-            if data:
+            if data is not None:
                 if ev('DEBUG_REDIS', '0') == '1':
                     log.info(
                         '{} - found key={} data={}'.format(
@@ -13,10 +13,9 @@ https://github.com/neberej/pinance/master/pinance/engine/yfinance2.py
 
 import datetime
 import json
-import urllib.request
-import urllib.error
-import urllib.parse
+import requests
 import pandas as pd
+import analysis_engine.http_session as http_session
 from random import randrange
 from spylunking.log.setup_logging import build_colorized_logger
 from analysis_engine.consts import COMMON_TICK_DATE_FORMAT
@@ -87,13 +86,12 @@ def make_request(
         url = create_url(ticker, None)
 
     try:
-        response = json.loads(
-            urllib.request.urlopen(url).read().decode('utf-8'))
-    except urllib.error.URLError as e:
-        if hasattr(e, 'reason'):
-            return []
-        elif hasattr(e, 'code'):
-            return []
+        res = http_session.get(url)
+    except requests.exceptions.RequestException:
+        return []
+    if res.status_code != requests.codes.ok:
+        return []
+    response = json.loads(res.text)
     return response
 # end of make_request
 
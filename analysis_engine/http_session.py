@@ -0,0 +1,361 @@
+"""
+Shared HTTP Sessions
+====================
+
+Process-wide ``requests.Session`` for the fetchers that call
+HTTP apis (IEX with ``analysis_engine.iex.utils.safe_get``,
+FinViz screeners and the Yahoo options in
+``analysis_engine.get_pricing``). The session keeps connections
+alive in a pool for each host and retries failed connections
+and retryable status codes with an exponential backoff.
+
+- every request has a connect and read timeout
+- ``gzip`` responses are requested unless ``HTTP_GZIP=0``
+- each host has a limit of ``HTTP_HOST_MAX_CONCURRENT``
+  requests in flight across all threads in the process
+- the session is fork-safe: a child process (like a Celery
+  prefork worker) builds its own session instead of reusing
+  its parent's sockets
+
+Per-host request, error and latency counters are available
+with ``get_http_stats()``:
+
+.. code-block:: python
+
+    import analysis_engine.http_session as http_session
+    res = http_session.get('https://finviz.com/screener.ashx?v=111')
+    print(http_session.get_http_stats())
+
+**Supported environment variables**
+
+::
+
+    # max connections kept alive for each host
+    export HTTP_POOL_MAXSIZE=20
+
+    # retries for connection errors and retryable status
+    # codes with a backoff of: factor * (2 ** (retry - 1))
+    export HTTP_RETRIES=3
+    export HTTP_BACKOFF_FACTOR=0.5
+    export HTTP_RETRY_STATUSES=429,500,502,503,504
+
+    # seconds to wait for a connection and for a response
+    export HTTP_CONNECT_TIMEOUT=5
+    export HTTP_READ_TIMEOUT=30
+
+    # set to 0 to ask for uncompressed responses
+    export HTTP_GZIP=1
+
+    # max requests in flight for each host
+    export HTTP_HOST_MAX_CONCURRENT=8
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import os
+import time
+import threading
+import urllib.parse
+import requests
+import requests.adapters
+from urllib3.util.retry import Retry
+from spylunking.log.setup_logging import build_colorized_logger
+from analysis_engine.consts import ev
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+HTTP_POOL_MAXSIZE = int(ev(
+    'HTTP_POOL_MAXSIZE',
+    '20'))
+HTTP_RETRIES = int(ev(
+    'HTTP_RETRIES',
+    '3'))
+HTTP_BACKOFF_FACTOR = float(ev(
+    'HTTP_BACKOFF_FACTOR',
+    '0.5'))
+HTTP_RETRY_STATUSES = [
+    int(status)
+    for status in ev(
+        'HTTP_RETRY_STATUSES',
+        '429,500,502,503,504').split(',')
+    if status
+]
+HTTP_CONNECT_TIMEOUT = float(ev(
+    'HTTP_CONNECT_TIMEOUT',
+    '5'))
+HTTP_READ_TIMEOUT = float(ev(
+    'HTTP_READ_TIMEOUT',
+    '30'))
+HTTP_GZIP = ev(
+    'HTTP_GZIP',
+    '1') == '1'
+HTTP_HOST_MAX_CONCURRENT = int(ev(
+    'HTTP_HOST_MAX_CONCURRENT',
+    '8'))
+
+SESSION = None
+SESSION_PID = os.getpid()
+SESSION_LOCK = threading.Lock()
+HOST_LIMITS = {}
+HOST_STATS = {}
+STATS_LOCK = threading.Lock()
+
+
+def build_session():
+    """build_session
+
+    Build a ``requests.Session`` with a pooled and retrying
+    ``HTTPAdapter`` for ``http://`` and ``https://`` urls
+    """
+    retry = Retry(
+        total=HTTP_RETRIES,
+        connect=HTTP_RETRIES,
+        read=HTTP_RETRIES,
+        status=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        raise_on_status=False)
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=HTTP_POOL_MAXSIZE,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry)
+    session = requests.Session()
+    session.mount(
+        'http://',
+        adapter)
+    session.mount(
+        'https://',
+        adapter)
+    return session
+# end of build_session
+
+
+def check_pid():
+    """check_pid
+
+    Drop the session, host limits and counters if the
+    process was forked since they were created (without
+    closing the parent's connections)
+    """
+    global SESSION
+    global SESSION_PID
+    global SESSION_LOCK
+    global HOST_LIMITS
+    global HOST_STATS
+    global STATS_LOCK
+    cur_pid = os.getpid()
+    if cur_pid != SESSION_PID:
+        SESSION = None
+        SESSION_PID = cur_pid
+        SESSION_LOCK = threading.Lock()
+        HOST_LIMITS = {}
+        HOST_STATS = {}
+        STATS_LOCK = threading.Lock()
+# end of check_pid
+
+
+def get_session():
+    """get_session
+
+    Get (or create) the shared ``requests.Session``
+    for this process
+    """
+    global SESSION
+    check_pid()
+    session = SESSION
+    if session:
+        return session
+    with SESSION_LOCK:
+        if not SESSION:
+            log.debug(
+                'creating http session pool={} retries={}'.format(
+                    HTTP_POOL_MAXSIZE,
+                    HTTP_RETRIES))
+            SESSION = build_session()
+        return SESSION
+# end of get_session
+
+
+def get_host_limit(
+        host):
+    """get_host_limit
+
+    Get the semaphore that limits the requests in flight
+    for a host
+
+    :param host: host from the url
+    """
+    with STATS_LOCK:
+        limit = HOST_LIMITS.get(
+            host,
+            None)
+        if not limit:
+            limit = threading.BoundedSemaphore(
+                max(HTTP_HOST_MAX_CONCURRENT, 1))
+            HOST_LIMITS[host] = limit
+        return limit
+# end of get_host_limit
+
+
+def record_request(
+        host,
+        seconds,
+        error=False):
+    """record_request
+
+    :param host: host from the url
+    :param seconds: seconds for the request
+    :param error: optional - request failed or
+        returned an error status code
+    """
+    with STATS_LOCK:
+        stats = HOST_STATS.get(
+            host,
+            None)
+        if not stats:
+            stats = {
+                'requests': 0,
+                'errors': 0,
+                'total_seconds': 0.0,
+                'max_seconds': 0.0
+            }
+            HOST_STATS[host] = stats
+        stats['requests'] += 1
+        if error:
+            stats['errors'] += 1
+        stats['total_seconds'] += seconds
+        if seconds > stats['max_seconds']:
+            stats['max_seconds'] = seconds
+# end of record_request
+
+
+def request(
+        method,
+        url,
+        timeout=None,
+        gzip=None,
+        **kwargs):
+    """request
+
+    Send a request with the shared session and return the
+    ``requests.Response``. Connection errors are raised
+    after the retries like ``requests.request``.
+
+    :param method: HTTP method
+    :param url: url
+    :param timeout: optional - seconds or a ``(connect, read)``
+        tuple (default is ``HTTP_CONNECT_TIMEOUT`` and
+        ``HTTP_READ_TIMEOUT``)
+    :param gzip: optional - ask for a compressed response
+        (default is ``HTTP_GZIP``)
+    :param kwargs: keyword arguments for
+        ``requests.Session.request``
+    """
+    if timeout is None:
+        timeout = (
+            HTTP_CONNECT_TIMEOUT,
+            HTTP_READ_TIMEOUT)
+    if gzip is None:
+        gzip = HTTP_GZIP
+    headers = dict(kwargs.pop(
+        'headers',
+        None) or {})
+    if 'Accept-Encoding' not in headers:
+        headers['Accept-Encoding'] = (
+            'gzip, deflate' if gzip else 'identity')
+
+    session = get_session()
+    host = urllib.parse.urlparse(url).netloc
+    with get_host_limit(host):
+        start_time = time.time()
+        try:
+            response = session.request(
+                method,
+                url,
+                timeout=timeout,
+                headers=headers,
+                **kwargs)
+        except Exception as e:
+            record_request(
+                host=host,
+                seconds=time.time() - start_time,
+                error=True)
+            log.debug(
+                'http {} host={} failed with ex={}'.format(
+                    method,
+                    host,
+                    e))
+            raise e
+        # end of try/ex
+    record_request(
+        host=host,
+        seconds=time.time() - start_time,
+        error=response.status_code >= 400)
+    return response
+# end of request
+
+
+def get(
+        url,
+        **kwargs):
+    """get
+
+    ``GET`` a url with the shared session
+
+    :param url: url
+    :param kwargs: keyword arguments for ``request``
+    """
+    return request(
+        'GET',
+        url,
+        **kwargs)
+# end of get
+
+
+def get_http_stats():
+    """get_http_stats
+
+    Get a dictionary of hosts to counters with keys:
+    ``requests``, ``errors``, ``total_seconds``,
+    ``avg_seconds`` and ``max_seconds``
+    """
+    check_pid()
+    stats = {}
+    with STATS_LOCK:
+        for host, host_stats in HOST_STATS.items():
+            stats[host] = dict(host_stats)
+            stats[host]['avg_seconds'] = (
+                host_stats['total_seconds'] /
+                max(host_stats['requests'], 1))
+    return stats
+# end of get_http_stats
+
+
+def reset_http_sessions():
+    """reset_http_sessions
+
+    Close the shared session and clear the host limits
+    and counters in this process
+    """
+    global SESSION
+    check_pid()
+    with SESSION_LOCK:
+        if SESSION:
+            try:
+                SESSION.close()
+            except Exception as e:
+                log.debug(
+                    'failed closing http session ex={}'.format(
+                        e))
+        SESSION = None
+    with STATS_LOCK:
+        HOST_LIMITS.clear()
+        HOST_STATS.clear()
+# end of reset_http_sessions
@@ -0,0 +1,473 @@
+"""
+Fetch many tickers and datasets from the IEX
+`batch endpoint <https://iextrading.com/developer/docs/#batch-requests>`__
+(``/stock/market/batch``) instead of one ``pyEX`` call per
+ticker and per dataset.
+
+The tickers are grouped into calls of up to ``IEX_BATCH_MAX_SYMBOLS``
+symbols and ``IEX_BATCH_MAX_TYPES`` types. Datasets that use a
+different ``range`` (like ``daily`` with ``5y`` and ``minute``
+with ``1d``) go into separate calls because the endpoint only
+accepts one ``range`` per call. ``daily`` and ``minute`` are
+always in separate calls (even with the same ``range``) because
+both use the ``chart`` type. Each response is split back into
+one ``pandas.DataFrame`` per ticker and dataset and scrubbed with
+``analysis_engine.dataset_scrub_utils.ingress_scrub_dataset`` like
+the ``analysis_engine.iex.fetch_api`` fetchers.
+
+.. code-block:: python
+
+    import analysis_engine.iex.fetch_batch as fetch_batch
+    datasets = fetch_batch.fetch_batch(
+        tickers=['SPY', 'AMZN', 'TSLA'],
+        fetch_types=['daily', 'quote', 'news'])
+    print(datasets['SPY']['daily'])
+
+Set ``base_url`` or ``IEX_API_URL`` to use a local stub server
+(like ``analysis_engine.mocks.mock_iex.start_mock_iex_server``).
+
+**Supported environment variables**
+
+::
+
+    # IEX api url
+    export IEX_API_URL=https://api.iextrading.com/1.0
+
+    # max number of symbols and types in one batch call
+    export IEX_BATCH_MAX_SYMBOLS=100
+    export IEX_BATCH_MAX_TYPES=10
+
+    # seconds to wait for a batch response
+    export IEX_BATCH_TIMEOUT=30
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import pandas as pd
+import analysis_engine.iex.utils as fetch_utils
+import analysis_engine.dataset_scrub_utils as scrub_utils
+from spylunking.log.setup_logging import build_colorized_logger
+from analysis_engine.consts import ev
+from analysis_engine.iex.consts import DEFAULT_FETCH_DATASETS
+from analysis_engine.iex.consts import DATAFEED_DAILY
+from analysis_engine.iex.consts import DATAFEED_MINUTE
+from analysis_engine.iex.consts import DATAFEED_QUOTE
+from analysis_engine.iex.consts import DATAFEED_STATS
+from analysis_engine.iex.consts import DATAFEED_PEERS
+from analysis_engine.iex.consts import DATAFEED_NEWS
+from analysis_engine.iex.consts import DATAFEED_FINANCIALS
+from analysis_engine.iex.consts import DATAFEED_EARNINGS
+from analysis_engine.iex.consts import DATAFEED_DIVIDENDS
+from analysis_engine.iex.consts import DATAFEED_COMPANY
+from analysis_engine.iex.consts import get_ft_str
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+IEX_API_URL = ev(
+    'IEX_API_URL',
+    'https://api.iextrading.com/1.0')
+IEX_BATCH_MAX_SYMBOLS = int(ev(
+    'IEX_BATCH_MAX_SYMBOLS',
+    '100'))
+IEX_BATCH_MAX_TYPES = int(ev(
+    'IEX_BATCH_MAX_TYPES',
+    '10'))
+IEX_BATCH_TIMEOUT = float(ev(
+    'IEX_BATCH_TIMEOUT',
+    '30'))
+
+# dataset field to the batch type, datafeed type and scrub mode
+BATCH_DATASETS = {
+    'daily': ('chart', DATAFEED_DAILY, 'sort-by-date'),
+    'minute': ('chart', DATAFEED_MINUTE, 'sort-by-date'),
+    'quote': ('quote', DATAFEED_QUOTE, 'sort-by-date'),
+    'stats': ('stats', DATAFEED_STATS, 'sort-by-date'),
+    'peers': ('peers', DATAFEED_PEERS, 'sort-by-date'),
+    'news': ('news', DATAFEED_NEWS, 'sort-by-date'),
+    'financials': ('financials', DATAFEED_FINANCIALS, 'sort-by-date'),
+    'earnings': ('earnings', DATAFEED_EARNINGS, 'sort-by-date'),
+    'dividends': ('dividends', DATAFEED_DIVIDENDS, 'sort-by-date'),
+    'company': ('company', DATAFEED_COMPANY, 'NO_SORT')
+}
+
+# default range for the datasets that use one (same as the
+# ``analysis_engine.api_requests.build_iex_fetch_*_request``
+# timeframes)
+BATCH_RANGES = {
+    'daily': '5y',
+    'minute': '1d',
+    'dividends': '2y'
+}
+
+BATCH_NEWS_COUNT = 50
+
+
+def get_chunks(
+        values,
+        size):
+    """get_chunks
+
+    split a list into lists of up to ``size`` values
+
+    :param values: list of values
+    :param size: max number of values in each chunk
+    """
+    size = max(int(size), 1)
+    return [
+        values[idx:idx + size]
+        for idx in range(0, len(values), size)
+    ]
+# end of get_chunks
+
+
+def build_batch_requests(
+        tickers,
+        fetch_types=None,
+        ranges=None,
+        max_symbols=None,
+        max_types=None):
+    """build_batch_requests
+
+    group the tickers and datasets into batch calls and
+    return a list of dictionaries with keys:
+    ``symbols``, ``fields`` (the dataset fields in the call)
+    and ``params`` (the query parameters)
+
+    :param tickers: list of ticker symbols
+    :param fetch_types: optional - list of
+        ``analysis_engine.iex.consts.FETCH_*`` values or
+        dataset names (default is ``DEFAULT_FETCH_DATASETS``)
+    :param ranges: optional - dictionary of dataset field to
+        ``range`` values to override ``BATCH_RANGES``
+    :param max_symbols: optional - max symbols per call
+        (default is ``IEX_BATCH_MAX_SYMBOLS``)
+    :param max_types: optional - max types per call
+        (default is ``IEX_BATCH_MAX_TYPES``)
+    """
+    if fetch_types is None:
+        fetch_types = DEFAULT_FETCH_DATASETS
+    if max_symbols is None:
+        max_symbols = IEX_BATCH_MAX_SYMBOLS
+    if max_types is None:
+        max_types = IEX_BATCH_MAX_TYPES
+    use_ranges = dict(BATCH_RANGES)
+    if ranges:
+        use_ranges.update(ranges)
+
+    fields = []
+    for ft_type in fetch_types:
+        field = get_ft_str(ft_type=ft_type)
+        if field not in BATCH_DATASETS:
+            log.error(
+                'unsupported batch ft_type={}'.format(
+                    ft_type))
+            continue
+        if field not in fields:
+            fields.append(field)
+    # end of for all fetch types
+
+    # one group of fields for each range value with the
+    # fields that do not use a range in the first group. Fields
+    # that share a batch type (``daily`` and ``minute`` both use
+    # ``chart``) always go into separate groups because the
+    # response only has one value per type.
+    groups = []
+    for field in fields:
+        range_value = use_ranges.get(field, None)
+        batch_type = BATCH_DATASETS[field][0]
+        use_group = None
+        for group in groups:
+            if (range_value is not None and
+                    group['range'] not in [None, range_value]):
+                continue
+            if batch_type in group['types']:
+                continue
+            use_group = group
+            break
+        if use_group is None:
+            use_group = {
+                'range': range_value,
+                'fields': [],
+                'types': []
+            }
+            groups.append(use_group)
+        elif range_value is not None and use_group['range'] is None:
+            use_group['range'] = range_value
+        use_group['fields'].append(field)
+        use_group['types'].append(batch_type)
+    # end of for all fields
+    if not groups:
+        groups.append({
+            'range': None,
+            'fields': [],
+            'types': []
+        })
+
+    requests = []
+    symbol_chunks = get_chunks(
+        values=[str(ticker).upper() for ticker in tickers],
+        size=max_symbols)
+    for group in groups:
+        range_value = group['range']
+        group_fields = group['fields']
+        batch_types = group['types']
+        for type_chunk in get_chunks(
+                values=batch_types,
+                size=max_types):
+            chunk_fields = [
+                field
+                for field in group_fields
+                if BATCH_DATASETS[field][0] in type_chunk
+            ]
+            for symbols in symbol_chunks:
+                params = {
+                    'symbols': ','.join(symbols),
+                    'types': ','.join(type_chunk)
+                }
+                if range_value:
+                    params['range'] = range_value
+                if 'news' in type_chunk:
+                    params['last'] = BATCH_NEWS_COUNT
+                requests.append({
+                    'symbols': symbols,
+                    'fields': chunk_fields,
+                    'params': params
+                })
+        # end of for all type chunks
+    # end of for all range groups
+
+    return requests
+# end of build_batch_requests
+
+
+def get_batch_df(
+        field,
+        data):
+    """get_batch_df
+
+    convert the json for one dataset from a batch response
+    into a ``pandas.DataFrame`` with the same columns as the
+    ``pyEX`` ``*DF`` calls
+
+    :param field: dataset field
+    :param data: json value for the dataset's batch type
+    """
+    if data is None:
+        return None
+    if field in ['financials', 'earnings']:
+        if isinstance(data, dict):
+            data = data.get(field, [])
+        return pd.DataFrame(data)
+    elif field == 'peers':
+        return pd.DataFrame(
+            data,
+            columns=['symbol'])
+    elif field in ['quote', 'stats', 'company']:
+        return pd.DataFrame([data])
+    return pd.DataFrame(data)
+# end of get_batch_df
+
+
+def get_batch_url(
+        base_url=None):
+    """get_batch_url
+
+    :param base_url: optional - IEX api url
+        (default is ``IEX_API_URL``)
+    """
+    if not base_url:
+        base_url = IEX_API_URL
+    return '{}/stock/market/batch'.format(
+        base_url.rstrip('/'))
+# end of get_batch_url
+
+
+def fetch_batch_call(
+        url,
+        req,
+        label=None,
+        timeout=None):
+    """fetch_batch_call
+
+    send one call from ``build_batch_requests`` and return
+    the decoded json dictionary (``None`` if the call failed)
+
+    :param url: batch url from ``get_batch_url``
+    :param req: batch request from ``build_batch_requests``
+    :param label: optional - log tracking label
+    :param timeout: optional - seconds to wait for the
+        response (default is ``IEX_BATCH_TIMEOUT``)
+    """
+    if timeout is None:
+        timeout = IEX_BATCH_TIMEOUT
+    try:
+        res = fetch_utils.safe_get(
+            url,
+            params=req['params'],
+            timeout=timeout)
+    except Exception as e:
+        log.error(
+            '{} types={} failed with ex={}'.format(
+                label,
+                req['params']['types'],
+                e))
+        return None
+    # end of try/ex
+
+    if not isinstance(res, dict):
+        log.error(
+            '{} types={} invalid response'.format(
+                label,
+                req['params']['types']))
+        return None
+    return res
+# end of fetch_batch_call
+
+
+def scrub_batch_call(
+        res,
+        req,
+        label=None,
+        use_date=None):
+    """scrub_batch_call
+
+    split the response from ``fetch_batch_call`` into a
+    dictionary of tickers to a dictionary of the call's
+    dataset fields to scrubbed ``pandas.DataFrame`` objects.
+    Tickers without data in the response are left out.
+
+    :param res: decoded json response
+    :param req: batch request from ``build_batch_requests``
+    :param label: optional - log tracking label
+    :param use_date: optional - date string for the scrubbers
+    """
+    datasets = {}
+    for symbol in req['symbols']:
+        symbol_data = res.get(
+            symbol,
+            None)
+        if not symbol_data:
+            log.info(
+                '{} no data for ticker={}'.format(
+                    label,
+                    symbol))
+            continue
+        datasets[symbol] = {}
+        for field in req['fields']:
+            batch_type, datafeed_type, scrub_mode = \
+                BATCH_DATASETS[field]
+            df = get_batch_df(
+                field=field,
+                data=symbol_data.get(batch_type, None))
+            datasets[symbol][field] = scrub_utils.ingress_scrub_dataset(
+                label=label,
+                scrub_mode=scrub_mode,
+                datafeed_type=datafeed_type,
+                msg_format='df={} date_str={}',
+                ds_id=symbol,
+                date_str=use_date,
+                df=df)
+        # end of for all fields in the call
+    # end of for all symbols in the call
+    return datasets
+# end of scrub_batch_call
+
+
+def fetch_batch(
+        tickers,
+        fetch_types=None,
+        label=None,
+        base_url=None,
+        ranges=None,
+        max_symbols=None,
+        max_types=None,
+        use_date=None,
+        timeout=None):
+    """fetch_batch
+
+    fetch the datasets for many tickers with IEX batch calls
+    and return a dictionary of tickers to a dictionary of
+    dataset fields to scrubbed ``pandas.DataFrame`` objects
+    (``None`` if the dataset was not returned)
+
+    :param tickers: list of ticker symbols
+    :param fetch_types: optional - list of
+        ``analysis_engine.iex.consts.FETCH_*`` values or
+        dataset names (default is ``DEFAULT_FETCH_DATASETS``)
+    :param label: optional - log tracking label
+    :param base_url: optional - IEX api url
+        (default is ``IEX_API_URL``)
+    :param ranges: optional - dictionary of dataset field to
+        ``range`` values to override ``BATCH_RANGES``
+    :param max_symbols: optional - max symbols per call
+        (default is ``IEX_BATCH_MAX_SYMBOLS``)
+    :param max_types: optional - max types per call
+        (default is ``IEX_BATCH_MAX_TYPES``)
+    :param use_date: optional - date string for the scrubbers
+    :param timeout: optional - seconds to wait for each
+        response (default is ``IEX_BATCH_TIMEOUT``)
+    """
+    if not label:
+        label = 'iex-batch'
+    url = get_batch_url(
+        base_url=base_url)
+
+    batch_requests = build_batch_requests(
+        tickers=tickers,
+        fetch_types=fetch_types,
+        ranges=ranges,
+        max_symbols=max_symbols,
+        max_types=max_types)
+
+    fields = []
+    for req in batch_requests:
+        for field in req['fields']:
+            if field not in fields:
+                fields.append(field)
+    datasets = {
+        str(ticker).upper(): {
+            field: None
+            for field in fields
+        }
+        for ticker in tickers
+    }
+
+    log.info(
+        '{} - fetching tickers={} calls={} url={}'.format(
+            label,
+            len(datasets),
+            len(batch_requests),
+            url))
+
+    num_calls = len(batch_requests)
+    for idx, req in enumerate(batch_requests):
+        call_label = '{} - batch={}/{}'.format(
+            label,
+            idx + 1,
+            num_calls)
+        res = fetch_batch_call(
+            url=url,
+            req=req,
+            label=call_label,
+            timeout=timeout)
+        if res is None:
+            continue
+        call_datasets = scrub_batch_call(
+            res=res,
+            req=req,
+            label=call_label,
+            use_date=use_date)
+        for symbol in call_datasets:
+            datasets[symbol].update(
+                call_datasets[symbol])
+    # end of for all batch calls
+
+    return datasets
+# end of fetch_batch
@@ -158,6 +158,11 @@ def get_data_from_iex(
                     label))
         # end of cloning keys
 
+        for k in ['serializer', 'encoding']:
+            if k in work_dict:
+                iex_req[k] = work_dict[k]
+        # end of cloning optional redis serialization keys
+
         if not iex_req:
             err = (
                 '{} - ticker={} did not build an IEX request '
@@ -11,6 +11,7 @@ import pyEX as p
 import string
 import warnings
 warnings.filterwarnings("ignore")  # noqa
+import analysis_engine.http_session as http_session
 from spylunking.log.setup_logging import build_colorized_logger
 from trading_calendars import get_calendar
 from datetime import datetime
@@ -55,7 +56,7 @@ def parse_body(req, **fields):
 def safe_get(path, *args, **kwargs):
     try:
         log.debug('GET: %s' % path)
-        resp = requests.get(path, *args, **kwargs).text
+        resp = http_session.get(path, *args, **kwargs).text
         # log.debug('GET_RESPONSE: %s' % resp)
         return ujson.loads(resp)
     except ConnectionRefusedError:
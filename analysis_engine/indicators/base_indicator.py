@@ -1,6 +1,16 @@
 """
 Base Indicator Class for deriving your own indicators
 to use within an ``analysis_engine.algo.BaseAlgo``
+
+Incremental Indicators
+======================
+
+By default the ``IndicatorProcessor`` calls ``process`` with the
+full dataset node on every date in a backtest. Rolling indicators
+can implement ``update`` instead and keep their rolling values in
+``self.get_state(ticker)``. The processor then only passes
+the rows that are new since the previous node (see
+``analysis_engine.indicators.indicator_processor``).
 """
 
 import uuid
@@ -36,6 +46,7 @@ class BaseIndicator:
         self.config = config_dict
         self.path_to_module = path_to_module
         self.verbose = verbose
+        self.state = {}
 
         if not self.name:
             self.name = 'ind_{}'.format(
@@ -60,6 +71,112 @@ class BaseIndicator:
         return self.name
     # end of get_name
 
+    def get_inputs(
+            self):
+        """get_inputs
+
+        Derive this method to declare the input series this
+        indicator uses as a list of keys from
+        ``analysis_engine.indicators.builtin_indicators.build_input_key``.
+        The ``IndicatorProcessor`` computes each distinct input
+        series once per dataset node and passes them to
+        ``process_inputs``.
+        """
+        return []
+    # end of get_inputs
+
+    def process_inputs(
+            self,
+            algo_id,
+            ticker,
+            dataset,
+            inputs):
+        """process_inputs
+
+        Process the dataset node with the shared input series
+        from ``get_inputs``. The default calls ``process``.
+
+        :param algo_id: string - algo identifier label for debugging
+            datasets during specific dates
+        :param ticker: string - ticker
+        :param dataset: dataset node dictionary
+        :param inputs: dictionary of input keys to ``numpy`` arrays
+        """
+        self.process(
+            algo_id=algo_id,
+            ticker=ticker,
+            dataset=dataset)
+    # end of process_inputs
+
+    def supports_update(
+            self):
+        """supports_update
+
+        return ``True`` if the derived indicator implements
+        ``update`` for incremental processing
+        """
+        return type(self).update is not BaseIndicator.update
+    # end of supports_update
+
+    def get_state(
+            self,
+            ticker):
+        """get_state
+
+        get the rolling state dictionary for a ticker
+
+        :param ticker: string - ticker
+        """
+        if ticker not in self.state:
+            self.state[ticker] = {}
+        return self.state[ticker]
+    # end of get_state
+
+    def reset_state(
+            self,
+            ticker=None):
+        """reset_state
+
+        drop the rolling state before a full recomputation
+
+        :param ticker: optional - string ticker (default
+            is to reset all tickers)
+        """
+        if ticker:
+            self.state.pop(
+                ticker,
+                None)
+        else:
+            self.state = {}
+    # end of reset_state
+
+    def update(
+            self,
+            algo_id,
+            ticker,
+            new_rows,
+            dataset):
+        """update
+
+        Derive this method to update the indicator incrementally.
+        ``new_rows`` only holds the rows of the indicator's
+        ``uses_data`` dataset that were not in the previous node.
+        After a ``reset_state`` call (first node, a gap in the
+        dates or a new backtest) ``new_rows`` is the full
+        ``pd.DataFrame``.
+
+        :param algo_id: string - algo identifier label for debugging
+            datasets during specific dates
+        :param ticker: string - ticker
+        :param new_rows: ``pd.DataFrame`` with the new rows
+        :param dataset: dataset node dictionary (same as ``process``)
+        """
+        log.info(
+            '{} update - rows={}'.format(
+                self.name,
+                len(new_rows.index)))
+    # end of update
+
     def process(
             self,
             algo_id,
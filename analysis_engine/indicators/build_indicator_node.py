@@ -6,6 +6,7 @@ import uuid
 import copy
 import analysis_engine.consts as ae_consts
 import analysis_engine.utils as ae_utils
+import analysis_engine.indicators.builtin_indicators as builtin_indicators
 import spylunking.log.setup_logging as log_utils
 
 log = log_utils.build_colorized_logger(name=__name__)
@@ -96,10 +97,14 @@ def build_indicator_node(
     use_module_name = None
     use_path_to_module = None
 
-    # none will use the BaseIndicator which does nothing
+    # none will use a built-in indicator for supported
+    # names (like ``rsi``) or the BaseIndicator which does nothing
+    default_path_to_module = ae_consts.INDICATOR_BASE_MODULE_PATH
+    if builtin_indicators.get_builtin_indicator_class(name=name):
+        default_path_to_module = ae_consts.INDICATOR_BUILTIN_MODULE_PATH
     use_path_to_module = node.get(
         'module_path',
-        ae_consts.INDICATOR_BASE_MODULE_PATH)
+        default_path_to_module)
     if not use_path_to_module:
         raise Exception(
             'Failed building Indicator node with missing '
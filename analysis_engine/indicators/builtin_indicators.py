@@ -0,0 +1,1157 @@
+"""
+Built-in Indicators
+===================
+
+Vectorized technical indicators derived from
+``analysis_engine.indicators.base_indicator.BaseIndicator``.
+Each indicator is computed over the whole ``uses_data`` dataset
+with ``numpy`` array operations (the recursive averages use
+the ``pandas`` ``ewm`` implementation) or with
+`TA-Lib <https://mrjbq7.github.io/ta-lib/>`__ when the ``talib``
+module is installed (see ``tools/linux-install-talib.sh``).
+
+Supported indicators (use the ``name`` in the algorithm config
+``indicators`` list without a ``module_path``):
+
+- ``sma`` - Simple Moving Average
+- ``ema`` - Exponential Moving Average
+- ``rsi`` - Relative Strength Index
+- ``macd`` - Moving Average Convergence/Divergence
+- ``willr`` - Williams' %R
+- ``atr`` - Average True Range
+- ``bbands`` or ``bollinger`` - Bollinger Bands
+- ``obv`` - On Balance Volume
+
+.. code-block:: python
+
+    {
+        "name": "rsi",
+        "category": "technical",
+        "type": "momentum",
+        "uses_data": "daily",
+        "num_points": 14
+    }
+
+Supported config keys:
+
+- ``num_points`` - time period (default depends on the indicator)
+- ``fast_points``, ``slow_points`` and ``signal_points`` -
+  ``macd`` time periods (defaults are ``12``, ``26`` and ``9``)
+- ``num_std`` - ``bbands`` number of standard deviations
+  (default is ``2.0``)
+- ``use_talib`` - set to ``false`` to use the ``numpy``
+  implementation even if ``talib`` is installed
+
+Each indicator declares the input series it needs in
+``get_inputs`` (keys from ``build_input_key`` like
+``('daily', 'close', 'sma', 20)``). The ``IndicatorProcessor``
+computes each distinct input series once per dataset node and
+shares it between the indicators (for example an ``sma`` and
+a ``bbands`` with the same ``num_points`` use the same moving
+average). The shared ``sma`` and ``ema`` series use ``talib``
+when it is installed.
+
+After ``process`` the full output arrays are in
+``self.get_state(ticker)['series']`` and the latest values are
+in ``self.get_values(ticker)``.
+
+The ``numpy`` implementations use the same warm-up as TA-Lib
+(``NaN`` until there are enough rows and averages seeded with
+a simple mean), so the values match TA-Lib except for the first
+``macd`` values where TA-Lib aligns the fast and slow averages
+differently.
+
+**Supported environment variables**
+
+::
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import numpy as np
+import pandas as pd
+import analysis_engine.consts as ae_consts
+import analysis_engine.indicators.base_indicator as base_indicator
+import spylunking.log.setup_logging as log_utils
+
+try:
+    import talib
+except ImportError:
+    talib = None
+
+log = log_utils.build_colorized_logger(name=__name__)
+
+
+def is_talib_supported():
+    """is_talib_supported
+
+    return ``True`` if the ``talib`` module is installed
+    """
+    return talib is not None
+# end of is_talib_supported
+
+
+def get_float_array(
+        values):
+    """get_float_array
+
+    convert a ``pd.Series``, list or array to a contiguous
+    ``float64`` array (TA-Lib requires ``float64``)
+
+    :param values: input values
+    """
+    if hasattr(values, 'values'):
+        values = values.values
+    return np.ascontiguousarray(
+        values,
+        dtype=np.float64)
+# end of get_float_array
+
+
+def get_windows(
+        values,
+        num_points):
+    """get_windows
+
+    get a read-only ``(len(values) - num_points + 1, num_points)``
+    view of all the rolling windows without copying
+
+    :param values: contiguous ``float64`` array
+    :param num_points: window size
+    """
+    num_windows = len(values) - num_points + 1
+    stride = values.strides[0]
+    windows = np.lib.stride_tricks.as_strided(
+        values,
+        shape=(num_windows, num_points),
+        strides=(stride, stride))
+    windows.flags.writeable = False
+    return windows
+# end of get_windows
+
+
+def get_seeded_ewm(
+        values,
+        num_points,
+        alpha):
+    """get_seeded_ewm
+
+    exponential moving average seeded with the mean of the
+    first ``num_points`` values (the TA-Lib ``EMA`` and Wilder
+    smoothing warm-up)
+
+    :param values: ``float64`` array
+    :param num_points: time period
+    :param alpha: smoothing factor
+    """
+    out = np.full(len(values), np.nan)
+    if num_points < 1 or len(values) < num_points:
+        return out
+    seeded = values[num_points - 1:].copy()
+    seeded[0] = values[:num_points].mean()
+    out[num_points - 1:] = pd.Series(seeded).ewm(
+        alpha=alpha,
+        adjust=False).mean().values
+    return out
+# end of get_seeded_ewm
+
+
+def compute_rolling(
+        values,
+        num_points,
+        func):
+    """compute_rolling
+
+    apply a ``numpy`` reduction (like ``np.max``) to each rolling
+    window with ``NaN`` for the first ``num_points - 1`` rows
+
+    :param values: input values
+    :param num_points: window size
+    :param func: reduction that supports ``axis=1``
+    """
+    values = get_float_array(values)
+    out = np.full(len(values), np.nan)
+    if num_points < 1 or len(values) < num_points:
+        return out
+    out[num_points - 1:] = func(
+        get_windows(values, num_points),
+        axis=1)
+    return out
+# end of compute_rolling
+
+
+def compute_rolling_max(
+        values,
+        num_points):
+    """compute_rolling_max
+
+    :param values: input values
+    :param num_points: window size
+    """
+    return compute_rolling(
+        values=values,
+        num_points=num_points,
+        func=np.max)
+# end of compute_rolling_max
+
+
+def compute_rolling_min(
+        values,
+        num_points):
+    """compute_rolling_min
+
+    :param values: input values
+    :param num_points: window size
+    """
+    return compute_rolling(
+        values=values,
+        num_points=num_points,
+        func=np.min)
+# end of compute_rolling_min
+
+
+def compute_rolling_std(
+        values,
+        num_points):
+    """compute_rolling_std
+
+    population standard deviation of each rolling window
+
+    :param values: input values
+    :param num_points: window size
+    """
+    return compute_rolling(
+        values=values,
+        num_points=num_points,
+        func=np.std)
+# end of compute_rolling_std
+
+
+def get_willr_from_range(
+        highest,
+        lowest,
+        close):
+    """get_willr_from_range
+
+    Williams' %R from the rolling highest highs and lowest lows
+
+    :param highest: rolling max of the highs
+    :param lowest: rolling min of the lows
+    :param close: close prices
+    """
+    price_range = highest - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = np.where(
+            price_range != 0,
+            -100.0 * (highest - close) / price_range,
+            0.0)
+    out[np.isnan(price_range)] = np.nan
+    return out
+# end of get_willr_from_range
+
+
+def compute_sma(
+        close,
+        num_points=30,
+        use_talib=True):
+    """compute_sma
+
+    Simple Moving Average
+
+    :param close: close prices
+    :param num_points: time period
+    :param use_talib: use ``talib.SMA`` if installed
+    """
+    close = get_float_array(close)
+    if use_talib and talib:
+        return talib.SMA(close, timeperiod=num_points)
+    out = np.full(len(close), np.nan)
+    if len(close) < num_points:
+        return out
+    cumsum = np.concatenate(([0.0], np.cumsum(close)))
+    out[num_points - 1:] = (
+        cumsum[num_points:] - cumsum[:-num_points]) / num_points
+    return out
+# end of compute_sma
+
+
+def compute_ema(
+        close,
+        num_points=30,
+        use_talib=True):
+    """compute_ema
+
+    Exponential Moving Average
+
+    :param close: close prices
+    :param num_points: time period
+    :param use_talib: use ``talib.EMA`` if installed
+    """
+    close = get_float_array(close)
+    if use_talib and talib:
+        return talib.EMA(close, timeperiod=num_points)
+    return get_seeded_ewm(
+        values=close,
+        num_points=num_points,
+        alpha=2.0 / (num_points + 1.0))
+# end of compute_ema
+
+
+def compute_rsi(
+        close,
+        num_points=14,
+        use_talib=True):
+    """compute_rsi
+
+    Relative Strength Index with Wilder smoothing
+
+    :param close: close prices
+    :param num_points: time period
+    :param use_talib: use ``talib.RSI`` if installed
+    """
+    close = get_float_array(close)
+    if use_talib and talib:
+        return talib.RSI(close, timeperiod=num_points)
+    out = np.full(len(close), np.nan)
+    if len(close) <= num_points:
+        return out
+    diffs = np.diff(close)
+    avg_gain = get_seeded_ewm(
+        values=np.where(diffs > 0, diffs, 0.0),
+        num_points=num_points,
+        alpha=1.0 / num_points)
+    avg_loss = get_seeded_ewm(
+        values=np.where(diffs < 0, -diffs, 0.0),
+        num_points=num_points,
+        alpha=1.0 / num_points)
+    total = avg_gain + avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[1:] = np.where(
+            total > 0,
+            100.0 * avg_gain / total,
+            0.0)
+    out[:num_points] = np.nan
+    return out
+# end of compute_rsi
+
+
+def compute_macd(
+        close,
+        fast_points=12,
+        slow_points=26,
+        signal_points=9,
+        use_talib=True):
+    """compute_macd
+
+    Moving Average Convergence/Divergence
+
+    returns a tuple of ``(macd, signal, hist)`` arrays
+
+    :param close: close prices
+    :param fast_points: fast time period
+    :param slow_points: slow time period
+    :param signal_points: signal time period
+    :param use_talib: use ``talib.MACD`` if installed
+    """
+    close = get_float_array(close)
+    if use_talib and talib:
+        return talib.MACD(
+            close,
+            fastperiod=fast_points,
+            slowperiod=slow_points,
+            signalperiod=signal_points)
+    macd = compute_ema(
+        close,
+        num_points=fast_points,
+        use_talib=False) - compute_ema(
+            close,
+            num_points=slow_points,
+            use_talib=False)
+    start_idx = max(fast_points, slow_points) - 1
+    signal = np.full(len(close), np.nan)
+    if len(close) > start_idx:
+        signal[start_idx:] = get_seeded_ewm(
+            values=macd[start_idx:],
+            num_points=signal_points,
+            alpha=2.0 / (signal_points + 1.0))
+    return macd, signal, macd - signal
+# end of compute_macd
+
+
+def compute_willr(
+        high,
+        low,
+        close,
+        num_points=14,
+        use_talib=True):
+    """compute_willr
+
+    Williams' %R
+
+    :param high: high prices
+    :param low: low prices
+    :param close: close prices
+    :param num_points: time period
+    :param use_talib: use ``talib.WILLR`` if installed
+    """
+    high = get_float_array(high)
+    low = get_float_array(low)
+    close = get_float_array(close)
+    if use_talib and talib:
+        return talib.WILLR(high, low, close, timeperiod=num_points)
+    return get_willr_from_range(
+        highest=compute_rolling_max(high, num_points),
+        lowest=compute_rolling_min(low, num_points),
+        close=close)
+# end of compute_willr
+
+
+def compute_atr(
+        high,
+        low,
+        close,
+        num_points=14,
+        use_talib=True):
+    """compute_atr
+
+    Average True Range with Wilder smoothing
+
+    :param high: high prices
+    :param low: low prices
+    :param close: close prices
+    :param num_points: time period
+    :param use_talib: use ``talib.ATR`` if installed
+    """
+    high = get_float_array(high)
+    low = get_float_array(low)
+    close = get_float_array(close)
+    if use_talib and talib:
+        return talib.ATR(high, low, close, timeperiod=num_points)
+    out = np.full(len(close), np.nan)
+    if len(close) <= num_points:
+        return out
+    prev_close = close[:-1]
+    true_range = np.maximum(
+        high[1:] - low[1:],
+        np.maximum(
+            np.abs(high[1:] - prev_close),
+            np.abs(low[1:] - prev_close)))
+    out[1:] = get_seeded_ewm(
+        values=true_range,
+        num_points=num_points,
+        alpha=1.0 / num_points)
+    return out
+# end of compute_atr
+
+
+def compute_bbands(
+        close,
+        num_points=20,
+        num_std=2.0,
+        use_talib=True):
+    """compute_bbands
+
+    Bollinger Bands using a simple moving average and the
+    population standard deviation
+
+    returns a tuple of ``(upper, middle, lower)`` arrays
+
+    :param close: close prices
+    :param num_points: time period
+    :param num_std: number of standard deviations
+    :param use_talib: use ``talib.BBANDS`` if installed
+    """
+    close = get_float_array(close)
+    if use_talib and talib:
+        return talib.BBANDS(
+            close,
+            timeperiod=num_points,
+            nbdevup=num_std,
+            nbdevdn=num_std,
+            matype=0)
+    middle = compute_sma(
+        close,
+        num_points=num_points,
+        use_talib=False)
+    dev = num_std * compute_rolling_std(
+        close,
+        num_points)
+    return middle + dev, middle, middle - dev
+# end of compute_bbands
+
+
+def compute_obv(
+        close,
+        volume,
+        use_talib=True):
+    """compute_obv
+
+    On Balance Volume
+
+    :param close: close prices
+    :param volume: volumes
+    :param use_talib: use ``talib.OBV`` if installed
+    """
+    close = get_float_array(close)
+    volume = get_float_array(volume)
+    if use_talib and talib:
+        return talib.OBV(close, volume)
+    out = np.full(len(close), np.nan)
+    if len(close) == 0:
+        return out
+    out[0] = volume[0]
+    out[1:] = volume[0] + np.cumsum(
+        np.sign(np.diff(close)) * volume[1:])
+    return out
+# end of compute_obv
+
+
+def build_input_key(
+        dataset,
+        column,
+        op='column',
+        num_points=None):
+    """build_input_key
+
+    build the key for an input series an indicator declares
+    in ``get_inputs`` (see
+    ``analysis_engine.indicators.indicator_processor``)
+
+    :param dataset: dataset name like ``daily``
+    :param column: column name like ``close``
+    :param op: ``column`` for the column values or a
+        ``SERIES_OPS`` name (``sma``, ``ema``, ``max``, ``min``
+        or ``std``)
+    :param num_points: window size for the ``op``
+    """
+    if op == 'column':
+        num_points = None
+    return (dataset, column, op, num_points)
+# end of build_input_key
+
+
+def get_input_dependencies(
+        key):
+    """get_input_dependencies
+
+    get the input keys an input series is computed from
+
+    :param key: input key from ``build_input_key``
+    """
+    dataset, column, op, num_points = key
+    if op == 'column':
+        return []
+    return [
+        build_input_key(
+            dataset=dataset,
+            column=column)
+    ]
+# end of get_input_dependencies
+
+
+def compute_input(
+        key,
+        dataset,
+        inputs):
+    """compute_input
+
+    compute one input series or ``None`` if the dataset or
+    column is missing
+
+    :param key: input key from ``build_input_key``
+    :param dataset: dataset node dictionary
+    :param inputs: dictionary of already computed input
+        series that holds the dependencies of ``key``
+    """
+    ds_name, column, op, num_points = key
+    if op == 'column':
+        df = dataset.get(
+            'data',
+            {}).get(
+                ds_name,
+                None)
+        if not hasattr(df, 'index') or column not in df:
+            return None
+        return get_float_array(df[column])
+    values = None
+    for dep_key in get_input_dependencies(key):
+        values = inputs.get(
+            dep_key,
+            None)
+    if values is None:
+        return None
+    return SERIES_OPS[op](values, num_points)
+# end of compute_input
+
+
+def compute_inputs(
+        keys,
+        dataset,
+        inputs=None):
+    """compute_inputs
+
+    compute the input series for ``keys`` and their dependencies
+    skipping series that are already in ``inputs``
+
+    :param keys: list of input keys
+    :param dataset: dataset node dictionary
+    :param inputs: optional - dictionary of computed input series
+        (updated in place)
+    """
+    if inputs is None:
+        inputs = {}
+    for key in keys:
+        if key in inputs:
+            continue
+        compute_inputs(
+            keys=get_input_dependencies(key),
+            dataset=dataset,
+            inputs=inputs)
+        inputs[key] = compute_input(
+            key=key,
+            dataset=dataset,
+            inputs=inputs)
+    return inputs
+# end of compute_inputs
+
+
+class BuiltinIndicator(base_indicator.BaseIndicator):
+    """BuiltinIndicator
+
+    Base class for the built-in indicators. Derived classes
+    implement ``get_inputs`` and ``compute``.
+    """
+
+    def __init__(
+            self,
+            **kwargs):
+        """__init__
+
+        :param kwargs: keyword arguments for
+            ``analysis_engine.indicators.base_indicator.BaseIndicator``
+        """
+        super().__init__(**kwargs)
+        self.use_talib = (
+            self.config.get('use_talib', True) and
+            is_talib_supported())
+        uses_data = ae_consts.get_indicator_uses_data_as_int(
+            val=self.config.get(
+                'uses_data',
+                'daily'))
+        self.dataset_name = ae_consts.INDICATOR_USES_DATA_DATASETS.get(
+            uses_data,
+            ['daily'])[0]
+    # end of __init__
+
+    def get_num_points(
+            self,
+            default_value):
+        """get_num_points
+
+        :param default_value: time period if the
+            config does not set ``num_points``
+        """
+        return int(self.config.get(
+            'num_points',
+            default_value))
+    # end of get_num_points
+
+    def get_key(
+            self,
+            column,
+            op='column',
+            num_points=None):
+        """get_key
+
+        build an input key for this indicator's dataset
+
+        :param column: column name
+        :param op: series operation (default is the column values)
+        :param num_points: window size for the ``op``
+        """
+        return build_input_key(
+            dataset=self.dataset_name,
+            column=column,
+            op=op,
+            num_points=num_points)
+    # end of get_key
+
+    def compute(
+            self,
+            inputs):
+        """compute
+
+        return a dictionary of output names to ``numpy`` arrays
+        with one value per row in the dataset
+
+        :param inputs: dictionary of input series for the
+            keys from ``get_inputs``
+        """
+        raise NotImplementedError(
+            '{} - please implement compute'.format(
+                self.__class__.__name__))
+    # end of compute
+
+    def get_values(
+            self,
+            ticker):
+        """get_values
+
+        get the latest output values from the last ``process`` call
+
+        :param ticker: string - ticker
+        """
+        return self.get_state(
+            ticker=ticker).get(
+                'values',
+                {})
+    # end of get_values
+
+    def process(
+            self,
+            algo_id,
+            ticker,
+            dataset):
+        """process
+
+        compute the input series and the indicator over the full
+        ``uses_data`` dataset
+
+        :param algo_id: string - algo identifier label for debugging
+            datasets during specific dates
+        :param ticker: string - ticker
+        :param dataset: dataset node dictionary
+        """
+        self.process_inputs(
+            algo_id=algo_id,
+            ticker=ticker,
+            dataset=dataset,
+            inputs=compute_inputs(
+                keys=self.get_inputs(),
+                dataset=dataset))
+    # end of process
+
+    def process_inputs(
+            self,
+            algo_id,
+            ticker,
+            dataset,
+            inputs):
+        """process_inputs
+
+        compute the indicator from the shared input series
+
+        :param algo_id: string - algo identifier label for debugging
+            datasets during specific dates
+        :param ticker: string - ticker
+        :param dataset: dataset node dictionary
+        :param inputs: dictionary of input series that holds the
+            keys from ``get_inputs``
+        """
+        num_rows = None
+        for key in self.get_inputs():
+            values = inputs.get(
+                key,
+                None)
+            if values is None:
+                log.debug(
+                    '{} process ticker={} - missing input={}'.format(
+                        self.name,
+                        ticker,
+                        key))
+                return
+            num_rows = len(values)
+        # end of checking the inputs
+
+        if not num_rows:
+            log.debug(
+                '{} process ticker={} - no {} rows'.format(
+                    self.name,
+                    ticker,
+                    self.dataset_name))
+            return
+
+        series = self.compute(
+            inputs=inputs)
+        state = self.get_state(
+            ticker=ticker)
+        state['series'] = series
+        state['values'] = {
+            key: float(series[key][-1])
+            for key in series
+        }
+        if self.verbose:
+            log.info(
+                '{} process ticker={} rows={} values={}'.format(
+                    self.name,
+                    ticker,
+                    num_rows,
+                    state['values']))
+    # end of process_inputs
+
+# end of BuiltinIndicator
+
+
+class SMAIndicator(BuiltinIndicator):
+    """SMAIndicator"""
+
+    def get_inputs(
+            self):
+        """get_inputs"""
+        return [
+            self.get_key('close', 'sma', self.get_num_points(30))
+        ]
+    # end of get_inputs
+
+    def compute(
+            self,
+            inputs):
+        """compute
+
+        :param inputs: dictionary of input series
+        """
+        return {
+            'sma': inputs[self.get_inputs()[0]]
+        }
+    # end of compute
+
+# end of SMAIndicator
+
+
+class EMAIndicator(BuiltinIndicator):
+    """EMAIndicator"""
+
+    def get_inputs(
+            self):
+        """get_inputs"""
+        return [
+            self.get_key('close', 'ema', self.get_num_points(30))
+        ]
+    # end of get_inputs
+
+    def compute(
+            self,
+            inputs):
+        """compute
+
+        :param inputs: dictionary of input series
+        """
+        return {
+            'ema': inputs[self.get_inputs()[0]]
+        }
+    # end of compute
+
+# end of EMAIndicator
+
+
+class RSIIndicator(BuiltinIndicator):
+    """RSIIndicator"""
+
+    def get_inputs(
+            self):
+        """get_inputs"""
+        return [
+            self.get_key('close')
+        ]
+    # end of get_inputs
+
+    def compute(
+            self,
+            inputs):
+        """compute
+
+        :param inputs: dictionary of input series
+        """
+        return {
+            'rsi': compute_rsi(
+                inputs[self.get_key('close')],
+                num_points=self.get_num_points(14),
+                use_talib=self.use_talib)
+        }
+    # end of compute
+
+# end of RSIIndicator
+
+
+class MACDIndicator(BuiltinIndicator):
+    """MACDIndicator
+
+    Without ``talib`` the fast and slow averages are shared
+    ``ema`` input series
+    """
+
+    def get_points(
+            self):
+        """get_points
+
+        return the fast, slow and signal time periods
+        """
+        return (
+            int(self.config.get('fast_points', 12)),
+            int(self.config.get('slow_points', 26)),
+            int(self.config.get('signal_points', 9)))
+    # end of get_points
+
+    def get_inputs(
+            self):
+        """get_inputs"""
+        if self.use_talib:
+            return [
+                self.get_key('close')
+            ]
+        fast_points, slow_points, signal_points = self.get_points()
+        return [
+            self.get_key('close', 'ema', fast_points),
+            self.get_key('close', 'ema', slow_points)
+        ]
+    # end of get_inputs
+
+    def compute(
+            self,
+            inputs):
+        """compute
+
+        :param inputs: dictionary of input series
+        """
+        fast_points, slow_points, signal_points = self.get_points()
+        if self.use_talib:
+            macd, signal, hist = compute_macd(
+                inputs[self.get_key('close')],
+                fast_points=fast_points,
+                slow_points=slow_points,
+                signal_points=signal_points,
+                use_talib=True)
+        else:
+            fast_key, slow_key = self.get_inputs()
+            macd = inputs[fast_key] - inputs[slow_key]
+            start_idx = max(fast_points, slow_points) - 1
+            signal = np.full(len(macd), np.nan)
+            if len(macd) > start_idx:
+                signal[start_idx:] = get_seeded_ewm(
+                    values=macd[start_idx:],
+                    num_points=signal_points,
+                    alpha=2.0 / (signal_points + 1.0))
+            hist = macd - signal
+        return {
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_hist': hist
+        }
+    # end of compute
+
+# end of MACDIndicator
+
+
+class WILLRIndicator(BuiltinIndicator):
+    """WILLRIndicator
+
+    The rolling highs and lows are shared input series
+    """
+
+    def get_inputs(
+            self):
+        """get_inputs"""
+        num_points = self.get_num_points(14)
+        return [
+            self.get_key('high', 'max', num_points),
+            self.get_key('low', 'min', num_points),
+            self.get_key('close')
+        ]
+    # end of get_inputs
+
+    def compute(
+            self,
+            inputs):
+        """compute
+
+        :param inputs: dictionary of input series
+        """
+        high_key, low_key, close_key = self.get_inputs()
+        return {
+            'willr': get_willr_from_range(
+                highest=inputs[high_key],
+                lowest=inputs[low_key],
+                close=inputs[close_key])
+        }
+    # end of compute
+
+# end of WILLRIndicator
+
+
+class ATRIndicator(BuiltinIndicator):
+    """ATRIndicator"""
+
+    def get_inputs(
+            self):
+        """get_inputs"""
+        return [
+            self.get_key('high'),
+            self.get_key('low'),
+            self.get_key('close')
+        ]
+    # end of get_inputs
+
+    def compute(
+            self,
+            inputs):
+        """compute
+
+        :param inputs: dictionary of input series
+        """
+        high_key, low_key, close_key = self.get_inputs()
+        return {
+            'atr': compute_atr(
+                inputs[high_key],
+                inputs[low_key],
+                inputs[close_key],
+                num_points=self.get_num_points(14),
+                use_talib=self.use_talib)
+        }
+    # end of compute
+
+# end of ATRIndicator
+
+
+class BBandsIndicator(BuiltinIndicator):
+    """BBandsIndicator
+
+    The moving average and standard deviation are shared
+    input series
+    """
+
+    def get_inputs(
+            self):
+        """get_inputs"""
+        num_points = self.get_num_points(20)
+        return [
+            self.get_key('close', 'sma', num_points),
+            self.get_key('close', 'std', num_points)
+        ]
+    # end of get_inputs
+
+    def compute(
+            self,
+            inputs):
+        """compute
+
+        :param inputs: dictionary of input series
+        """
+        sma_key, std_key = self.get_inputs()
+        middle = inputs[sma_key]
+        dev = float(self.config.get('num_std', 2.0)) * inputs[std_key]
+        return {
+            'bb_upper': middle + dev,
+            'bb_middle': middle,
+            'bb_lower': middle - dev
+        }
+    # end of compute
+
+# end of BBandsIndicator
+
+
+class OBVIndicator(BuiltinIndicator):
+    """OBVIndicator"""
+
+    def get_inputs(
+            self):
+        """get_inputs"""
+        return [
+            self.get_key('close'),
+            self.get_key('volume')
+        ]
+    # end of get_inputs
+
+    def compute(
+            self,
+            inputs):
+        """compute
+
+        :param inputs: dictionary of input series
+        """
+        close_key, volume_key = self.get_inputs()
+        return {
+            'obv': compute_obv(
+                inputs[close_key],
+                inputs[volume_key],
+                use_talib=self.use_talib)
+        }
+    # end of compute
+
+# end of OBVIndicator
+
+
+SERIES_OPS = {
+    'sma': compute_sma,
+    'ema': compute_ema,
+    'max': compute_rolling_max,
+    'min': compute_rolling_min,
+    'std': compute_rolling_std
+}
+
+BUILTIN_INDICATORS = {
+    'sma': SMAIndicator,
+    'ema': EMAIndicator,
+    'rsi': RSIIndicator,
+    'macd': MACDIndicator,
+    'willr': WILLRIndicator,
+    'atr': ATRIndicator,
+    'bbands': BBandsIndicator,
+    'bollinger': BBandsIndicator,
+    'obv': OBVIndicator
+}
+
+
+def get_builtin_indicator_class(
+        name):
+    """get_builtin_indicator_class
+
+    get the built-in indicator class for a config ``name``
+    or ``None`` if it is not a built-in indicator
+
+    :param name: indicator name like ``rsi``
+    """
+    if not name:
+        return None
+    return BUILTIN_INDICATORS.get(
+        str(name).lower(),
+        None)
+# end of get_builtin_indicator_class
+
+
+def build_builtin_indicator(
+        ind_dict,
+        log_label=None):
+    """build_builtin_indicator
+
+    create a built-in indicator from an algorithm config
+    ``indicators`` dictionary
+
+    :param ind_dict: indicator dictionary with a supported ``name``
+    :param log_label: optional - log tracking label
+        (default is the ``name``)
+    """
+    name = ind_dict.get(
+        'name',
+        None)
+    ind_class = get_builtin_indicator_class(
+        name=name)
+    if not ind_class:
+        raise Exception(
+            'unsupported built-in indicator name={} supported={}'.format(
+                name,
+                sorted(BUILTIN_INDICATORS)))
+    log.info(
+        'load - built-in indicator={} class={} talib={}'.format(
+            log_label or name,
+            ind_class.__name__,
+            is_talib_supported()))
+    return ind_class(
+        config_dict=ind_dict,
+        name=log_label or name,
+        path_to_module=ae_consts.INDICATOR_BUILTIN_MODULE_PATH)
+# end of build_builtin_indicator
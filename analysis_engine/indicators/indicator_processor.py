@@ -1,10 +1,52 @@
 """
 Indicator Processor
+
+Indicators that implement ``update`` (see
+``analysis_engine.indicators.base_indicator.BaseIndicator.update``)
+are processed incrementally: the processor tracks the last row it
+passed to each indicator for each ticker and only passes the rows
+that are new in the next node. If the last row is not found in
+the next node (first node, a gap in the dates or a new backtest)
+the indicator's state is reset and it gets the full dataset.
+Indicators that only implement ``process`` get the full dataset
+node on every call.
+
+Indicators can declare the input series they use with
+``get_inputs`` (like the built-in indicators in
+``analysis_engine.indicators.builtin_indicators``). The processor
+builds a dependency graph of all the declared inputs (dataset,
+column, operation and window), computes each distinct input
+series once per dataset node and passes the shared series to
+each indicator's ``process_inputs``. With more than one worker
+the input series on the same graph level and the indicators
+run concurrently on a thread pool. The pool is created on the
+first ``process`` call and reused for every dataset node until
+``close()`` (``BaseAlgo`` closes it at the end of each run).
+``get_timings()`` returns the number of calls and seconds spent
+in each indicator.
+
+**Supported environment variables**
+
+::
+
+    # number of threads for computing the input series
+    # and running the indicators (0 or 1 is serial)
+    export INDICATOR_WORKERS=0
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
 """
 
 import os
 import json
+import time
+import logging
+import concurrent.futures
 import analysis_engine.consts as ae_consts
+import analysis_engine.indicators.builtin_indicators as builtin_indicators
 import analysis_engine.indicators.build_indicator_node as build_indicator
 import analysis_engine.indicators.load_indicator_from_module as load_indicator
 import spylunking.log.setup_logging as log_utils
@@ -12,6 +54,11 @@ import spylunking.log.setup_logging as log_utils
 log = log_utils.build_colorized_logger(name=__name__)
 
 
+INDICATOR_WORKERS = int(ae_consts.ev(
+    'INDICATOR_WORKERS',
+    '0'))
+
+
 class IndicatorProcessor:
     """IndicatorProcessor"""
 
@@ -21,7 +68,9 @@ class IndicatorProcessor:
             config_file=None,
             ticker=None,
             label=None,
-            verbose=False):
+            verbose=False,
+            workers=None,
+            quiet=False):
         """__init__
 
         Algorithm's use the ``IndicatorProcessor`` to drive
@@ -55,6 +104,14 @@ class IndicatorProcessor:
             when running distributed)
         :param verbose: optional - bool for logging
             more
+        :param workers: optional - number of threads for
+            computing the input series and running the indicators
+            (default is ``INDICATOR_WORKERS`` which is ``0``
+            for serial processing)
+        :param quiet: optional - bool for skipping the
+            per-indicator start logs on every dataset node
+            unless the logger is set to ``DEBUG``
+            (default is ``False``)
         """
 
         self.config_dict = config_dict
@@ -84,9 +141,19 @@ class IndicatorProcessor:
             self.label = 'idprc'
 
         self.verbose = verbose
+        self.quiet = quiet
+        self.update_state = {}
+        self.workers = workers
+        if self.workers is None:
+            self.workers = INDICATOR_WORKERS
+        self.executor = None
+        self.input_levels = []
+        self.ind_inputs = {}
+        self.timings = {}
 
         self.build_indicators_for_config(
             config_dict=self.config_dict)
+        self.build_input_graph()
     # end of __init__
 
     def get_num_indicators(
@@ -107,6 +174,348 @@ class IndicatorProcessor:
         return self.ind_dict
     # end of get_indicators
 
+    def get_uses_datasets(
+            self):
+        """get_uses_datasets
+
+        Get the set of algorithm-ready dataset names the
+        indicators use from their ``uses_data`` values
+        """
+        datasets = set()
+        for ind_id in self.ind_dict:
+            uses_data = self.ind_dict[ind_id].get(
+                'report',
+                {}).get(
+                    'metrics',
+                    {}).get(
+                        'uses_data',
+                        ae_consts.INDICATOR_USES_DAILY_DATA)
+            datasets.update(
+                ae_consts.INDICATOR_USES_DATA_DATASETS.get(
+                    uses_data,
+                    ae_consts.DEFAULT_SERIALIZED_DATASETS))
+        return datasets
+    # end of get_uses_datasets
+
+    def get_update_dataset(
+            self,
+            ind_node):
+        """get_update_dataset
+
+        get the dataset name an incremental indicator
+        is updated with or ``None`` if the indicator does not
+        support ``update`` or uses more than one dataset
+
+        :param ind_node: indicator node from ``self.ind_dict``
+        """
+        if not ind_node['obj'].supports_update():
+            return None
+        uses_data = ind_node['report']['metrics'].get(
+            'uses_data',
+            ae_consts.INDICATOR_USES_DAILY_DATA)
+        datasets = ae_consts.INDICATOR_USES_DATA_DATASETS.get(
+            uses_data,
+            [])
+        if len(datasets) != 1:
+            return None
+        return datasets[0]
+    # end of get_update_dataset
+
+    def get_new_rows(
+            self,
+            ind_id,
+            ticker,
+            df):
+        """get_new_rows
+
+        get the rows in ``df`` after the last row passed to
+        the indicator for this ticker and a bool that is ``True``
+        if the indicator state must be reset because the last row
+        was not found
+
+        Rows are matched on the ``date`` column (or the index
+        if there is no ``date`` column). A dataset that grows by
+        appending rows is checked without searching.
+
+        :param ind_id: indicator key in ``self.ind_dict``
+        :param ticker: string - ticker
+        :param df: ``pd.DataFrame`` for the indicator's dataset
+        """
+        if 'date' in df:
+            keys = df['date'].values
+        else:
+            keys = df.index.values
+        num_rows = len(keys)
+        last_node = self.update_state.get(
+            (ind_id, ticker),
+            None)
+        start_idx = None
+        if last_node:
+            prev_rows = last_node['num_rows']
+            if (0 < prev_rows <= num_rows and
+                    keys[prev_rows - 1] == last_node['key']):
+                start_idx = prev_rows
+            else:
+                found = (keys == last_node['key']).nonzero()[0]
+                if len(found) > 0:
+                    start_idx = int(found[-1]) + 1
+        # end of finding the last row
+
+        needs_reset = start_idx is None
+        if needs_reset:
+            start_idx = 0
+        if num_rows > 0:
+            self.update_state[(ind_id, ticker)] = {
+                'key': keys[-1],
+                'num_rows': num_rows
+            }
+        else:
+            self.update_state.pop(
+                (ind_id, ticker),
+                None)
+        return df.iloc[start_idx:], needs_reset
+    # end of get_new_rows
+
+    def build_input_graph(
+            self):
+        """build_input_graph
+
+        build the dependency graph of the input series the
+        indicators declare with ``get_inputs``. Each distinct
+        input key is stored once in ``self.input_levels`` where
+        level ``0`` holds the dataset columns and a series is on
+        a higher level than all of its dependencies.
+        """
+        levels = {}
+
+        def add_key(
+                key):
+            if key in levels:
+                return levels[key]
+            level = 0
+            for dep_key in builtin_indicators.get_input_dependencies(key):
+                level = max(level, add_key(dep_key) + 1)
+            levels[key] = level
+            while len(self.input_levels) <= level:
+                self.input_levels.append([])
+            self.input_levels[level].append(key)
+            return level
+        # end of add_key
+
+        num_requested = 0
+        self.input_levels = []
+        self.ind_inputs = {}
+        for ind_id in self.ind_dict:
+            keys = self.ind_dict[ind_id]['obj'].get_inputs()
+            self.ind_inputs[ind_id] = keys
+            num_requested += len(keys)
+            for key in keys:
+                add_key(key)
+        # end of for all indicators
+
+        log.info(
+            '{} - input graph indicators={} requested={} '
+            'distinct={} levels={}'.format(
+                self.label,
+                len(self.ind_inputs),
+                num_requested,
+                len(levels),
+                len(self.input_levels)))
+    # end of build_input_graph
+
+    def get_timings(
+            self):
+        """get_timings
+
+        get a dictionary of indicator names to the number of
+        ``calls``, the ``seconds`` of the last call and the
+        ``total_seconds``. The ``inputs`` key holds the time spent
+        computing the shared input series.
+        """
+        return self.timings
+    # end of get_timings
+
+    def record_timing(
+            self,
+            name,
+            seconds):
+        """record_timing
+
+        :param name: indicator name or ``inputs``
+        :param seconds: elapsed seconds
+        """
+        timing = self.timings.get(
+            name,
+            None)
+        if not timing:
+            timing = {
+                'calls': 0,
+                'seconds': 0.0,
+                'total_seconds': 0.0
+            }
+            self.timings[name] = timing
+        timing['calls'] += 1
+        timing['seconds'] = seconds
+        timing['total_seconds'] += seconds
+    # end of record_timing
+
+    def run_jobs(
+            self,
+            executor,
+            func,
+            jobs):
+        """run_jobs
+
+        call ``func(job)`` for each job on the ``executor`` or
+        serially if there is no executor and return the results
+        in the same order as ``jobs``
+
+        :param executor: ``concurrent.futures.ThreadPoolExecutor``
+            or ``None``
+        :param func: function to call
+        :param jobs: list of arguments
+        """
+        if not executor or len(jobs) < 2:
+            return [
+                func(job)
+                for job in jobs
+            ]
+        return list(executor.map(func, jobs))
+    # end of run_jobs
+
+    def compute_inputs(
+            self,
+            executor,
+            dataset):
+        """compute_inputs
+
+        compute each distinct input series once for the node
+        one graph level at a time
+
+        :param executor: ``concurrent.futures.ThreadPoolExecutor``
+            or ``None``
+        :param dataset: dataset node dictionary
+        """
+        inputs = {}
+        for level_keys in self.input_levels:
+
+            def compute_key(
+                    key):
+                return builtin_indicators.compute_input(
+                    key=key,
+                    dataset=dataset,
+                    inputs=inputs)
+            # end of compute_key
+
+            values = self.run_jobs(
+                executor=executor,
+                func=compute_key,
+                jobs=level_keys)
+            inputs.update(zip(level_keys, values))
+        # end of for all graph levels
+        return inputs
+    # end of compute_inputs
+
+    def process_indicator(
+            self,
+            ind_id,
+            algo_id,
+            ticker,
+            dataset,
+            inputs):
+        """process_indicator
+
+        run one indicator with ``update`` for incremental
+        indicators, ``process_inputs`` for indicators that
+        declare input series or ``process`` and return the
+        elapsed seconds
+
+        :param ind_id: indicator key in ``self.ind_dict``
+        :param algo_id: string - algo identifier label
+        :param ticker: string - ticker
+        :param dataset: dataset node dictionary
+        :param inputs: dictionary of shared input series
+        """
+        start_time = time.time()
+        ind_node = self.ind_dict[ind_id]
+        ind_obj = ind_node['obj']
+        update_dataset = self.get_update_dataset(
+            ind_node=ind_node)
+        update_df = None
+        if update_dataset:
+            update_df = dataset.get(
+                'data',
+                {}).get(
+                    update_dataset,
+                    None)
+        if hasattr(update_df, 'iloc'):
+            new_rows, needs_reset = self.get_new_rows(
+                ind_id=ind_id,
+                ticker=ticker,
+                df=update_df)
+            if needs_reset:
+                ind_obj.reset_state(
+                    ticker=ticker)
+            if needs_reset or len(new_rows.index) > 0:
+                ind_obj.update(
+                    algo_id=algo_id,
+                    ticker=ticker,
+                    new_rows=new_rows,
+                    dataset=dataset)
+        elif self.ind_inputs.get(ind_id, None):
+            ind_obj.process_inputs(
+                algo_id=algo_id,
+                ticker=ticker,
+                dataset=dataset,
+                inputs=inputs)
+        else:
+            ind_obj.process(
+                algo_id=algo_id,
+                ticker=ticker,
+                dataset=dataset)
+        return time.time() - start_time
+    # end of process_indicator
+
+    def reset_state(
+            self):
+        """reset_state
+
+        reset the incremental state for all indicators so the
+        next ``process`` call is a full recomputation
+        """
+        self.update_state = {}
+        for ind_id in self.ind_dict:
+            self.ind_dict[ind_id]['obj'].reset_state()
+    # end of reset_state
+
+    def get_executor(
+            self):
+        """get_executor
+
+        get the thread pool for the inputs and indicators
+        (created on first use) or ``None`` for serial runs
+        """
+        if self.workers <= 1 or len(self.ind_dict) <= 1:
+            return None
+        if not self.executor:
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.workers)
+        return self.executor
+    # end of get_executor
+
+    def close(
+            self):
+        """close
+
+        shut down the thread pool (the next ``process``
+        call creates a new one)
+        """
+        if self.executor:
+            self.executor.shutdown(
+                wait=True)
+            self.executor = None
+    # end of close
+
     def build_indicators_for_config(
             self,
             config_dict):
@@ -209,28 +618,52 @@ class IndicatorProcessor:
             ``Yahoo``, ``FinViz`` or other). Here is the supported
             dataset structure for the process method:
         """
-        for idx, ind_id in enumerate(self.ind_dict):
-            ind_node = self.ind_dict[ind_id]
-            ind_obj = ind_node['obj']
-            percent_done = ae_consts.get_percent_done(
-                progress=(idx + 1),
-                total=self.num_indicators)
-            percent_label = 'ticker={} {} {}/{}'.format(
-                self.ticker,
-                percent_done,
-                (idx + 1),
-                self.num_indicators)
-            # this will throw on errors parsing to make
-            log.info(
-                '{} - {} start {}'.format(
-                    self.label,
-                    ind_obj.get_name(),
-                    percent_label))
-            ind_obj.process(
+        ind_ids = list(self.ind_dict)
+        executor = self.get_executor()
+        start_time = time.time()
+        inputs = self.compute_inputs(
+            executor=executor,
+            dataset=dataset)
+        self.record_timing(
+            name='inputs',
+            seconds=time.time() - start_time)
+
+        if not self.quiet or log.isEnabledFor(logging.DEBUG):
+            for idx, ind_id in enumerate(ind_ids):
+                percent_done = ae_consts.get_percent_done(
+                    progress=(idx + 1),
+                    total=self.num_indicators)
+                percent_label = 'ticker={} {} {}/{}'.format(
+                    self.ticker,
+                    percent_done,
+                    (idx + 1),
+                    self.num_indicators)
+                log.info(
+                    '{} - {} start {}'.format(
+                        self.label,
+                        self.ind_dict[ind_id]['obj'].get_name(),
+                        percent_label))
+            # end of for all indicators
+
+        def run_indicator(
+                ind_id):
+            return self.process_indicator(
+                ind_id=ind_id,
                 algo_id=algo_id,
                 ticker=ticker,
-                dataset=dataset)
-        # end of for all indicators
+                dataset=dataset,
+                inputs=inputs)
+        # end of run_indicator
+
+        all_seconds = self.run_jobs(
+            executor=executor,
+            func=run_indicator,
+            jobs=ind_ids)
+
+        for ind_id, seconds in zip(ind_ids, all_seconds):
+            self.record_timing(
+                name=self.ind_dict[ind_id]['obj'].get_name(),
+                seconds=seconds)
     # end of process
 
 # end of IndicatorProcessor
@@ -3,11 +3,10 @@ Helper for loading derived Indicators from a local module file
 """
 
 import os
-import inspect
-import types
-import importlib.machinery
 import analysis_engine.consts as ae_consts
+import analysis_engine.module_cache as module_cache
 import analysis_engine.indicators.base_indicator as base_indicator
+import analysis_engine.indicators.builtin_indicators as builtin_indicators
 import spylunking.log.setup_logging as log_utils
 
 log = log_utils.build_colorized_logger(name=__name__)
@@ -26,9 +25,11 @@ def load_indicator_from_module(
     :param module_name: string name of the indicator module
         use in to load the module
     :param path_to_module: optional - path to custom indicator file
-        (default is to use the
-        ``analysis_engine.indicators.base_indicator.BaseIndicator`` or
-        if set the ``ind_dict['module_path']`` value)
+        (default is to use the ``ind_dict['module_path']`` value,
+        a built-in indicator from
+        ``analysis_engine.indicators.builtin_indicators`` if
+        the ``ind_dict['name']`` is supported or the
+        ``analysis_engine.indicators.base_indicator.BaseIndicator``)
     :param ind_dict: dictionary of keyword arguments
         to pass to the newly created derived Indicator's
         constructor
@@ -51,6 +52,14 @@ def load_indicator_from_module(
             'module_path',
             None)
 
+    is_builtin = builtin_indicators.get_builtin_indicator_class(
+        name=ind_dict.get('name', None))
+    if (path_to_module == ae_consts.INDICATOR_BUILTIN_MODULE_PATH or
+            (not path_to_module and is_builtin)):
+        return builtin_indicators.build_builtin_indicator(
+            ind_dict=ind_dict,
+            log_label=use_log_label)
+
     if not path_to_module:
         return base_indicator.BaseIndicator(
             config_dict=ind_dict,
@@ -71,22 +80,12 @@ def load_indicator_from_module(
     # this allows building multiple indicator objects
     # that use the same filename but in different
     # locations on disk
-    loader = importlib.machinery.SourceFileLoader(
-        module_name,
-        path_to_module)
-    custom_indicator_module = types.ModuleType(
-        loader.name)
-    loader.exec_module(
-        custom_indicator_module)
-
-    found_base_object = False
-    class_member_in_module = None
-    for member in inspect.getmembers(custom_indicator_module):
-        if module_name in str(member):
-            found_base_object = True
-            class_member_in_module = member
-            break
-    # for all members in this custom module file
+    # the module is only executed again if the file changed
+    custom_indicator_module, class_member_in_module = \
+        module_cache.find_member(
+            module_name=module_name,
+            path_to_module=path_to_module)
+    found_base_object = class_member_in_module is not None
 
     if not found_base_object:
         raise Exception(
@@ -24,7 +24,8 @@ def load_algo_dataset_from_file(
         path_to_file,
         serialize_datasets=DEFAULT_SERIALIZED_DATASETS,
         compress=False,
-        encoding='utf-8'):
+        encoding='utf-8',
+        lazy=None):
     """load_algo_dataset_from_file
 
     Load an algorithm-ready dataset for algorithm backtesting
@@ -39,6 +40,10 @@ def load_algo_dataset_from_file(
         (default is ``False`` and algorithms
         use ``zlib`` for compression)
     :param encoding: optional - string for data encoding
+    :param lazy: optional - bool for converting each dataset
+        on first access (see
+        ``analysis_engine.prepare_dict_for_algo.LazyDatasetDict``)
+        (default is ``LAZY_DATASETS`` which is ``False``)
     """
     log.debug('start')
     data_from_file = None
@@ -54,5 +59,7 @@ def load_algo_dataset_from_file(
         data=data_from_file,
         compress=compress,
         convert_to_dict=True,
-        encoding=encoding)
+        encoding=encoding,
+        dataset_names=serialize_datasets,
+        lazy=lazy)
 # end of load_algo_dataset_from_file
@@ -31,7 +31,8 @@ def load_algo_dataset_from_redis(
         redis_serializer='json',
         serialize_datasets=DEFAULT_SERIALIZED_DATASETS,
         compress=False,
-        encoding='utf-8'):
+        encoding='utf-8',
+        lazy=None):
     """load_algo_dataset_from_redis
 
     Load an algorithm-ready dataset for algorithm backtesting
@@ -44,12 +45,16 @@ def load_algo_dataset_from_redis(
         (default is ``False`` and algorithms
         use ``zlib`` for compression)
     :param encoding: optional - string for data encoding
+    :param lazy: optional - bool for converting each dataset
+        on first access (see
+        ``analysis_engine.prepare_dict_for_algo.LazyDatasetDict``)
+        (default is ``LAZY_DATASETS`` which is ``False``)
     """
     log.debug('start')
     data_from_file = None
 
     redis_host = redis_address.split(':')[0]
-    redis_port = int(redis_address.split(':')[0])
+    redis_port = int(redis_address.split(':')[1])
 
     redis_res = redis_utils.get_data_from_redis_key(
         key=redis_key,
@@ -82,5 +87,7 @@ def load_algo_dataset_from_redis(
         data=data_from_file,
         compress=compress,
         convert_to_dict=True,
-        encoding=encoding)
+        encoding=encoding,
+        dataset_names=serialize_datasets,
+        lazy=lazy)
 # end of load_algo_dataset_from_redis
@@ -32,7 +32,8 @@ def load_algo_dataset_from_s3(
         s3_secure,
         serialize_datasets=DEFAULT_SERIALIZED_DATASETS,
         compress=False,
-        encoding='utf-8'):
+        encoding='utf-8',
+        lazy=None):
     """load_algo_dataset_from_s3
 
     Load an algorithm-ready dataset for algorithm backtesting
@@ -45,6 +46,10 @@ def load_algo_dataset_from_s3(
         (default is ``False`` and algorithms
         use ``zlib`` for compression)
     :param encoding: optional - string for data encoding
+    :param lazy: optional - bool for converting each dataset
+        on first access (see
+        ``analysis_engine.prepare_dict_for_algo.LazyDatasetDict``)
+        (default is ``LAZY_DATASETS`` which is ``False``)
 
     **Minio (S3) connectivity arguments**
 
@@ -120,5 +125,7 @@ def load_algo_dataset_from_s3(
         data=data_from_file,
         compress=compress,
         convert_to_dict=False,
-        encoding=encoding)
+        encoding=encoding,
+        dataset_names=serialize_datasets,
+        lazy=lazy)
 # end of load_algo_dataset_from_s3
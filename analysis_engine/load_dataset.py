@@ -20,6 +20,7 @@ import os
 import analysis_engine.load_algo_dataset_from_file as file_utils
 import analysis_engine.load_algo_dataset_from_s3 as s3_utils
 import analysis_engine.load_algo_dataset_from_redis as redis_utils
+import analysis_engine.columnar_dataset as columnar_dataset
 from analysis_engine.consts import DEFAULT_SERIALIZED_DATASETS
 from analysis_engine.consts import SA_DATASET_TYPE_ALGO_READY
 from analysis_engine.consts import get_status
@@ -55,6 +56,10 @@ def load_dataset(
         slack_enabled=False,
         slack_code_block=False,
         slack_full_width=False,
+        lazy=None,
+        tickers=None,
+        start_date=None,
+        end_date=None,
         verbose=False):
     """load_dataset
 
@@ -64,7 +69,8 @@ def load_dataset(
     :param dataset_type: optional - dataset type
         (default is ``SA_DATASET_TYPE_ALGO_READY``)
     :param path_to_file: optional - path to an algorithm-ready dataset
-        in a file
+        in a file or a columnar dataset directory (see
+        ``analysis_engine.columnar_dataset``)
     :param serialize_datasets: optional - list of dataset names to
         deserialize in the dataset
     :param compress: optional - boolean flag for decompressing
@@ -124,6 +130,16 @@ def load_dataset(
 
     Additonal arguments
 
+    :param lazy: optional - bool for converting each dataset
+        on first access (see
+        ``analysis_engine.prepare_dict_for_algo.LazyDatasetDict``)
+        (default is ``LAZY_DATASETS`` which is ``False``)
+    :param tickers: optional - list of tickers to load from a
+        columnar dataset (default is all tickers)
+    :param start_date: optional - first date to load from a
+        columnar dataset
+    :param end_date: optional - last date to load from a
+        columnar dataset
     :param verbose: optional - bool for increasing
         logging
     """
@@ -145,11 +161,20 @@ def load_dataset(
                 not use_ds):
             if not os.path.exists(path_to_file):
                 log.error('missing file: {}'.format(path_to_file))
-            use_ds = file_utils.load_algo_dataset_from_file(
-                path_to_file=path_to_file,
-                compress=compress,
-                encoding=redis_encoding,
-                serialize_datasets=serialize_datasets)
+            if columnar_dataset.is_columnar_dataset(path_to_file):
+                use_ds = columnar_dataset.load_columnar_dataset(
+                    path_to_dir=path_to_file,
+                    serialize_datasets=serialize_datasets,
+                    tickers=tickers,
+                    start_date=start_date,
+                    end_date=end_date)
+            else:
+                use_ds = file_utils.load_algo_dataset_from_file(
+                    path_to_file=path_to_file,
+                    compress=compress,
+                    encoding=redis_encoding,
+                    serialize_datasets=serialize_datasets,
+                    lazy=lazy)
         elif (s3_key and
                 not use_ds):
             use_ds = s3_utils.load_algo_dataset_from_s3(
@@ -162,10 +187,11 @@ def load_dataset(
                 s3_secure=s3_secure,
                 compress=compress,
                 encoding=redis_encoding,
-                serialize_datasets=serialize_datasets)
+                serialize_datasets=serialize_datasets,
+                lazy=lazy)
         elif (redis_key and
                 not use_ds):
-            use_ds = redis_utils.load_algo_dataset_from_s3(
+            use_ds = redis_utils.load_algo_dataset_from_redis(
                 redis_key=redis_key,
                 redis_address=redis_address,
                 redis_db=redis_db,
@@ -174,7 +200,8 @@ def load_dataset(
                 redis_serializer=redis_serializer,
                 compress=compress,
                 encoding=redis_encoding,
-                serialize_datasets=serialize_datasets)
+                serialize_datasets=serialize_datasets,
+                lazy=lazy)
     else:
         supported_type = False
         use_ds = None
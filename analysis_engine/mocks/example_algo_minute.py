@@ -250,7 +250,7 @@ class ExampleMinuteAlgo(BaseAlgo):
             'name': self.name,
             'created': self.created_date,
             'updated': finished_date,
-            'open_positions': self.positions,
+            'open_positions': self.get_positions(),
             'buys': self.get_buys(),
             'sells': self.get_sells(),
             'num_processed': len(self.order_history),
@@ -1,6 +1,11 @@
 """
 Example Williams Percent R Indicator
 
+This example implements ``update`` so the
+``IndicatorProcessor`` only passes the new ``daily`` rows
+on each date. The last ``num_points`` highs and lows are kept
+in the rolling state for each ticker.
+
 **Supported environment variables**
 
 ::
@@ -12,6 +17,7 @@ Example Williams Percent R Indicator
     export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
 """
 
+import collections
 import analysis_engine.indicators.base_indicator as base_indicator
 import spylunking.log.setup_logging as log_utils
 
@@ -92,12 +98,85 @@ class ExampleIndicatorWilliamsR(base_indicator.BaseIndicator):
         """
         real = WILLR(high, low, close, timeperiod=14)
         """
-        print(dataset)
+        df = dataset.get(
+            'data',
+            {}).get(
+                'daily',
+                None)
+        self.reset_state(
+            ticker=ticker)
+        if df is not None:
+            self.update(
+                algo_id=algo_id,
+                ticker=ticker,
+                new_rows=df,
+                dataset=dataset)
         log.info(
             '{} - end'.format(
                 label))
     # end of process
 
+    def update(
+            self,
+            algo_id,
+            ticker,
+            new_rows,
+            dataset):
+        """update
+
+        Update the rolling highs and lows with the new
+        ``daily`` rows and set the latest Williams Percent R value
+        in ``self.get_state(ticker)['willr']``
+
+        :param algo_id: string - algo identifier label for debugging
+            datasets during specific dates
+        :param ticker: string - ticker
+        :param new_rows: ``pd.DataFrame`` with the new ``daily`` rows
+        :param dataset: dataset node dictionary
+        """
+        num_points = int(self.config.get(
+            'num_points',
+            14))
+        state = self.get_state(
+            ticker=ticker)
+        if 'highs' not in state:
+            state['highs'] = collections.deque(
+                maxlen=num_points)
+            state['lows'] = collections.deque(
+                maxlen=num_points)
+            state['willr'] = None
+
+        for col in ['high', 'low', 'close']:
+            if col not in new_rows:
+                log.debug(
+                    '{} update ticker={} - missing column={}'.format(
+                        self.name,
+                        ticker,
+                        col))
+                return
+        # end of checking the columns
+
+        for high, low, close in zip(
+                new_rows['high'].values,
+                new_rows['low'].values,
+                new_rows['close'].values):
+            state['highs'].append(high)
+            state['lows'].append(low)
+            highest = max(state['highs'])
+            lowest = min(state['lows'])
+            if highest != lowest:
+                state['willr'] = (
+                    (highest - close) / (highest - lowest) * -100.0)
+        # end of for all new rows
+
+        log.debug(
+            '{} update ticker={} rows={} willr={}'.format(
+                self.name,
+                ticker,
+                len(new_rows.index),
+                state['willr']))
+    # end of update
+
 # end of ExampleIndicatorWilliamsR
 
 
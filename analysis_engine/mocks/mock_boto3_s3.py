@@ -2,6 +2,7 @@
 Mock boto3 s3 objects
 """
 
+import io
 import os
 import json
 from spylunking.log.setup_logging import build_colorized_logger
@@ -281,6 +282,90 @@ class MockBotoS3:
 # end of MockBotoS3
 
 
+class MockBotoS3ClientError(Exception):
+    """MockBotoS3ClientError
+
+    ``botocore.exceptions.ClientError`` stand-in with
+    the same ``response`` error code structure
+    """
+
+    def __init__(
+            self,
+            code,
+            msg):
+        """__init__
+
+        :param code: S3 error code like ``NoSuchKey``
+        :param msg: error message
+        """
+        super().__init__(msg)
+        self.response = {
+            'Error': {
+                'Code': code,
+                'Message': msg
+            }
+        }
+    # end of __init__
+
+# end of MockBotoS3ClientError
+
+
+class MockBotoS3Client:
+    """MockBotoS3Client
+
+    mock ``boto3.client('s3')`` for reading keys
+    """
+
+    def __init__(
+            self,
+            objects=None):
+        """__init__
+
+        :param objects: dictionary of ``(bucket, key)``
+            to the stored bytes
+        """
+        self.objects = objects if objects else {}
+        self.gets = []  # (bucket, key) for each get_object call
+    # end of __init__
+
+    def put_object(
+            self,
+            Bucket=None,
+            Key=None,
+            Body=None):
+        """put_object
+
+        :param Bucket: bucket name
+        :param Key: new Key name
+        :param Body: new Payload in Key
+        """
+        self.objects[(Bucket, Key)] = Body
+    # end of put_object
+
+    def get_object(
+            self,
+            Bucket=None,
+            Key=None):
+        """get_object
+
+        :param Bucket: bucket name
+        :param Key: key name
+        """
+        self.gets.append((Bucket, Key))
+        if (Bucket, Key) not in self.objects:
+            raise MockBotoS3ClientError(
+                code='NoSuchKey',
+                msg='mock - missing s3={}/{}'.format(
+                    Bucket,
+                    Key))
+        return {
+            'Body': io.BytesIO(self.objects[(Bucket, Key)])
+        }
+    # end of get_object
+
+# end of MockBotoS3Client
+
+
 def build_boto3_resource(
         name='mock_s3',
         endpoint_url=None,
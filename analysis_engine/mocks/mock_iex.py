@@ -1,7 +1,28 @@
 """
-Mocking pyEX data fetch api calls
+Mocking pyEX data fetch api calls and the IEX batch endpoint
+
+``start_mock_iex_server`` runs a local stub server for the
+``/stock/market/batch`` endpoint that
+``analysis_engine.iex.fetch_batch.fetch_batch`` can use with
+``base_url``:
+
+.. code-block:: python
+
+    import analysis_engine.mocks.mock_iex as mock_iex
+    import analysis_engine.iex.fetch_batch as fetch_batch
+    server, base_url = mock_iex.start_mock_iex_server()
+    try:
+        datasets = fetch_batch.fetch_batch(
+            tickers=['SPY', 'AMZN'],
+            base_url=base_url)
+    finally:
+        mock_iex.stop_mock_iex_server(server)
 """
 
+import json
+import threading
+import http.server
+import urllib.parse
 import pandas as pd
 
 
@@ -187,3 +208,177 @@ def companyDF(
         val)
     return df
 # end of companyDF
+
+
+def build_batch_type_data(
+        symbol,
+        batch_type,
+        range_value=None,
+        last=None):
+    """build_batch_type_data
+
+    mock json for one type in an IEX batch response
+
+    :param symbol: ticker symbol
+    :param batch_type: batch type like ``chart`` or ``quote``
+    :param range_value: optional - ``range`` query parameter
+    :param last: optional - ``last`` query parameter
+    """
+    testcase = 'mock-batch-{}'.format(
+        batch_type)
+    if batch_type == 'chart':
+        return [
+            {
+                'date': '2018-11-0{}'.format(idx + 1),
+                'open': 270.0 + idx,
+                'high': 275.0 + idx,
+                'low': 265.0 + idx,
+                'close': 272.0 + idx,
+                'volume': 1000 + idx,
+                'range': range_value,
+                'testcase': testcase
+            }
+            for idx in range(3)
+        ]
+    elif batch_type == 'peers':
+        return [
+            '{}-PEER{}'.format(
+                symbol,
+                idx)
+            for idx in range(2)
+        ]
+    elif batch_type in ['news', 'dividends']:
+        return [
+            {
+                'symbol': symbol,
+                'range': range_value,
+                'last': last,
+                'testcase': testcase
+            }
+        ]
+    elif batch_type in ['financials', 'earnings']:
+        return {
+            'symbol': symbol,
+            batch_type: [
+                {
+                    'testcase': testcase
+                }
+            ]
+        }
+    return {
+        'symbol': symbol,
+        'testcase': testcase
+    }
+# end of build_batch_type_data
+
+
+def build_batch_response(
+        query):
+    """build_batch_response
+
+    mock IEX ``/stock/market/batch`` response for a
+    dictionary of query parameters
+
+    :param query: dictionary with ``symbols``, ``types`` and
+        optional ``range`` and ``last`` values
+    """
+    res = {}
+    for symbol in str(query.get('symbols', '')).split(','):
+        if not symbol:
+            continue
+        res[symbol.upper()] = {
+            batch_type: build_batch_type_data(
+                symbol=symbol.upper(),
+                batch_type=batch_type,
+                range_value=query.get('range', None),
+                last=query.get('last', None))
+            for batch_type in str(query.get('types', '')).split(',')
+            if batch_type
+        }
+    return res
+# end of build_batch_response
+
+
+class MockIEXBatchHandler(http.server.BaseHTTPRequestHandler):
+    """MockIEXBatchHandler
+
+    request handler for the stub IEX server that records
+    each query in ``server.batch_queries``
+    """
+
+    def do_GET(
+            self):
+        """do_GET"""
+        parsed = urllib.parse.urlparse(
+            self.path)
+        if not parsed.path.endswith('/stock/market/batch'):
+            self.send_error(404)
+            return
+        query = {
+            key: values[0]
+            for key, values in urllib.parse.parse_qs(
+                parsed.query).items()
+        }
+        self.server.batch_queries.append(query)
+        body = json.dumps(
+            build_batch_response(
+                query=query)).encode('utf-8')
+        self.send_response(200)
+        self.send_header(
+            'Content-Type',
+            'application/json')
+        self.send_header(
+            'Content-Length',
+            str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    # end of do_GET
+
+    def log_message(
+            self,
+            *args):
+        """log_message
+
+        do not log each request to stderr
+        """
+    # end of log_message
+
+# end of MockIEXBatchHandler
+
+
+def start_mock_iex_server(
+        host='127.0.0.1',
+        port=0):
+    """start_mock_iex_server
+
+    start a stub IEX server on a background thread and
+    return a tuple ``(server, base_url)``
+
+    :param host: optional - address to listen on
+    :param port: optional - port to listen on (default
+        is ``0`` for any free port)
+    """
+    server = http.server.HTTPServer(
+        (host, port),
+        MockIEXBatchHandler)
+    server.batch_queries = []
+    thread = threading.Thread(
+        target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    base_url = 'http://{}:{}/1.0'.format(
+        host,
+        server.server_address[1])
+    return server, base_url
+# end of start_mock_iex_server
+
+
+def stop_mock_iex_server(
+        server):
+    """stop_mock_iex_server
+
+    :param server: server from ``start_mock_iex_server``
+    """
+    server.shutdown()
+    server.server_close()
+# end of stop_mock_iex_server
@@ -17,7 +17,9 @@ class MockRedisFailToConnect:
             host=None,
             port=None,
             password=None,
-            db=None):
+            db=None,
+            connection_pool=None,
+            **kwargs):
         """__init__
 
         build a mock redis client that will raise an exception
@@ -27,6 +29,8 @@ class MockRedisFailToConnect:
         :param port: port
         :param password: password
         :param db: database number
+        :param connection_pool: redis connection pool
+        :param kwargs: additional redis client arguments
         """
         raise Exception(
             'test MockRedisFailToConnect')
@@ -35,6 +39,96 @@ class MockRedisFailToConnect:
 # end of MockRedisFailToConnect
 
 
+class MockRedisPipeline:
+    """MockRedisPipeline"""
+
+    def __init__(
+            self,
+            client,
+            transaction=True):
+        """__init__
+
+        build a mock redis pipeline that queues commands
+        and runs them against the ``client`` on ``execute``
+
+        :param client: ``MockRedis`` client
+        :param transaction: redis values
+        """
+        self.client = client
+        self.transaction = transaction
+        self.commands = []
+    # end of __init__
+
+    def get(
+            self,
+            name=None):
+        """get
+
+        queue a mock redis get
+
+        :param name: name of the key to check
+        """
+        self.commands.append((self.client.get, [name]))
+        return self
+    # end of get
+
+    def mget(
+            self,
+            keys,
+            *args):
+        """mget
+
+        queue a mock redis mget
+
+        :param keys: list of key names to check
+        :param args: additional key names
+        """
+        self.commands.append((self.client.mget, [keys] + list(args)))
+        return self
+    # end of mget
+
+    def set(
+            self,
+            name=None,
+            value=None,
+            ex=None,
+            px=None,
+            nx=False,
+            xx=False):
+        """set
+
+        queue a mock redis set
+
+        :param name: cache key name
+        :param value: value to cache
+        :param ex: expire time
+        :param px: redis values
+        :param nx: redis values
+        :param xx: redis values
+        """
+        self.commands.append(
+            (self.client.set, [name, value, ex, px, nx, xx]))
+        return self
+    # end of set
+
+    def execute(
+            self):
+        """execute
+
+        run all queued commands and return the
+        list of results
+        """
+        results = [
+            func(*args)
+            for func, args in self.commands
+        ]
+        self.commands = []
+        return results
+    # end of execute
+
+# end of MockRedisPipeline
+
+
 class MockRedis:
     """MockRedis"""
 
@@ -43,7 +137,9 @@ class MockRedis:
             host=None,
             port=None,
             password=None,
-            db=None):
+            db=None,
+            connection_pool=None,
+            **kwargs):
         """__init__
 
         build mock redis client
@@ -52,11 +148,14 @@ class MockRedis:
         :param port: port
         :param password: password
         :param db: database number
+        :param connection_pool: redis connection pool
+        :param kwargs: additional redis client arguments
         """
         self.host = host
         self.port = port
         self.password = password
         self.db = db
+        self.connection_pool = connection_pool
         self.cache_dict = {}  # cache dictionary replicating redis
         self.keys = []        # cache redis keys
     # end of __init__
@@ -144,4 +243,41 @@ class MockRedis:
         # end of get data from dict vs in the env
     # end of get
 
+    def mget(
+            self,
+            keys,
+            *args):
+        """mget
+
+        mock redis mget
+
+        :param keys: list of key names to check
+        :param args: additional key names
+        """
+        use_keys = keys
+        if isinstance(keys, str):
+            use_keys = [keys]
+        use_keys = list(use_keys) + list(args)
+        return [
+            self.get(name=key)
+            for key in use_keys
+        ]
+    # end of mget
+
+    def pipeline(
+            self,
+            transaction=True,
+            shard_hint=None):
+        """pipeline
+
+        mock redis pipeline
+
+        :param transaction: redis values
+        :param shard_hint: redis values
+        """
+        return MockRedisPipeline(
+            client=self,
+            transaction=transaction)
+    # end of pipeline
+
 # end of MockRedis
@@ -0,0 +1,267 @@
+"""
+Compiled Module Cache
+=====================
+
+Custom algorithm and indicator files are loaded from a path on
+disk with ``importlib.machinery.SourceFileLoader``. Without a
+cache every ``load_indicator_from_module`` call and every
+``run_distributed_algorithm`` Celery task re-executes the module
+file and scans it with ``inspect.getmembers``.
+
+This module keeps the loaded modules (and the class members
+found in them) for the life of the process, keyed by the
+absolute file path and the module name. Each lookup checks the
+file's modification time and size with one ``os.stat`` call:
+
+- unchanged files are a dictionary lookup
+- if the modification time or size changed, the file's
+  ``sha1`` is compared with the cached one and the module is
+  only executed again if the contents changed
+
+.. note:: Cached modules are shared like normal imports, so
+    class-level variables in a custom algorithm or indicator
+    module keep their values between tasks in the same worker.
+
+.. code-block:: python
+
+    import analysis_engine.module_cache as module_cache
+    algo_class = module_cache.find_member(
+        module_name='example_algo_minute.py',
+        path_to_module='/opt/sa/analysis_engine/mocks/'
+                       'example_algo_minute.py')[1]
+
+**Supported environment variables**
+
+::
+
+    # set to 0 to execute the module file on every load
+    export MODULE_CACHE_ENABLED=1
+
+    # set to 1 to compare the file sha1 on every lookup
+    # (for file systems without reliable modification times)
+    export MODULE_CACHE_VERIFY_HASH=0
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import os
+import types
+import inspect
+import hashlib
+import threading
+import importlib.machinery
+from analysis_engine.consts import ev
+from spylunking.log.setup_logging import build_colorized_logger
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+MODULE_CACHE_ENABLED = ev(
+    'MODULE_CACHE_ENABLED',
+    '1') == '1'
+MODULE_CACHE_VERIFY_HASH = ev(
+    'MODULE_CACHE_VERIFY_HASH',
+    '0') == '1'
+
+MODULES = {}
+MODULES_LOCK = threading.RLock()
+MODULE_STATS = {
+    'hits': 0,
+    'misses': 0,
+    'reloads': 0
+}
+
+
+def get_file_hash(
+        path_to_module):
+    """get_file_hash
+
+    :param path_to_module: path to the module file
+    """
+    with open(path_to_module, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+# end of get_file_hash
+
+
+def exec_module_file(
+        module_name,
+        path_to_module):
+    """exec_module_file
+
+    Load and execute a module file without adding it to
+    ``sys.modules``
+
+    :param module_name: name for the new module
+    :param path_to_module: path to the module file
+    """
+    loader = importlib.machinery.SourceFileLoader(
+        module_name,
+        path_to_module)
+    new_module = types.ModuleType(
+        loader.name)
+    loader.exec_module(
+        new_module)
+    return new_module
+# end of exec_module_file
+
+
+def get_module_entry(
+        module_name,
+        path_to_module,
+        verify_hash=None):
+    """get_module_entry
+
+    Get the cache entry for a module file and load or reload
+    the module if it is missing or the file changed
+
+    :param module_name: name for the module
+    :param path_to_module: path to the module file
+    :param verify_hash: optional - compare the file ``sha1``
+        on every lookup (default is ``MODULE_CACHE_VERIFY_HASH``)
+    """
+    if verify_hash is None:
+        verify_hash = MODULE_CACHE_VERIFY_HASH
+    abs_path = os.path.abspath(path_to_module)
+    stat_res = os.stat(abs_path)
+    signature = (stat_res.st_mtime_ns, stat_res.st_size)
+    cache_key = (abs_path, module_name)
+
+    with MODULES_LOCK:
+        entry = MODULES.get(
+            cache_key,
+            None)
+        if entry:
+            if entry['signature'] == signature and not verify_hash:
+                MODULE_STATS['hits'] += 1
+                return entry
+            file_hash = get_file_hash(abs_path)
+            if file_hash == entry['hash']:
+                entry['signature'] = signature
+                MODULE_STATS['hits'] += 1
+                return entry
+            MODULE_STATS['reloads'] += 1
+            log.info(
+                'reloading changed module={} path={}'.format(
+                    module_name,
+                    abs_path))
+        else:
+            file_hash = get_file_hash(abs_path)
+            MODULE_STATS['misses'] += 1
+
+        entry = {
+            'module': exec_module_file(
+                module_name=module_name,
+                path_to_module=abs_path),
+            'signature': signature,
+            'hash': file_hash,
+            'members': {}
+        }
+        MODULES[cache_key] = entry
+        return entry
+    # end of with the lock
+# end of get_module_entry
+
+
+def load_module(
+        module_name,
+        path_to_module):
+    """load_module
+
+    Get the module for a file from the cache or execute it
+
+    :param module_name: name for the module
+    :param path_to_module: path to the module file
+    """
+    if not MODULE_CACHE_ENABLED:
+        return exec_module_file(
+            module_name=module_name,
+            path_to_module=path_to_module)
+    return get_module_entry(
+        module_name=module_name,
+        path_to_module=path_to_module)['module']
+# end of load_module
+
+
+def find_member(
+        module_name,
+        path_to_module,
+        match_name=None):
+    """find_member
+
+    Get the module and the first ``(name, value)`` member from
+    ``inspect.getmembers`` where ``match_name`` is in the
+    member's string (the lookup the custom algorithm and
+    indicator loaders use). Returns a tuple
+    ``(module, member)`` where ``member`` is ``None`` if
+    nothing matched.
+
+    :param module_name: name for the module
+    :param path_to_module: path to the module file
+    :param match_name: optional - string to find in the
+        member (default is ``module_name``)
+    """
+    if not match_name:
+        match_name = module_name
+    if not MODULE_CACHE_ENABLED:
+        new_module = exec_module_file(
+            module_name=module_name,
+            path_to_module=path_to_module)
+        return new_module, get_matching_member(
+            new_module=new_module,
+            match_name=match_name)
+    entry = get_module_entry(
+        module_name=module_name,
+        path_to_module=path_to_module)
+    with MODULES_LOCK:
+        if match_name not in entry['members']:
+            entry['members'][match_name] = get_matching_member(
+                new_module=entry['module'],
+                match_name=match_name)
+        return entry['module'], entry['members'][match_name]
+# end of find_member
+
+
+def get_matching_member(
+        new_module,
+        match_name):
+    """get_matching_member
+
+    :param new_module: loaded module
+    :param match_name: string to find in the member
+    """
+    for member in inspect.getmembers(new_module):
+        if match_name in str(member):
+            return member
+    return None
+# end of get_matching_member
+
+
+def get_module_cache_stats():
+    """get_module_cache_stats
+
+    Get the number of cached modules and the number of
+    ``hits``, ``misses`` and ``reloads``
+    """
+    with MODULES_LOCK:
+        stats = dict(MODULE_STATS)
+        stats['modules'] = len(MODULES)
+    return stats
+# end of get_module_cache_stats
+
+
+def clear_module_cache():
+    """clear_module_cache
+
+    Drop all cached modules
+    """
+    with MODULES_LOCK:
+        MODULES.clear()
+        for key in MODULE_STATS:
+            MODULE_STATS[key] = 0
+# end of clear_module_cache
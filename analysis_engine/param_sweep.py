@@ -0,0 +1,576 @@
+"""
+Parallel Parameter Sweeps for Algorithm Configs
+===============================================
+
+Tuning an algorithm means running the same backtest with many
+variants of its ``config_dict`` (like the indicator
+``num_points``, ``buy_above`` and ``sell_below`` values in
+``tests/algo_configs/test_5_days_ahead.json``).
+``run_param_sweep`` loads the algorithm-ready dataset once,
+builds a grid (or a random sample of the grid) of config
+variants and runs one ``analysis_engine.algo.BaseAlgo`` (or
+derived class) per variant in a pool of workers.
+
+With the default ``process`` workers the pool is created with
+the ``fork`` start method after the dataset is loaded, so the
+workers read the parent's dataset through copy-on-write memory
+instead of pickling it. Platforms without ``fork`` fall back to
+``thread`` workers that share the dataset in one process. Each
+worker only sends back a small summary row, and the rows are
+returned as a ``pandas.DataFrame`` ranked by ``rank_by``.
+
+Parameters are addressed with dotted paths into the
+``config_dict``. A list of dictionaries can be indexed by
+position or by the ``name`` key:
+
+.. code-block:: python
+
+    import analysis_engine.param_sweep as param_sweep
+
+    ranked_df = param_sweep.run_param_sweep(
+        mod_path='/opt/sa/analysis_engine/mocks/example_algo_minute.py',
+        config_file='/opt/sa/tests/algo_configs/test_5_days_ahead.json',
+        param_grid={
+            'indicators.willr.num_points': [8, 12, 16],
+            'indicators.willr.buy_above': [50, 60, 70],
+            'indicators.willr.sell_below': [10, 20, 30]
+        },
+        num_samples=10,
+        load_config={
+            'path_to_file': '/opt/sa/tests/datasets/algo/SPY-latest.json'
+        },
+        tickers=['SPY'])
+    print(ranked_df.head())
+
+From the command line put the grid in a json file and pass it
+with ``-S``:
+
+::
+
+    sa -t SPY -g /opt/sa/analysis_engine/mocks/example_algo_minute.py \\
+        -c /opt/sa/tests/algo_configs/test_5_days_ahead.json \\
+        -b file:/opt/sa/tests/datasets/algo/SPY-latest.json \\
+        -S /opt/sa/tests/algo_configs/sweep_willr.json
+
+where the sweep file looks like:
+
+::
+
+    {
+        "params": {
+            "indicators.willr.num_points": [8, 12, 16],
+            "indicators.willr.buy_above": [50, 60, 70]
+        },
+        "samples": null,
+        "seed": 1,
+        "workers": 4,
+        "rank_by": "equity",
+        "output_file": "/tmp/sweep.csv"
+    }
+
+**Supported environment variables**
+
+::
+
+    # number of sweep workers (default is the number of cpus)
+    export SWEEP_WORKERS=4
+
+    # process or thread workers
+    export SWEEP_WORKER_TYPE=process
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import os
+import copy
+import json
+import random
+import inspect
+import datetime
+import itertools
+import multiprocessing
+import multiprocessing.pool
+import pandas as pd
+import analysis_engine.consts as ae_consts
+import analysis_engine.algo as base_algo
+import analysis_engine.load_dataset as load_dataset
+import analysis_engine.module_cache as module_cache
+from spylunking.log.setup_logging import build_colorized_logger
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+SWEEP_WORKERS = int(ae_consts.ev(
+    'SWEEP_WORKERS',
+    str(os.cpu_count() or 1)))
+SWEEP_WORKER_TYPE = ae_consts.ev(
+    'SWEEP_WORKER_TYPE',
+    'process')
+
+# read-only sweep inputs for the workers - set before the pool
+# is created so forked workers inherit them without pickling
+SWEEP_STATE = {}
+
+
+def build_param_grid(
+        param_grid):
+    """build_param_grid
+
+    Build the list of all parameter combinations
+
+    :param param_grid: dictionary of dotted config paths to
+        a list of values
+    """
+    names = sorted(param_grid.keys())
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*[
+            param_grid[name] for name in names
+        ])
+    ]
+# end of build_param_grid
+
+
+def sample_param_grid(
+        param_grid,
+        num_samples,
+        seed=None):
+    """sample_param_grid
+
+    Pick ``num_samples`` unique parameter combinations without
+    building the full grid
+
+    :param param_grid: dictionary of dotted config paths to
+        a list of values
+    :param num_samples: number of combinations
+    :param seed: optional - random seed
+    """
+    names = sorted(param_grid.keys())
+    sizes = [len(param_grid[name]) for name in names]
+    total = 1
+    for size in sizes:
+        total *= size
+    if num_samples >= total:
+        return build_param_grid(
+            param_grid=param_grid)
+    variants = []
+    for grid_idx in random.Random(seed).sample(range(total), num_samples):
+        params = {}
+        for name, size in zip(reversed(names), reversed(sizes)):
+            grid_idx, value_idx = divmod(grid_idx, size)
+            params[name] = param_grid[name][value_idx]
+        variants.append(params)
+    # end of for all sampled combinations
+    return variants
+# end of sample_param_grid
+
+
+def set_config_value(
+        config_dict,
+        path,
+        value):
+    """set_config_value
+
+    Set a value in a nested ``config_dict`` with a dotted path
+    like ``indicators.willr.num_points`` or
+    ``indicators.0.num_points``
+
+    :param config_dict: algorithm config dictionary
+    :param path: dotted path
+    :param value: new value
+    """
+    parts = path.split('.')
+    node = config_dict
+    for part in parts[:-1]:
+        if isinstance(node, list):
+            node = get_list_item(
+                items=node,
+                part=part,
+                path=path)
+        else:
+            if part not in node:
+                node[part] = {}
+            node = node[part]
+    # end of walking the path
+    last = parts[-1]
+    if isinstance(node, list):
+        node[int(last)] = value
+    else:
+        node[last] = value
+# end of set_config_value
+
+
+def get_list_item(
+        items,
+        part,
+        path):
+    """get_list_item
+
+    Find a list item by index or by its ``name`` key
+
+    :param items: list from the config
+    :param part: index or name
+    :param path: dotted path for errors
+    """
+    if part.isdigit() and int(part) < len(items):
+        return items[int(part)]
+    for item in items:
+        if isinstance(item, dict) and item.get('name', None) == part:
+            return item
+    raise KeyError(
+        'sweep param={} has no list item={}'.format(
+            path,
+            part))
+# end of get_list_item
+
+
+def build_variant_config(
+        config_dict,
+        params):
+    """build_variant_config
+
+    Copy the ``config_dict`` and apply the parameters
+
+    :param config_dict: base algorithm config dictionary
+    :param params: dictionary of dotted paths to values
+    """
+    variant = copy.deepcopy(config_dict or {})
+    for path, value in params.items():
+        set_config_value(
+            config_dict=variant,
+            path=path,
+            value=value)
+    return variant
+# end of build_variant_config
+
+
+def load_algo_class(
+        mod_path):
+    """load_algo_class
+
+    Load the first ``analysis_engine.algo.BaseAlgo`` derived
+    class defined in a module file
+
+    :param mod_path: path to the algorithm module file
+    """
+    custom_algo_module = module_cache.load_module(
+        module_name=mod_path.split('/')[-1],
+        path_to_module=mod_path)
+    for member_name, member in inspect.getmembers(
+            custom_algo_module,
+            inspect.isclass):
+        if (issubclass(member, base_algo.BaseAlgo) and
+                member is not base_algo.BaseAlgo):
+            return member
+    raise Exception(
+        'did not find a derived analysis_engine.algo.BaseAlgo '
+        'class in the module file={}'.format(
+            mod_path))
+# end of load_algo_class
+
+
+def get_last_closes(
+        dataset):
+    """get_last_closes
+
+    Get the last ``daily`` close for each ticker to value the
+    open positions at the end of a backtest
+
+    :param dataset: algorithm-ready dataset
+    """
+    last_closes = {}
+    for ticker, nodes in dataset.items():
+        for node in reversed(nodes):
+            df = node['data'].get(
+                'daily',
+                None)
+            if (hasattr(df, 'columns') and 'close' in df.columns and
+                    len(df.index) > 0):
+                last_closes[ticker] = float(df['close'].iloc[-1])
+                break
+    # end of for all tickers
+    return last_closes
+# end of get_last_closes
+
+
+def run_sweep_variant(
+        variant_idx):
+    """run_sweep_variant
+
+    Run one config variant with the read-only ``SWEEP_STATE``
+    and return a summary row dictionary
+
+    :param variant_idx: index in ``SWEEP_STATE['variants']``
+    """
+    params = SWEEP_STATE['variants'][variant_idx]
+    row = {
+        'variant': variant_idx,
+        'status': ae_consts.SUCCESS,
+        'err': None
+    }
+    row.update(params)
+    start_time = datetime.datetime.utcnow()
+    try:
+        algo_kwargs = dict(SWEEP_STATE['algo_kwargs'])
+        algo_kwargs['name'] = '{}-{}'.format(
+            algo_kwargs.get('name', 'sweep'),
+            variant_idx)
+        algo = SWEEP_STATE['algo_class'](
+            config_dict=build_variant_config(
+                config_dict=SWEEP_STATE['config_dict'],
+                params=params),
+            **algo_kwargs)
+        algo.handle_data(
+            data=SWEEP_STATE['dataset'])
+        open_value = 0.0
+        for ticker, position in algo.get_positions().items():
+            open_value += (
+                (position.get('shares', 0) or 0) *
+                SWEEP_STATE['last_closes'].get(ticker, 0.0))
+        row['balance'] = algo.balance
+        row['equity'] = algo.balance + open_value
+        row['net_gain'] = row['equity'] - algo.starting_balance
+        row['num_buys'] = len([
+            order for order in algo.buys
+            if order and order['status'] == ae_consts.TRADE_FILLED
+        ])
+        row['num_sells'] = len([
+            order for order in algo.sells
+            if order and order['status'] == ae_consts.TRADE_FILLED
+        ])
+        row['num_processed'] = len(algo.order_history)
+    except Exception as e:
+        row['status'] = ae_consts.ERR
+        row['err'] = (
+            'variant={} params={} failed with ex={}'.format(
+                variant_idx,
+                params,
+                e))
+        log.error(row['err'])
+    # end of try/ex
+    row['seconds'] = (
+        datetime.datetime.utcnow() - start_time).total_seconds()
+    return row
+# end of run_sweep_variant
+
+
+def build_worker_pool(
+        workers,
+        worker_type):
+    """build_worker_pool
+
+    Build a ``fork`` process pool (or a thread pool if ``fork``
+    is not supported or ``worker_type`` is ``thread``)
+
+    :param workers: number of workers
+    :param worker_type: ``process`` or ``thread``
+    """
+    if worker_type == 'process':
+        if 'fork' in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context('fork').Pool(
+                processes=workers)
+        log.info(
+            'sweep - fork is not supported using thread workers')
+    return multiprocessing.pool.ThreadPool(
+        processes=workers)
+# end of build_worker_pool
+
+
+def run_param_sweep(
+        param_grid,
+        algo_class=None,
+        mod_path=None,
+        config_dict=None,
+        config_file=None,
+        dataset=None,
+        load_config=None,
+        num_samples=None,
+        seed=None,
+        workers=None,
+        worker_type=None,
+        rank_by='equity',
+        algo_kwargs=None,
+        tickers=None,
+        balance=5000.0,
+        commission=6.0,
+        name='sweep'):
+    """run_param_sweep
+
+    Run a backtest for each config variant in parallel and
+    return the summary rows as a ``pandas.DataFrame`` ranked
+    by ``rank_by`` (best first)
+
+    :param param_grid: dictionary of dotted config paths
+        to a list of values
+    :param algo_class: optional - ``BaseAlgo`` derived class
+        (default is ``analysis_engine.algo.BaseAlgo``)
+    :param mod_path: optional - path to an algorithm module
+        file to load ``algo_class`` from
+    :param config_dict: optional - base algorithm config
+    :param config_file: optional - path to a json algorithm
+        config file for the base config
+    :param dataset: optional - algorithm-ready dataset
+        dictionary to use instead of loading one
+    :param load_config: optional - dictionary of
+        ``analysis_engine.load_dataset.load_dataset`` arguments
+        (like ``path_to_file``, ``s3_key`` or ``redis_key``)
+    :param num_samples: optional - run a random sample of this
+        many variants instead of the full grid
+    :param seed: optional - random seed for ``num_samples``
+    :param workers: optional - number of workers
+        (default is ``SWEEP_WORKERS``)
+    :param worker_type: optional - ``process`` or ``thread``
+        (default is ``SWEEP_WORKER_TYPE``)
+    :param rank_by: optional - summary column to rank by
+        (default is ``equity``: balance plus the open positions
+        at the last daily close)
+    :param algo_kwargs: optional - dictionary of arguments for
+        each algorithm
+    :param tickers: optional - list of tickers
+    :param balance: optional - starting balance
+    :param commission: optional - commission per trade
+    :param name: optional - name prefix for the algorithms
+    """
+    if not algo_class:
+        algo_class = base_algo.BaseAlgo
+        if mod_path:
+            algo_class = load_algo_class(
+                mod_path=mod_path)
+    if not config_dict and config_file:
+        with open(config_file, 'r') as cur_file:
+            config_dict = json.loads(cur_file.read())
+    if not dataset:
+        use_load_config = dict(load_config or {})
+        if tickers and 'tickers' not in use_load_config:
+            use_load_config['tickers'] = tickers
+        dataset = load_dataset.load_dataset(
+            **use_load_config)
+    if not dataset:
+        raise Exception(
+            'sweep - unable to load a dataset with '
+            'load_config={}'.format(
+                load_config))
+
+    if num_samples:
+        variants = sample_param_grid(
+            param_grid=param_grid,
+            num_samples=num_samples,
+            seed=seed)
+    else:
+        variants = build_param_grid(
+            param_grid=param_grid)
+
+    use_algo_kwargs = {
+        'tickers': tickers or list(dataset.keys()),
+        'balance': balance,
+        'commission': commission,
+        'name': name,
+        'publish_to_slack': False,
+        'publish_to_s3': False,
+        'publish_to_redis': False,
+        'compact_history': True
+    }
+    use_algo_kwargs.update(algo_kwargs or {})
+
+    SWEEP_STATE.clear()
+    SWEEP_STATE.update({
+        'algo_class': algo_class,
+        'config_dict': config_dict,
+        'dataset': dataset,
+        'variants': variants,
+        'algo_kwargs': use_algo_kwargs,
+        'last_closes': get_last_closes(dataset)
+    })
+
+    num_workers = max(1, min(
+        int(workers or SWEEP_WORKERS),
+        len(variants)))
+    use_worker_type = worker_type or SWEEP_WORKER_TYPE
+    log.info(
+        'sweep - start algo={} variants={} workers={} type={}'.format(
+            algo_class.__name__,
+            len(variants),
+            num_workers,
+            use_worker_type))
+
+    rows = []
+    try:
+        if num_workers == 1:
+            rows = [
+                run_sweep_variant(variant_idx)
+                for variant_idx in range(len(variants))
+            ]
+        else:
+            pool = build_worker_pool(
+                workers=num_workers,
+                worker_type=use_worker_type)
+            try:
+                rows = list(pool.imap_unordered(
+                    run_sweep_variant,
+                    range(len(variants))))
+            finally:
+                pool.close()
+                pool.join()
+    finally:
+        SWEEP_STATE.clear()
+    # end of running all variants
+
+    ranked_df = pd.DataFrame(rows)
+    if len(ranked_df.index) > 0 and rank_by in ranked_df.columns:
+        ranked_df = ranked_df.sort_values(
+            by=[rank_by, 'variant'],
+            ascending=[False, True],
+            na_position='last').reset_index(drop=True)
+    log.info(
+        'sweep - done algo={} variants={} failed={}'.format(
+            algo_class.__name__,
+            len(rows),
+            len([
+                row for row in rows
+                if row['status'] != ae_consts.SUCCESS
+            ])))
+    return ranked_df
+# end of run_param_sweep
+
+
+def run_param_sweep_from_file(
+        sweep_file,
+        **kwargs):
+    """run_param_sweep_from_file
+
+    Run ``run_param_sweep`` with the settings in a json file
+    (keys: ``params``, ``samples``, ``seed``, ``workers``,
+    ``worker_type``, ``rank_by`` and ``output_file`` for saving
+    the ranked table as a csv)
+
+    :param sweep_file: path to the json sweep file
+    :param kwargs: arguments for ``run_param_sweep``
+    """
+    with open(sweep_file, 'r') as cur_file:
+        sweep_config = json.loads(cur_file.read())
+    ranked_df = run_param_sweep(
+        param_grid=sweep_config['params'],
+        num_samples=sweep_config.get('samples', None),
+        seed=sweep_config.get('seed', None),
+        workers=sweep_config.get('workers', None),
+        worker_type=sweep_config.get('worker_type', None),
+        rank_by=sweep_config.get('rank_by', 'equity'),
+        **kwargs)
+    output_file = sweep_config.get(
+        'output_file',
+        None)
+    if output_file:
+        ranked_df.to_csv(
+            output_file,
+            index=False)
+        log.info(
+            'sweep - saved ranked results to file={}'.format(
+                output_file))
+    return ranked_df
+# end of run_param_sweep_from_file
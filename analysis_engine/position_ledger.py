@@ -0,0 +1,343 @@
+"""
+Position Ledger
+===============
+
+``BaseAlgo`` keeps a ``PositionLedger`` with one
+``TickerPosition`` per ticker. Each filled order updates the
+position in constant time, so share counts, order counts,
+cost basis and profit and loss never require scanning the
+``buys`` and ``sells`` order lists.
+
+- the cost basis uses the average cost method: a sell
+  releases ``shares_sold * average_cost`` from the cost basis
+- realized P&L is the sell proceeds minus the released
+  cost basis
+- unrealized P&L is ``shares * last_price - cost_basis`` where
+  the last price is set with ``mark`` on every dataset node
+- buy costs and sell proceeds are the changes in the
+  algorithm's balance (so they include the commission)
+
+.. code-block:: python
+
+    algo.handle_data(data=algo_ready_dataset)
+    print(algo.get_position_summary(ticker='SPY'))
+    print(algo.ledger.get_realized_pnl())
+
+**Supported environment variables**
+
+::
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+from spylunking.log.setup_logging import build_colorized_logger
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+class TickerPosition(object):
+    """TickerPosition
+
+    Running totals for one ticker
+
+    :param ticker: ticker symbol
+    """
+
+    def __init__(
+            self,
+            ticker):
+        """__init__
+
+        :param ticker: ticker symbol
+        """
+        self.ticker = ticker
+        self.shares = 0
+        self.cost_basis = 0.0
+        self.realized_pnl = 0.0
+        self.last_price = None
+        self.num_buys = 0
+        self.num_sells = 0
+        self.num_failed = 0
+        self.shares_bought = 0
+        self.shares_sold = 0
+        self.last_date = None
+    # end of __init__
+
+    def get_average_cost(
+            self):
+        """get_average_cost
+
+        average cost per owned share or ``0.0`` if
+        no shares are owned
+        """
+        if self.shares <= 0:
+            return 0.0
+        return self.cost_basis / self.shares
+    # end of get_average_cost
+
+    def get_market_value(
+            self):
+        """get_market_value
+
+        value of the owned shares at the last price
+        """
+        if self.last_price is None:
+            return 0.0
+        return self.shares * self.last_price
+    # end of get_market_value
+
+    def get_unrealized_pnl(
+            self):
+        """get_unrealized_pnl
+
+        market value minus the cost basis of the owned shares
+        """
+        if self.shares <= 0 or self.last_price is None:
+            return 0.0
+        return self.get_market_value() - self.cost_basis
+    # end of get_unrealized_pnl
+
+    def add_buy(
+            self,
+            shares,
+            cost,
+            date=None):
+        """add_buy
+
+        :param shares: number of shares bought
+        :param cost: total cost including commission
+        :param date: optional - trade date
+        """
+        self.shares += shares
+        self.shares_bought += shares
+        self.cost_basis += cost
+        self.num_buys += 1
+        self.last_date = date
+    # end of add_buy
+
+    def add_sell(
+            self,
+            shares,
+            proceeds,
+            date=None):
+        """add_sell
+
+        :param shares: number of shares sold
+        :param proceeds: total proceeds after commission
+        :param date: optional - trade date
+        """
+        released = self.get_average_cost() * shares
+        self.realized_pnl += proceeds - released
+        self.shares -= shares
+        self.shares_sold += shares
+        self.cost_basis -= released
+        if self.shares <= 0:
+            self.cost_basis = 0.0
+        self.num_sells += 1
+        self.last_date = date
+    # end of add_sell
+
+    def to_dict(
+            self):
+        """to_dict
+
+        summary dictionary for reports and logs
+        """
+        return {
+            'ticker': self.ticker,
+            'shares': self.shares,
+            'cost_basis': self.cost_basis,
+            'average_cost': self.get_average_cost(),
+            'last_price': self.last_price,
+            'market_value': self.get_market_value(),
+            'realized_pnl': self.realized_pnl,
+            'unrealized_pnl': self.get_unrealized_pnl(),
+            'num_buys': self.num_buys,
+            'num_sells': self.num_sells,
+            'num_failed': self.num_failed,
+            'shares_bought': self.shares_bought,
+            'shares_sold': self.shares_sold,
+            'last_date': self.last_date
+        }
+    # end of to_dict
+
+# end of TickerPosition
+
+
+class PositionLedger(object):
+    """PositionLedger
+
+    Dictionary of ``TickerPosition`` objects by ticker
+    """
+
+    def __init__(
+            self):
+        """__init__"""
+        self.positions = {}
+    # end of __init__
+
+    def get_position(
+            self,
+            ticker):
+        """get_position
+
+        get the ``TickerPosition`` for a ticker (created
+        on first use)
+
+        :param ticker: ticker symbol
+        """
+        position = self.positions.get(
+            ticker,
+            None)
+        if position is None:
+            position = TickerPosition(
+                ticker=ticker)
+            self.positions[ticker] = position
+        return position
+    # end of get_position
+
+    def get_tickers(
+            self):
+        """get_tickers"""
+        return list(self.positions)
+    # end of get_tickers
+
+    def get_shares(
+            self,
+            ticker):
+        """get_shares
+
+        :param ticker: ticker symbol
+        """
+        position = self.positions.get(
+            ticker,
+            None)
+        if position is None:
+            return 0
+        return position.shares
+    # end of get_shares
+
+    def record_buy(
+            self,
+            order):
+        """record_buy
+
+        update the position with a filled buy order from
+        ``analysis_engine.build_buy_order.build_buy_order``
+
+        :param order: buy order dictionary
+        """
+        self.get_position(
+            ticker=order['ticker']).add_buy(
+                shares=(order['shares'] or 0) - (order['prev_shares'] or 0),
+                cost=order['prev_balance'] - order['balance'],
+                date=order.get('date', None))
+    # end of record_buy
+
+    def record_sell(
+            self,
+            order):
+        """record_sell
+
+        update the position with a filled sell order from
+        ``analysis_engine.build_sell_order.build_sell_order``
+
+        :param order: sell order dictionary
+        """
+        self.get_position(
+            ticker=order['ticker']).add_sell(
+                shares=(order['prev_shares'] or 0) - (order['shares'] or 0),
+                proceeds=order['balance'] - order['prev_balance'],
+                date=order.get('date', None))
+    # end of record_sell
+
+    def record_failed(
+            self,
+            ticker):
+        """record_failed
+
+        count an order that did not fill
+
+        :param ticker: ticker symbol
+        """
+        self.get_position(
+            ticker=ticker).num_failed += 1
+    # end of record_failed
+
+    def mark(
+            self,
+            ticker,
+            price):
+        """mark
+
+        set the last price used for the unrealized P&L
+
+        :param ticker: ticker symbol
+        :param price: latest price
+        """
+        if price:
+            self.get_position(
+                ticker=ticker).last_price = float(price)
+    # end of mark
+
+    def get_realized_pnl(
+            self,
+            ticker=None):
+        """get_realized_pnl
+
+        :param ticker: optional - ticker symbol (default is
+            the total for all tickers)
+        """
+        if ticker:
+            return self.get_position(ticker).realized_pnl
+        return sum(
+            position.realized_pnl
+            for position in self.positions.values())
+    # end of get_realized_pnl
+
+    def get_unrealized_pnl(
+            self,
+            ticker=None):
+        """get_unrealized_pnl
+
+        :param ticker: optional - ticker symbol (default is
+            the total for all tickers)
+        """
+        if ticker:
+            return self.get_position(ticker).get_unrealized_pnl()
+        return sum(
+            position.get_unrealized_pnl()
+            for position in self.positions.values())
+    # end of get_unrealized_pnl
+
+    def get_summary(
+            self,
+            ticker=None):
+        """get_summary
+
+        get the ``TickerPosition.to_dict()`` for a ticker
+        or a dictionary of them for all tickers
+
+        :param ticker: optional - ticker symbol
+        """
+        if ticker:
+            return self.get_position(ticker).to_dict()
+        return {
+            use_ticker: position.to_dict()
+            for use_ticker, position in self.positions.items()
+        }
+    # end of get_summary
+
+    def clear(
+            self):
+        """clear"""
+        self.positions = {}
+    # end of clear
+
+# end of PositionLedger
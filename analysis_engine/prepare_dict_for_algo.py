@@ -1,24 +1,319 @@
 """
 Helper for converting a dictionary to an algorithm-ready
 dataset
+
+By default every serialized dataset in every node is converted
+to a ``pandas.DataFrame`` up front. With ``lazy=True`` each
+``node['data']`` is a ``LazyDatasetDict`` that keeps the
+serialized json and converts a dataset the first time it is
+accessed (and then reuses the converted ``pandas.DataFrame``),
+so an algorithm that only uses ``daily`` never converts the
+other datasets. ``dict(node['data'])``, ``**node['data']``,
+``copy()``, ``copy.copy``, ``copy.deepcopy`` and ``pickle``
+all see the converted datasets (copies and pickles keep the
+datasets that were not converted yet as json).
+
+**Supported environment variables**
+
+::
+
+    # convert datasets on first access for all loads
+    export LAZY_DATASETS=1
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
 """
 
+import copy
 import json
 import zlib
 import pandas as pd
 from analysis_engine.consts import DEFAULT_SERIALIZED_DATASETS
+from analysis_engine.consts import ev
 from spylunking.log.setup_logging import build_colorized_logger
 
 log = build_colorized_logger(
     name=__name__)
 
 
+LAZY_DATASETS = ev(
+    'LAZY_DATASETS',
+    '0') == '1'
+
+
+class LazyDatasetDict(dict):
+    """LazyDatasetDict
+
+    Dictionary of dataset name to ``pandas.DataFrame`` that
+    converts each serialized dataset (a
+    ``to_json(orient='records')`` string) on first access
+
+    :param serialized: dictionary of dataset name to the
+        serialized dataset
+    :param empty_df: ``pandas.DataFrame`` for datasets
+        without any data
+    """
+
+    def __init__(
+            self,
+            serialized,
+            empty_df=None):
+        """__init__
+
+        :param serialized: dictionary of dataset name to the
+            serialized dataset
+        :param empty_df: ``pandas.DataFrame`` for datasets
+            without any data
+        """
+        super().__init__(serialized)
+        self.empty_df = empty_df
+        if self.empty_df is None:
+            self.empty_df = pd.DataFrame([{}])
+        self.pending = set(serialized.keys())
+    # end of __init__
+
+    def __getitem__(
+            self,
+            name):
+        """__getitem__
+
+        :param name: dataset name
+        """
+        value = super().__getitem__(name)
+        if name in self.pending:
+            raw_data = value
+            value = self.empty_df
+            if raw_data:
+                value = pd.read_json(
+                    raw_data,
+                    orient='records')
+            super().__setitem__(name, value)
+            self.pending.discard(name)
+        return value
+    # end of __getitem__
+
+    def __setitem__(
+            self,
+            name,
+            value):
+        """__setitem__
+
+        :param name: dataset name
+        :param value: ``pandas.DataFrame``
+        """
+        self.pending.discard(name)
+        super().__setitem__(name, value)
+    # end of __setitem__
+
+    def __iter__(
+            self):
+        """__iter__
+
+        iterate over the dataset names (defining this makes
+        ``dict(node)`` and ``**node`` read each value with
+        ``__getitem__`` instead of copying the raw values)
+        """
+        return super().__iter__()
+    # end of __iter__
+
+    def __reduce__(
+            self):
+        """__reduce__
+
+        pickle the raw values and the names that are not
+        converted yet
+        """
+        return (
+            rebuild_lazy_dataset_dict,
+            (
+                dict(super().items()),
+                sorted(self.pending),
+                self.empty_df))
+    # end of __reduce__
+
+    def copy(
+            self):
+        """copy
+
+        shallow copy that keeps the datasets that are not
+        converted yet as json
+        """
+        return rebuild_lazy_dataset_dict(
+            raw_data=dict(super().items()),
+            pending=self.pending,
+            empty_df=self.empty_df)
+    # end of copy
+
+    def __copy__(
+            self):
+        """__copy__"""
+        return self.copy()
+    # end of __copy__
+
+    def __deepcopy__(
+            self,
+            memo):
+        """__deepcopy__
+
+        :param memo: ``copy.deepcopy`` memo dictionary
+        """
+        return rebuild_lazy_dataset_dict(
+            raw_data=copy.deepcopy(
+                dict(super().items()),
+                memo),
+            pending=self.pending,
+            empty_df=self.empty_df)
+    # end of __deepcopy__
+
+    def get(
+            self,
+            name,
+            default=None):
+        """get
+
+        :param name: dataset name
+        :param default: value if ``name`` is not in the node
+        """
+        if name in self:
+            return self[name]
+        return default
+    # end of get
+
+    def items(
+            self):
+        """items
+
+        convert all datasets and return the
+        ``(name, pandas.DataFrame)`` tuples
+        """
+        return [
+            (name, self[name])
+            for name in self
+        ]
+    # end of items
+
+    def values(
+            self):
+        """values
+
+        convert all datasets and return them
+        """
+        return [
+            self[name]
+            for name in self
+        ]
+    # end of values
+
+    def is_loaded(
+            self,
+            name):
+        """is_loaded
+
+        return ``True`` if the dataset was converted
+
+        :param name: dataset name
+        """
+        return name in self and name not in self.pending
+    # end of is_loaded
+
+# end of LazyDatasetDict
+
+
+def rebuild_lazy_dataset_dict(
+        raw_data,
+        pending,
+        empty_df=None):
+    """rebuild_lazy_dataset_dict
+
+    Build a ``LazyDatasetDict`` from raw values where only the
+    ``pending`` names are still serialized
+
+    :param raw_data: dictionary of dataset name to a
+        serialized dataset or a ``pandas.DataFrame``
+    :param pending: names of the datasets that are not
+        converted yet
+    :param empty_df: ``pandas.DataFrame`` for datasets
+        without any data
+    """
+    lazy_data = LazyDatasetDict(
+        serialized=raw_data,
+        empty_df=empty_df)
+    lazy_data.pending = set(pending) & set(raw_data.keys())
+    return lazy_data
+# end of rebuild_lazy_dataset_dict
+
+
+def prepare_node_for_algo(
+        node,
+        dataset_names=None,
+        lazy=None,
+        empty_df=None):
+    """prepare_node_for_algo
+
+    Convert one serialized node from an algorithm-ready
+    dataset (``{'id': ..., 'date': ..., 'data': {...}}``)
+    into a node with ``pandas.DataFrame`` datasets
+
+    :param node: dictionary with the serialized datasets in
+        ``node['data']``
+    :param dataset_names: optional - list of dataset names to
+        convert (default is ``DEFAULT_SERIALIZED_DATASETS``)
+    :param lazy: optional - bool for converting each dataset
+        on first access with a ``LazyDatasetDict``
+        (default is ``LAZY_DATASETS`` which is ``False``)
+    :param empty_df: optional - ``pandas.DataFrame`` for
+        datasets without any data
+    """
+    use_serialized_datasets = dataset_names
+    if not use_serialized_datasets:
+        use_serialized_datasets = DEFAULT_SERIALIZED_DATASETS
+    use_lazy = lazy
+    if use_lazy is None:
+        use_lazy = LAZY_DATASETS
+    empty_pd = empty_df
+    if empty_pd is None:
+        empty_pd = pd.DataFrame([{}])
+
+    new_node = {
+        'id': node['id'],
+        'date': node['date'],
+        'data': {}
+    }
+    if use_lazy:
+        serialized = {}
+        for ds_key in node['data']:
+            if ds_key in use_serialized_datasets:
+                serialized[ds_key] = node['data'][ds_key]
+        new_node['data'] = LazyDatasetDict(
+            serialized=serialized,
+            empty_df=empty_pd)
+        return new_node
+    # end of converting on first access
+
+    for ds_key in node['data']:
+        if ds_key in use_serialized_datasets:
+            new_node['data'][ds_key] = empty_pd
+            if node['data'][ds_key]:
+                new_node['data'][ds_key] = pd.read_json(
+                    node['data'][ds_key],
+                    orient='records')
+        # if supported dataset key
+    # end for all datasets in this node
+
+    return new_node
+# end of prepare_node_for_algo
+
+
 def prepare_dict_for_algo(
         data,
         compress=False,
         encoding='utf-8',
         convert_to_dict=False,
-        dataset_names=None):
+        dataset_names=None,
+        lazy=None):
     """prepare_dict_for_algo
 
     :param data: string holding contents of an algorithm-ready
@@ -33,6 +328,9 @@ def prepare_dict_for_algo(
     :param dataset_names: optional - list of string keys
         for each dataset node in:
         ``dataset[ticker][0]['data'][dataset_names[0]]``
+    :param lazy: optional - bool for converting each dataset
+        on first access with a ``LazyDatasetDict``
+        (default is ``LAZY_DATASETS`` which is ``False``)
     """
     log.debug('start')
     use_data = None
@@ -67,30 +365,28 @@ def prepare_dict_for_algo(
     use_serialized_datasets = dataset_names
     if not use_serialized_datasets:
         use_serialized_datasets = DEFAULT_SERIALIZED_DATASETS
+    use_lazy = lazy
+    if use_lazy is None:
+        use_lazy = LAZY_DATASETS
     log.info(
-        'converting serialized_datasets={}'.format(
-            use_serialized_datasets))
+        'converting serialized_datasets={} lazy={}'.format(
+            use_serialized_datasets,
+            use_lazy))
     num_datasets = 0
     for ticker in data_as_dict:
         if ticker not in use_data:
             use_data[ticker] = []
         for node in data_as_dict[ticker]:
-            new_node = {
-                'id': node['id'],
-                'date': node['date'],
-                'data': {}
-            }
+            use_data[ticker].append(
+                prepare_node_for_algo(
+                    node=node,
+                    dataset_names=use_serialized_datasets,
+                    lazy=use_lazy,
+                    empty_df=empty_pd))
             for ds_key in node['data']:
-                if ds_key in use_serialized_datasets:
-                    new_node['data'][ds_key] = empty_pd
-                    if node['data'][ds_key]:
-                        new_node['data'][ds_key] = pd.read_json(
-                            node['data'][ds_key],
-                            orient='records')
-                        num_datasets += 1
-                # if supported dataset key
-            # end for all datasets in this node
-            use_data[ticker].append(new_node)
+                if (ds_key in use_serialized_datasets and
+                        node['data'][ds_key]):
+                    num_datasets += 1
         # end for all datasets on this date to load
     # end for all tickers in the dataset
 
@@ -14,11 +14,12 @@ Dataset Publishing API
 
 import json
 import boto3
-import redis
 import zlib
 import analysis_engine.set_data_in_redis_key as redis_utils
 import analysis_engine.send_to_slack as slack_utils
 import analysis_engine.write_to_file as file_utils
+import analysis_engine.redis_pool as redis_pool
+import analysis_engine.df_serializers as df_serializers
 from analysis_engine.consts import SUCCESS
 from analysis_engine.consts import NOT_RUN
 from analysis_engine.consts import INVALID
@@ -104,8 +105,9 @@ def publish(
         (default is ``None``)
     :param redis_expire: optional - Redis expire value
         (default is ``None``)
-    :param redis_serializer: not used yet - support for future
-        pickle objects in redis
+    :param redis_serializer: optional - ``json`` (default) or
+        a binary columnar format for DataFrames published with
+        ``is_df=True``: ``arrow`` or ``parquet``
     :param redis_encoding: format of the encoded key in redis
 
     **(Optional) Minio (S3) connectivity arguments**
@@ -169,6 +171,12 @@ def publish(
         if verbose:
             log.debug('compress end')
 
+    # binary columnar redis serializers cache the DataFrame itself
+    redis_data = use_data
+    if (is_df and not compress and
+            redis_serializer in df_serializers.COLUMNAR_SERIALIZERS):
+        redis_data = data
+
     num_bytes = len(use_data)
     num_mb = get_mb(num_bytes)
 
@@ -254,7 +262,7 @@ def publish(
                 redis_key,
                 redis_expire))
 
-        rc = redis.Redis(
+        rc = redis_pool.get_redis_client(
             host=redis_host,
             port=redis_port,
             password=redis_password,
@@ -264,7 +272,7 @@ def publish(
             label=label,
             client=rc,
             key=redis_key,
-            data=use_data,
+            data=redis_data,
             serializer=redis_serializer,
             encoding=redis_encoding,
             expire=redis_expire,
@@ -0,0 +1,291 @@
+"""
+Shared Redis Connection Pools
+=============================
+
+Process-wide registry of Redis connection pools keyed by
+``host:port``, ``db`` and ``password``. Extract, publish and
+the Celery tasks use ``get_redis_client`` instead of building a
+new ``redis.Redis`` (and a new TCP connection) for every key.
+
+The registry is fork-safe: it records the pid that created the
+pools and drops them in a child process (like a Celery prefork
+worker) so a child never reuses its parent's sockets.
+
+Pool stats are available with ``get_redis_pool_stats()``:
+
+.. code-block:: python
+
+    import analysis_engine.redis_pool as redis_pool
+    print(redis_pool.get_redis_pool_stats())
+
+**Supported environment variables**
+
+::
+
+    # disable the shared pools and create a new
+    # redis client on every call
+    export REDIS_POOL_ENABLED=0
+
+    # max connections per pool before callers wait
+    export REDIS_POOL_MAX_CONNECTIONS=50
+
+    # seconds to wait for a free connection
+    export REDIS_POOL_TIMEOUT=20
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import os
+import threading
+import redis
+from spylunking.log.setup_logging import build_colorized_logger
+from analysis_engine.consts import REDIS_ADDRESS
+from analysis_engine.consts import ev
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+REDIS_POOL_ENABLED = ev(
+    'REDIS_POOL_ENABLED',
+    '1') == '1'
+REDIS_POOL_MAX_CONNECTIONS = int(ev(
+    'REDIS_POOL_MAX_CONNECTIONS',
+    '50'))
+REDIS_POOL_TIMEOUT = int(ev(
+    'REDIS_POOL_TIMEOUT',
+    '20'))
+
+POOLS = {}
+POOLS_PID = os.getpid()
+POOLS_LOCK = threading.Lock()
+
+
+class TrackedConnectionPool(redis.BlockingConnectionPool):
+    """TrackedConnectionPool
+
+    ``redis.BlockingConnectionPool`` that counts connections
+    in use and how many times a caller had to wait for a
+    free connection
+    """
+
+    def reset(
+            self):
+        """reset
+
+        reset the pool and its counters (this is also called
+        by ``redis-py`` when the pool is used after a fork)
+        """
+        super().reset()
+        self.stats_lock = threading.Lock()
+        self.num_in_use = 0
+        self.num_waits = 0
+    # end of reset
+
+    def get_connection(
+            self,
+            command_name,
+            *keys,
+            **options):
+        """get_connection
+
+        get a connection from the pool and track
+        if the caller had to wait for it
+
+        :param command_name: redis command
+        :param keys: redis keys
+        :param options: redis options
+        """
+        if self.pool.empty():
+            with self.stats_lock:
+                self.num_waits += 1
+        connection = super().get_connection(
+            command_name,
+            *keys,
+            **options)
+        with self.stats_lock:
+            self.num_in_use += 1
+        return connection
+    # end of get_connection
+
+    def release(
+            self,
+            connection):
+        """release
+
+        release a connection back to the pool
+
+        :param connection: redis connection
+        """
+        super().release(connection)
+        with self.stats_lock:
+            if self.num_in_use > 0:
+                self.num_in_use -= 1
+    # end of release
+
+# end of TrackedConnectionPool
+
+
+def get_pools():
+    """get_pools
+
+    Get the registry of pools for this process. If the
+    process was forked since the pools were created,
+    the registry is cleared without closing the parent's
+    connections.
+    """
+    global POOLS
+    global POOLS_PID
+    global POOLS_LOCK
+    cur_pid = os.getpid()
+    if cur_pid != POOLS_PID:
+        POOLS = {}
+        POOLS_PID = cur_pid
+        POOLS_LOCK = threading.Lock()
+    return POOLS
+# end of get_pools
+
+
+def get_redis_pool(
+        host,
+        port,
+        password=None,
+        db=0):
+    """get_redis_pool
+
+    Get (or create) the shared pool for a redis server
+
+    :param host: redis host
+    :param port: redis port
+    :param password: redis password
+    :param db: redis db
+    """
+    pools = get_pools()
+    pool_key = (
+        host,
+        int(port),
+        int(db),
+        password)
+    pool = pools.get(
+        pool_key,
+        None)
+    if pool:
+        return pool
+
+    with POOLS_LOCK:
+        pool = pools.get(
+            pool_key,
+            None)
+        if not pool:
+            log.debug(
+                'creating redis pool={}:{}@{} max={}'.format(
+                    host,
+                    port,
+                    db,
+                    REDIS_POOL_MAX_CONNECTIONS))
+            pool = TrackedConnectionPool(
+                host=host,
+                port=int(port),
+                password=password,
+                db=int(db),
+                max_connections=REDIS_POOL_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT)
+            pools[pool_key] = pool
+    # end of creating the pool
+
+    return pool
+# end of get_redis_pool
+
+
+def get_redis_client(
+        address=None,
+        host=None,
+        port=None,
+        password=None,
+        db=None):
+    """get_redis_client
+
+    Get a ``redis.Redis`` client backed by the shared
+    pool for the ``address`` (or ``host`` and ``port``)
+
+    :param address: redis address: <host:port>
+    :param host: redis host
+    :param port: redis port
+    :param password: redis password
+    :param db: redis db
+    """
+    use_host = host
+    use_port = port
+    if not use_host and not use_port:
+        use_address = address if address else REDIS_ADDRESS
+        use_host = use_address.split(':')[0]
+        use_port = use_address.split(':')[1]
+    use_port = int(use_port)
+    use_db = int(db) if db is not None else 0
+
+    if not REDIS_POOL_ENABLED:
+        return redis.Redis(
+            host=use_host,
+            port=use_port,
+            password=password,
+            db=use_db)
+
+    return redis.Redis(
+        host=use_host,
+        port=use_port,
+        password=password,
+        db=use_db,
+        connection_pool=get_redis_pool(
+            host=use_host,
+            port=use_port,
+            password=password,
+            db=use_db))
+# end of get_redis_client
+
+
+def get_redis_pool_stats():
+    """get_redis_pool_stats
+
+    Get a list of stats dictionaries for the pools in
+    this process with keys: ``address``, ``db``,
+    ``max_connections``, ``created``, ``in_use``
+    and ``waits``
+    """
+    stats = []
+    for pool_key, pool in list(get_pools().items()):
+        stats.append({
+            'address': '{}:{}'.format(
+                pool_key[0],
+                pool_key[1]),
+            'db': pool_key[2],
+            'pid': POOLS_PID,
+            'max_connections': pool.max_connections,
+            'created': len(getattr(pool, '_connections', [])),
+            'in_use': pool.num_in_use,
+            'waits': pool.num_waits
+        })
+    return stats
+# end of get_redis_pool_stats
+
+
+def reset_redis_pools():
+    """reset_redis_pools
+
+    Disconnect and remove all pools in this process
+    """
+    global POOLS
+    with POOLS_LOCK:
+        for pool in get_pools().values():
+            try:
+                pool.disconnect()
+            except Exception as e:
+                log.debug(
+                    'failed disconnecting redis pool ex={}'.format(
+                        e))
+        POOLS = {}
+# end of reset_redis_pools
@@ -10,6 +10,7 @@ Supported Datasets:
 import analysis_engine.load_dataset as load_dataset
 import analysis_engine.show_dataset as show_dataset
 import analysis_engine.get_data_from_redis_key as redis_utils
+import analysis_engine.redis_pool as redis_pool
 import analysis_engine.publish as publish
 from analysis_engine.consts import SUCCESS
 from analysis_engine.consts import REDIS_ADDRESS
@@ -53,6 +54,9 @@ def restore_dataset(
         slack_enabled=False,
         slack_code_block=False,
         slack_full_width=False,
+        tickers=None,
+        start_date=None,
+        end_date=None,
         verbose=False):
     """restore_dataset
 
@@ -72,7 +76,8 @@ def restore_dataset(
     :param serialize_datasets: optional - list of dataset names to
         deserialize in the dataset
     :param path_to_file: optional - path to an algorithm-ready dataset
-        in a file
+        in a file or a columnar dataset directory (see
+        ``analysis_engine.columnar_dataset``)
     :param compress: optional - boolean flag for decompressing
         the contents of the ``path_to_file`` if necessary
         (default is ``False`` and algorithms
@@ -132,6 +137,12 @@ def restore_dataset(
 
     Additonal arguments
 
+    :param tickers: optional - list of tickers to load from a
+        columnar dataset (default is all tickers)
+    :param start_date: optional - first date to load from a
+        columnar dataset
+    :param end_date: optional - last date to load from a
+        columnar dataset
     :param verbose: optional - bool for increasing
         logging
     """
@@ -162,7 +173,10 @@ def restore_dataset(
             redis_password=redis_password,
             redis_expire=redis_expire,
             redis_serializer=redis_serializer,
-            serialize_datasets=serialize_datasets)
+            serialize_datasets=serialize_datasets,
+            tickers=tickers,
+            start_date=start_date,
+            end_date=end_date)
 
     # end of if show_summary
 
@@ -190,7 +204,10 @@ def restore_dataset(
             redis_password=redis_password,
             redis_expire=redis_expire,
             redis_serializer=redis_serializer,
-            serialize_datasets=serialize_datasets)
+            serialize_datasets=serialize_datasets,
+            tickers=tickers,
+            start_date=start_date,
+            end_date=end_date)
     # load if not loaded
 
     if not use_ds:
@@ -202,6 +219,12 @@ def restore_dataset(
                 redis_key))
         return None
 
+    rc = redis_pool.get_redis_client(
+        host=redis_host,
+        port=redis_port,
+        password=redis_password,
+        db=redis_db)
+
     log.info('restore - start')
     total_to_restore = 0
     for ticker in use_ds:
@@ -228,6 +251,7 @@ def restore_dataset(
                 print(ds_parent_key)
 
             cache_res = redis_utils.get_data_from_redis_key(
+                client=rc,
                 host=redis_host,
                 port=redis_port,
                 password=redis_password,
@@ -302,6 +326,7 @@ def restore_dataset(
                                         new_key))
 
                             cache_res = redis_utils.get_data_from_redis_key(
+                                client=rc,
                                 host=redis_host,
                                 port=redis_port,
                                 password=redis_password,
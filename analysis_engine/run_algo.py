@@ -29,6 +29,9 @@ import json
 import analysis_engine.consts as ae_consts
 import analysis_engine.utils as ae_utils
 import analysis_engine.build_algo_request as algo_utils
+import analysis_engine.extract_batch_utils as extract_batch_utils
+import analysis_engine.df_cache as df_cache
+import analysis_engine.shared_dataset_cache as shared_dataset_cache
 import analysis_engine.iex.extract_df_from_redis as iex_extract_utils
 import analysis_engine.yahoo.extract_df_from_redis as yahoo_extract_utils
 import analysis_engine.algo as default_algo
@@ -85,7 +88,16 @@ def run_algo(
         config_file=None,
         config_dict=None,
         version=1,
-        raise_on_err=False):
+        extract_batch=True,
+        extract_batch_size=None,
+        extract_workers=None,
+        extract_worker_type=None,
+        extract_cache=None,
+        extract_cache_version=None,
+        dataset_cache=None,
+        dataset_cache_version=None,
+        raise_on_err=False,
+        extract_s3_fallback=None):
     """run_algo
 
     Run an algorithm with steps:
@@ -176,10 +188,47 @@ def run_algo(
         (default is ``None``)
     :param redis_key: optional - redis key not used
         (default is ``None``)
+    :param extract_batch: optional - bool for extracting all
+        datasets for all dates with pipelined ``MGET`` calls
+        over one Redis connection instead of one ``GET``
+        per dataset per date
+        (default is ``True``)
+    :param extract_batch_size: optional - number of keys
+        per ``MGET`` in the batch extract pipeline
+        (default is ``EXTRACT_BATCH_CHUNK_SIZE`` or ``500``)
+    :param extract_workers: optional - number of workers for
+        decoding and scrubbing each ticker's dates concurrently
+        during a batch extract. ``algo.handle_data`` still gets
+        each ticker's datasets in ascending date order. Only used
+        with ``extract_batch=True`` and Redis enabled (a warning
+        is logged otherwise)
+        (default is ``EXTRACT_WORKERS`` which is serial)
+    :param extract_worker_type: optional - ``thread`` or
+        ``process`` pool for ``extract_workers``
+        (default is ``EXTRACT_WORKER_TYPE`` or ``thread``)
+    :param extract_cache: optional - bool for serving scrubbed
+        datasets from the in-process ``analysis_engine.df_cache``
+        LRU cache on repeated runs over the same dates
+        (default is ``DF_CACHE_ENABLED`` which is ``False``)
+    :param extract_cache_version: optional - content version
+        for the cached datasets. Change it after re-publishing
+        datasets to stop using the cached copies
+        (default is ``DF_CACHE_VERSION``)
+    :param dataset_cache: optional - bool for sharing the
+        extracted algorithm-ready dataset with the other
+        processes on this host through the memory-mapped
+        ``analysis_engine.shared_dataset_cache``
+        (default is ``SHARED_DATASET_CACHE_ENABLED`` which
+        is ``False``)
+    :param dataset_cache_version: optional - content version
+        for the shared datasets
+        (default is ``SHARED_DATASET_CACHE_VERSION``)
 
     **(Optional) Minio (S3) connectivity arguments**
 
     :param s3_enabled: bool - toggle for auto-archiving on Minio (S3)
+        and for reading datasets missing from redis out of the
+        ``s3_bucket`` archive when ``extract_s3_fallback`` is set
         (default is ``True``)
     :param s3_address: Minio S3 connection string format: ``host:port``
         (default is ``localhost:9000``)
@@ -225,6 +274,13 @@ def run_algo(
         ``analysis_engine.run_algo.run_algo`` helper.
         When set to ``True`` exceptions will
         are raised to the calling functions
+
+    **(Optional) Extract from S3**
+
+    :param extract_s3_fallback: optional - bool for reading
+        datasets missing from redis out of the ``s3_bucket``
+        archive and writing them back into redis
+        (default is ``EXTRACT_S3_FALLBACK`` which is ``False``)
     """
 
     # dictionary structure with a list sorted on: ascending dates
@@ -378,6 +434,8 @@ def run_algo(
     common_vals['s3_access_key'] = s3_access_key
     common_vals['s3_secret_key'] = s3_secret_key
     common_vals['s3_key'] = ticker_key
+    if extract_s3_fallback is not None:
+        common_vals['s3_fallback'] = extract_s3_fallback
     common_vals['redis_enabled'] = redis_enabled
     common_vals['redis_address'] = redis_address
     common_vals['redis_password'] = redis_password
@@ -487,6 +545,8 @@ def run_algo(
                 base_key=date_key,
                 ds_id=label,
                 service_dict=common_vals)
+            date_req['df_cache'] = extract_cache
+            date_req['df_cache_version'] = extract_cache_version
             node_date_key = date_key.replace(
                 '{}_'.format(ticker),
                 '')
@@ -506,6 +566,74 @@ def run_algo(
     if extract_mode not in ['all', 'yahoo']:
         extract_yahoo = False
 
+    shared_cache = shared_dataset_cache.get_enabled_shared_dataset_cache(
+        enabled=dataset_cache)
+    shared_dataset_id = None
+    cached_dataset = None
+    if shared_cache:
+        shared_dataset_id = shared_dataset_cache.build_dataset_id(
+            tickers=use_tickers,
+            start_date=use_start_date_str,
+            end_date=use_end_date_str,
+            datasets=iex_datasets,
+            extract_mode=extract_mode,
+            version=dataset_cache_version,
+            redis_address=redis_address,
+            redis_db=redis_db,
+            s3_address=s3_address,
+            s3_bucket=s3_bucket)
+        cached_dataset = shared_cache.get(
+            dataset_id=shared_dataset_id,
+            tickers=use_tickers)
+    if cached_dataset:
+        # another worker on this host already extracted it
+        algo_data_req = cached_dataset
+        extract_requests = []
+    # end of checking the shared dataset cache
+
+    batch_data = None
+    if (extract_workers and int(extract_workers) > 1 and
+            extract_requests and
+            not (extract_batch and redis_enabled)):
+        log.warning(
+            '{} - ignoring extract_workers={} extract_worker_type={} '
+            'because they only apply to a batch extract '
+            '(extract_batch={} redis_enabled={}) - extracting '
+            'serially'.format(
+                label,
+                extract_workers,
+                extract_worker_type,
+                extract_batch,
+                redis_enabled))
+    if extract_batch and redis_enabled and extract_requests:
+        batch_datasets = extract_batch_utils.get_batch_datasets(
+            iex_datasets=iex_datasets,
+            extract_iex=extract_iex,
+            extract_yahoo=extract_yahoo)
+        log.info(
+            '{} - batch extract - nodes={} datasets={} '
+            'workers={}'.format(
+                label,
+                len(extract_requests),
+                len(batch_datasets),
+                extract_workers))
+        batch_data = extract_batch_utils.extract_datasets_in_batch(
+            extract_requests=extract_requests,
+            datasets=batch_datasets,
+            label=label,
+            address=redis_address,
+            password=redis_password,
+            db=redis_db,
+            chunk_size=extract_batch_size,
+            workers=extract_workers,
+            worker_type=extract_worker_type,
+            s3_req=common_vals,
+            cache=df_cache.get_enabled_df_cache(
+                enabled=extract_cache),
+            cache_version=extract_cache_version,
+            verbose=verbose)
+    # end of batch extract
+
     first_extract_date = None
     last_extract_date = None
     total_extract_requests = len(extract_requests)
@@ -532,136 +660,152 @@ def run_algo(
         log.debug(
             '{} - extract - start'.format(
                 percent_label))
-        if 'daily' in iex_datasets or extract_iex:
-            iex_daily_status, iex_daily_df = \
-                iex_extract_utils.extract_daily_dataset(
-                    extract_req)
-            if iex_daily_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract iex_daily={}'.format(ticker))
-        if 'minute' in iex_datasets or extract_iex:
-            iex_minute_status, iex_minute_df = \
-                iex_extract_utils.extract_minute_dataset(
-                    extract_req)
-            if iex_minute_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract iex_minute={}'.format(ticker))
-        if 'quote' in iex_datasets or extract_iex:
-            iex_quote_status, iex_quote_df = \
-                iex_extract_utils.extract_quote_dataset(
-                    extract_req)
-            if iex_quote_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract iex_quote={}'.format(ticker))
-        if 'stats' in iex_datasets or extract_iex:
-            iex_stats_df, iex_stats_df = \
-                iex_extract_utils.extract_stats_dataset(
-                    extract_req)
-            if iex_stats_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract iex_stats={}'.format(ticker))
-        if 'peers' in iex_datasets or extract_iex:
-            iex_peers_df, iex_peers_df = \
-                iex_extract_utils.extract_peers_dataset(
-                    extract_req)
-            if iex_peers_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract iex_peers={}'.format(ticker))
-        if 'news' in iex_datasets or extract_iex:
-            iex_news_status, iex_news_df = \
-                iex_extract_utils.extract_news_dataset(
-                    extract_req)
-            if iex_news_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract iex_news={}'.format(ticker))
-        if 'financials' in iex_datasets or extract_iex:
-            iex_financials_status, iex_financials_df = \
-                iex_extract_utils.extract_financials_dataset(
-                    extract_req)
-            if iex_financials_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract iex_financials={}'.format(ticker))
-        if 'earnings' in iex_datasets or extract_iex:
-            iex_earnings_status, iex_earnings_df = \
-                iex_extract_utils.extract_earnings_dataset(
-                    extract_req)
-            if iex_earnings_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract iex_earnings={}'.format(ticker))
-        if 'dividends' in iex_datasets or extract_iex:
-            iex_dividends_status, iex_dividends_df = \
-                iex_extract_utils.extract_dividends_dataset(
-                    extract_req)
-            if iex_dividends_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract iex_dividends={}'.format(ticker))
-        if 'company' in iex_datasets or extract_iex:
-            iex_company_status, iex_company_df = \
-                iex_extract_utils.extract_company_dataset(
-                    extract_req)
-            if iex_company_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract iex_company={}'.format(ticker))
-        # end of iex extracts
-
-        if extract_yahoo:
-            yahoo_options_status, yahoo_option_calls_df = \
-                yahoo_extract_utils.extract_option_calls_dataset(
-                    extract_req)
-            yahoo_options_status, yahoo_option_puts_df = \
-                yahoo_extract_utils.extract_option_puts_dataset(
-                    extract_req)
-            if yahoo_options_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract yahoo_options={}'.format(ticker))
-            yahoo_pricing_status, yahoo_pricing_df = \
-                yahoo_extract_utils.extract_pricing_dataset(
-                    extract_req)
-            if yahoo_pricing_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract yahoo_pricing={}'.format(ticker))
-            yahoo_news_status, yahoo_news_df = \
-                yahoo_extract_utils.extract_yahoo_news_dataset(
-                    extract_req)
-            if yahoo_news_status != ae_consts.SUCCESS:
-                if verbose:
-                    log.warning(
-                        'unable to extract yahoo_news={}'.format(ticker))
-        # end of yahoo extracts
-
-        # map extracted data to DEFAULT_SERIALIZED_DATASETS
-        ticker_data = {}
-        ticker_data['daily'] = iex_daily_df
-        ticker_data['minute'] = iex_minute_df
-        ticker_data['quote'] = iex_quote_df
-        ticker_data['stats'] = iex_stats_df
-        ticker_data['peers'] = iex_peers_df
-        ticker_data['news1'] = iex_news_df
-        ticker_data['financials'] = iex_financials_df
-        ticker_data['earnings'] = iex_earnings_df
-        ticker_data['dividends'] = iex_dividends_df
-        ticker_data['company'] = iex_company_df
-        ticker_data['calls'] = yahoo_option_calls_df
-        ticker_data['puts'] = yahoo_option_puts_df
-        ticker_data['pricing'] = yahoo_pricing_df
-        ticker_data['news'] = yahoo_news_df
-
-        if ticker not in algo_data_req:
-            algo_data_req[ticker] = []
-
-        algo_data_req[ticker].append({
+        if batch_data is not None:
+            ticker_data = batch_data[idx]
+        else:
+            if 'daily' in iex_datasets or extract_iex:
+                iex_daily_status, iex_daily_df = \
+                    iex_extract_utils.extract_daily_dataset(
+                        extract_req)
+                if iex_daily_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract iex_daily={}'.format(
+                                extract_ticker))
+            if 'minute' in iex_datasets or extract_iex:
+                iex_minute_status, iex_minute_df = \
+                    iex_extract_utils.extract_minute_dataset(
+                        extract_req)
+                if iex_minute_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract iex_minute={}'.format(
+                                extract_ticker))
+            if 'quote' in iex_datasets or extract_iex:
+                iex_quote_status, iex_quote_df = \
+                    iex_extract_utils.extract_quote_dataset(
+                        extract_req)
+                if iex_quote_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract iex_quote={}'.format(
+                                extract_ticker))
+            if 'stats' in iex_datasets or extract_iex:
+                iex_stats_status, iex_stats_df = \
+                    iex_extract_utils.extract_stats_dataset(
+                        extract_req)
+                if iex_stats_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract iex_stats={}'.format(
+                                extract_ticker))
+            if 'peers' in iex_datasets or extract_iex:
+                iex_peers_status, iex_peers_df = \
+                    iex_extract_utils.extract_peers_dataset(
+                        extract_req)
+                if iex_peers_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract iex_peers={}'.format(
+                                extract_ticker))
+            if 'news' in iex_datasets or extract_iex:
+                iex_news_status, iex_news_df = \
+                    iex_extract_utils.extract_news_dataset(
+                        extract_req)
+                if iex_news_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract iex_news={}'.format(
+                                extract_ticker))
+            if 'financials' in iex_datasets or extract_iex:
+                iex_financials_status, iex_financials_df = \
+                    iex_extract_utils.extract_financials_dataset(
+                        extract_req)
+                if iex_financials_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract iex_financials={}'.format(
+                                extract_ticker))
+            if 'earnings' in iex_datasets or extract_iex:
+                iex_earnings_status, iex_earnings_df = \
+                    iex_extract_utils.extract_earnings_dataset(
+                        extract_req)
+                if iex_earnings_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract iex_earnings={}'.format(
+                                extract_ticker))
+            if 'dividends' in iex_datasets or extract_iex:
+                iex_dividends_status, iex_dividends_df = \
+                    iex_extract_utils.extract_dividends_dataset(
+                        extract_req)
+                if iex_dividends_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract iex_dividends={}'.format(
+                                extract_ticker))
+            if 'company' in iex_datasets or extract_iex:
+                iex_company_status, iex_company_df = \
+                    iex_extract_utils.extract_company_dataset(
+                        extract_req)
+                if iex_company_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract iex_company={}'.format(
+                                extract_ticker))
+            # end of iex extracts
+
+            if extract_yahoo:
+                yahoo_options_status, yahoo_option_calls_df = \
+                    yahoo_extract_utils.extract_option_calls_dataset(
+                        extract_req)
+                yahoo_options_status, yahoo_option_puts_df = \
+                    yahoo_extract_utils.extract_option_puts_dataset(
+                        extract_req)
+                if yahoo_options_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract yahoo_options={}'.format(
+                                extract_ticker))
+                yahoo_pricing_status, yahoo_pricing_df = \
+                    yahoo_extract_utils.extract_pricing_dataset(
+                        extract_req)
+                if yahoo_pricing_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract yahoo_pricing={}'.format(
+                                extract_ticker))
+                yahoo_news_status, yahoo_news_df = \
+                    yahoo_extract_utils.extract_yahoo_news_dataset(
+                        extract_req)
+                if yahoo_news_status != ae_consts.SUCCESS:
+                    if verbose:
+                        log.warning(
+                            'unable to extract yahoo_news={}'.format(
+                                extract_ticker))
+            # end of yahoo extracts
+
+            # map extracted data to DEFAULT_SERIALIZED_DATASETS
+            ticker_data = {}
+            ticker_data['daily'] = iex_daily_df
+            ticker_data['minute'] = iex_minute_df
+            ticker_data['quote'] = iex_quote_df
+            ticker_data['stats'] = iex_stats_df
+            ticker_data['peers'] = iex_peers_df
+            ticker_data['news1'] = iex_news_df
+            ticker_data['financials'] = iex_financials_df
+            ticker_data['earnings'] = iex_earnings_df
+            ticker_data['dividends'] = iex_dividends_df
+            ticker_data['company'] = iex_company_df
+            ticker_data['calls'] = yahoo_option_calls_df
+            ticker_data['puts'] = yahoo_option_puts_df
+            ticker_data['pricing'] = yahoo_pricing_df
+            ticker_data['news'] = yahoo_news_df
+
+        if extract_ticker not in algo_data_req:
+            algo_data_req[extract_ticker] = []
+
+        algo_data_req[extract_ticker].append({
             'id': dataset_id,  # id is currently the cache key in redis
             'date': extract_date,  # used to confirm dates in asc order
             'data': ticker_data
@@ -670,10 +814,27 @@ def run_algo(
         log.info(
             'extract - {} dataset={}'.format(
                 percent_label,
-                len(algo_data_req[ticker])))
+                len(algo_data_req[extract_ticker])))
         cur_idx += 1
     # end of for service_dict in extract_requests
 
+    if cached_dataset:
+        cached_dates = [
+            node['date']
+            for nodes in cached_dataset.values()
+            for node in nodes
+        ]
+        first_extract_date = min(cached_dates)
+        last_extract_date = max(cached_dates)
+        percent_label = '{} shared dataset={}'.format(
+            label,
+            shared_dataset_id)
+    elif shared_cache and algo_data_req:
+        shared_cache.put(
+            dataset_id=shared_dataset_id,
+            dataset=algo_data_req)
+    # end of sharing the extracted dataset
+
     # this could be a separate celery task
     status = ae_consts.NOT_RUN
     if len(algo_data_req) == 0:
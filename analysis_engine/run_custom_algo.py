@@ -14,12 +14,10 @@ Example with the command line tool:
 """
 
 import os
-import inspect
-import types
-import importlib.machinery
 import datetime
 import json
 import analysis_engine.consts as ae_consts
+import analysis_engine.module_cache as module_cache
 import analysis_engine.build_algo_request as build_algo_request
 import analysis_engine.build_publish_request as build_publish_request
 import analysis_engine.build_result as build_result
@@ -109,7 +107,14 @@ def run_custom_algo(
         ssl_options=ae_consts.SSL_OPTIONS,
         transport_options=ae_consts.TRANSPORT_OPTIONS,
         path_to_config_module=ae_consts.WORKER_CELERY_CONFIG_MODULE,
-        raise_on_err=True):
+        extract_workers=None,
+        extract_worker_type=None,
+        extract_cache=None,
+        extract_cache_version=None,
+        dataset_cache=None,
+        dataset_cache_version=None,
+        raise_on_err=True,
+        extract_s3_fallback=None):
     """run_custom_algo
 
     Run a custom algorithm that derives the
@@ -173,6 +178,34 @@ def run_custom_algo(
         (default is ``analysis_engine.work_tasks.celery_config``
         or ``analysis_engine.consts.WORKER_CELERY_CONFIG_MODULE``)
 
+    **Extract Arguments**
+
+    :param extract_workers: optional - number of workers for
+        decoding and scrubbing cached datasets concurrently
+        before the backtest starts
+        (default is ``EXTRACT_WORKERS`` which is serial)
+    :param extract_worker_type: optional - ``thread`` or
+        ``process`` pool for ``extract_workers``
+        (default is ``EXTRACT_WORKER_TYPE`` or ``thread``)
+    :param extract_cache: optional - bool for serving scrubbed
+        datasets from the in-process ``analysis_engine.df_cache``
+        LRU cache when running many backtests in one process
+        (default is ``DF_CACHE_ENABLED`` which is ``False``)
+    :param extract_cache_version: optional - content version
+        for the cached datasets
+        (default is ``DF_CACHE_VERSION``)
+    :param dataset_cache: optional - bool for sharing extracted
+        datasets with the other workers on the same host through
+        the memory-mapped ``analysis_engine.shared_dataset_cache``
+        (default is ``SHARED_DATASET_CACHE_ENABLED`` which
+        is ``False``)
+    :param dataset_cache_version: optional - content version
+        for the shared datasets
+        (default is ``SHARED_DATASET_CACHE_VERSION``)
+    :param extract_s3_fallback: optional - bool for reading
+        datasets missing from redis out of the S3 archive
+        (default is ``EXTRACT_S3_FALLBACK`` which is ``False``)
+
     **Load Algorithm-Ready Dataset From Source**
 
     Use these arguments to load algorithm-ready datasets
@@ -390,6 +423,7 @@ def run_custom_algo(
 
     module_name = 'BaseAlgo'
     custom_algo_module = None
+    use_class_member_object = None
     new_algo_object = None
     use_custom_algo = False
     found_algo_module = True
@@ -418,20 +452,13 @@ def run_custom_algo(
     err = None
     if mod_path:
         module_name = mod_path.split('/')[-1]
-        loader = importlib.machinery.SourceFileLoader(
-            module_name,
-            mod_path)
-        custom_algo_module = types.ModuleType(
-            loader.name)
-        loader.exec_module(
-            custom_algo_module)
+        # the module file is only executed again if it changed
+        custom_algo_module, use_class_member_object = \
+            module_cache.find_member(
+                module_name=module_name,
+                path_to_module=mod_path)
         use_custom_algo = True
-
-        for member in inspect.getmembers(custom_algo_module):
-            if module_name in str(member):
-                found_algo_module = True
-                break
-        # for all members in this custom module file
+        found_algo_module = use_class_member_object is not None
     # if loading a custom algorithm module from a file on disk
 
     if not found_algo_module:
@@ -713,6 +740,20 @@ def run_custom_algo(
         label=name)
 
     algo_req['name'] = name
+    if extract_workers:
+        algo_req['extract_workers'] = extract_workers
+    if extract_worker_type:
+        algo_req['extract_worker_type'] = extract_worker_type
+    if extract_cache is not None:
+        algo_req['extract_cache'] = extract_cache
+    if extract_cache_version is not None:
+        algo_req['extract_cache_version'] = extract_cache_version
+    if dataset_cache is not None:
+        algo_req['dataset_cache'] = dataset_cache
+    if dataset_cache_version is not None:
+        algo_req['dataset_cache_version'] = dataset_cache_version
+    if extract_s3_fallback is not None:
+        algo_req['extract_s3_fallback'] = extract_s3_fallback
 
     algo_res = build_result.build_result(
         status=ae_consts.NOT_RUN,
@@ -778,19 +819,12 @@ def run_custom_algo(
             'inspecting {} for class {}'.format(
                 custom_algo_module,
                 module_name))
-        use_class_member_object = None
-        for member in inspect.getmembers(custom_algo_module):
-            if module_name in str(member):
-                log.info(
-                    'start {} with {}'.format(
-                        name,
-                        member[1]))
-                use_class_member_object = member
-                break
-        # end of looking over the class definition but did not find it
-
         if use_class_member_object:
-            new_algo_object = member[1](
+            log.info(
+                'start {} with {}'.format(
+                    name,
+                    use_class_member_object[1]))
+            new_algo_object = use_class_member_object[1](
                 **algo_req)
         else:
             err = (
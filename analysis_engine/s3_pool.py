@@ -0,0 +1,325 @@
+"""
+Shared S3 Clients
+=================
+
+Process-wide registry of ``boto3`` S3 clients keyed by the
+endpoint, credentials and region. Extract uses
+``get_s3_client`` instead of building a new ``boto3`` client
+(and a new connection pool) for every key, and
+``get_data_from_s3_keys`` to download many archived keys with
+a bounded number of concurrent ``GET`` requests.
+
+The registry is fork-safe like ``analysis_engine.redis_pool``:
+a child process (like a Celery prefork worker) builds its own
+clients instead of reusing its parent's sockets.
+
+**Supported environment variables**
+
+::
+
+    # max concurrent S3 GET requests per extract
+    export S3_MAX_CONCURRENT_GETS=8
+
+    # seconds before giving up on connecting or reading
+    export S3_CONNECT_TIMEOUT=5
+    export S3_READ_TIMEOUT=60
+
+    # max attempts per request (including the first one)
+    export S3_MAX_ATTEMPTS=2
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import os
+import threading
+import concurrent.futures
+import boto3
+from spylunking.log.setup_logging import build_colorized_logger
+from analysis_engine.consts import S3_ACCESS_KEY
+from analysis_engine.consts import S3_SECRET_KEY
+from analysis_engine.consts import S3_REGION_NAME
+from analysis_engine.consts import S3_ADDRESS
+from analysis_engine.consts import S3_SECURE
+from analysis_engine.consts import ev
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+S3_MAX_CONCURRENT_GETS = int(ev(
+    'S3_MAX_CONCURRENT_GETS',
+    '8'))
+S3_CONNECT_TIMEOUT = int(ev(
+    'S3_CONNECT_TIMEOUT',
+    '5'))
+S3_READ_TIMEOUT = int(ev(
+    'S3_READ_TIMEOUT',
+    '60'))
+S3_MAX_ATTEMPTS = int(ev(
+    'S3_MAX_ATTEMPTS',
+    '2'))
+
+# error codes for a key that is not in the archive
+S3_MISSING_CODES = [
+    'NoSuchKey',
+    'NoSuchBucket',
+    '404'
+]
+
+CLIENTS = {}
+CLIENTS_PID = os.getpid()
+CLIENTS_LOCK = threading.Lock()
+
+
+def get_clients():
+    """get_clients
+
+    Get the registry of S3 clients for this process. If the
+    process was forked since the clients were created, the
+    registry is cleared.
+    """
+    global CLIENTS
+    global CLIENTS_PID
+    global CLIENTS_LOCK
+    cur_pid = os.getpid()
+    if cur_pid != CLIENTS_PID:
+        CLIENTS = {}
+        CLIENTS_PID = cur_pid
+        CLIENTS_LOCK = threading.Lock()
+    return CLIENTS
+# end of get_clients
+
+
+def get_s3_client(
+        address=None,
+        access_key=None,
+        secret_key=None,
+        region_name=None,
+        secure=None):
+    """get_s3_client
+
+    Get (or create) the shared ``boto3`` S3 client for an
+    endpoint. ``boto3`` clients are thread-safe, so one client
+    serves all concurrent ``GET`` requests in this process.
+
+    :param address: S3 address: <host:port>
+    :param access_key: S3 access key
+    :param secret_key: S3 secret key
+    :param region_name: S3 region name
+    :param secure: bool or ``'1'`` - use https
+    """
+    use_address = address if address else S3_ADDRESS
+    use_access_key = access_key if access_key else S3_ACCESS_KEY
+    use_secret_key = secret_key if secret_key else S3_SECRET_KEY
+    use_region_name = region_name if region_name else S3_REGION_NAME
+    use_secure = secure if secure is not None else S3_SECURE
+    use_secure = use_secure is True or str(use_secure) == '1'
+
+    endpoint_url = 'http://{}'.format(
+        use_address)
+    if use_secure:
+        endpoint_url = 'https://{}'.format(
+            use_address)
+
+    clients = get_clients()
+    client_key = (
+        endpoint_url,
+        use_access_key,
+        use_secret_key,
+        use_region_name)
+    client = clients.get(
+        client_key,
+        None)
+    if client:
+        return client
+
+    with CLIENTS_LOCK:
+        client = clients.get(
+            client_key,
+            None)
+        if not client:
+            log.debug(
+                'creating s3 client endpoint_url={} '
+                'region={}'.format(
+                    endpoint_url,
+                    use_region_name))
+            client = boto3.client(
+                's3',
+                endpoint_url=endpoint_url,
+                aws_access_key_id=use_access_key,
+                aws_secret_access_key=use_secret_key,
+                region_name=use_region_name,
+                config=boto3.session.Config(
+                    signature_version='s3v4',
+                    max_pool_connections=max(
+                        S3_MAX_CONCURRENT_GETS,
+                        10),
+                    connect_timeout=S3_CONNECT_TIMEOUT,
+                    read_timeout=S3_READ_TIMEOUT,
+                    retries={
+                        'max_attempts': S3_MAX_ATTEMPTS
+                    }))
+            clients[client_key] = client
+    # end of creating the client
+
+    return client
+# end of get_s3_client
+
+
+def is_missing_key_error(
+        ex):
+    """is_missing_key_error
+
+    Return ``True`` if the exception is from a key (or bucket)
+    that is not in S3
+
+    :param ex: exception from ``boto3``
+    """
+    response = getattr(
+        ex,
+        'response',
+        None)
+    if not isinstance(response, dict):
+        return False
+    code = str(response.get('Error', {}).get('Code', ''))
+    return code in S3_MISSING_CODES
+# end of is_missing_key_error
+
+
+def read_s3_key_bytes(
+        client,
+        bucket,
+        key):
+    """read_s3_key_bytes
+
+    Download the raw bytes for an S3 key or return ``None``
+    if the key is not in the bucket. Other errors are raised.
+
+    :param client: ``boto3`` S3 client
+    :param bucket: S3 bucket name
+    :param key: S3 key
+    """
+    try:
+        res = client.get_object(
+            Bucket=bucket,
+            Key=key)
+    except Exception as e:
+        if is_missing_key_error(e):
+            return None
+        raise e
+    return res['Body'].read()
+# end of read_s3_key_bytes
+
+
+def get_data_from_s3_keys(
+        keys,
+        bucket,
+        label=None,
+        client=None,
+        address=None,
+        access_key=None,
+        secret_key=None,
+        region_name=None,
+        secure=None,
+        workers=None):
+    """get_data_from_s3_keys
+
+    Download the raw bytes for all ``keys`` in ``bucket`` with
+    at most ``workers`` concurrent ``GET`` requests. Returns a
+    dictionary of ``key`` to raw bytes (or ``None`` if the key
+    is not in S3). After the first connection (or permission)
+    error the remaining keys are skipped so an unreachable S3
+    does not stall the caller.
+
+    :param keys: list of S3 keys
+    :param bucket: S3 bucket name
+    :param label: log tracking label
+    :param client: optional - initialized ``boto3`` S3 client
+    :param address: S3 address: <host:port>
+    :param access_key: S3 access key
+    :param secret_key: S3 secret key
+    :param region_name: S3 region name
+    :param secure: bool or ``'1'`` - use https
+    :param workers: max concurrent ``GET`` requests
+        (default is ``S3_MAX_CONCURRENT_GETS``)
+    """
+    log_id = label if label else 'get-s3-keys'
+    use_workers = workers if workers else S3_MAX_CONCURRENT_GETS
+    payloads = {}
+    if not keys:
+        return payloads
+
+    use_client = client
+    if not use_client:
+        use_client = get_s3_client(
+            address=address,
+            access_key=access_key,
+            secret_key=secret_key,
+            region_name=region_name,
+            secure=secure)
+    # create S3 client if not set
+
+    failed = threading.Event()
+
+    def read_key(
+            key):
+        """read_key
+
+        :param key: S3 key
+        """
+        if failed.is_set():
+            return None
+        try:
+            return read_s3_key_bytes(
+                client=use_client,
+                bucket=bucket,
+                key=key)
+        except Exception as e:
+            if not failed.is_set():
+                failed.set()
+                log.error(
+                    '{} - failed reading s3={}/{} - skipping '
+                    'remaining keys ex={}'.format(
+                        log_id,
+                        bucket,
+                        key,
+                        e))
+            return None
+    # end of read_key
+
+    if use_workers > 1 and len(keys) > 1:
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(use_workers, len(keys))) as executor:
+            for key, raw_data in zip(keys, executor.map(read_key, keys)):
+                payloads[key] = raw_data
+    else:
+        for key in keys:
+            payloads[key] = read_key(key)
+    # end of downloading all keys
+
+    log.debug(
+        '{} fetched s3={} keys={} found={} workers={}'.format(
+            log_id,
+            bucket,
+            len(keys),
+            len([k for k in payloads if payloads[k]]),
+            use_workers))
+
+    return payloads
+# end of get_data_from_s3_keys
+
+
+def reset_s3_clients():
+    """reset_s3_clients
+
+    Remove all S3 clients in this process
+    """
+    global CLIENTS
+    with CLIENTS_LOCK:
+        CLIENTS = {}
+# end of reset_s3_clients
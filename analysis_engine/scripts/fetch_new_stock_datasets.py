@@ -15,6 +15,7 @@ import argparse
 import celery
 import analysis_engine.api_requests as api_requests
 import analysis_engine.work_tasks.get_new_pricing_data as task_pricing
+import analysis_engine.work_tasks.collect_pricing_datasets as task_collect
 import analysis_engine.work_tasks.task_screener_analysis as screener_utils
 import spylunking.log.setup_logging as log_utils
 import analysis_engine.work_tasks.get_celery_app as get_celery_app
@@ -75,6 +76,13 @@ def fetch_new_stock_datasets():
 
         fetch_new_stock_datasets.py -t SPY
 
+    Collect all datasets for many tickers with the
+    concurrent fetch, scrub and publish pipeline:
+
+    ::
+
+        fetch_new_stock_datasets.py -t SPY,AMZN,TSLA,NFLX -C
+
     .. note:: This requires the following services are listening on:
 
         - redis ``localhost:6379``
@@ -261,6 +269,15 @@ def fetch_new_stock_datasets():
             'tickers for analysis'),
         required=False,
         dest='urls')
+    parser.add_argument(
+        '-C',
+        help=(
+            'optional - collect all comma-separated tickers '
+            'in -t with the concurrent fetch, scrub and '
+            'publish pipeline'),
+        required=False,
+        dest='collect',
+        action='store_true')
     parser.add_argument(
         '-Z',
         help=(
@@ -396,6 +413,17 @@ def fetch_new_stock_datasets():
     work['label'] = 'ticker={}'.format(
         ticker)
 
+    if args.collect:
+        collect_tickers = [
+            cur_ticker
+            for cur_ticker in ticker.split(',')
+            if cur_ticker
+        ]
+        work['ticker'] = collect_tickers[0]
+        work['tickers'] = collect_tickers
+        work['label'] = 'collect tickers={}'.format(
+            len(collect_tickers))
+
     if analysis_type == 'scn':
         label = 'screener={}'.format(
             work['ticker'])
@@ -428,6 +456,13 @@ def fetch_new_stock_datasets():
         task_name = (
             '{}.get_new_pricing_data.get_new_pricing_data'.format(
                 path_to_tasks))
+        task_func = task_pricing.get_new_pricing_data
+        if args.collect:
+            task_name = (
+                '{}.collect_pricing_datasets.'
+                'collect_pricing_datasets'.format(
+                    path_to_tasks))
+            task_func = task_collect.collect_pricing_datasets
         task_res = None
         if ae_consts.is_celery_disabled() or run_offline:
             work['celery_disabled'] = True
@@ -435,7 +470,7 @@ def fetch_new_stock_datasets():
                 'starting without celery work={} offline={}'.format(
                     ae_consts.ppj(work),
                     run_offline))
-            task_res = task_pricing.get_new_pricing_data(
+            task_res = task_func(
                 work)
 
             if debug:
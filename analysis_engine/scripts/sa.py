@@ -65,6 +65,18 @@
 
         sa -t SPY -g /opt/sa/analysis_engine/mocks/example_algo_minute.py
 
+#.  **Sweep Algorithm Parameters**
+
+    Run every variant in a parameter sweep file (see
+    ``analysis_engine.param_sweep``) against one dataset in
+    parallel and show the ranked results
+
+    ::
+
+        sa -t SPY -c /opt/sa/tests/algo_configs/test_5_days_ahead.json \\
+            -b file:/opt/sa/tests/datasets/algo/SPY-latest.json \\
+            -S /opt/sa/tests/algo_configs/sweep_willr.json
+
 """
 
 import os
@@ -81,6 +93,7 @@ import analysis_engine.work_tasks.prepare_pricing_dataset as prep_dataset
 import analysis_engine.work_tasks.get_celery_app as get_celery_app
 import analysis_engine.api_requests as api_requests
 import analysis_engine.run_custom_algo as run_custom_algo
+import analysis_engine.param_sweep as param_sweep
 import spylunking.log.setup_logging as log_utils
 
 
@@ -240,7 +253,9 @@ def run_sa_tool():
         '-e',
         help=(
             'file path to extract an '
-            'algorithm-ready datasets from redis'),
+            'algorithm-ready datasets from redis '
+            '(a path ending with / writes the columnar '
+            'format: file:/opt/sa/tests/datasets/algo/SPY-latest/)'),
         required=False,
         dest='algo_extract_loc')
     parser.add_argument(
@@ -277,7 +292,8 @@ def run_sa_tool():
             'a file path/s3 key/redis key formats: '
             'file:/opt/sa/tests/datasets/algo/SPY-latest.json or '
             's3://algoready/SPY-latest.json or '
-            'redis:SPY-latest'),
+            'redis:SPY-latest or a columnar dataset directory: '
+            'file:/opt/sa/tests/datasets/algo/SPY-latest/'),
         required=False,
         dest='backtest_loc')
     parser.add_argument(
@@ -437,6 +453,15 @@ def run_sa_tool():
             'optional - ignore column names (comma separated)'),
         required=False,
         dest='ignore_columns')
+    parser.add_argument(
+        '-S',
+        help=(
+            'optional - json file with a parameter sweep for '
+            'the -c algorithm config. Runs each config variant '
+            'on the -b dataset in parallel and shows the ranked '
+            'results'),
+        required=False,
+        dest='sweep_file')
     parser.add_argument(
         '-d',
         help=(
@@ -570,6 +595,8 @@ def run_sa_tool():
         mode = ae_consts.SA_MODE_RUN_ALGO
     if args.backtest_loc:
         mode = ae_consts.SA_MODE_RUN_ALGO
+    if args.sweep_file:
+        mode = ae_consts.SA_MODE_RUN_ALGO
     if args.start_date:
         try:
             use_start_date = '{} 00:00:00'.format(
@@ -824,6 +851,47 @@ def run_sa_tool():
         use_custom_algo = True
     # end of set up for backtest
 
+    if use_custom_algo and args.sweep_file:
+        if not os.path.exists(args.sweep_file):
+            log.error(
+                'missing sweep file: {}'.format(
+                    args.sweep_file))
+            sys.exit(1)
+        if not args.backtest_loc:
+            log.error(
+                'please use -b <backtest dataset> with -S')
+            sys.exit(1)
+
+        ranked_df = param_sweep.run_param_sweep_from_file(
+            sweep_file=args.sweep_file,
+            mod_path=args.run_algo_in_file,
+            config_file=use_config_file,
+            load_config={
+                'path_to_file': load_from_file,
+                'compress': load_compress,
+                's3_key': load_from_s3_key,
+                's3_bucket': load_from_s3_bucket,
+                's3_address': s3_address,
+                's3_access_key': s3_access_key,
+                's3_secret_key': s3_secret_key,
+                's3_region_name': s3_region_name,
+                's3_secure': s3_secure,
+                'redis_key': load_from_redis_key,
+                'redis_address': redis_address,
+                'redis_db': redis_db,
+                'redis_password': redis_password
+            },
+            tickers=[ticker],
+            balance=use_balance,
+            commission=use_commission,
+            name=use_name)
+        log.info(
+            'sweep results for {}:\n{}'.format(
+                ticker,
+                ranked_df.to_string()))
+        sys.exit(0)
+    # end of running a parameter sweep
+
     if use_custom_algo:
 
         if args.run_on_engine:
@@ -15,8 +15,10 @@ Debug redis calls with:
 
 """
 import json
-import redis
 import analysis_engine.build_result as build_result
+import analysis_engine.df_cache as df_cache
+import analysis_engine.df_serializers as df_serializers
+import analysis_engine.redis_pool as redis_pool
 from spylunking.log.setup_logging import build_colorized_logger
 from analysis_engine.consts import SUCCESS
 from analysis_engine.consts import NOT_RUN
@@ -56,8 +58,10 @@ def set_data_in_redis_key(
     :param px: redis px
     :param nx: redis nx
     :param xx: redis xx
-    :param serializer: not used yet - support for future
-                       pickle objects in redis
+    :param serializer: ``json`` (default) or a binary columnar
+                       format for DataFrames: ``arrow`` or
+                       ``parquet`` (see
+                       ``analysis_engine.df_serializers``)
     :param encoding: format of the encoded key in redis
     """
 
@@ -82,6 +86,19 @@ def set_data_in_redis_key(
         if serializer == 'json':
             data_str = json.dumps(data)
             encoded_data = data_str.encode(encoding)
+        elif serializer in df_serializers.COLUMNAR_SERIALIZERS:
+            encoded_data = df_serializers.serialize_df(
+                data=data,
+                serializer=serializer)
+            if not encoded_data:
+                log.debug(
+                    '{} serializer={} not supported for key={} '
+                    '- using json'.format(
+                        log_id,
+                        serializer,
+                        key))
+                data_str = json.dumps(data)
+                encoded_data = data_str.encode(encoding)
         else:
             encoded_data = None
             err = (
@@ -116,7 +133,7 @@ def set_data_in_redis_key(
                         host,
                         port,
                         db))
-                use_client = redis.Redis(
+                use_client = redis_pool.get_redis_client(
                     host=host,
                     port=port,
                     password=password,
@@ -135,6 +152,7 @@ def set_data_in_redis_key(
                 px=px,
                 nx=nx,
                 xx=xx)
+            df_cache.invalidate_key(key)
             res = build_result.build_result(
                 status=SUCCESS,
                 err=None,
@@ -0,0 +1,515 @@
+"""
+Host-local Shared Dataset Cache
+===============================
+
+Each ``run_distributed_algorithm`` Celery task calls
+``analysis_engine.run_algo.run_algo`` which extracts every
+dataset for the tickers and dates out of Redis, even when other
+workers on the same host just extracted the same data. With the
+shared dataset cache enabled, the first worker writes the
+extracted algorithm-ready dataset to a host-local directory
+(``/dev/shm`` by default) as a columnar dataset (see
+``analysis_engine.columnar_dataset``) and the other workers
+memory-map the Arrow files instead of re-downloading.
+
+Entries are keyed by a dataset id built from the tickers, the
+date range, the extracted datasets, the extract mode, the Redis
+and S3 source (address, db and bucket) and a content
+``version``. Each entry is written to a temporary
+directory and renamed into place, so a worker either sees a
+complete entry or none. The cache is bounded by the total size
+of its files: after each write the least recently used entries
+(by the manifest's modification time, which is updated on
+every hit) are deleted. Workers that already memory-mapped a
+deleted entry keep reading it until they are done.
+
+Requires the optional ``pyarrow`` package.
+
+.. code-block:: python
+
+    import analysis_engine.shared_dataset_cache as shared_cache
+    print(shared_cache.get_shared_dataset_cache().get_stats())
+
+**Supported environment variables**
+
+::
+
+    # enable the cache for all run_algo calls
+    export SHARED_DATASET_CACHE_ENABLED=1
+
+    # host-local cache directory
+    export SHARED_DATASET_CACHE_DIR=/dev/shm/sa-dataset-cache
+
+    # max bytes of cached datasets (default 2 GB)
+    export SHARED_DATASET_CACHE_MAX_BYTES=2147483648
+
+    # content version for all cached datasets
+    export SHARED_DATASET_CACHE_VERSION=1
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import os
+import json
+import uuid
+import shutil
+import hashlib
+import tempfile
+import threading
+import analysis_engine.columnar_dataset as columnar_dataset
+import analysis_engine.df_serializers as df_serializers
+from analysis_engine.consts import SUCCESS
+from analysis_engine.consts import ev
+from spylunking.log.setup_logging import build_colorized_logger
+
+try:
+    import fcntl
+except Exception:
+    fcntl = None
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+DEFAULT_CACHE_DIR = os.path.join(
+    '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+    'sa-dataset-cache')
+SHARED_DATASET_CACHE_ENABLED = ev(
+    'SHARED_DATASET_CACHE_ENABLED',
+    '0') == '1'
+SHARED_DATASET_CACHE_DIR = ev(
+    'SHARED_DATASET_CACHE_DIR',
+    DEFAULT_CACHE_DIR)
+SHARED_DATASET_CACHE_MAX_BYTES = int(ev(
+    'SHARED_DATASET_CACHE_MAX_BYTES',
+    '2147483648'))
+SHARED_DATASET_CACHE_VERSION = ev(
+    'SHARED_DATASET_CACHE_VERSION',
+    '')
+
+LOCK_FILE = '.lock'
+TMP_PREFIX = '.tmp-'
+
+SHARED_DATASET_CACHE = None
+SHARED_DATASET_CACHE_LOCK = threading.Lock()
+
+
+def build_dataset_id(
+        tickers,
+        start_date,
+        end_date,
+        datasets=None,
+        extract_mode='all',
+        version=None,
+        redis_address=None,
+        redis_db=None,
+        s3_address=None,
+        s3_bucket=None):
+    """build_dataset_id
+
+    Build the cache key for an extract (the Redis and S3
+    source is part of the key so extracts from different
+    Redis dbs or buckets are cached separately)
+
+    :param tickers: list of tickers
+    :param start_date: start date string
+    :param end_date: end date string
+    :param datasets: optional - list of extracted dataset names
+    :param extract_mode: optional - extract mode
+        (default is ``all``)
+    :param version: optional - content version
+        (default is ``SHARED_DATASET_CACHE_VERSION``)
+    :param redis_address: optional - Redis address of the
+        extract
+    :param redis_db: optional - Redis db of the extract
+    :param s3_address: optional - S3 address of the extract
+    :param s3_bucket: optional - S3 bucket of the extract
+    """
+    if version is None:
+        version = SHARED_DATASET_CACHE_VERSION
+    key = json.dumps(
+        {
+            'tickers': sorted(tickers),
+            'start_date': str(start_date),
+            'end_date': str(end_date),
+            'datasets': sorted(datasets or []),
+            'extract_mode': extract_mode,
+            'version': str(version),
+            'redis_address': str(redis_address),
+            'redis_db': str(redis_db),
+            's3_address': str(s3_address),
+            's3_bucket': str(s3_bucket)
+        },
+        sort_keys=True)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+# end of build_dataset_id
+
+
+def get_dir_size(
+        path_to_dir):
+    """get_dir_size
+
+    Get the number of bytes in the files in a directory
+
+    :param path_to_dir: directory
+    """
+    num_bytes = 0
+    for file_name in os.listdir(path_to_dir):
+        try:
+            num_bytes += os.path.getsize(
+                os.path.join(path_to_dir, file_name))
+        except OSError:
+            continue
+    return num_bytes
+# end of get_dir_size
+
+
+class SharedDatasetCache(object):
+    """SharedDatasetCache
+
+    Directory of columnar algorithm-ready datasets shared by
+    all processes on a host
+
+    :param cache_dir: optional - cache directory
+        (default is ``SHARED_DATASET_CACHE_DIR``)
+    :param max_bytes: optional - max bytes of cached datasets
+        (default is ``SHARED_DATASET_CACHE_MAX_BYTES``)
+    """
+
+    def __init__(
+            self,
+            cache_dir=None,
+            max_bytes=None):
+        """__init__
+
+        :param cache_dir: optional - cache directory
+        :param max_bytes: optional - max bytes of cached datasets
+        """
+        self.cache_dir = cache_dir or SHARED_DATASET_CACHE_DIR
+        self.max_bytes = max_bytes
+        if self.max_bytes is None:
+            self.max_bytes = SHARED_DATASET_CACHE_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+    # end of __init__
+
+    def get_entry_dir(
+            self,
+            dataset_id):
+        """get_entry_dir
+
+        :param dataset_id: dataset id
+        """
+        return os.path.join(
+            self.cache_dir,
+            dataset_id)
+    # end of get_entry_dir
+
+    def lock(
+            self):
+        """lock
+
+        Open and lock the cache's lock file (returns ``None``
+        without ``fcntl``)
+        """
+        if not fcntl:
+            return None
+        os.makedirs(
+            self.cache_dir,
+            exist_ok=True)
+        lock_file = open(
+            os.path.join(self.cache_dir, LOCK_FILE),
+            'a')
+        fcntl.flock(
+            lock_file,
+            fcntl.LOCK_EX)
+        return lock_file
+    # end of lock
+
+    def unlock(
+            self,
+            lock_file):
+        """unlock
+
+        :param lock_file: file from ``lock``
+        """
+        if lock_file:
+            fcntl.flock(
+                lock_file,
+                fcntl.LOCK_UN)
+            lock_file.close()
+    # end of unlock
+
+    def get(
+            self,
+            dataset_id,
+            tickers=None):
+        """get
+
+        Memory-map a cached dataset and return it as an
+        algorithm-ready dataset dictionary or ``None``
+
+        :param dataset_id: dataset id
+        :param tickers: optional - list of tickers to load
+        """
+        entry_dir = self.get_entry_dir(
+            dataset_id)
+        if not columnar_dataset.is_columnar_dataset(entry_dir):
+            self.misses += 1
+            return None
+        try:
+            os.utime(
+                os.path.join(
+                    entry_dir,
+                    columnar_dataset.MANIFEST_FILE),
+                None)
+            dataset = columnar_dataset.load_columnar_dataset(
+                path_to_dir=entry_dir,
+                tickers=tickers)
+        except Exception as e:
+            # evicted by another worker during the load
+            log.info(
+                'shared cache - miss id={} during load ex={}'.format(
+                    dataset_id,
+                    e))
+            dataset = None
+        if not dataset:
+            self.misses += 1
+            return None
+        self.hits += 1
+        log.info(
+            'shared cache - hit id={} tickers={}'.format(
+                dataset_id,
+                len(dataset)))
+        return dataset
+    # end of get
+
+    def put(
+            self,
+            dataset_id,
+            dataset):
+        """put
+
+        Write a dataset into the cache (if another worker has
+        not already) and evict entries over ``max_bytes``.
+        Returns ``True`` if the entry is in the cache.
+
+        :param dataset_id: dataset id
+        :param dataset: algorithm-ready dataset dictionary
+        """
+        entry_dir = self.get_entry_dir(
+            dataset_id)
+        if columnar_dataset.is_columnar_dataset(entry_dir):
+            return True
+        os.makedirs(
+            self.cache_dir,
+            exist_ok=True)
+        tmp_dir = os.path.join(
+            self.cache_dir,
+            '{}{}-{}'.format(
+                TMP_PREFIX,
+                dataset_id,
+                uuid.uuid4().hex))
+        status = columnar_dataset.write_columnar_dataset(
+            algo_dataset=dataset,
+            output_dir=tmp_dir,
+            columnar_format=df_serializers.SERIALIZER_ARROW)
+        if status != SUCCESS:
+            shutil.rmtree(
+                tmp_dir,
+                ignore_errors=True)
+            return False
+        entry_size = get_dir_size(tmp_dir)
+        if entry_size > self.max_bytes:
+            log.info(
+                'shared cache - skip id={} bytes={} over '
+                'max_bytes={}'.format(
+                    dataset_id,
+                    entry_size,
+                    self.max_bytes))
+            shutil.rmtree(
+                tmp_dir,
+                ignore_errors=True)
+            return False
+        lock_file = self.lock()
+        try:
+            try:
+                os.rename(
+                    tmp_dir,
+                    entry_dir)
+                self.writes += 1
+            except OSError:
+                # another worker cached it first
+                shutil.rmtree(
+                    tmp_dir,
+                    ignore_errors=True)
+            self.evict(
+                keep_id=dataset_id)
+        finally:
+            self.unlock(lock_file)
+        log.info(
+            'shared cache - put id={} bytes={}'.format(
+                dataset_id,
+                entry_size))
+        return True
+    # end of put
+
+    def get_entries(
+            self):
+        """get_entries
+
+        Get a list of ``(last_used, num_bytes, dataset_id)``
+        tuples for the complete entries
+        """
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for dataset_id in os.listdir(self.cache_dir):
+            entry_dir = self.get_entry_dir(
+                dataset_id)
+            if dataset_id.startswith('.') or not os.path.isdir(entry_dir):
+                continue
+            try:
+                last_used = os.path.getmtime(
+                    os.path.join(
+                        entry_dir,
+                        columnar_dataset.MANIFEST_FILE))
+            except OSError:
+                continue
+            entries.append((
+                last_used,
+                get_dir_size(entry_dir),
+                dataset_id))
+        # end of for all entries
+        return entries
+    # end of get_entries
+
+    def evict(
+            self,
+            keep_id=None):
+        """evict
+
+        Delete the least recently used entries until the cache
+        is under ``max_bytes``
+
+        :param keep_id: optional - dataset id to keep
+        """
+        entries = sorted(self.get_entries())
+        total_bytes = sum(entry[1] for entry in entries)
+        for last_used, num_bytes, dataset_id in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            if dataset_id == keep_id:
+                continue
+            self.invalidate(
+                dataset_id)
+            total_bytes -= num_bytes
+            self.evictions += 1
+        # end of for least recently used entries
+    # end of evict
+
+    def invalidate(
+            self,
+            dataset_id):
+        """invalidate
+
+        Delete one entry
+
+        :param dataset_id: dataset id
+        """
+        entry_dir = self.get_entry_dir(
+            dataset_id)
+        tmp_dir = os.path.join(
+            self.cache_dir,
+            '{}{}-{}'.format(
+                TMP_PREFIX,
+                dataset_id,
+                uuid.uuid4().hex))
+        try:
+            # rename first so readers never see a partial entry
+            os.rename(
+                entry_dir,
+                tmp_dir)
+        except OSError:
+            return
+        shutil.rmtree(
+            tmp_dir,
+            ignore_errors=True)
+    # end of invalidate
+
+    def clear(
+            self):
+        """clear
+
+        Delete all entries
+        """
+        for entry in self.get_entries():
+            self.invalidate(entry[2])
+    # end of clear
+
+    def get_stats(
+            self):
+        """get_stats
+
+        Get the cache stats for this process and the current
+        size of the shared directory
+        """
+        entries = self.get_entries()
+        return {
+            'cache_dir': self.cache_dir,
+            'entries': len(entries),
+            'bytes': sum(entry[1] for entry in entries),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'evictions': self.evictions
+        }
+    # end of get_stats
+
+# end of SharedDatasetCache
+
+
+def get_shared_dataset_cache():
+    """get_shared_dataset_cache
+
+    Get the process-wide ``SharedDatasetCache``
+    """
+    global SHARED_DATASET_CACHE
+    if SHARED_DATASET_CACHE is None:
+        with SHARED_DATASET_CACHE_LOCK:
+            if SHARED_DATASET_CACHE is None:
+                SHARED_DATASET_CACHE = SharedDatasetCache()
+    return SHARED_DATASET_CACHE
+# end of get_shared_dataset_cache
+
+
+def get_enabled_shared_dataset_cache(
+        enabled=None):
+    """get_enabled_shared_dataset_cache
+
+    Get the ``SharedDatasetCache`` if it is enabled (and
+    ``pyarrow`` is installed) else ``None``
+
+    :param enabled: optional - bool to override
+        ``SHARED_DATASET_CACHE_ENABLED``
+    """
+    use_cache = enabled
+    if use_cache is None:
+        use_cache = SHARED_DATASET_CACHE_ENABLED
+    if not (use_cache is True or str(use_cache) == '1'):
+        return None
+    if not df_serializers.is_columnar_supported():
+        log.info(
+            'shared cache - disabled because pyarrow is not '
+            'installed')
+        return None
+    return get_shared_dataset_cache()
+# end of get_enabled_shared_dataset_cache
@@ -52,6 +52,9 @@ def show_dataset(
         slack_enabled=False,
         slack_code_block=False,
         slack_full_width=False,
+        tickers=None,
+        start_date=None,
+        end_date=None,
         verbose=False):
     """show_dataset
 
@@ -64,7 +67,8 @@ def show_dataset(
     :param serialize_datasets: optional - list of dataset names to
         deserialize in the dataset
     :param path_to_file: optional - path to an algorithm-ready dataset
-        in a file
+        in a file or a columnar dataset directory (see
+        ``analysis_engine.columnar_dataset``)
     :param compress: optional - boolean flag for decompressing
         the contents of the ``path_to_file`` if necessary
         (default is ``False`` and algorithms
@@ -122,6 +126,12 @@ def show_dataset(
 
     Additonal arguments
 
+    :param tickers: optional - list of tickers to load from a
+        columnar dataset (default is all tickers)
+    :param start_date: optional - first date to load from a
+        columnar dataset
+    :param end_date: optional - last date to load from a
+        columnar dataset
     :param verbose: optional - bool for increasing
         logging
     """
@@ -151,7 +161,10 @@ def show_dataset(
             redis_password=redis_password,
             redis_expire=redis_expire,
             redis_serializer=redis_serializer,
-            serialize_datasets=serialize_datasets)
+            serialize_datasets=serialize_datasets,
+            tickers=tickers,
+            start_date=start_date,
+            end_date=end_date)
 
         if not use_ds:
             log.error(
@@ -0,0 +1,516 @@
+"""
+Stream an Algorithm-Ready Dataset
+=================================
+
+``load_algo_dataset_from_file`` and ``load_algo_dataset_from_s3``
+read, decompress and decode the whole algorithm-ready document
+before building any ``pandas.DataFrame``. For multi-month minute
+datasets that needs more memory than a worker has.
+
+This module reads the same document (optionally ``zlib``
+compressed) from a file or an S3 object in chunks and yields
+one ``(ticker, node)`` tuple at a time:
+
+::
+
+    {
+        ticker: [
+            {
+                'id': dataset_id,
+                'date': date,
+                'data': {
+                    'daily': serialized DataFrame json,
+                    ...
+                }
+            },
+            ...
+        ]
+    }
+
+Only the current node is decoded and converted, so peak memory
+is bounded by a single node instead of the whole backtest.
+``analysis_engine.algo.BaseAlgo.handle_data`` consumes the
+iterator directly:
+
+.. code-block:: python
+
+    import analysis_engine.stream_algo_dataset as stream_utils
+    algo.handle_data(
+        data=stream_utils.stream_algo_dataset_from_file(
+            path_to_file='/tmp/SPY-minute.json.zlib',
+            compress=True))
+
+**Supported environment variables**
+
+::
+
+    # bytes read from the file or s3 object per chunk
+    export ALGO_STREAM_CHUNK_BYTES=1048576
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import re
+import json
+import zlib
+import codecs
+import pandas as pd
+import analysis_engine.prepare_dict_for_algo as prepare_utils
+import analysis_engine.s3_pool as s3_pool
+from analysis_engine.consts import DEFAULT_SERIALIZED_DATASETS
+from analysis_engine.consts import ev
+from spylunking.log.setup_logging import build_colorized_logger
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+ALGO_STREAM_CHUNK_BYTES = int(ev(
+    'ALGO_STREAM_CHUNK_BYTES',
+    '1048576'))
+
+# parser states for the top-level ``{ticker: [node, ...]}`` document
+START = 'start'
+OBJECT = 'object'
+KEY = 'key'
+COLON = 'colon'
+LIST_START = 'list_start'
+LIST = 'list'
+NODE = 'node'
+DONE = 'done'
+
+# next character that changes the parser state inside a string
+STRING_SPECIAL = re.compile(r'["\\]')
+# next character that changes the parser state inside a node
+NODE_SPECIAL = re.compile(r'["{}]')
+
+
+class AlgoDatasetStreamParser:
+    """AlgoDatasetStreamParser
+
+    Incremental parser for an algorithm-ready json document.
+    ``feed`` takes the decoded text in chunks of any size and
+    yields ``(ticker, node_json)`` as soon as each node's json
+    object is complete. Only the current node's text is kept.
+    """
+
+    def __init__(
+            self):
+        """__init__"""
+        self.state = START
+        self.ticker = None
+        self.key_parts = []
+        self.node_parts = []
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.num_nodes = 0
+    # end of __init__
+
+    def feed(
+            self,
+            text):
+        """feed
+
+        Parse the next chunk of text and yield each completed
+        ``(ticker, node_json)`` tuple
+
+        :param text: next decoded chunk of the document
+        """
+        pos = 0
+        num_chars = len(text)
+        while pos < num_chars:
+            if self.state == NODE:
+                pos, node_json = self.scan_node(
+                    text=text,
+                    pos=pos)
+                if node_json is not None:
+                    self.num_nodes += 1
+                    yield (
+                        self.ticker,
+                        node_json)
+                continue
+            elif self.state == KEY:
+                pos = self.scan_key(
+                    text=text,
+                    pos=pos)
+                continue
+            # end of scanning strings and nodes
+
+            cur_char = text[pos]
+            pos += 1
+            if cur_char.isspace():
+                continue
+            if self.state == START and cur_char == '{':
+                self.state = OBJECT
+            elif self.state == OBJECT and cur_char == '"':
+                self.key_parts = ['"']
+                self.state = KEY
+            elif self.state == OBJECT and cur_char == ',':
+                continue
+            elif self.state == OBJECT and cur_char == '}':
+                self.state = DONE
+            elif self.state == COLON and cur_char == ':':
+                self.state = LIST_START
+            elif self.state == LIST_START and cur_char == '[':
+                self.state = LIST
+            elif self.state == LIST and cur_char == ',':
+                continue
+            elif self.state == LIST and cur_char == ']':
+                self.state = OBJECT
+            elif self.state == LIST and cur_char == '{':
+                self.node_parts = []
+                self.depth = 0
+                self.in_string = False
+                self.escape = False
+                self.state = NODE
+                pos -= 1
+            else:
+                raise ValueError(
+                    'invalid algorithm-ready dataset - unexpected '
+                    'character={} state={} after nodes={}'.format(
+                        cur_char,
+                        self.state,
+                        self.num_nodes))
+        # end of all characters in this chunk
+    # end of feed
+
+    def scan_key(
+            self,
+            text,
+            pos):
+        """scan_key
+
+        Read the ticker key string and return the next position
+
+        :param text: current chunk
+        :param pos: position in ``text``
+        """
+        start = pos
+        num_chars = len(text)
+        while pos < num_chars:
+            if self.escape:
+                self.escape = False
+                pos += 1
+                continue
+            found = STRING_SPECIAL.search(text, pos)
+            if not found:
+                pos = num_chars
+                break
+            pos = found.end()
+            if found.group() == '\\':
+                self.escape = True
+            else:
+                self.key_parts.append(text[start:pos])
+                self.ticker = json.loads(''.join(self.key_parts))
+                self.key_parts = []
+                self.state = COLON
+                return pos
+        # end of scanning the key
+
+        self.key_parts.append(text[start:pos])
+        return pos
+    # end of scan_key
+
+    def scan_node(
+            self,
+            text,
+            pos):
+        """scan_node
+
+        Read the current node's json object and return a tuple
+        of the next position and the node's json (or ``None``
+        if the node continues in the next chunk)
+
+        :param text: current chunk
+        :param pos: position in ``text``
+        """
+        start = pos
+        num_chars = len(text)
+        while pos < num_chars:
+            if self.escape:
+                self.escape = False
+                pos += 1
+                continue
+            if self.in_string:
+                found = STRING_SPECIAL.search(text, pos)
+                if not found:
+                    pos = num_chars
+                    break
+                pos = found.end()
+                if found.group() == '\\':
+                    self.escape = True
+                else:
+                    self.in_string = False
+                continue
+            # end of inside a string
+
+            found = NODE_SPECIAL.search(text, pos)
+            if not found:
+                pos = num_chars
+                break
+            pos = found.end()
+            cur_char = found.group()
+            if cur_char == '"':
+                self.in_string = True
+            elif cur_char == '{':
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.node_parts.append(text[start:pos])
+                    node_json = ''.join(self.node_parts)
+                    self.node_parts = []
+                    self.state = LIST
+                    return (
+                        pos,
+                        node_json)
+        # end of scanning the node
+
+        self.node_parts.append(text[start:pos])
+        return (
+            pos,
+            None)
+    # end of scan_node
+
+    def close(
+            self):
+        """close
+
+        Raise a ``ValueError`` if the document ended before
+        the top-level object was closed
+        """
+        if self.state != DONE:
+            raise ValueError(
+                'truncated algorithm-ready dataset - state={} '
+                'after nodes={}'.format(
+                    self.state,
+                    self.num_nodes))
+    # end of close
+
+# end of AlgoDatasetStreamParser
+
+
+def iter_algo_dataset_json(
+        stream,
+        compress=False,
+        encoding='utf-8',
+        chunk_size=None):
+    """iter_algo_dataset_json
+
+    Read a binary ``stream`` in chunks and yield each
+    ``(ticker, node_json)`` tuple in the algorithm-ready
+    document
+
+    :param stream: file-like object with a ``read(size)``
+        method returning ``bytes``
+    :param compress: optional - bool for decompressing the
+        ``zlib`` compressed stream
+    :param encoding: optional - string for data encoding
+    :param chunk_size: optional - bytes per read
+        (default is ``ALGO_STREAM_CHUNK_BYTES``)
+    """
+    use_chunk_size = chunk_size
+    if not use_chunk_size:
+        use_chunk_size = ALGO_STREAM_CHUNK_BYTES
+    decompressor = None
+    if compress:
+        decompressor = zlib.decompressobj()
+    decoder = codecs.getincrementaldecoder(encoding)()
+    parser = AlgoDatasetStreamParser()
+
+    while True:
+        chunk = stream.read(use_chunk_size)
+        if not chunk:
+            break
+        if decompressor:
+            chunk = decompressor.decompress(chunk)
+        yield from parser.feed(
+            decoder.decode(chunk))
+    # end of reading all chunks
+
+    tail = b''
+    if decompressor:
+        tail = decompressor.flush()
+    yield from parser.feed(
+        decoder.decode(
+            tail,
+            final=True))
+    parser.close()
+# end of iter_algo_dataset_json
+
+
+def stream_algo_dataset(
+        stream,
+        serialize_datasets=DEFAULT_SERIALIZED_DATASETS,
+        compress=False,
+        encoding='utf-8',
+        lazy=None,
+        tickers=None,
+        chunk_size=None):
+    """stream_algo_dataset
+
+    Yield each ``(ticker, node)`` tuple in an algorithm-ready
+    dataset stream with the node's datasets converted to
+    ``pandas.DataFrame`` objects
+
+    :param stream: file-like object with a ``read(size)``
+        method returning ``bytes``
+    :param serialize_datasets: optional - list of dataset names to
+        deserialize in each node
+    :param compress: optional - bool for decompressing the
+        ``zlib`` compressed stream
+    :param encoding: optional - string for data encoding
+    :param lazy: optional - bool for converting each dataset
+        on first access (see
+        ``analysis_engine.prepare_dict_for_algo.LazyDatasetDict``)
+        (default is ``LAZY_DATASETS`` which is ``False``)
+    :param tickers: optional - list of tickers to yield, nodes
+        for other tickers are skipped without decoding them
+    :param chunk_size: optional - bytes per read
+        (default is ``ALGO_STREAM_CHUNK_BYTES``)
+    """
+    empty_pd = pd.DataFrame([{}])
+    num_nodes = 0
+    for ticker, node_json in iter_algo_dataset_json(
+            stream=stream,
+            compress=compress,
+            encoding=encoding,
+            chunk_size=chunk_size):
+        if tickers and ticker not in tickers:
+            continue
+        num_nodes += 1
+        yield (
+            ticker,
+            prepare_utils.prepare_node_for_algo(
+                node=json.loads(node_json),
+                dataset_names=serialize_datasets,
+                lazy=lazy,
+                empty_df=empty_pd))
+    # end of all nodes in the stream
+
+    log.debug(
+        'streamed nodes={}'.format(
+            num_nodes))
+# end of stream_algo_dataset
+
+
+def stream_algo_dataset_from_file(
+        path_to_file,
+        serialize_datasets=DEFAULT_SERIALIZED_DATASETS,
+        compress=False,
+        encoding='utf-8',
+        lazy=None,
+        tickers=None,
+        chunk_size=None):
+    """stream_algo_dataset_from_file
+
+    Yield each ``(ticker, node)`` tuple from an algorithm-ready
+    dataset in a local file. The file is closed when the
+    iterator is exhausted or closed.
+
+    :param path_to_file: string - path to file holding an
+        algorithm-ready dataset
+    :param serialize_datasets: optional - list of dataset names to
+        deserialize in each node
+    :param compress: optional - bool for decompressing the
+        ``zlib`` compressed file
+    :param encoding: optional - string for data encoding
+    :param lazy: optional - bool for converting each dataset
+        on first access
+    :param tickers: optional - list of tickers to yield
+    :param chunk_size: optional - bytes per read
+        (default is ``ALGO_STREAM_CHUNK_BYTES``)
+    """
+    log.info(
+        'start streaming file={}'.format(
+            path_to_file))
+    with open(path_to_file, 'rb') as cur_file:
+        yield from stream_algo_dataset(
+            stream=cur_file,
+            serialize_datasets=serialize_datasets,
+            compress=compress,
+            encoding=encoding,
+            lazy=lazy,
+            tickers=tickers,
+            chunk_size=chunk_size)
+# end of stream_algo_dataset_from_file
+
+
+def stream_algo_dataset_from_s3(
+        s3_key,
+        s3_bucket,
+        s3_address=None,
+        s3_access_key=None,
+        s3_secret_key=None,
+        s3_region_name=None,
+        s3_secure=None,
+        serialize_datasets=DEFAULT_SERIALIZED_DATASETS,
+        compress=False,
+        encoding='utf-8',
+        lazy=None,
+        tickers=None,
+        chunk_size=None,
+        client=None):
+    """stream_algo_dataset_from_s3
+
+    Yield each ``(ticker, node)`` tuple from an algorithm-ready
+    dataset in an S3 object while it downloads
+
+    :param s3_key: string - S3 key holding the dataset
+    :param s3_bucket: S3 bucket name
+    :param s3_address: S3 address: <host:port>
+    :param s3_access_key: S3 access key
+    :param s3_secret_key: S3 secret key
+    :param s3_region_name: S3 region name
+    :param s3_secure: bool or ``'1'`` - use https
+    :param serialize_datasets: optional - list of dataset names to
+        deserialize in each node
+    :param compress: optional - bool for decompressing the
+        ``zlib`` compressed object
+    :param encoding: optional - string for data encoding
+    :param lazy: optional - bool for converting each dataset
+        on first access
+    :param tickers: optional - list of tickers to yield
+    :param chunk_size: optional - bytes per read
+        (default is ``ALGO_STREAM_CHUNK_BYTES``)
+    :param client: optional - initialized ``boto3`` S3 client
+        (default is ``analysis_engine.s3_pool.get_s3_client``)
+    """
+    log.info(
+        'start streaming s3={}:{}/{}'.format(
+            s3_address,
+            s3_bucket,
+            s3_key))
+    use_client = client
+    if not use_client:
+        use_client = s3_pool.get_s3_client(
+            address=s3_address,
+            access_key=s3_access_key,
+            secret_key=s3_secret_key,
+            region_name=s3_region_name,
+            secure=s3_secure)
+    # create S3 client if not set
+
+    res = use_client.get_object(
+        Bucket=s3_bucket,
+        Key=s3_key)
+    body = res['Body']
+    try:
+        yield from stream_algo_dataset(
+            stream=body,
+            serialize_datasets=serialize_datasets,
+            compress=compress,
+            encoding=encoding,
+            lazy=lazy,
+            tickers=tickers,
+            chunk_size=chunk_size)
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+# end of stream_algo_dataset_from_s3
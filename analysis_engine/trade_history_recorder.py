@@ -0,0 +1,433 @@
+"""
+Compact Trade History Recorder
+==============================
+
+``BaseAlgo`` records one trade history dictionary per dataset
+node (see ``analysis_engine.build_trade_history_entry``). Each
+entry has ~80 keys and most of them (the options spread fields)
+are ``None`` for share trades, so a long minute backtest keeps
+hundreds of MB of dictionaries in ``self.order_history``.
+
+``TradeHistoryRecorder`` stores the same entries in
+preallocated ``numpy`` columns:
+
+- a column is only created the first time a key has a
+  non-``None`` value, so the schema only holds the populated
+  fields
+- the columns double in size when they are full
+- numbers and bools use ``float64`` / ``int8`` columns with
+  a missing value marker, everything else uses ``object``
+  columns
+- list values are stored as their length
+
+The recorder supports ``append``, ``extend``, ``len``,
+indexing and iteration (rows are rebuilt as dictionaries), so
+it is a drop-in replacement for the ``self.order_history``
+list. Use ``to_df()`` for a ``pandas.DataFrame``,
+``to_records()`` for a list of dictionaries and
+``get_memory_usage()`` for the number of bytes used.
+
+.. code-block:: python
+
+    algo = BaseAlgo(
+        ticker='SPY',
+        compact_history=True)
+    algo.handle_data(data=algo_ready_dataset)
+    print(algo.order_history.get_memory_usage())
+    print(algo.get_history_df())
+
+**Supported environment variables**
+
+::
+
+    # use the compact trade history for all algorithms
+    export ALGO_COMPACT_HISTORY=1
+
+    # number of rows to preallocate
+    export ALGO_HISTORY_CAPACITY=1024
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import sys
+import numbers
+import numpy as np
+import pandas as pd
+from analysis_engine.consts import ev
+from spylunking.log.setup_logging import build_colorized_logger
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+COMPACT_HISTORY = ev(
+    'ALGO_COMPACT_HISTORY',
+    '0') == '1'
+HISTORY_CAPACITY = int(ev(
+    'ALGO_HISTORY_CAPACITY',
+    '1024'))
+
+KIND_BOOL = 'bool'
+KIND_INT = 'int'
+KIND_FLOAT = 'float'
+KIND_OBJECT = 'object'
+MISSING_BOOL = -1
+
+
+def get_value_kind(
+        value):
+    """get_value_kind
+
+    Get the column kind for a value
+
+    :param value: non-``None`` history value
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return KIND_BOOL
+    if isinstance(value, numbers.Integral):
+        return KIND_INT
+    if isinstance(value, numbers.Real):
+        return KIND_FLOAT
+    return KIND_OBJECT
+# end of get_value_kind
+
+
+def build_column(
+        kind,
+        capacity):
+    """build_column
+
+    Build an empty column filled with the missing value marker
+    for the column kind
+
+    :param kind: column kind
+    :param capacity: number of rows
+    """
+    if kind == KIND_BOOL:
+        return np.full(capacity, MISSING_BOOL, dtype=np.int8)
+    if kind in [KIND_INT, KIND_FLOAT]:
+        return np.full(capacity, np.nan, dtype=np.float64)
+    return np.full(capacity, None, dtype=object)
+# end of build_column
+
+
+class TradeHistoryRecorder(object):
+    """TradeHistoryRecorder
+
+    Columnar store for trade history entries
+
+    :param capacity: optional - number of rows to preallocate
+        (default is ``ALGO_HISTORY_CAPACITY`` which is ``1024``)
+    """
+
+    def __init__(
+            self,
+            capacity=None):
+        """__init__
+
+        :param capacity: optional - number of rows to preallocate
+        """
+        self.capacity = max(1, int(capacity or HISTORY_CAPACITY))
+        self.num_rows = 0
+        self.names = []
+        self.columns = {}
+        self.kinds = {}
+    # end of __init__
+
+    def __len__(
+            self):
+        """__len__"""
+        return self.num_rows
+    # end of __len__
+
+    def __iter__(
+            self):
+        """__iter__
+
+        yield each row as a dictionary
+        """
+        for row_idx in range(self.num_rows):
+            yield self.get_row(row_idx)
+    # end of __iter__
+
+    def __getitem__(
+            self,
+            idx):
+        """__getitem__
+
+        :param idx: row index or slice
+        """
+        if isinstance(idx, slice):
+            return [
+                self.get_row(row_idx)
+                for row_idx in range(*idx.indices(self.num_rows))
+            ]
+        if idx < 0:
+            idx += self.num_rows
+        if idx < 0 or idx >= self.num_rows:
+            raise IndexError(
+                'history index out of range')
+        return self.get_row(idx)
+    # end of __getitem__
+
+    def append(
+            self,
+            entry):
+        """append
+
+        Add a history entry dictionary as a new row
+
+        :param entry: history dictionary (like from
+            ``build_trade_history_entry``)
+        """
+        if self.num_rows == self.capacity:
+            self.grow()
+        for name, value in entry.items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple)):
+                value = len(value)
+            self.set_value(
+                name=name,
+                row_idx=self.num_rows,
+                value=value)
+        # end of for all keys
+        self.num_rows += 1
+    # end of append
+
+    def extend(
+            self,
+            entries):
+        """extend
+
+        :param entries: list of history dictionaries
+        """
+        for entry in entries:
+            self.append(entry)
+    # end of extend
+
+    def grow(
+            self):
+        """grow
+
+        Double the capacity of all columns
+        """
+        new_capacity = self.capacity * 2
+        for name in self.names:
+            column = build_column(
+                kind=self.kinds[name],
+                capacity=new_capacity)
+            column[:self.capacity] = self.columns[name]
+            self.columns[name] = column
+        self.capacity = new_capacity
+        log.debug(
+            'history - grow capacity={} columns={}'.format(
+                self.capacity,
+                len(self.names)))
+    # end of grow
+
+    def set_value(
+            self,
+            name,
+            row_idx,
+            value):
+        """set_value
+
+        Store a value and create or widen the column if needed
+
+        :param name: column name
+        :param row_idx: row index
+        :param value: non-``None`` value
+        """
+        kind = get_value_kind(value)
+        cur_kind = self.kinds.get(
+            name,
+            None)
+        if cur_kind is None:
+            self.names.append(name)
+            self.kinds[name] = kind
+            self.columns[name] = build_column(
+                kind=kind,
+                capacity=self.capacity)
+        elif cur_kind != kind:
+            self.widen(
+                name=name,
+                kind=kind)
+        column_kind = self.kinds[name]
+        if column_kind == KIND_BOOL:
+            value = int(bool(value))
+        elif column_kind in [KIND_INT, KIND_FLOAT]:
+            value = float(value)
+        self.columns[name][row_idx] = value
+    # end of set_value
+
+    def widen(
+            self,
+            name,
+            kind):
+        """widen
+
+        Convert a column so it can hold values of ``kind``:
+        ``bool`` to ``int`` to ``float`` to ``object``
+
+        :param name: column name
+        :param kind: kind of the new value
+        """
+        order = [KIND_BOOL, KIND_INT, KIND_FLOAT, KIND_OBJECT]
+        cur_kind = self.kinds[name]
+        new_kind = order[max(order.index(cur_kind), order.index(kind))]
+        if new_kind == cur_kind:
+            return
+        column = self.columns[name]
+        if new_kind == KIND_OBJECT:
+            values = build_column(
+                kind=KIND_OBJECT,
+                capacity=self.capacity)
+            for row_idx in range(self.num_rows):
+                values[row_idx] = self.get_value(
+                    name=name,
+                    row_idx=row_idx)
+            self.columns[name] = values
+        elif cur_kind == KIND_BOOL:
+            values = column.astype(np.float64)
+            values[column == MISSING_BOOL] = np.nan
+            self.columns[name] = values
+        self.kinds[name] = new_kind
+    # end of widen
+
+    def get_value(
+            self,
+            name,
+            row_idx):
+        """get_value
+
+        Get a stored value as a python value or ``None``
+
+        :param name: column name
+        :param row_idx: row index
+        """
+        kind = self.kinds[name]
+        value = self.columns[name][row_idx]
+        if kind == KIND_BOOL:
+            if value == MISSING_BOOL:
+                return None
+            return bool(value)
+        if kind in [KIND_INT, KIND_FLOAT]:
+            if np.isnan(value):
+                return None
+            if kind == KIND_INT:
+                return int(value)
+            return float(value)
+        return value
+    # end of get_value
+
+    def get_row(
+            self,
+            row_idx):
+        """get_row
+
+        Rebuild a row as a dictionary with all populated columns
+
+        :param row_idx: row index
+        """
+        return {
+            name: self.get_value(
+                name=name,
+                row_idx=row_idx)
+            for name in self.names
+        }
+    # end of get_row
+
+    def get_column(
+            self,
+            name):
+        """get_column
+
+        Get the populated rows of a column as a ``numpy`` array
+        (``bool`` and ``int`` columns with missing values are
+        returned as ``object`` and ``float64``)
+
+        :param name: column name
+        """
+        kind = self.kinds[name]
+        values = self.columns[name][:self.num_rows]
+        if kind == KIND_BOOL:
+            missing = values == MISSING_BOOL
+            if missing.any():
+                converted = values.astype(bool).astype(object)
+                converted[missing] = None
+                return converted
+            return values.astype(bool)
+        if kind == KIND_INT and not np.isnan(values).any():
+            return values.astype(np.int64)
+        return values.copy()
+    # end of get_column
+
+    def to_records(
+            self):
+        """to_records
+
+        Get all rows as a list of dictionaries (the same form
+        as a list ``self.order_history``)
+        """
+        return [
+            self.get_row(row_idx)
+            for row_idx in range(self.num_rows)
+        ]
+    # end of to_records
+
+    def to_df(
+            self):
+        """to_df
+
+        Build a ``pandas.DataFrame`` with one row per entry
+        and one column per populated key
+        """
+        return pd.DataFrame(
+            {
+                name: self.get_column(name)
+                for name in self.names
+            },
+            columns=self.names)
+    # end of to_df
+
+    def get_memory_usage(
+            self,
+            deep=True):
+        """get_memory_usage
+
+        Get the number of bytes used by the columns
+
+        :param deep: optional - include the size of the
+            python objects in ``object`` columns
+            (default is ``True``)
+        """
+        num_bytes = 0
+        for name in self.names:
+            column = self.columns[name]
+            num_bytes += column.nbytes
+            if deep and self.kinds[name] == KIND_OBJECT:
+                for value in column[:self.num_rows]:
+                    if value is not None:
+                        num_bytes += sys.getsizeof(value)
+        return num_bytes
+    # end of get_memory_usage
+
+    def clear(
+            self):
+        """clear
+
+        Drop all rows and columns
+        """
+        self.num_rows = 0
+        self.names = []
+        self.columns = {}
+        self.kinds = {}
+    # end of clear
+
+# end of TradeHistoryRecorder
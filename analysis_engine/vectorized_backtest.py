@@ -0,0 +1,489 @@
+"""
+Vectorized Backtest Engine
+==========================
+
+``BaseAlgo.handle_data`` loads every node, runs the indicators,
+``process()`` and builds a trade history dictionary one node at
+a time. Algorithms that can express their buy and sell
+conditions as signal columns can run a backtest with
+``BaseAlgo(vectorized=True)`` instead:
+
+1. all nodes for a ticker are concatenated into one signal
+   frame: the last ``daily`` row of each node (the row the loop
+   uses for the day's prices) or every row of an intraday
+   dataset like ``minute`` (``signal_dataset='minute'``)
+2. ``algo.build_signals(ticker, df)`` returns boolean ``buy``
+   and ``sell`` columns for the whole frame
+3. the engine jumps between signal rows with NumPy index arrays
+   and only calls ``create_buy_order`` / ``create_sell_order``
+   where the loop would place an order
+4. the per-node history (balance, shares, order counts and
+   triggers) is computed with ``numpy.searchsorted`` and
+   cumulative sums over the order events
+
+The history has the same columns as the loop mode's
+``analysis_engine.build_trade_history_entry`` nodes plus
+``buy_triggered`` and ``sell_triggered``. The balance, shares,
+order counts, ``close`` (the loop mode's trade price: the last
+``minute`` close or else the last ``daily`` close of the node),
+``status``, ``algo_status`` and ``balance_net_gain`` match the
+loop mode. The columns the
+engine does not track (``high``, ``low``, ``open``,
+``volume``, ``today_*``, ``bid``, ``ask``, stop losses, hold
+units, option spread fields, ``note`` and ``err``) are
+``None``.
+
+The fill rules are the same in both modes: on each signal row
+sell all shares on a ``sell`` signal if shares are owned, else
+buy the max number of shares on a ``buy`` signal if no shares
+are owned. In the loop mode ``BaseAlgo.process_signals`` calls
+``build_signals`` on the rows seen so far for each node, so
+signals must only use the current and previous rows (no
+look-ahead) for both modes to return the same results.
+
+.. code-block:: python
+
+    class SMACrossAlgo(BaseAlgo):
+        def build_signals(self, ticker, df):
+            sma = df['close'].rolling(5).mean()
+            return pd.DataFrame({
+                'buy': df['close'] > sma,
+                'sell': df['close'] < sma})
+
+    algo = SMACrossAlgo(
+        ticker='SPY',
+        vectorized=True)
+    algo.handle_data(data=algo_ready_dataset)
+    print(algo.history_df)
+
+**Supported environment variables**
+
+::
+
+    # to show debug, trace logging please export ``SHARED_LOG_CFG``
+    # to a debug logger json file. To turn on debugging for this
+    # library, you can export this variable to the repo's
+    # included file with the command:
+    export SHARED_LOG_CFG=/opt/sa/analysis_engine/log/debug-logging.json
+
+"""
+
+import numpy as np
+import pandas as pd
+import analysis_engine.consts as ae_consts
+import analysis_engine.build_trade_history_entry as history_utils
+from spylunking.log.setup_logging import build_colorized_logger
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+# datasets where each node holds the full history up to the
+# node's date so only the last row is a new bar
+LAST_ROW_DATASETS = [
+    'daily'
+]
+BUY_SIGNAL = 'buy'
+SELL_SIGNAL = 'sell'
+BUY_REASON = 'buy signal'
+SELL_REASON = 'sell signal'
+# history columns that are not in the loop mode's history
+SIGNAL_HISTORY_COLUMNS = [
+    'buy_triggered',
+    'sell_triggered'
+]
+
+
+def get_signal_rows(
+        node,
+        dataset_name='daily'):
+    """get_signal_rows
+
+    Get the new bar rows in a node for the signal frame or
+    ``None`` if the node has no rows with a ``close`` and
+    ``date``
+
+    :param node: dataset node dictionary with keys:
+        ``id``, ``date`` and ``data``
+    :param dataset_name: dataset to trade on
+        (default is ``daily``)
+    """
+    df = node['data'].get(
+        dataset_name,
+        None)
+    if not hasattr(df, 'index') or len(df.index) == 0:
+        return None
+    if 'close' not in df.columns or 'date' not in df.columns:
+        return None
+    if dataset_name in LAST_ROW_DATASETS:
+        return df.iloc[-1:]
+    return df
+# end of get_signal_rows
+
+
+def build_signal_frame(
+        nodes,
+        dataset_name='daily'):
+    """build_signal_frame
+
+    Concatenate the bar rows for all nodes of a ticker and
+    return a tuple of the frame, the first row index and the
+    last row index of each node (nodes without rows have a
+    last row index before their first row index)
+
+    :param nodes: list of dataset nodes for a ticker
+    :param dataset_name: dataset to trade on
+        (default is ``daily``)
+    """
+    frames = []
+    node_starts = np.zeros(len(nodes), dtype=np.int64)
+    node_ends = np.zeros(len(nodes), dtype=np.int64)
+    num_rows = 0
+    for idx, node in enumerate(nodes):
+        rows = get_signal_rows(
+            node=node,
+            dataset_name=dataset_name)
+        node_starts[idx] = num_rows
+        if rows is not None:
+            frames.append(rows)
+            num_rows += len(rows.index)
+        node_ends[idx] = num_rows - 1
+    # end of for all nodes
+
+    frame = pd.DataFrame([])
+    if frames:
+        frame = pd.concat(
+            frames,
+            ignore_index=True,
+            sort=False)
+    return (
+        frame,
+        node_starts,
+        node_ends)
+# end of build_signal_frame
+
+
+def get_signal_arrays(
+        signals,
+        num_rows):
+    """get_signal_arrays
+
+    Convert the ``build_signals`` result to a tuple of
+    ``buy`` and ``sell`` boolean ``numpy`` arrays
+
+    :param signals: ``pandas.DataFrame`` or dictionary with
+        ``buy`` and ``sell`` columns
+    :param num_rows: number of rows in the signal frame
+    """
+    arrays = []
+    for name in [BUY_SIGNAL, SELL_SIGNAL]:
+        values = None
+        if signals is not None and name in signals:
+            values = signals[name]
+        if values is None:
+            arrays.append(np.zeros(num_rows, dtype=bool))
+            continue
+        values = np.asarray(values)
+        if len(values) != num_rows:
+            raise ValueError(
+                'build_signals returned {}={} rows for a signal '
+                'frame with rows={}'.format(
+                    name,
+                    len(values),
+                    num_rows))
+        arrays.append(
+            np.where(
+                pd.isnull(values),
+                False,
+                values).astype(bool))
+    # end of for buy and sell
+    return (
+        arrays[0],
+        arrays[1])
+# end of get_signal_arrays
+
+
+def get_next_true(
+        values):
+    """get_next_true
+
+    Return an array where element ``i`` is the index of the
+    first ``True`` value at or after ``i`` (or ``len(values)``
+    if there is none)
+
+    :param values: boolean ``numpy`` array
+    """
+    num_rows = len(values)
+    positions = np.where(
+        values,
+        np.arange(num_rows),
+        num_rows)
+    return np.minimum.accumulate(
+        positions[::-1])[::-1]
+# end of get_next_true
+
+
+def get_node_trade_price(
+        node,
+        load_datasets=None):
+    """get_node_trade_price
+
+    Get the price the loop mode records as a node's ``close``
+    (``BaseAlgo.load_from_dataset`` sets ``trade_price`` to the
+    last ``minute`` close or else the last ``daily`` close) or
+    ``None`` if the node has neither
+
+    :param node: dataset node dictionary with keys:
+        ``id``, ``date`` and ``data``
+    :param load_datasets: optional - set of dataset names the
+        algorithm loads (``None`` loads all)
+    """
+    for ds_name in ['minute', 'daily']:
+        if load_datasets is not None and ds_name not in load_datasets:
+            continue
+        df = node['data'].get(
+            ds_name,
+            None)
+        if not hasattr(df, 'index') or len(df.index) == 0:
+            continue
+        if 'close' not in df.columns:
+            continue
+        return float(df['close'].iloc[-1])
+    # end of for the datasets with prices
+    return None
+# end of get_node_trade_price
+
+
+def get_history_columns():
+    """get_history_columns
+
+    Get the column names of a trade history node from
+    ``analysis_engine.build_trade_history_entry``
+    """
+    return list(history_utils.build_trade_history_entry(
+        ticker=None,
+        num_owned=0,
+        close=0.0,
+        balance=0.0,
+        commission=0.0,
+        date=None,
+        trade_type=None,
+        algo_start_price=0.0,
+        original_balance=0.0))
+# end of get_history_columns
+
+
+def fill_history_columns(
+        history_df,
+        algo_start_price,
+        original_balance):
+    """fill_history_columns
+
+    Add the statuses and gains that
+    ``analysis_engine.build_trade_history_entry`` computes
+    for each node, add the columns the vectorized engine does
+    not track as ``None`` and return the history with the
+    loop mode's column order
+
+    :param history_df: per-node history ``pandas.DataFrame``
+        with at least ``close`` and ``balance`` columns
+    :param algo_start_price: starting close of the algorithm
+    :param original_balance: starting balance of the algorithm
+    """
+    closes = history_df['close'].to_numpy(dtype=np.float64)
+    balances = history_df['balance'].to_numpy(dtype=np.float64)
+    has_balance = np.zeros(len(balances), dtype=bool)
+    if original_balance:
+        has_balance = balances != 0.0
+    balance_net_gain = np.where(
+        has_balance,
+        balances - (original_balance or 0.0),
+        0.0)
+    history_df['balance_net_gain'] = balance_net_gain
+    history_df['algo_status'] = np.where(
+        has_balance,
+        np.where(
+            balance_net_gain > 0.0,
+            ae_consts.ALGO_PROFITABLE,
+            ae_consts.ALGO_NOT_PROFITABLE),
+        ae_consts.ALGO_ERROR)
+    history_df['status'] = np.where(
+        (closes < 0.01) | (algo_start_price < 0.01),
+        ae_consts.TRADE_ERROR,
+        np.where(
+            closes - algo_start_price > 0.0,
+            ae_consts.TRADE_PROFITABLE,
+            ae_consts.TRADE_NOT_PROFITABLE))
+    history_df['net_gain'] = 0.0
+
+    columns = get_history_columns() + SIGNAL_HISTORY_COLUMNS
+    for column in columns:
+        if column not in history_df.columns:
+            history_df[column] = None
+    return history_df[columns]
+# end of fill_history_columns
+
+
+def run_vectorized_ticker(
+        algo,
+        ticker,
+        nodes,
+        dataset_name='daily'):
+    """run_vectorized_ticker
+
+    Backtest all ``nodes`` for a ticker with the algorithm's
+    ``build_signals`` and return the per-node history as a
+    ``pandas.DataFrame`` with the loop mode's history columns
+    (see ``fill_history_columns``)
+
+    :param algo: ``analysis_engine.algo.BaseAlgo`` instance
+    :param ticker: ticker symbol
+    :param nodes: list of dataset nodes for the ticker
+    :param dataset_name: dataset to trade on
+        (default is ``daily``)
+    """
+    frame, node_starts, node_ends = build_signal_frame(
+        nodes=nodes,
+        dataset_name=dataset_name)
+    num_rows = len(frame.index)
+    buy = np.zeros(0, dtype=bool)
+    sell = np.zeros(0, dtype=bool)
+    closes = []
+    dates = []
+    if num_rows:
+        buy, sell = get_signal_arrays(
+            signals=algo.build_signals(
+                ticker=ticker,
+                df=frame),
+            num_rows=num_rows)
+        closes = frame['close'].tolist()
+        dates = frame['date'].tolist()
+    # end of building signals
+
+    start_balance = algo.balance
+    start_trade_price = algo.trade_price
+    start_position = algo.ledger.get_position(
+        ticker=ticker)
+    start_owned = algo.get_owned_shares(
+        ticker=ticker) or 0
+    num_start_buys = start_position.num_buys
+    num_start_sells = start_position.num_sells
+
+    next_buy = get_next_true(buy)
+    next_sell = get_next_true(sell)
+    event_rows = []
+    event_balances = [start_balance]
+    event_owned = [start_owned]
+    buy_rows = []
+    sell_rows = []
+    owned = start_owned
+    row_idx = 0
+    while row_idx < num_rows:
+        if owned:
+            order_row = int(next_sell[row_idx])
+            if order_row >= num_rows:
+                break
+            algo.create_sell_order(
+                ticker=ticker,
+                row={
+                    'date': dates[order_row],
+                    'close': closes[order_row]
+                },
+                reason=SELL_REASON)
+            filled_rows = sell_rows
+        else:
+            order_row = int(next_buy[row_idx])
+            if order_row >= num_rows:
+                break
+            algo.create_buy_order(
+                ticker=ticker,
+                row={
+                    'date': dates[order_row],
+                    'close': closes[order_row]
+                },
+                reason=BUY_REASON)
+            filled_rows = buy_rows
+        new_owned = algo.get_owned_shares(
+            ticker=ticker) or 0
+        if new_owned != owned or algo.balance != event_balances[-1]:
+            filled_rows.append(order_row)
+            event_rows.append(order_row)
+            event_balances.append(algo.balance)
+            event_owned.append(new_owned)
+        owned = new_owned
+        row_idx = order_row + 1
+    # end of walking the order events
+
+    event_rows = np.asarray(event_rows, dtype=np.int64)
+    event_balances = np.asarray(event_balances, dtype=np.float64)
+    event_owned = np.asarray(event_owned, dtype=np.int64)
+    end_events = np.searchsorted(
+        event_rows,
+        node_ends,
+        side='right')
+    start_events = np.searchsorted(
+        event_rows,
+        node_starts,
+        side='left')
+    buy_counts = np.concatenate(
+        [[0], np.cumsum(buy, dtype=np.int64)])
+    sell_counts = np.concatenate(
+        [[0], np.cumsum(sell, dtype=np.int64)])
+    load_datasets = algo.get_load_datasets()
+    node_closes = pd.Series(
+        [
+            get_node_trade_price(
+                node=node,
+                load_datasets=load_datasets)
+            for node in nodes
+        ],
+        dtype=np.float64).ffill().fillna(
+            start_trade_price).to_numpy()
+
+    algo_start_price = algo.starting_close or 0.0
+    history_df = pd.DataFrame({
+        'ticker': ticker,
+        'date': [node['date'] for node in nodes],
+        'ds_id': [node['id'] for node in nodes],
+        'close': node_closes,
+        'balance': event_balances[end_events],
+        'prev_balance': event_balances[start_events],
+        'num_owned': event_owned[end_events],
+        'prev_num_owned': event_owned[start_events],
+        'total_buys': num_start_buys + np.searchsorted(
+            np.asarray(buy_rows, dtype=np.int64),
+            node_ends,
+            side='right'),
+        'total_sells': num_start_sells + np.searchsorted(
+            np.asarray(sell_rows, dtype=np.int64),
+            node_ends,
+            side='right'),
+        'buy_triggered': (
+            buy_counts[node_ends + 1] - buy_counts[node_starts]) > 0,
+        'sell_triggered': (
+            sell_counts[node_ends + 1] - sell_counts[node_starts]) > 0,
+        'commission': algo.commission,
+        'algo_start_price': algo_start_price,
+        'original_balance': algo.starting_balance,
+        'trade_type': algo.trade_type,
+        'version': algo.version
+    })
+    history_df['algo_price_change'] = (
+        history_df['close'] - algo_start_price)
+    history_df = fill_history_columns(
+        history_df=history_df,
+        algo_start_price=algo_start_price,
+        original_balance=algo.starting_balance)
+
+    log.info(
+        '{} vectorized - ticker={} nodes={} rows={} orders={} '
+        'filled={} status={}'.format(
+            algo.name,
+            ticker,
+            len(nodes),
+            num_rows,
+            len(algo.buys) + len(algo.sells),
+            len(event_rows),
+            ae_consts.get_status(status=ae_consts.SUCCESS)))
+    return history_df
+# end of run_vectorized_ticker
@@ -0,0 +1,247 @@
+"""
+**Collect Pricing Datasets Task**
+
+Collect the datasets for a list of tickers with the
+``asyncio`` fetch, scrub and publish pipeline in
+`analysis_engine.collection_pipeline <https://github.com/AlgoTraders/st
+ock-analysis-engine/blob/master/analysis_engine/collection_pipeline.py>`__
+instead of one ``get_new_pricing_data`` task per ticker.
+
+**Sample work_dict request for this method**
+
+`analysis_engine.api_requests.build_get_new_pricing_request <https://
+github.com/AlgoTraders/stock-analysis-engine/blob/master/ana
+lysis_engine/api_requests.py#L49>`__ with a list of ``tickers``:
+
+::
+
+    import analysis_engine.api_requests as api_requests
+    from analysis_engine.work_tasks.collect_pricing_datasets \\
+        import run_collect_pricing_datasets
+    work = api_requests.build_get_new_pricing_request()
+    work['tickers'] = ['SPY', 'AMZN', 'TSLA', 'NFLX']
+    work['celery_disabled'] = True
+    res = run_collect_pricing_datasets(
+        work_dict=work)
+    print(res['rec']['tickers'])
+
+Optional keys for tuning the pipeline (defaults are the
+``COLLECT_*`` environment variables):
+
+::
+
+    work['fetch_workers'] = 8
+    work['scrub_workers'] = 2
+    work['publish_workers'] = 4
+    work['queue_size'] = 32
+
+.. tip:: This task uses the `analysis_engine.work_tasks.
+    custom_task.CustomTask class <https://github.com/A
+    lgoTraders/stock-analysis-engine/blob/master/anal
+    ysis_engine/work_tasks/custom_task.py>`__ for
+    task event handling.
+
+**Supported Environment Variables**
+
+::
+
+    export DEBUG_RESULTS=1
+
+"""
+
+import analysis_engine.build_result as build_result
+import analysis_engine.get_task_results
+import analysis_engine.work_tasks.custom_task
+import analysis_engine.collection_pipeline as collection_pipeline
+from celery.task import task
+from spylunking.log.setup_logging import build_colorized_logger
+from analysis_engine.consts import SUCCESS
+from analysis_engine.consts import NOT_RUN
+from analysis_engine.consts import ERR
+from analysis_engine.consts import FETCH_MODE_ALL
+from analysis_engine.consts import get_status
+from analysis_engine.consts import ev
+from analysis_engine.consts import ppj
+from analysis_engine.consts import is_celery_disabled
+from analysis_engine.iex.consts import DEFAULT_FETCH_DATASETS
+
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+@task(
+    bind=True,
+    base=analysis_engine.work_tasks.custom_task.CustomTask,
+    queue='collect_pricing_datasets')
+def collect_pricing_datasets(
+        self,
+        work_dict):
+    """collect_pricing_datasets
+
+    Fetch, scrub and publish the datasets for all
+    ``work_dict['tickers']`` (or ``work_dict['ticker']``)
+
+    :param work_dict: dictionary for key/values
+    """
+
+    label = work_dict.get(
+        'label',
+        'collect_pricing_datasets')
+
+    log.info(
+        'task - {} - start'.format(
+            label))
+
+    res = build_result.build_result(
+        status=NOT_RUN,
+        err=None,
+        rec={})
+
+    try:
+        tickers = work_dict.get(
+            'tickers',
+            None)
+        if not tickers:
+            tickers = []
+            if work_dict.get('ticker', None):
+                tickers = [work_dict['ticker']]
+        if not tickers:
+            err = (
+                '{} - missing tickers in work_dict'.format(
+                    label))
+            log.error(err)
+            res = build_result.build_result(
+                status=ERR,
+                err=err,
+                rec={})
+        else:
+            res = collection_pipeline.run_collection_pipeline(
+                tickers=tickers,
+                work_dict=work_dict,
+                fetch_mode=work_dict.get(
+                    'fetch_mode',
+                    FETCH_MODE_ALL),
+                iex_datasets=work_dict.get(
+                    'iex_datasets',
+                    DEFAULT_FETCH_DATASETS),
+                label=label,
+                fetch_workers=work_dict.get(
+                    'fetch_workers',
+                    None),
+                scrub_workers=work_dict.get(
+                    'scrub_workers',
+                    None),
+                publish_workers=work_dict.get(
+                    'publish_workers',
+                    None),
+                queue_size=work_dict.get(
+                    'queue_size',
+                    None))
+        # end of if/else tickers
+    except Exception as e:
+        res = build_result.build_result(
+            status=ERR,
+            err=(
+                'failed - collect_pricing_datasets '
+                'dict={} with ex={}').format(
+                    work_dict,
+                    e),
+            rec={})
+        log.error(
+            '{} - {}'.format(
+                label,
+                res['err']))
+    # end of try/ex
+
+    log.info(
+        'task - collect_pricing_datasets done - '
+        '{} - status={}'.format(
+            label,
+            get_status(res['status'])))
+
+    return analysis_engine.get_task_results.get_task_results(
+        work_dict=work_dict,
+        result=res)
+# end of collect_pricing_datasets
+
+
+def run_collect_pricing_datasets(
+        work_dict):
+    """run_collect_pricing_datasets
+
+    Celery wrapper for running without celery
+
+    :param work_dict: task data
+    """
+
+    label = work_dict.get(
+        'label',
+        '')
+
+    log.info(
+        'run_collect_pricing_datasets - {} - start'.format(
+            label))
+
+    response = build_result.build_result(
+        status=NOT_RUN,
+        err=None,
+        rec={})
+    task_res = {}
+
+    # allow running without celery
+    if is_celery_disabled(
+            work_dict=work_dict):
+        work_dict['celery_disabled'] = True
+        task_res = collect_pricing_datasets(
+            work_dict)
+        if task_res:
+            response = task_res.get(
+                'result',
+                task_res)
+            if ev('DEBUG_RESULTS', '0') == '1':
+                response_details = response
+                try:
+                    response_details = ppj(response)
+                except Exception:
+                    response_details = response
+
+                log.info(
+                    '{} task result={}'.format(
+                        label,
+                        response_details))
+        else:
+            log.error(
+                '{} celery was disabled but the task={} '
+                'did not return anything'.format(
+                    label,
+                    response))
+        # end of if response
+    else:
+        task_res = collect_pricing_datasets.delay(
+            work_dict=work_dict)
+        rec = {
+            'task_id': task_res
+        }
+        response = build_result.build_result(
+            status=SUCCESS,
+            err=None,
+            rec=rec)
+    # if celery enabled
+
+    if response:
+        log.info(
+            'run_collect_pricing_datasets - {} - done '
+            'status={} err={}'.format(
+                label,
+                get_status(response['status']),
+                response['err']))
+    else:
+        log.info(
+            'run_collect_pricing_datasets - {} - done '
+            'no response'.format(
+                label))
+    # end of if/else response
+
+    return response
+# end of run_collect_pricing_datasets
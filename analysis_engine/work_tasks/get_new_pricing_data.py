@@ -62,16 +62,36 @@ and more) from these sources:
 github.com/AlgoTraders/stock-analysis-engine/blob/master/ana
 lysis_engine/api_requests.py#L49>`__
 
+**Concurrent IEX Fetches**
+
+By default the IEX datasets for a ticker are fetched one after
+another. Set ``iex_workers`` in the ``work_dict`` (or export
+``IEX_FETCH_WORKERS``) above ``1`` to fetch all the IEX datasets
+for the ticker in parallel on a thread pool. The results are
+merged into the same ``rec`` dictionary in the order of
+``iex_datasets``. All threads in the process share one limit of
+``IEX_MAX_CONCURRENT`` in-flight IEX requests so concurrent tasks
+in the same worker do not flood the API.
+
 **Supported Environment Variables**
 
 ::
 
     export DEBUG_RESULTS=1
 
+    # number of threads for fetching the IEX datasets
+    # for one ticker (0 or 1 is serial)
+    export IEX_FETCH_WORKERS=0
+
+    # max number of IEX requests in flight per process
+    export IEX_MAX_CONCURRENT=4
+
 """
 
 import datetime
 import copy
+import threading
+import concurrent.futures
 import analysis_engine.build_result as build_result
 import analysis_engine.get_task_results
 import analysis_engine.work_tasks.custom_task
@@ -120,6 +140,108 @@ from analysis_engine.iex.consts import get_ft_str
 log = build_colorized_logger(
     name=__name__)
 
+IEX_FETCH_WORKERS = int(ev(
+    'IEX_FETCH_WORKERS',
+    '0'))
+IEX_MAX_CONCURRENT = int(ev(
+    'IEX_MAX_CONCURRENT',
+    '4'))
+IEX_FETCH_SEMAPHORE = threading.BoundedSemaphore(
+    max(IEX_MAX_CONCURRENT, 1))
+
+
+def fetch_iex_dataset(
+        work_dict,
+        ticker,
+        ft_type,
+        label,
+        idx=0,
+        num_datasets=1):
+    """fetch_iex_dataset
+
+    fetch one IEX dataset for a ticker with
+    ``analysis_engine.iex.get_data.get_data_from_iex``
+    while holding the process-wide IEX request limit and
+    return a tuple ``(dataset_field, iex_res)``
+
+    :param work_dict: dictionary for key/values
+    :param ticker: ticker symbol
+    :param ft_type: IEX fetch type
+    :param label: log tracking label
+    :param idx: optional - index of the dataset for the logs
+    :param num_datasets: optional - number of datasets
+        for the logs
+    """
+    dataset_field = get_ft_str(ft_type=ft_type)
+
+    log.info(
+        '{} iex={}/{} field={} ticker={}'.format(
+            label,
+            idx,
+            num_datasets,
+            dataset_field,
+            ticker))
+    iex_label = '{}-{}'.format(
+        label,
+        dataset_field)
+    iex_req = copy.deepcopy(work_dict)
+    iex_req['label'] = iex_label
+    iex_req['ft_type'] = ft_type
+    iex_req['field'] = dataset_field
+    iex_req['ticker'] = ticker
+    with IEX_FETCH_SEMAPHORE:
+        iex_res = iex_data.get_data_from_iex(
+            work_dict=iex_req)
+    return dataset_field, iex_res
+# end of fetch_iex_dataset
+
+
+def fetch_iex_datasets(
+        work_dict,
+        ticker,
+        iex_datasets,
+        label,
+        workers=None):
+    """fetch_iex_datasets
+
+    fetch all the IEX datasets for a ticker and return a
+    list of ``(dataset_field, iex_res)`` tuples in the same
+    order as ``iex_datasets``. With more than one worker the
+    datasets are fetched in parallel on a thread pool.
+
+    :param work_dict: dictionary for key/values
+    :param ticker: ticker symbol
+    :param iex_datasets: list of IEX fetch types
+    :param label: log tracking label
+    :param workers: optional - number of threads
+        (default is ``IEX_FETCH_WORKERS`` which is ``0``
+        for serial fetches)
+    """
+    if workers is None:
+        workers = IEX_FETCH_WORKERS
+    num_datasets = len(iex_datasets)
+
+    def fetch_one(
+            job):
+        idx, ft_type = job
+        return fetch_iex_dataset(
+            work_dict=work_dict,
+            ticker=ticker,
+            ft_type=ft_type,
+            label=label,
+            idx=idx,
+            num_datasets=num_datasets)
+    # end of fetch_one
+
+    jobs = list(enumerate(iex_datasets))
+    if workers <= 1 or num_datasets <= 1:
+        return [fetch_one(job) for job in jobs]
+
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(workers, num_datasets)) as executor:
+        return list(executor.map(fetch_one, jobs))
+# end of fetch_iex_datasets
+
 
 @task(
     bind=True,
@@ -212,6 +334,9 @@ def get_new_pricing_data(
         fetch_mode = work_dict.get(
             'fetch_mode',
             FETCH_MODE_ALL)
+        iex_workers = int(work_dict.get(
+            'iex_workers',
+            IEX_FETCH_WORKERS))
 
         # control flags to deal with feed issues:
         get_yahoo_data = True
@@ -308,27 +433,13 @@ def get_new_pricing_data(
                 '{} iex datasaets={}'.format(
                     label,
                     num_iex_ds))
-            for idx, ft_type in enumerate(iex_datasets):
-                dataset_field = get_ft_str(ft_type=ft_type)
-
-                log.info(
-                    '{} iex={}/{} field={} ticker={}'.format(
-                        label,
-                        idx,
-                        num_iex_ds,
-                        dataset_field,
-                        ticker))
-                iex_label = '{}-{}'.format(
-                    label,
-                    dataset_field)
-                iex_req = copy.deepcopy(work_dict)
-                iex_req['label'] = iex_label
-                iex_req['ft_type'] = ft_type
-                iex_req['field'] = dataset_field
-                iex_req['ticker'] = ticker
-                iex_res = iex_data.get_data_from_iex(
-                    work_dict=iex_req)
-
+            iex_results = fetch_iex_datasets(
+                work_dict=work_dict,
+                ticker=ticker,
+                iex_datasets=iex_datasets,
+                label=label,
+                workers=iex_workers)
+            for dataset_field, iex_res in iex_results:
                 if iex_res['status'] == SUCCESS:
                     iex_rec = iex_res['rec']
                     log.info(
@@ -353,7 +464,7 @@ def get_new_pricing_data(
                             get_status(status=iex_res['status']),
                             iex_res['err']))
                 # end of if/else succcess
-            # end idx, ft_type in enumerate(iex_datasets):
+            # end of merging the iex results into the rec
         # end of if get_iex_data
 
         update_req = {
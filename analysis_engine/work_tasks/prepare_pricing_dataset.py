@@ -48,7 +48,6 @@ lysis_engine/api_requests.py#L300>`__
 """
 
 import datetime
-import redis
 import analysis_engine.build_result as build_result
 import analysis_engine.api_requests as api_requests
 import analysis_engine.get_data_from_redis_key as redis_get
@@ -59,6 +58,7 @@ import analysis_engine.get_pricing
 import analysis_engine.work_tasks.publish_from_s3_to_redis as \
     s3_to_redis
 import analysis_engine.dict_to_csv
+import analysis_engine.redis_pool as redis_pool
 from celery.task import task
 from spylunking.log.setup_logging import build_colorized_logger
 from analysis_engine.consts import SUCCESS
@@ -256,7 +256,7 @@ def prepare_pricing_dataset(
                     redis_key,
                     updated,
                     redis_expire))
-            rc = redis.Redis(
+            rc = redis_pool.get_redis_client(
                 host=redis_host,
                 port=redis_port,
                 password=redis_password,
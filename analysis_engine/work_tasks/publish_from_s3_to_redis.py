@@ -40,7 +40,6 @@ lysis_engine/api_requests.py#L386>`__
 """
 
 import boto3
-import redis
 import analysis_engine.build_result as build_result
 import analysis_engine.get_task_results
 import analysis_engine.work_tasks.custom_task
@@ -71,6 +70,7 @@ from analysis_engine.consts import to_f
 from analysis_engine.consts import is_celery_disabled
 import analysis_engine.s3_read_contents_from_key as \
     s3_read_contents_from_key
+import analysis_engine.redis_pool as redis_pool
 
 log = build_colorized_logger(
     name=__name__)
@@ -344,7 +344,7 @@ def publish_from_s3_to_redis(
                             redis_expire))
                 # end of if/else
 
-                rc = redis.Redis(
+                rc = redis_pool.get_redis_client(
                     host=redis_host,
                     port=redis_port,
                     password=redis_password,
@@ -41,7 +41,6 @@ lysis_engine/api_requests.py#L344>`__
 """
 
 import boto3
-import redis
 import json
 import analysis_engine.build_result as build_result
 import analysis_engine.get_task_results
@@ -49,6 +48,7 @@ import analysis_engine.work_tasks.custom_task
 import analysis_engine.options_dates
 import analysis_engine.get_pricing
 import analysis_engine.set_data_in_redis_key as redis_set
+import analysis_engine.redis_pool as redis_pool
 from celery.task import task
 from spylunking.log.setup_logging import build_colorized_logger
 from analysis_engine.consts import SUCCESS
@@ -91,6 +91,9 @@ def publish_pricing_update(
     - prices - turn off with ``work_dict.get_pricing = False``
     - news - turn off with ``work_dict.get_news = False``
     - options - turn off with ``work_dict.get_options = False``
+    - redis serializer - set ``work_dict.serializer`` to ``arrow``
+      or ``parquet`` to cache DataFrame datasets as binary
+      columnar bytes instead of json (default is ``json``)
 
     :param work_dict: dictionary for key/values
     """
@@ -322,7 +325,7 @@ def publish_pricing_update(
                         updated,
                         redis_expire))
 
-                rc = redis.Redis(
+                rc = redis_pool.get_redis_client(
                     host=redis_host,
                     port=redis_port,
                     password=redis_password,
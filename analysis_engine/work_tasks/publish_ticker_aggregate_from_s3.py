@@ -43,7 +43,6 @@ lysis_engine/api_requests.py#L426>`__
 import boto3
 import json
 import re
-import redis
 import zlib
 import analysis_engine.build_result as build_result
 import analysis_engine.get_task_results
@@ -77,6 +76,7 @@ from analysis_engine.consts import ev
 from analysis_engine.consts import to_f
 import analysis_engine.s3_read_contents_from_key as \
     s3_read_contents_from_key
+import analysis_engine.redis_pool as redis_pool
 
 log = build_colorized_logger(
     name=__name__)
@@ -486,7 +486,7 @@ def publish_ticker_aggregate_from_s3(
                             redis_expire))
                 # end of if/else
 
-                rc = redis.Redis(
+                rc = redis_pool.get_redis_client(
                     host=redis_host,
                     port=redis_port,
                     password=redis_password,
@@ -36,14 +36,18 @@ or manually with:
         -n ${use_date} \
         -w
 
+Workers on the same host can share the extracted datasets
+instead of each re-extracting them from Redis by setting
+``dataset_cache`` in the ``algo_req`` (or
+``export SHARED_DATASET_CACHE_ENABLED=1`` on the workers),
+see ``analysis_engine.shared_dataset_cache``.
+
 """
 
-import inspect
-import types
-import importlib.machinery
 import datetime
 import celery.task as celery_task
 import analysis_engine.consts as ae_consts
+import analysis_engine.module_cache as module_cache
 import analysis_engine.build_result as build_result
 import analysis_engine.get_task_results as get_task_results
 import analysis_engine.work_tasks.custom_task as custom_task
@@ -100,6 +104,7 @@ def run_distributed_algorithm(
 
     created_algo_object = None
     custom_algo_module = None
+    use_class_member_object = None
     new_algo_object = None
     use_custom_algo = False
     found_algo_module = True  # assume the BaseAlgo
@@ -164,20 +169,13 @@ def run_distributed_algorithm(
     if algo_module_path:
         found_algo_module = False
         module_name = algo_module_path.split('/')[-1]
-        loader = importlib.machinery.SourceFileLoader(
-            module_name,
-            algo_module_path)
-        custom_algo_module = types.ModuleType(
-            loader.name)
-        loader.exec_module(
-            custom_algo_module)
+        # the module file is only executed again if it changed
+        custom_algo_module, use_class_member_object = \
+            module_cache.find_member(
+                module_name=module_name,
+                path_to_module=algo_module_path)
         use_custom_algo = True
-
-        for member in inspect.getmembers(custom_algo_module):
-            if module_name in str(member):
-                found_algo_module = True
-                break
-        # for all members in this custom module file
+        found_algo_module = use_class_member_object is not None
     # if loading a custom algorithm module from a file on disk
 
     if not found_algo_module:
@@ -244,19 +242,12 @@ def run_distributed_algorithm(
                 'inspecting {} for class {}'.format(
                     custom_algo_module,
                     module_name))
-            use_class_member_object = None
-            for member in inspect.getmembers(custom_algo_module):
-                if module_name in str(member):
-                    log.info(
-                        'start {} with {}'.format(
-                            name,
-                            member[1]))
-                    use_class_member_object = member
-                    break
-            # end of looking over the class definition but did not find it
-
             if use_class_member_object:
-                new_algo_object = member[1](
+                log.info(
+                    'start {} with {}'.format(
+                        name,
+                        use_class_member_object[1]))
+                new_algo_object = use_class_member_object[1](
                     **algo_req)
             else:
                 err = (
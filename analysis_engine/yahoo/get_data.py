@@ -366,6 +366,10 @@ def get_data_from_yahoo(
             'puts',
             'news'
         ]
+        # the collection pipeline publishes the fields
+        # in its own stage
+        if not work_dict.get('publish_fields', True):
+            fields_to_upload = []
 
         for field_name in fields_to_upload:
             upload_and_cache_req = copy.deepcopy(work_dict)
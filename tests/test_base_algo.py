@@ -599,6 +599,95 @@ class TestBaseAlgo(BaseTestCase):
             data=self.data)
     # end of test_run_daily
 
+    def test_run_daily_uses_data(self):
+        """test_run_daily_uses_data"""
+        self.data[self.ticker][0]['data']['minute'] = self.daily_df
+        algo = BaseAlgo(
+            ticker=self.ticker,
+            balance=self.balance,
+            name='test_run_daily_uses_data',
+            uses_data=['pricing'])
+        self.assertEqual(
+            algo.get_load_datasets(),
+            set(['daily', 'pricing']))
+        algo.handle_data(
+            data=self.data)
+        self.assertEqual(
+            algo.today_close,
+            274.02)
+        self.assertTrue(
+            algo.df_minute is algo.empty_pd)
+        self.assertIsNone(
+            algo.latest_min)
+    # end of test_run_daily_uses_data
+
+    def test_run_daily_quiet(self):
+        """test_run_daily_quiet"""
+        results = []
+        for quiet in [False, True]:
+            algo = BaseAlgo(
+                ticker=self.ticker,
+                balance=self.balance,
+                name='test_run_daily_quiet',
+                quiet=quiet)
+            algo.handle_data(
+                data=self.data)
+            results.append(algo)
+        self.assertTrue(
+            results[0].log_nodes)
+        self.assertFalse(
+            results[1].log_nodes)
+        self.assertNotEqual(
+            results[0].get_debug_msg(),
+            '')
+        self.assertEqual(
+            results[1].get_debug_msg(),
+            '')
+        self.assertEqual(
+            results[0].get_balance(),
+            results[1].get_balance())
+        self.assertEqual(
+            len(results[0].get_history_df().index),
+            len(results[1].get_history_df().index))
+    # end of test_run_daily_quiet
+
+    def test_create_datasets_serialize_once(self):
+        """test_create_datasets_serialize_once"""
+        algo = BaseAlgo(
+            ticker=self.ticker,
+            balance=self.balance,
+            name='test_create_datasets_serialize_once')
+        algo.handle_data(
+            data=self.data)
+        with mock.patch.object(
+                algo,
+                'serialize_node_data',
+                wraps=algo.serialize_node_data) as mock_serialize:
+            with mock.patch.object(
+                    algo,
+                    'load_from_dataset') as mock_load:
+                ready_ds = algo.create_algorithm_ready_dataset()
+                history_ds = algo.create_history_dataset()
+                report_ds = algo.create_report_dataset()
+        self.assertEqual(
+            mock_serialize.call_count,
+            len(self.data[self.ticker]))
+        self.assertEqual(
+            mock_load.call_count,
+            0)
+        self.assertEqual(
+            ready_ds,
+            history_ds)
+        self.assertEqual(
+            ready_ds,
+            report_ds)
+        self.assertEqual(
+            ready_ds[self.ticker][0]['data']['daily'],
+            self.daily_df.to_json(
+                orient='records',
+                date_format='iso'))
+    # end of test_create_datasets_serialize_once
+
     @mock.patch(
         ('analysis_engine.write_to_file.write_to_file'),
         new=mock_write_to_file)
@@ -0,0 +1,111 @@
+"""
+Test file for:
+Build a DataFrame from cached bytes
+
+Benchmarks
+----------
+
+Compare the direct bytes-to-DataFrame decode against the
+previous ``json.loads`` + ``pd.read_json`` path with:
+
+::
+
+    export BENCH_TESTS=1
+    python -m unittest tests.test_build_df_from_bytes
+
+"""
+
+import os
+import json
+import time
+import pandas as pd
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.consts import ev
+from analysis_engine.build_df_from_bytes import build_df_from_bytes
+from spylunking.log.setup_logging import build_colorized_logger
+
+log = build_colorized_logger(
+    name=__name__)
+
+
+class TestBuildDfFromBytes(BaseTestCase):
+    """TestBuildDfFromBytes"""
+
+    payload = None
+
+    def setUp(
+            self):
+        """setUp"""
+        path_to_file = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            'datasets',
+            'spy-minute.json')
+        with open(path_to_file, 'r') as cur_file:
+            minute_json = cur_file.read()
+        # cached datasets are json-serialized df.to_json() strings
+        self.payload = json.dumps(
+            minute_json).encode('utf-8')
+    # end of setUp
+
+    def test_empty_payloads(self):
+        """test_empty_payloads"""
+        self.assertIsNone(
+            build_df_from_bytes(
+                raw_data=None))
+        self.assertIsNone(
+            build_df_from_bytes(
+                raw_data=json.dumps('').encode('utf-8')))
+        df = build_df_from_bytes(
+            raw_data=json.dumps('[]').encode('utf-8'))
+        self.assertEqual(
+            len(df.index),
+            0)
+    # end of test_empty_payloads
+
+    def test_fast_decode_matches_read_json(self):
+        """test_fast_decode_matches_read_json"""
+        fast_df = build_df_from_bytes(
+            raw_data=self.payload,
+            mode='fast')
+        read_json_df = build_df_from_bytes(
+            raw_data=self.payload,
+            mode='read_json')
+        self.assertEqual(
+            len(fast_df.index),
+            len(read_json_df.index))
+        pd.testing.assert_frame_equal(
+            fast_df,
+            read_json_df,
+            check_like=True)
+        self.assertEqual(
+            fast_df['date'].dtype,
+            read_json_df['date'].dtype)
+        self.assertTrue(
+            str(fast_df['date'].dtype).startswith('datetime64'))
+    # end of test_fast_decode_matches_read_json
+
+    def test_bench_decode_spy_minute(self):
+        """test_bench_decode_spy_minute"""
+        if ev('BENCH_TESTS', '0') == '0':
+            return
+        num_runs = int(ev('BENCH_RUNS', '200'))
+        timings = {}
+        for mode in ['read_json', 'fast']:
+            start = time.time()
+            for idx in range(num_runs):
+                build_df_from_bytes(
+                    raw_data=self.payload,
+                    mode=mode)
+            timings[mode] = (time.time() - start) / num_runs
+        # end of timing each decode path
+
+        log.info(
+            'bench decode spy-minute runs={} read_json={:.6f}s '
+            'fast={:.6f}s speedup={:.2f}x'.format(
+                num_runs,
+                timings['read_json'],
+                timings['fast'],
+                timings['read_json'] / timings['fast']))
+    # end of test_bench_decode_spy_minute
+
+# end of TestBuildDfFromBytes
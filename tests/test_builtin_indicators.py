@@ -0,0 +1,278 @@
+"""
+Test file for:
+Built-in Indicators
+"""
+
+import numpy as np
+import pandas as pd
+import analysis_engine.consts as ae_consts
+import analysis_engine.indicators.builtin_indicators as builtin
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.indicators.indicator_processor import IndicatorProcessor
+
+
+class TestBuiltinIndicators(BaseTestCase):
+    """TestBuiltinIndicators"""
+
+    def setUp(
+            self):
+        """setUp"""
+        rand = np.random.RandomState(7)
+        num_rows = 200
+        close = 100.0 + np.cumsum(rand.normal(0.0, 1.0, num_rows))
+        self.df = pd.DataFrame({
+            'date': pd.date_range(
+                '2018-01-01',
+                periods=num_rows).strftime('%Y-%m-%d'),
+            'close': close,
+            'high': close + rand.uniform(0.1, 2.0, num_rows),
+            'low': close - rand.uniform(0.1, 2.0, num_rows),
+            'volume': rand.randint(1000, 5000, num_rows).astype(float)
+        })
+    # end of setUp
+
+    def assert_same(
+            self,
+            values,
+            expected):
+        """assert_same
+
+        :param values: computed array
+        :param expected: reference ``pd.Series`` or array
+        """
+        np.testing.assert_allclose(
+            values,
+            np.asarray(expected, dtype=np.float64),
+            rtol=1e-7,
+            atol=1e-7)
+    # end of assert_same
+
+    def test_numpy_matches_pandas_rolling(self):
+        """test_numpy_matches_pandas_rolling"""
+        close = self.df['close']
+        high = self.df['high']
+        low = self.df['low']
+        self.assert_same(
+            builtin.compute_sma(close, 10, use_talib=False),
+            close.rolling(10).mean())
+        highest = high.rolling(14).max()
+        lowest = low.rolling(14).min()
+        self.assert_same(
+            builtin.compute_willr(high, low, close, 14, use_talib=False),
+            -100.0 * (highest - close) / (highest - lowest))
+        upper, middle, lower = builtin.compute_bbands(
+            close,
+            20,
+            2.0,
+            use_talib=False)
+        std = close.rolling(20).std(ddof=0)
+        self.assert_same(
+            upper,
+            close.rolling(20).mean() + 2.0 * std)
+        self.assert_same(
+            lower,
+            close.rolling(20).mean() - 2.0 * std)
+        obv = [self.df['volume'][0]]
+        for idx in range(1, len(close)):
+            change = np.sign(close[idx] - close[idx - 1])
+            obv.append(obv[-1] + change * self.df['volume'][idx])
+        self.assert_same(
+            builtin.compute_obv(close, self.df['volume'], use_talib=False),
+            obv)
+    # end of test_numpy_matches_pandas_rolling
+
+    def test_numpy_matches_recursive_averages(self):
+        """test_numpy_matches_recursive_averages"""
+        close = self.df['close'].values
+        num_points = 10
+        ema = [np.nan] * (num_points - 1) + [close[:num_points].mean()]
+        alpha = 2.0 / (num_points + 1.0)
+        for value in close[num_points:]:
+            ema.append(alpha * value + (1.0 - alpha) * ema[-1])
+        self.assert_same(
+            builtin.compute_ema(close, num_points, use_talib=False),
+            ema)
+
+        diffs = np.diff(close)
+        gains = np.where(diffs > 0, diffs, 0.0)
+        losses = np.where(diffs < 0, -diffs, 0.0)
+        avg_gain = gains[:14].mean()
+        avg_loss = losses[:14].mean()
+        rsi = [np.nan] * 14 + [100.0 * avg_gain / (avg_gain + avg_loss)]
+        for gain, loss in zip(gains[14:], losses[14:]):
+            avg_gain = (avg_gain * 13 + gain) / 14
+            avg_loss = (avg_loss * 13 + loss) / 14
+            rsi.append(100.0 * avg_gain / (avg_gain + avg_loss))
+        self.assert_same(
+            builtin.compute_rsi(close, 14, use_talib=False),
+            rsi)
+
+        macd, signal, hist = builtin.compute_macd(
+            close,
+            12,
+            26,
+            9,
+            use_talib=False)
+        self.assertTrue(np.isnan(macd[24]))
+        self.assertFalse(np.isnan(macd[25]))
+        self.assertTrue(np.isnan(signal[32]))
+        self.assertFalse(np.isnan(signal[33]))
+        self.assert_same(
+            hist[33:],
+            macd[33:] - signal[33:])
+
+        atr = builtin.compute_atr(
+            self.df['high'],
+            self.df['low'],
+            close,
+            14,
+            use_talib=False)
+        self.assertTrue(np.isnan(atr[13]))
+        self.assertFalse(np.isnan(atr[14]))
+    # end of test_numpy_matches_recursive_averages
+
+    def test_numpy_matches_talib(self):
+        """test_numpy_matches_talib"""
+        if not builtin.is_talib_supported():
+            return
+        close = self.df['close']
+        high = self.df['high']
+        low = self.df['low']
+        for use_talib in [True, False]:
+            self.assertEqual(
+                len(builtin.compute_sma(close, 10, use_talib)),
+                len(close))
+        self.assert_same(
+            builtin.compute_ema(close, 10, use_talib=False),
+            builtin.compute_ema(close, 10, use_talib=True))
+        self.assert_same(
+            builtin.compute_rsi(close, 14, use_talib=False),
+            builtin.compute_rsi(close, 14, use_talib=True))
+        self.assert_same(
+            builtin.compute_atr(high, low, close, 14, use_talib=False),
+            builtin.compute_atr(high, low, close, 14, use_talib=True))
+        self.assert_same(
+            builtin.compute_willr(high, low, close, 14, use_talib=False),
+            builtin.compute_willr(high, low, close, 14, use_talib=True))
+    # end of test_numpy_matches_talib
+
+    def test_load_builtin_indicators_by_name(self):
+        """test_load_builtin_indicators_by_name"""
+        names = ['sma', 'ema', 'rsi', 'macd', 'willr', 'atr', 'bollinger',
+                 'obv']
+        config_dict = {
+            'name': 'builtin',
+            'indicators': [
+                {
+                    'name': name,
+                    'uses_data': 'daily',
+                    'use_talib': False
+                }
+                for name in names
+            ]
+        }
+        proc = IndicatorProcessor(
+            config_dict=config_dict)
+        indicators = proc.get_indicators()
+        self.assertEqual(
+            len(indicators),
+            len(names))
+        proc.process(
+            algo_id='test',
+            ticker='SPY',
+            dataset={
+                'id': 'SPY_2018-07-19',
+                'date': '2018-07-19',
+                'data': {
+                    'daily': self.df
+                }
+            })
+        values = {}
+        for ind_id in indicators:
+            ind_node = indicators[ind_id]
+            self.assertEqual(
+                ind_node['report']['path_to_module'],
+                ae_consts.INDICATOR_BUILTIN_MODULE_PATH)
+            self.assertTrue(
+                isinstance(
+                    ind_node['obj'],
+                    builtin.BuiltinIndicator))
+            values.update(ind_node['obj'].get_values('SPY'))
+        for key in ['sma', 'ema', 'rsi', 'macd', 'macd_signal', 'willr',
+                    'atr', 'bb_upper', 'bb_lower', 'obv']:
+            self.assertFalse(
+                np.isnan(values[key]))
+        self.assertAlmostEqual(
+            values['sma'],
+            self.df['close'][-30:].mean())
+    # end of test_load_builtin_indicators_by_name
+
+    def test_shared_inputs_and_workers(self):
+        """test_shared_inputs_and_workers"""
+        config_dict = {
+            'name': 'builtin',
+            'indicators': [
+                {
+                    'name': 'sma',
+                    'num_points': 20
+                },
+                {
+                    'name': 'bbands',
+                    'num_points': 20
+                },
+                {
+                    'name': 'ema',
+                    'num_points': 12
+                },
+                {
+                    'name': 'macd',
+                    'use_talib': False
+                }
+            ]
+        }
+        dataset = {
+            'id': 'SPY_2018-07-19',
+            'date': '2018-07-19',
+            'data': {
+                'daily': self.df
+            }
+        }
+        all_values = []
+        for workers in [0, 4]:
+            proc = IndicatorProcessor(
+                config_dict=config_dict,
+                workers=workers)
+            self.assertEqual(
+                [len(keys) for keys in proc.input_levels],
+                [1, 4])
+            proc.process(
+                algo_id='test',
+                ticker='SPY',
+                dataset=dataset)
+            values = {}
+            indicators = proc.get_indicators()
+            for ind_id in indicators:
+                values.update(indicators[ind_id]['obj'].get_values('SPY'))
+            all_values.append(values)
+            timings = proc.get_timings()
+            self.assertEqual(
+                len(timings),
+                len(indicators) + 1)
+            for name in timings:
+                self.assertEqual(
+                    timings[name]['calls'],
+                    1)
+        # end of for serial and threaded
+        self.assertEqual(
+            all_values[0],
+            all_values[1])
+        self.assertAlmostEqual(
+            all_values[0]['bb_middle'],
+            all_values[0]['sma'])
+        self.assertAlmostEqual(
+            all_values[0]['bb_upper'],
+            self.df['close'][-20:].mean() +
+            2.0 * self.df['close'][-20:].std(ddof=0))
+    # end of test_shared_inputs_and_workers
+
+# end of TestBuiltinIndicators
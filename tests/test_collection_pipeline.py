@@ -0,0 +1,135 @@
+"""
+Test file for:
+Collection Pipeline
+"""
+
+import threading
+import mock
+import analysis_engine.mocks.mock_pinance
+import analysis_engine.mocks.mock_iex as mock_iex
+import analysis_engine.collection_pipeline as collection_pipeline
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.consts import SUCCESS
+from analysis_engine.consts import ERR
+from analysis_engine.work_tasks.collect_pricing_datasets \
+    import run_collect_pricing_datasets
+
+
+PUBLISHED = {}
+PUBLISHED_LOCK = threading.Lock()
+
+
+def mock_record_publish_pricing_update(
+        work_dict):
+    """mock_record_publish_pricing_update
+
+    :param work_dict: publish request
+    """
+    with PUBLISHED_LOCK:
+        PUBLISHED[work_dict['redis_key']] = work_dict['data']
+    return {
+        'status': SUCCESS,
+        'err': None,
+        'rec': {}
+    }
+# end of mock_record_publish_pricing_update
+
+
+class TestCollectionPipeline(BaseTestCase):
+    """TestCollectionPipeline"""
+
+    def setUp(
+            self):
+        """setUp"""
+        PUBLISHED.clear()
+        self.server, self.base_url = mock_iex.start_mock_iex_server()
+    # end of setUp
+
+    def tearDown(
+            self):
+        """tearDown"""
+        mock_iex.stop_mock_iex_server(
+            server=self.server)
+    # end of tearDown
+
+    @mock.patch(
+        'pinance.Pinance',
+        new=analysis_engine.mocks.mock_pinance.MockPinance)
+    @mock.patch(
+        ('analysis_engine.get_pricing.'
+         'get_options'),
+        new=analysis_engine.mocks.mock_pinance.mock_get_options)
+    @mock.patch(
+        ('analysis_engine.work_tasks.publish_pricing_update.'
+         'run_publish_pricing_update'),
+        new=mock_record_publish_pricing_update)
+    def test_run_collection_pipeline(self):
+        """test_run_collection_pipeline"""
+        res = collection_pipeline.run_collection_pipeline(
+            tickers=['spy', 'AMZN', 'TSLA'],
+            work_dict={
+                'last_close_str': '2018-11-01'
+            },
+            iex_datasets=['daily', 'minute', 'quote', 'news'],
+            iex_base_url=self.base_url,
+            iex_batch_symbols=2,
+            fetch_workers=3,
+            queue_size=1)
+        self.assertEqual(
+            res['status'],
+            SUCCESS)
+        self.assertEqual(
+            res['rec']['tickers'],
+            {
+                'SPY': SUCCESS,
+                'AMZN': SUCCESS,
+                'TSLA': SUCCESS
+            })
+        self.assertEqual(
+            res['rec']['num_fetch_errors'],
+            0)
+        # daily+quote+news and minute for 2 groups of tickers
+        self.assertEqual(
+            len(self.server.batch_queries),
+            4)
+        self.assertEqual(
+            res['rec']['limits']['iex']['calls'],
+            4)
+        self.assertEqual(
+            res['rec']['limits']['yahoo']['calls'],
+            3)
+        for ticker in ['SPY', 'AMZN', 'TSLA']:
+            key = '{}_2018-11-01'.format(
+                ticker)
+            self.assertEqual(
+                res['rec']['keys'][ticker],
+                key)
+            for suffix in ['daily', 'minute', 'quote', 'news1',
+                           'pricing', 'calls', 'puts', 'news']:
+                self.assertIn(
+                    '{}_{}'.format(
+                        key,
+                        suffix),
+                    PUBLISHED)
+            self.assertNotEqual(
+                PUBLISHED['{}_daily'.format(key)],
+                '{}')
+            self.assertEqual(
+                PUBLISHED[key]['daily'],
+                PUBLISHED['{}_daily'.format(key)])
+            self.assertIsNotNone(
+                PUBLISHED[key]['pricing'])
+    # end of test_run_collection_pipeline
+
+    def test_collect_pricing_datasets_without_tickers(self):
+        """test_collect_pricing_datasets_without_tickers"""
+        res = run_collect_pricing_datasets(
+            work_dict={
+                'celery_disabled': True
+            })
+        self.assertEqual(
+            res['status'],
+            ERR)
+    # end of test_collect_pricing_datasets_without_tickers
+
+# end of TestCollectionPipeline
@@ -0,0 +1,182 @@
+"""
+Test file for:
+Columnar Algorithm-Ready Datasets on Disk
+"""
+
+import os
+import shutil
+import tempfile
+import pandas as pd
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.consts import SUCCESS
+from analysis_engine.df_serializers import is_columnar_supported
+from analysis_engine.columnar_dataset import is_columnar_dataset
+from analysis_engine.columnar_dataset import is_columnar_path
+from analysis_engine.columnar_dataset import write_columnar_dataset
+from analysis_engine.columnar_dataset import load_columnar_dataset
+from analysis_engine.load_dataset import load_dataset
+
+
+class TestColumnarDataset(BaseTestCase):
+    """TestColumnarDataset"""
+
+    output_dir = None
+    dataset = None
+
+    def setUp(
+            self):
+        """setUp"""
+        self.output_dir = tempfile.mkdtemp()
+        self.dataset = {}
+        for ticker in ['SPY', 'AMZN']:
+            self.dataset[ticker] = []
+            for idx, date in enumerate(
+                    ['2018-11-01', '2018-11-02', '2018-11-05']):
+                self.dataset[ticker].append({
+                    'id': '{}_{}'.format(
+                        ticker,
+                        date),
+                    'date': date,
+                    'data': {
+                        'daily': pd.DataFrame([
+                            {
+                                'date': date,
+                                'close': 270.0 + idx
+                            }
+                        ]).to_json(
+                            orient='records',
+                            date_format='iso'),
+                        'minute': '',
+                        'calls': pd.DataFrame([
+                            {
+                                'strike': 280.0 + idx,
+                                'ask': 1.5
+                            },
+                            {
+                                'strike': 285.0 + idx,
+                                'ask': 0.5
+                            }
+                        ])
+                    }
+                })
+    # end of setUp
+
+    def tearDown(
+            self):
+        """tearDown"""
+        shutil.rmtree(
+            self.output_dir,
+            ignore_errors=True)
+    # end of tearDown
+
+    def test_columnar_paths(self):
+        """test_columnar_paths"""
+        self.assertTrue(
+            is_columnar_path('/tmp/SPY-latest/'))
+        self.assertTrue(
+            is_columnar_path(self.output_dir))
+        self.assertFalse(
+            is_columnar_path('/tmp/SPY-latest.json'))
+        self.assertFalse(
+            is_columnar_dataset(self.output_dir))
+    # end of test_columnar_paths
+
+    def test_write_and_load_slice(self):
+        """test_write_and_load_slice"""
+        if not is_columnar_supported():
+            return
+        for columnar_format in ['arrow', 'parquet']:
+            output_dir = os.path.join(
+                self.output_dir,
+                columnar_format)
+            self.assertEqual(
+                write_columnar_dataset(
+                    algo_dataset=self.dataset,
+                    output_dir=output_dir,
+                    columnar_format=columnar_format),
+                SUCCESS)
+            self.assertTrue(
+                is_columnar_dataset(output_dir))
+            res = load_columnar_dataset(
+                path_to_dir=output_dir,
+                tickers=['SPY'],
+                start_date='2018-11-02',
+                end_date='2018-11-05')
+            self.assertEqual(
+                list(res.keys()),
+                ['SPY'])
+            self.assertEqual(
+                [node['id'] for node in res['SPY']],
+                ['SPY_2018-11-02', 'SPY_2018-11-05'])
+            node = res['SPY'][1]
+            self.assertEqual(
+                node['data']['daily']['close'][0],
+                272.0)
+            self.assertEqual(
+                list(node['data']['calls']['strike']),
+                [282.0, 287.0])
+            self.assertEqual(
+                len(node['data']['minute'].index),
+                1)
+            self.assertEqual(
+                list(node['data']['daily'].columns),
+                ['date', 'close'])
+    # end of test_write_and_load_slice
+
+    def test_null_and_mixed_type_columns(self):
+        """test_null_and_mixed_type_columns"""
+        if not is_columnar_supported():
+            return
+        for idx, node in enumerate(self.dataset['SPY']):
+            node['data']['news'] = pd.DataFrame([
+                {
+                    'headline': 'SPY news {}'.format(idx),
+                    'related': None,
+                    'source': 5 if idx == 0 else 'wire'
+                }
+            ])
+        self.assertEqual(
+            write_columnar_dataset(
+                algo_dataset=self.dataset,
+                output_dir=self.output_dir,
+                serialize_datasets=['daily', 'news']),
+            SUCCESS)
+        res = load_columnar_dataset(
+            path_to_dir=self.output_dir,
+            serialize_datasets=['daily', 'news'],
+            tickers=['SPY'])
+        news = res['SPY'][0]['data']['news']
+        self.assertEqual(
+            list(news.columns),
+            ['headline', 'related', 'source'])
+        self.assertTrue(
+            news['related'].isnull().all())
+        self.assertEqual(
+            list(news['source']),
+            ['5'])
+        self.assertEqual(
+            list(res['SPY'][1]['data']['news']['source']),
+            ['wire'])
+    # end of test_null_and_mixed_type_columns
+
+    def test_load_dataset_reads_columnar_dir(self):
+        """test_load_dataset_reads_columnar_dir"""
+        if not is_columnar_supported():
+            return
+        write_columnar_dataset(
+            algo_dataset=self.dataset,
+            output_dir=self.output_dir)
+        res = load_dataset(
+            path_to_file=self.output_dir)
+        self.assertEqual(
+            sorted(res.keys()),
+            ['AMZN', 'SPY'])
+        self.assertEqual(
+            len(res['AMZN']),
+            3)
+        self.assertEqual(
+            res['AMZN'][0]['data']['daily']['close'][0],
+            270.0)
+    # end of test_load_dataset_reads_columnar_dir
+
+# end of TestColumnarDataset
@@ -0,0 +1,139 @@
+"""
+Test file for:
+In-process LRU Cache of Scrubbed DataFrames
+"""
+
+import pandas as pd
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.mocks.mock_redis import MockRedis
+from analysis_engine.df_cache import DataFrameCache
+from analysis_engine.df_cache import get_df_size
+from analysis_engine.api_requests import get_ds_dict
+from analysis_engine.extract_batch_utils import extract_datasets_in_batch
+
+
+class TestDfCache(BaseTestCase):
+    """TestDfCache"""
+
+    df = None
+
+    def setUp(
+            self):
+        """setUp"""
+        self.df = pd.DataFrame([
+            {
+                'date': '2018-11-01',
+                'close': 273.73
+            }
+        ])
+    # end of setUp
+
+    def test_hits_misses_and_copies(self):
+        """test_hits_misses_and_copies"""
+        cache = DataFrameCache()
+        self.assertIsNone(
+            cache.get(
+                key='SPY_2018-11-01_daily',
+                name='daily'))
+        cache.set(
+            key='SPY_2018-11-01_daily',
+            df=self.df,
+            name='daily')
+        cached_df = cache.get(
+            key='SPY_2018-11-01_daily',
+            name='daily')
+        cached_df['close'] = 0.0
+        self.assertEqual(
+            cache.get(
+                key='SPY_2018-11-01_daily',
+                name='daily')['close'][0],
+            273.73)
+        self.assertIsNone(
+            cache.get(
+                key='SPY_2018-11-01_daily',
+                name='daily',
+                version='2'))
+        stats = cache.get_stats()
+        self.assertEqual(
+            stats['hits'],
+            2)
+        self.assertEqual(
+            stats['misses'],
+            2)
+    # end of test_hits_misses_and_copies
+
+    def test_evicts_least_recently_used(self):
+        """test_evicts_least_recently_used"""
+        cache = DataFrameCache(
+            max_bytes=get_df_size(self.df) * 2)
+        for date_str in ['2018-11-01', '2018-11-02']:
+            cache.set(
+                key='SPY_{}_daily'.format(date_str),
+                df=self.df)
+        cache.get(
+            key='SPY_2018-11-01_daily')
+        cache.set(
+            key='SPY_2018-11-05_daily',
+            df=self.df)
+        self.assertIsNone(
+            cache.get(
+                key='SPY_2018-11-02_daily'))
+        self.assertIsNotNone(
+            cache.get(
+                key='SPY_2018-11-01_daily'))
+        self.assertEqual(
+            cache.get_stats()['evictions'],
+            1)
+    # end of test_evicts_least_recently_used
+
+    def test_invalidate_ticker(self):
+        """test_invalidate_ticker"""
+        cache = DataFrameCache()
+        for ticker in ['SPY', 'AMZN']:
+            cache.set(
+                key='{}_2018-11-01_daily'.format(ticker),
+                df=self.df)
+        self.assertEqual(
+            cache.invalidate_ticker('spy'),
+            1)
+        self.assertEqual(
+            cache.get_stats()['entries'],
+            1)
+        self.assertEqual(
+            cache.get_stats()['bytes'],
+            get_df_size(self.df))
+    # end of test_invalidate_ticker
+
+    def test_batch_extract_uses_cache(self):
+        """test_batch_extract_uses_cache"""
+        cache = DataFrameCache()
+        extract_requests = [{
+            'id': 'SPY_2018-11-01',
+            'ticker': 'SPY',
+            'date_key': 'SPY_2018-11-01',
+            'date': '2018-11-01',
+            'req': get_ds_dict(
+                ticker='SPY',
+                base_key='SPY_2018-11-01',
+                ds_id='test')
+        }]
+        cache.set(
+            key='SPY_2018-11-01_daily',
+            df=self.df,
+            name='daily',
+            scrub_mode='sort-by-date')
+        client = MockRedis()
+        res = extract_datasets_in_batch(
+            extract_requests=extract_requests,
+            datasets=['daily'],
+            client=client,
+            cache=cache)
+        self.assertEqual(
+            res[0]['daily']['close'][0],
+            273.73)
+        self.assertEqual(
+            cache.get_stats()['hits'],
+            1)
+    # end of test_batch_extract_uses_cache
+
+# end of TestDfCache
@@ -0,0 +1,115 @@
+"""
+Test file for:
+Binary columnar serializers for caching DataFrames in Redis
+"""
+
+import json
+import pandas as pd
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.mocks.mock_redis import MockRedis
+from analysis_engine.consts import SUCCESS
+from analysis_engine.df_serializers import is_columnar_supported
+from analysis_engine.df_serializers import get_columnar_format
+from analysis_engine.df_serializers import serialize_df
+from analysis_engine.set_data_in_redis_key import set_data_in_redis_key
+from analysis_engine.get_data_from_redis_key import get_data_from_redis_key
+from analysis_engine.build_df_from_bytes import build_df_from_bytes
+
+
+class TestDfSerializers(BaseTestCase):
+    """TestDfSerializers"""
+
+    df = None
+
+    def setUp(
+            self):
+        """setUp"""
+        self.df = pd.DataFrame([
+            {
+                'date': '2018-11-01',
+                'close': 273.73,
+                'volume': 100
+            },
+            {
+                'date': '2018-11-02',
+                'close': 271.89,
+                'volume': 200
+            }
+        ])
+        self.df['date'] = pd.to_datetime(
+            self.df['date'])
+    # end of setUp
+
+    def test_json_payloads_are_not_columnar(self):
+        """test_json_payloads_are_not_columnar"""
+        self.assertIsNone(
+            get_columnar_format(
+                json.dumps(self.df.to_json(
+                    orient='records')).encode('utf-8')))
+        self.assertIsNone(
+            get_columnar_format(None))
+        self.assertIsNone(
+            serialize_df(
+                data=self.df,
+                serializer='json'))
+    # end of test_json_payloads_are_not_columnar
+
+    def test_dict_data_falls_back_to_json(self):
+        """test_dict_data_falls_back_to_json"""
+        client = MockRedis()
+        res = set_data_in_redis_key(
+            client=client,
+            key='SPY_2018-11-02_pricing',
+            data={
+                'close': 271.89
+            },
+            serializer='arrow')
+        self.assertEqual(
+            res['status'],
+            SUCCESS)
+        self.assertEqual(
+            json.loads(client.get(name='SPY_2018-11-02_pricing')),
+            {
+                'close': 271.89
+            })
+    # end of test_dict_data_falls_back_to_json
+
+    def test_roundtrip_columnar_serializers(self):
+        """test_roundtrip_columnar_serializers"""
+        if not is_columnar_supported():
+            return
+        for serializer in ['arrow', 'parquet']:
+            client = MockRedis()
+            key = 'SPY_2018-11-02_daily_{}'.format(
+                serializer)
+            res = set_data_in_redis_key(
+                client=client,
+                key=key,
+                data=self.df.to_json(
+                    orient='records',
+                    date_format='iso'),
+                serializer=serializer)
+            self.assertEqual(
+                res['status'],
+                SUCCESS)
+            raw_data = client.get(name=key)
+            self.assertEqual(
+                get_columnar_format(raw_data),
+                serializer)
+            loaded_df = build_df_from_bytes(
+                raw_data=raw_data)
+            self.assertEqual(
+                list(loaded_df['close']),
+                list(self.df['close']))
+            self.assertEqual(
+                list(loaded_df['volume']),
+                list(self.df['volume']))
+            redis_res = get_data_from_redis_key(
+                client=client,
+                key=key)
+            self.assertEqual(
+                len(redis_res['rec']['data'].index),
+                2)
+    # end of test_roundtrip_columnar_serializers
+
+# end of TestDfSerializers
@@ -0,0 +1,194 @@
+"""
+Test file for:
+Batched Dataset Extraction Utilities
+"""
+
+import json
+import pandas as pd
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.mocks.mock_redis import MockRedis
+from analysis_engine.api_requests import get_ds_dict
+from analysis_engine.api_requests \
+    import build_cache_ready_pricing_dataset
+from analysis_engine.extract_batch_utils import get_batch_datasets
+from analysis_engine.extract_batch_utils import build_batch_keys
+from analysis_engine.extract_batch_utils import get_data_from_redis_keys
+from analysis_engine.extract_batch_utils import extract_datasets_in_batch
+
+
+class TestExtractBatchUtils(BaseTestCase):
+    """TestExtractBatchUtils"""
+
+    ticker = None
+    dates = None
+    extract_requests = None
+
+    def setUp(
+            self):
+        """setUp"""
+        self.ticker = 'SPY'
+        self.dates = [
+            '2018-11-01',
+            '2018-11-02'
+        ]
+        self.extract_requests = []
+        for date_str in self.dates:
+            date_key = '{}_{}'.format(
+                self.ticker,
+                date_str)
+            self.extract_requests.append({
+                'id': date_key,
+                'ticker': self.ticker,
+                'date_key': date_key,
+                'date': date_str,
+                'req': get_ds_dict(
+                    ticker=self.ticker,
+                    base_key=date_key,
+                    ds_id='test')})
+    # end of setUp
+
+    def build_client(
+            self):
+        """build_client"""
+        client = MockRedis()
+        daily_df = pd.DataFrame([
+            {
+                'date': '2018-11-01',
+                'close': 273.73
+            }
+        ])
+        cached = build_cache_ready_pricing_dataset(
+            label='test_extract_batch')
+        for node in self.extract_requests:
+            req = node['req']
+            client.set(
+                name=req['daily'],
+                value=json.dumps(
+                    daily_df.to_json(
+                        orient='records',
+                        date_format='iso')).encode('utf-8'))
+            client.set(
+                name=req['pricing'],
+                value=json.dumps(cached['pricing']).encode('utf-8'))
+            client.set(
+                name=req['options'],
+                value=json.dumps(cached['options']).encode('utf-8'))
+        return client
+    # end of build_client
+
+    def test_get_batch_datasets(self):
+        """test_get_batch_datasets"""
+        datasets = get_batch_datasets(
+            iex_datasets=['daily', 'news'],
+            extract_iex=False,
+            extract_yahoo=False)
+        self.assertEqual(
+            datasets,
+            ['daily', 'news1'])
+        datasets = get_batch_datasets(
+            extract_iex=False,
+            extract_yahoo=True)
+        self.assertEqual(
+            datasets,
+            ['calls', 'puts', 'pricing', 'news'])
+    # end of test_get_batch_datasets
+
+    def test_build_batch_keys_shares_options_key(self):
+        """test_build_batch_keys_shares_options_key"""
+        keys = build_batch_keys(
+            extract_requests=self.extract_requests,
+            datasets=['daily', 'calls', 'puts'])
+        self.assertEqual(
+            keys,
+            [
+                'SPY_2018-11-01_daily',
+                'SPY_2018-11-01_options',
+                'SPY_2018-11-02_daily',
+                'SPY_2018-11-02_options'
+            ])
+    # end of test_build_batch_keys_shares_options_key
+
+    def test_get_data_from_redis_keys_in_chunks(self):
+        """test_get_data_from_redis_keys_in_chunks"""
+        client = self.build_client()
+        keys = build_batch_keys(
+            extract_requests=self.extract_requests,
+            datasets=['daily', 'minute', 'pricing'])
+        payloads = get_data_from_redis_keys(
+            keys=keys,
+            client=client,
+            chunk_size=4)
+        self.assertEqual(
+            len(payloads),
+            len(keys))
+        self.assertIsNotNone(
+            payloads['SPY_2018-11-02_daily'])
+        self.assertIsNone(
+            payloads['SPY_2018-11-02_minute'])
+    # end of test_get_data_from_redis_keys_in_chunks
+
+    def test_extract_datasets_in_batch(self):
+        """test_extract_datasets_in_batch"""
+        client = self.build_client()
+        datasets = get_batch_datasets(
+            extract_iex=True,
+            extract_yahoo=True)
+        res = extract_datasets_in_batch(
+            extract_requests=self.extract_requests,
+            datasets=datasets,
+            client=client)
+        self.assertEqual(
+            len(res),
+            len(self.extract_requests))
+        for ticker_data in res:
+            self.assertEqual(
+                ticker_data['daily']['close'][0],
+                273.73)
+            self.assertEqual(
+                len(ticker_data['pricing'].index),
+                1)
+            self.assertEqual(
+                len(ticker_data['calls'].index),
+                1)
+            self.assertEqual(
+                len(ticker_data['puts'].index),
+                1)
+            self.assertIsNone(
+                ticker_data['minute'])
+            self.assertIsNone(
+                ticker_data['news'])
+    # end of test_extract_datasets_in_batch
+
+    def test_extract_datasets_with_workers_keeps_order(self):
+        """test_extract_datasets_with_workers_keeps_order"""
+        client = MockRedis()
+        for idx, node in enumerate(self.extract_requests):
+            client.set(
+                name=node['req']['daily'],
+                value=json.dumps(
+                    pd.DataFrame([
+                        {
+                            'date': node['date'],
+                            'close': float(idx)
+                        }
+                    ]).to_json(
+                        orient='records',
+                        date_format='iso')).encode('utf-8'))
+        res = extract_datasets_in_batch(
+            extract_requests=self.extract_requests,
+            datasets=['daily'],
+            client=client,
+            workers=2,
+            worker_type='thread')
+        self.assertEqual(
+            [
+                ticker_data['daily']['close'][0]
+                for ticker_data in res
+            ],
+            [
+                0.0,
+                1.0
+            ])
+    # end of test_extract_datasets_with_workers_keeps_order
+
+# end of TestExtractBatchUtils
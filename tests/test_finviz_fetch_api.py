@@ -109,7 +109,7 @@ class TestFinVizFetchAPI(BaseTestCase):
     """TestFinVizFetchAPI"""
 
     @mock.patch(
-        ('requests.get'),
+        ('analysis_engine.http_session.get'),
         new=mock_request_get)
     def test_fetch_tickers_from_screener_success(self):
         """test_fetch_tickers_from_screener_success"""
@@ -150,7 +150,7 @@ class TestFinVizFetchAPI(BaseTestCase):
     # end of test_fetch_tickers_from_screener_success
 
     @mock.patch(
-        ('requests.get'),
+        ('analysis_engine.http_session.get'),
         new=mock_request_get)
     def test_fetch_tickers_from_screener_empty_data(self):
         """test_fetch_tickers_from_screener_empty_data"""
@@ -173,7 +173,7 @@ class TestFinVizFetchAPI(BaseTestCase):
     # end of test_fetch_tickers_from_screener_empty_data
 
     @mock.patch(
-        ('requests.get'),
+        ('analysis_engine.http_session.get'),
         new=mock_request_get)
     def test_fetch_tickers_from_screener_failure_data(self):
         """test_fetch_tickers_from_screener_failure_data"""
@@ -198,7 +198,7 @@ class TestFinVizFetchAPI(BaseTestCase):
     # end of test_fetch_tickers_from_screener_failure_data
 
     @mock.patch(
-        ('requests.get'),
+        ('analysis_engine.http_session.get'),
         new=mock_request_get)
     def test_fetch_tickers_from_screener_exception(self):
         """test_fetch_tickers_from_screener_exception"""
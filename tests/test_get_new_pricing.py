@@ -9,6 +9,8 @@ import analysis_engine.mocks.mock_iex
 from analysis_engine.mocks.base_test import BaseTestCase
 from analysis_engine.consts import SUCCESS
 from analysis_engine.consts import ERR
+from analysis_engine.iex.consts import DEFAULT_FETCH_DATASETS
+from analysis_engine.iex.consts import get_ft_str
 from analysis_engine.work_tasks.get_new_pricing_data \
     import run_get_new_pricing_data
 from analysis_engine.api_requests \
@@ -164,4 +166,39 @@ class TestGetNewPricing(BaseTestCase):
             res['status'] == SUCCESS)
     # end of test_success_if_iex_errors
 
+    @mock.patch(
+        'pinance.Pinance',
+        new=analysis_engine.mocks.mock_pinance.MockPinance)
+    @mock.patch(
+        ('analysis_engine.iex.get_data.'
+         'get_data_from_iex'),
+        new=mock_success_iex_fetch)
+    @mock.patch(
+        ('analysis_engine.get_pricing.'
+         'get_options'),
+        new=analysis_engine.mocks.mock_pinance.mock_get_options)
+    @mock.patch(
+        ('analysis_engine.get_task_results.'
+         'get_task_results'),
+        new=mock_success_task_result)
+    def test_success_get_new_pricing_concurrent_iex(self):
+        """test_success_get_new_pricing_concurrent_iex"""
+        work = build_get_new_pricing_request()
+        work['label'] = 'test_success_get_new_pricing_concurrent_iex'
+        work['fetch_mode'] = 'iex'
+        work['iex_workers'] = 4
+        res = run_get_new_pricing_data(
+            work)
+        self.assertTrue(
+            res['status'] == SUCCESS)
+        for ft_type in DEFAULT_FETCH_DATASETS:
+            field = get_ft_str(ft_type=ft_type)
+            rec_key = field
+            if field == 'news':
+                rec_key = 'iex_news'
+            self.assertEqual(
+                res['rec'][rec_key]['work_dict']['field'],
+                field)
+    # end of test_success_get_new_pricing_concurrent_iex
+
 # end of TestGetNewPricing
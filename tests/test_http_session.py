@@ -0,0 +1,83 @@
+"""
+Test file for:
+Shared HTTP Sessions
+"""
+
+import analysis_engine.http_session as http_session
+import analysis_engine.mocks.mock_iex as mock_iex
+import analysis_engine.iex.fetch_batch as fetch_batch
+from analysis_engine.mocks.base_test import BaseTestCase
+
+
+class TestHTTPSession(BaseTestCase):
+    """TestHTTPSession"""
+
+    def setUp(
+            self):
+        """setUp"""
+        http_session.reset_http_sessions()
+        self.server, self.base_url = mock_iex.start_mock_iex_server()
+        self.host = '127.0.0.1:{}'.format(
+            self.server.server_address[1])
+    # end of setUp
+
+    def tearDown(
+            self):
+        """tearDown"""
+        mock_iex.stop_mock_iex_server(
+            server=self.server)
+        http_session.reset_http_sessions()
+    # end of tearDown
+
+    def test_shared_session_and_stats(self):
+        """test_shared_session_and_stats"""
+        session = http_session.get_session()
+        url = '{}/stock/market/batch'.format(
+            self.base_url)
+        for _ in range(2):
+            res = http_session.get(
+                url,
+                params={
+                    'symbols': 'SPY',
+                    'types': 'quote'
+                })
+            self.assertEqual(
+                res.status_code,
+                200)
+            self.assertEqual(
+                res.json()['SPY']['quote']['symbol'],
+                'SPY')
+        self.assertTrue(
+            http_session.get_session() is session)
+        missing = http_session.get(
+            '{}/not-a-route'.format(
+                self.base_url))
+        self.assertEqual(
+            missing.status_code,
+            404)
+        stats = http_session.get_http_stats()[self.host]
+        self.assertEqual(
+            stats['requests'],
+            3)
+        self.assertEqual(
+            stats['errors'],
+            1)
+        self.assertTrue(
+            stats['max_seconds'] >= stats['avg_seconds'])
+    # end of test_shared_session_and_stats
+
+    def test_iex_batch_uses_shared_session(self):
+        """test_iex_batch_uses_shared_session"""
+        datasets = fetch_batch.fetch_batch(
+            tickers=['SPY', 'AMZN'],
+            fetch_types=['quote', 'company'],
+            base_url=self.base_url)
+        self.assertEqual(
+            datasets['AMZN']['quote']['symbol'].iloc[0],
+            'AMZN')
+        self.assertEqual(
+            http_session.get_http_stats()[self.host]['requests'],
+            len(self.server.batch_queries))
+    # end of test_iex_batch_uses_shared_session
+
+# end of TestHTTPSession
@@ -0,0 +1,98 @@
+"""
+Test file for:
+IEX Batch Fetch
+"""
+
+import analysis_engine.mocks.mock_iex as mock_iex
+import analysis_engine.iex.fetch_batch as fetch_batch
+from analysis_engine.mocks.base_test import BaseTestCase
+
+
+class TestIEXFetchBatch(BaseTestCase):
+    """TestIEXFetchBatch"""
+
+    def setUp(
+            self):
+        """setUp"""
+        self.server, self.base_url = mock_iex.start_mock_iex_server()
+    # end of setUp
+
+    def tearDown(
+            self):
+        """tearDown"""
+        mock_iex.stop_mock_iex_server(
+            server=self.server)
+    # end of tearDown
+
+    def test_build_batch_requests(self):
+        """test_build_batch_requests"""
+        requests = fetch_batch.build_batch_requests(
+            tickers=['spy', 'amzn', 'tsla'],
+            fetch_types=['daily', 'minute', 'quote', 'dividends'],
+            max_symbols=2)
+        self.assertEqual(
+            [req['params']['types'] for req in requests],
+            ['chart,quote', 'chart,quote', 'chart', 'chart',
+             'dividends', 'dividends'])
+        self.assertEqual(
+            [req['params']['range'] for req in requests],
+            ['5y', '5y', '1d', '1d', '2y', '2y'])
+        self.assertEqual(
+            [req['params']['symbols'] for req in requests[:2]],
+            ['SPY,AMZN', 'TSLA'])
+        requests = fetch_batch.build_batch_requests(
+            tickers=['spy'],
+            fetch_types=['daily', 'minute', 'quote'],
+            ranges={
+                'minute': '5y'
+            })
+        self.assertEqual(
+            [req['fields'] for req in requests],
+            [['daily', 'quote'], ['minute']])
+        self.assertEqual(
+            [req['params']['range'] for req in requests],
+            ['5y', '5y'])
+    # end of test_build_batch_requests
+
+    def test_fetch_batch_from_stub_server(self):
+        """test_fetch_batch_from_stub_server"""
+        tickers = ['SPY', 'AMZN', 'TSLA']
+        datasets = fetch_batch.fetch_batch(
+            tickers=tickers,
+            base_url=self.base_url,
+            max_symbols=2,
+            max_types=4)
+        # daily (5y) with 7 other types split into 2 calls,
+        # minute (1d) and dividends (2y) for 2 symbol groups
+        self.assertEqual(
+            len(self.server.batch_queries),
+            8)
+        for ticker in tickers:
+            ticker_datasets = datasets[ticker]
+            self.assertEqual(
+                sorted(ticker_datasets),
+                sorted(fetch_batch.BATCH_DATASETS))
+            self.assertEqual(
+                len(ticker_datasets['daily'].index),
+                3)
+            self.assertEqual(
+                ticker_datasets['daily']['range'].iloc[0],
+                '5y')
+            self.assertEqual(
+                ticker_datasets['minute']['range'].iloc[0],
+                '1d')
+            self.assertEqual(
+                ticker_datasets['quote']['symbol'].iloc[0],
+                ticker)
+            self.assertEqual(
+                list(ticker_datasets['peers']['symbol']),
+                ['{}-PEER0'.format(ticker), '{}-PEER1'.format(ticker)])
+            self.assertEqual(
+                ticker_datasets['earnings']['testcase'].iloc[0],
+                'mock-batch-earnings')
+            self.assertEqual(
+                ticker_datasets['company']['testcase'].iloc[0],
+                'mock-batch-company')
+    # end of test_fetch_batch_from_stub_server
+
+# end of TestIEXFetchBatch
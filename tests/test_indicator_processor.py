@@ -6,6 +6,7 @@ Test file for classes and functions:
 
 """
 
+import pandas as pd
 import analysis_engine.consts as ae_consts
 from analysis_engine.mocks.base_test import BaseTestCase
 from analysis_engine.indicators.indicator_processor import IndicatorProcessor
@@ -94,4 +95,132 @@ class TestIndicatorProcessor(BaseTestCase):
                     self.example_module_path)
     # end of test_build_indicator_processor
 
+    def build_nodes(
+            self,
+            num_days):
+        """build_nodes
+
+        build dataset nodes where each ``daily`` dataset
+        holds all the rows up to the node's date
+
+        :param num_days: number of nodes
+        """
+        rows = []
+        nodes = []
+        for idx in range(num_days):
+            date = '2018-11-{:02d}'.format(idx + 1)
+            close = 270.0 + (idx * 7 % 11)
+            rows.append({
+                'date': date,
+                'high': close + 2.0,
+                'low': close - 3.0,
+                'close': close
+            })
+            nodes.append({
+                'id': 'SPY_{}'.format(date),
+                'date': date,
+                'data': {
+                    'daily': pd.DataFrame(list(rows))
+                }
+            })
+        return nodes
+    # end of build_nodes
+
+    def test_incremental_update_matches_process(self):
+        """test_incremental_update_matches_process"""
+        proc = IndicatorProcessor(
+            config_dict=self.test_data)
+        indicators = proc.get_indicators()
+        update_calls = []
+        for ind_id in indicators:
+            ind_obj = indicators[ind_id]['obj']
+            if ind_obj.supports_update():
+                orig_update = ind_obj.update
+
+                def track_update(
+                        new_rows,
+                        orig_update=orig_update,
+                        **kwargs):
+                    update_calls.append(len(new_rows.index))
+                    return orig_update(
+                        new_rows=new_rows,
+                        **kwargs)
+
+                ind_obj.update = track_update
+        self.assertEqual(
+            len([
+                ind_id for ind_id in indicators
+                if indicators[ind_id]['obj'].supports_update()
+            ]),
+            2)
+        full_proc = IndicatorProcessor(
+            config_dict=self.test_data)
+        full_objs = {}
+        for ind_node in full_proc.get_indicators().values():
+            full_objs[ind_node['obj'].config.get('num_points')] = \
+                ind_node['obj']
+        nodes = self.build_nodes(
+            num_days=25)
+        for node in nodes:
+            proc.process(
+                algo_id='test',
+                ticker=self.ticker,
+                dataset=node)
+            for ind_id in indicators:
+                ind_obj = indicators[ind_id]['obj']
+                if not ind_obj.supports_update():
+                    continue
+                full_obj = full_objs[ind_obj.config['num_points']]
+                full_obj.process(
+                    algo_id='test',
+                    ticker=self.ticker,
+                    dataset=node)
+                self.assertAlmostEqual(
+                    ind_obj.get_state(self.ticker)['willr'],
+                    full_obj.get_state(self.ticker)['willr'])
+        # full dataset on the first node then one row per node
+        self.assertEqual(
+            update_calls[:4],
+            [1, 1, 1, 1])
+        self.assertEqual(
+            sum(update_calls),
+            2 * len(nodes))
+
+        # a new backtest resets the state with the full dataset
+        proc.process(
+            algo_id='test',
+            ticker=self.ticker,
+            dataset=nodes[9])
+        self.assertEqual(
+            update_calls[-2:],
+            [10, 10])
+    # end of test_incremental_update_matches_process
+
+    def test_thread_pool_reused_until_close(self):
+        """test_thread_pool_reused_until_close"""
+        proc = IndicatorProcessor(
+            config_dict=self.test_data,
+            workers=2)
+        nodes = self.build_nodes(
+            num_days=3)
+        proc.process(
+            algo_id='test',
+            ticker=self.ticker,
+            dataset=nodes[0])
+        executor = proc.executor
+        self.assertIsNotNone(
+            executor)
+        for node in nodes[1:]:
+            proc.process(
+                algo_id='test',
+                ticker=self.ticker,
+                dataset=node)
+            self.assertIs(
+                proc.executor,
+                executor)
+        proc.close()
+        self.assertIsNone(
+            proc.executor)
+    # end of test_thread_pool_reused_until_close
+
 # end of TestIndicatorProcessor
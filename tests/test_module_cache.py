@@ -0,0 +1,119 @@
+"""
+Test file for:
+Compiled Module Cache
+"""
+
+import os
+import shutil
+import tempfile
+import analysis_engine.module_cache as module_cache
+from analysis_engine.mocks.base_test import BaseTestCase
+
+
+class TestModuleCache(BaseTestCase):
+    """TestModuleCache"""
+
+    def setUp(
+            self):
+        """setUp"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path_to_module = os.path.join(
+            self.tmp_dir,
+            'my_algo.py')
+        module_cache.clear_module_cache()
+    # end of setUp
+
+    def tearDown(
+            self):
+        """tearDown"""
+        shutil.rmtree(
+            self.tmp_dir,
+            ignore_errors=True)
+        module_cache.clear_module_cache()
+    # end of tearDown
+
+    def write_module(
+            self,
+            value,
+            mtime=None):
+        """write_module
+
+        :param value: value for the class variable
+        :param mtime: optional - modification time to set
+        """
+        with open(self.path_to_module, 'w') as f:
+            f.write(
+                'class MyAlgo(object):\n'
+                '    value = {}\n'.format(value))
+        if mtime:
+            os.utime(
+                self.path_to_module,
+                (mtime, mtime))
+    # end of write_module
+
+    def test_cached_until_file_changes(self):
+        """test_cached_until_file_changes"""
+        self.write_module(
+            value=1,
+            mtime=1500000000)
+        first_module, first_member = module_cache.find_member(
+            module_name='my_algo.py',
+            path_to_module=self.path_to_module)
+        second_module, second_member = module_cache.find_member(
+            module_name='my_algo.py',
+            path_to_module=self.path_to_module)
+        self.assertTrue(first_module is second_module)
+        self.assertEqual(
+            first_member[1].value,
+            1)
+        self.assertEqual(
+            module_cache.get_module_cache_stats()['misses'],
+            1)
+
+        # same contents with a new modification time
+        self.write_module(
+            value=1,
+            mtime=1500000100)
+        self.assertTrue(
+            module_cache.load_module(
+                module_name='my_algo.py',
+                path_to_module=self.path_to_module) is first_module)
+
+        # changed contents are reloaded
+        self.write_module(
+            value=22,
+            mtime=1500000200)
+        new_module, new_member = module_cache.find_member(
+            module_name='my_algo.py',
+            path_to_module=self.path_to_module)
+        self.assertFalse(new_module is first_module)
+        self.assertEqual(
+            new_member[1].value,
+            22)
+        stats = module_cache.get_module_cache_stats()
+        self.assertEqual(
+            stats['reloads'],
+            1)
+        self.assertEqual(
+            stats['hits'],
+            2)
+        self.assertEqual(
+            stats['modules'],
+            1)
+    # end of test_cached_until_file_changes
+
+    def test_missing_member(self):
+        """test_missing_member"""
+        self.write_module(
+            value=1)
+        loaded_module, member = module_cache.find_member(
+            module_name='my_algo.py',
+            path_to_module=self.path_to_module,
+            match_name='NotInTheModule')
+        self.assertTrue(loaded_module is not None)
+        self.assertEqual(
+            member,
+            None)
+    # end of test_missing_member
+
+# end of TestModuleCache
@@ -0,0 +1,171 @@
+"""
+Test file for:
+Parallel Parameter Sweeps for Algorithm Configs
+"""
+
+import pandas as pd
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.consts import SUCCESS
+from analysis_engine.algo import BaseAlgo
+from analysis_engine.param_sweep import build_param_grid
+from analysis_engine.param_sweep import sample_param_grid
+from analysis_engine.param_sweep import build_variant_config
+from analysis_engine.param_sweep import run_param_sweep
+
+
+class SweepSignalAlgo(BaseAlgo):
+    """SweepSignalAlgo"""
+
+    def build_signals(
+            self,
+            ticker,
+            df):
+        """build_signals
+
+        :param ticker: ticker symbol
+        :param df: signal rows
+        """
+        return pd.DataFrame({
+            'buy': df['close'] < self.config_dict['buy_below'],
+            'sell': df['close'] > self.config_dict['sell_above']
+        })
+    # end of build_signals
+
+# end of SweepSignalAlgo
+
+
+class TestParamSweep(BaseTestCase):
+    """TestParamSweep"""
+
+    config_dict = None
+    dataset = None
+
+    def setUp(
+            self):
+        """setUp"""
+        self.config_dict = {
+            'name': 'sweep-test',
+            'indicators': [
+                {
+                    'name': 'willr',
+                    'num_points': 12
+                }
+            ],
+            'buy_below': 100.0,
+            'sell_above': 110.0
+        }
+        closes = [105.0, 99.0, 96.0, 108.0, 112.0, 103.0, 97.0, 115.0]
+        self.dataset = {
+            'SPY': []
+        }
+        for idx, close in enumerate(closes):
+            date = '2018-11-{:02d}'.format(idx + 1)
+            self.dataset['SPY'].append({
+                'id': 'SPY_{}'.format(date),
+                'date': date,
+                'data': {
+                    'daily': pd.DataFrame([
+                        {
+                            'date': date,
+                            'close': close
+                        }
+                    ])
+                }
+            })
+    # end of setUp
+
+    def test_build_and_sample_grid(self):
+        """test_build_and_sample_grid"""
+        param_grid = {
+            'buy_below': [97.0, 100.0, 104.0],
+            'sell_above': [107.0, 110.0]
+        }
+        grid = build_param_grid(param_grid)
+        self.assertEqual(
+            len(grid),
+            6)
+        samples = sample_param_grid(
+            param_grid=param_grid,
+            num_samples=4,
+            seed=7)
+        self.assertEqual(
+            len(samples),
+            4)
+        self.assertEqual(
+            len(set(
+                (row['buy_below'], row['sell_above'])
+                for row in samples)),
+            4)
+        self.assertEqual(
+            samples,
+            sample_param_grid(
+                param_grid=param_grid,
+                num_samples=4,
+                seed=7))
+        for row in samples:
+            self.assertIn(
+                row,
+                grid)
+    # end of test_build_and_sample_grid
+
+    def test_build_variant_config(self):
+        """test_build_variant_config"""
+        variant = build_variant_config(
+            config_dict=self.config_dict,
+            params={
+                'indicators.willr.num_points': 20,
+                'indicators.0.buy_above': 60,
+                'buy_below': 98.0
+            })
+        self.assertEqual(
+            variant['indicators'][0]['num_points'],
+            20)
+        self.assertEqual(
+            variant['indicators'][0]['buy_above'],
+            60)
+        self.assertEqual(
+            variant['buy_below'],
+            98.0)
+        self.assertEqual(
+            self.config_dict['indicators'][0]['num_points'],
+            12)
+    # end of test_build_variant_config
+
+    def test_run_param_sweep_ranks_variants(self):
+        """test_run_param_sweep_ranks_variants"""
+        param_grid = {
+            'buy_below': [97.0, 100.0],
+            'sell_above': [107.0, 111.0]
+        }
+        results = {}
+        for worker_type in ['process', 'thread']:
+            results[worker_type] = run_param_sweep(
+                param_grid=param_grid,
+                algo_class=SweepSignalAlgo,
+                config_dict={
+                    'indicators': [],
+                    'buy_below': 100.0,
+                    'sell_above': 110.0
+                },
+                dataset=self.dataset,
+                workers=2,
+                worker_type=worker_type,
+                balance=1000.0)
+        ranked_df = results['process']
+        self.assertEqual(
+            len(ranked_df.index),
+            4)
+        self.assertEqual(
+            set(ranked_df['status']),
+            set([SUCCESS]))
+        self.assertEqual(
+            list(ranked_df['equity']),
+            sorted(ranked_df['equity'], reverse=True))
+        self.assertEqual(
+            list(ranked_df['variant']),
+            list(results['thread']['variant']))
+        self.assertTrue(
+            ranked_df['num_buys'].max() > 0)
+    # end of test_run_param_sweep_ranks_variants
+
+# end of TestParamSweep
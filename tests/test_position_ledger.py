@@ -0,0 +1,135 @@
+"""
+Test file for:
+Position Ledger
+"""
+
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.algo import BaseAlgo
+from analysis_engine.position_ledger import PositionLedger
+
+
+class TestPositionLedger(BaseTestCase):
+    """TestPositionLedger"""
+
+    def test_average_cost_and_pnl(self):
+        """test_average_cost_and_pnl"""
+        ledger = PositionLedger()
+        position = ledger.get_position('SPY')
+        position.add_buy(
+            shares=10,
+            cost=1000.0)
+        position.add_buy(
+            shares=10,
+            cost=1200.0)
+        self.assertEqual(
+            position.get_average_cost(),
+            110.0)
+        position.add_sell(
+            shares=5,
+            proceeds=600.0)
+        self.assertEqual(
+            ledger.get_shares('SPY'),
+            15)
+        self.assertEqual(
+            ledger.get_realized_pnl('SPY'),
+            50.0)
+        self.assertEqual(
+            position.cost_basis,
+            1650.0)
+        ledger.mark(
+            ticker='SPY',
+            price=120.0)
+        self.assertEqual(
+            ledger.get_unrealized_pnl(),
+            150.0)
+        position.add_sell(
+            shares=15,
+            proceeds=1800.0)
+        summary = ledger.get_summary('SPY')
+        self.assertEqual(
+            summary['shares'],
+            0)
+        self.assertEqual(
+            summary['cost_basis'],
+            0.0)
+        self.assertEqual(
+            summary['realized_pnl'],
+            200.0)
+        self.assertEqual(
+            summary['num_buys'],
+            2)
+        self.assertEqual(
+            summary['num_sells'],
+            2)
+    # end of test_average_cost_and_pnl
+
+    def test_algo_orders_update_ledger(self):
+        """test_algo_orders_update_ledger"""
+        algo = BaseAlgo(
+            ticker='SPY',
+            balance=1000.0,
+            commission=6.0)
+        algo.create_buy_order(
+            ticker='SPY',
+            row={
+                'close': 100.0,
+                'date': '2018-11-01'
+            },
+            shares=5)
+        bal_before_sell = algo.balance
+        algo.create_sell_order(
+            ticker='SPY',
+            row={
+                'close': 110.0,
+                'date': '2018-11-02'
+            },
+            shares=2)
+        algo.create_sell_order(
+            ticker='AMZN',
+            row={
+                'close': 110.0,
+                'date': '2018-11-02'
+            },
+            shares=2)
+        summary = algo.get_position_summary(
+            ticker='SPY')
+        self.assertEqual(
+            summary['shares'],
+            algo.get_owned_shares('SPY'))
+        self.assertEqual(
+            summary['shares'],
+            3)
+        self.assertEqual(
+            summary['num_buys'],
+            algo.get_ticker_positions('SPY')[1])
+        self.assertEqual(
+            summary['num_sells'],
+            algo.get_ticker_positions('SPY')[2])
+        self.assertAlmostEqual(
+            summary['cost_basis'],
+            (1000.0 - bal_before_sell) * 3.0 / 5.0)
+        self.assertAlmostEqual(
+            summary['realized_pnl'],
+            (algo.balance - bal_before_sell) -
+            (1000.0 - bal_before_sell) * 2.0 / 5.0)
+        self.assertEqual(
+            algo.get_position_summary('AMZN')['num_failed'],
+            1)
+        self.assertEqual(
+            algo.get_ticker_positions('AMZN'),
+            (None, 0, 0))
+        self.assertEqual(
+            algo.get_positions(),
+            {
+                'SPY': {
+                    'shares': 3,
+                    'num_buys': 1,
+                    'num_sells': 1
+                }
+            })
+        self.assertIn(
+            'SPY',
+            algo.get_result()['positions_summary'])
+    # end of test_algo_orders_update_ledger
+
+# end of TestPositionLedger
@@ -0,0 +1,132 @@
+"""
+Test file for:
+Convert an algorithm-ready dictionary into DataFrames
+"""
+
+import copy
+import json
+import pickle
+import pandas as pd
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.prepare_dict_for_algo import prepare_dict_for_algo
+from analysis_engine.prepare_dict_for_algo import LazyDatasetDict
+
+
+class TestPrepareDictForAlgo(BaseTestCase):
+    """TestPrepareDictForAlgo"""
+
+    data = None
+
+    def setUp(
+            self):
+        """setUp"""
+        daily_df = pd.DataFrame([
+            {
+                'date': '2018-11-05',
+                'close': 273.73
+            }
+        ])
+        self.data = json.dumps({
+            'SPY': [
+                {
+                    'id': 'SPY_2018-11-05',
+                    'date': '2018-11-05',
+                    'data': {
+                        'daily': daily_df.to_json(
+                            orient='records',
+                            date_format='iso'),
+                        'minute': daily_df.to_json(
+                            orient='records',
+                            date_format='iso'),
+                        'quote': ''
+                    }
+                }
+            ]
+        })
+    # end of setUp
+
+    def test_lazy_matches_eager(self):
+        """test_lazy_matches_eager"""
+        eager = prepare_dict_for_algo(
+            data=self.data,
+            convert_to_dict=True,
+            lazy=False)
+        lazy = prepare_dict_for_algo(
+            data=self.data,
+            convert_to_dict=True,
+            lazy=True)
+        eager_data = eager['SPY'][0]['data']
+        lazy_data = lazy['SPY'][0]['data']
+        self.assertTrue(
+            isinstance(lazy_data, LazyDatasetDict))
+        self.assertEqual(
+            sorted(eager_data.keys()),
+            sorted(lazy_data.keys()))
+        for ds_name in eager_data:
+            pd.testing.assert_frame_equal(
+                eager_data[ds_name],
+                lazy_data[ds_name])
+    # end of test_lazy_matches_eager
+
+    def test_lazy_converts_on_first_access(self):
+        """test_lazy_converts_on_first_access"""
+        lazy = prepare_dict_for_algo(
+            data=self.data,
+            convert_to_dict=True,
+            lazy=True)
+        lazy_data = lazy['SPY'][0]['data']
+        self.assertFalse(
+            lazy_data.is_loaded('daily'))
+        daily_df = lazy_data['daily']
+        self.assertTrue(
+            lazy_data.is_loaded('daily'))
+        self.assertFalse(
+            lazy_data.is_loaded('minute'))
+        self.assertTrue(
+            lazy_data['daily'] is daily_df)
+        self.assertEqual(
+            daily_df['close'][0],
+            273.73)
+        self.assertEqual(
+            len(lazy_data.get('quote').columns),
+            0)
+        self.assertIsNone(
+            lazy_data.get('calls'))
+    # end of test_lazy_converts_on_first_access
+
+    def test_lazy_copies_convert_datasets(self):
+        """test_lazy_copies_convert_datasets"""
+        lazy = prepare_dict_for_algo(
+            data=self.data,
+            convert_to_dict=True,
+            lazy=True)
+        lazy_data = lazy['SPY'][0]['data']
+
+        def get_kwargs(
+                **kwargs):
+            return kwargs
+
+        for copied in [
+                lazy_data.copy(),
+                copy.copy(lazy_data),
+                copy.deepcopy(lazy_data),
+                pickle.loads(pickle.dumps(lazy_data))]:
+            self.assertTrue(
+                isinstance(copied, LazyDatasetDict))
+            self.assertFalse(
+                copied.is_loaded('daily'))
+            self.assertEqual(
+                copied['daily']['close'][0],
+                273.73)
+        self.assertFalse(
+            lazy_data.is_loaded('daily'))
+        for converted in [
+                dict(lazy_data),
+                get_kwargs(**lazy_data)]:
+            self.assertTrue(
+                isinstance(converted['daily'], pd.DataFrame))
+        self.assertTrue(
+            lazy_data.is_loaded('daily'))
+    # end of test_lazy_copies_convert_datasets
+
+# end of TestPrepareDictForAlgo
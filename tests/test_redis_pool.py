@@ -0,0 +1,103 @@
+"""
+Test file for:
+Shared Redis Connection Pools
+"""
+
+import mock
+import analysis_engine.redis_pool as redis_pool
+from analysis_engine.mocks.base_test import BaseTestCase
+
+
+class TestRedisPool(BaseTestCase):
+    """TestRedisPool"""
+
+    def setUp(
+            self):
+        """setUp"""
+        redis_pool.reset_redis_pools()
+    # end of setUp
+
+    def tearDown(
+            self):
+        """tearDown"""
+        redis_pool.reset_redis_pools()
+    # end of tearDown
+
+    def test_same_pool_for_same_server(self):
+        """test_same_pool_for_same_server"""
+        pool1 = redis_pool.get_redis_pool(
+            host='localhost',
+            port=6379,
+            db=0)
+        pool2 = redis_pool.get_redis_pool(
+            host='localhost',
+            port='6379',
+            db='0')
+        pool3 = redis_pool.get_redis_pool(
+            host='localhost',
+            port=6379,
+            db=1)
+        self.assertTrue(
+            pool1 is pool2)
+        self.assertFalse(
+            pool1 is pool3)
+    # end of test_same_pool_for_same_server
+
+    def test_client_uses_shared_pool(self):
+        """test_client_uses_shared_pool"""
+        client1 = redis_pool.get_redis_client(
+            address='localhost:6379',
+            db=0)
+        client2 = redis_pool.get_redis_client(
+            host='localhost',
+            port=6379,
+            db=0)
+        self.assertTrue(
+            client1.connection_pool is client2.connection_pool)
+    # end of test_client_uses_shared_pool
+
+    def test_pools_dropped_after_fork(self):
+        """test_pools_dropped_after_fork"""
+        pool1 = redis_pool.get_redis_pool(
+            host='localhost',
+            port=6379,
+            db=0)
+        with mock.patch(
+                'os.getpid',
+                return_value=redis_pool.POOLS_PID + 1):
+            pool2 = redis_pool.get_redis_pool(
+                host='localhost',
+                port=6379,
+                db=0)
+        self.assertFalse(
+            pool1 is pool2)
+    # end of test_pools_dropped_after_fork
+
+    def test_pool_stats(self):
+        """test_pool_stats"""
+        redis_pool.get_redis_pool(
+            host='localhost',
+            port=6379,
+            db=2)
+        stats = redis_pool.get_redis_pool_stats()
+        self.assertEqual(
+            len(stats),
+            1)
+        self.assertEqual(
+            stats[0]['address'],
+            'localhost:6379')
+        self.assertEqual(
+            stats[0]['db'],
+            2)
+        self.assertEqual(
+            stats[0]['in_use'],
+            0)
+        self.assertEqual(
+            stats[0]['waits'],
+            0)
+        self.assertEqual(
+            stats[0]['created'],
+            0)
+    # end of test_pool_stats
+
+# end of TestRedisPool
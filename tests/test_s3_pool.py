@@ -0,0 +1,134 @@
+"""
+Test file for:
+Shared S3 Clients and the S3 read-through extract
+"""
+
+import json
+import mock
+import pandas as pd
+import analysis_engine.s3_pool as s3_pool
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.mocks.mock_redis import MockRedis
+from analysis_engine.mocks.mock_boto3_s3 import MockBotoS3Client
+from analysis_engine.api_requests import get_ds_dict
+from analysis_engine.extract_batch_utils import extract_datasets_in_batch
+
+
+class TestS3Pool(BaseTestCase):
+    """TestS3Pool"""
+
+    def setUp(
+            self):
+        """setUp"""
+        s3_pool.reset_s3_clients()
+    # end of setUp
+
+    def tearDown(
+            self):
+        """tearDown"""
+        s3_pool.reset_s3_clients()
+    # end of tearDown
+
+    def test_same_client_for_same_endpoint(self):
+        """test_same_client_for_same_endpoint"""
+        client1 = s3_pool.get_s3_client(
+            address='localhost:9000')
+        client2 = s3_pool.get_s3_client(
+            address='localhost:9000')
+        client3 = s3_pool.get_s3_client(
+            address='localhost:9001')
+        self.assertTrue(
+            client1 is client2)
+        self.assertFalse(
+            client1 is client3)
+    # end of test_same_client_for_same_endpoint
+
+    def test_get_data_from_s3_keys(self):
+        """test_get_data_from_s3_keys"""
+        client = MockBotoS3Client(
+            objects={
+                ('pricing', 'SPY_2018-11-01_daily'): b'1',
+                ('pricing', 'SPY_2018-11-02_daily'): b'2'
+            })
+        keys = [
+            'SPY_2018-11-01_daily',
+            'SPY_2018-11-02_daily',
+            'SPY_2018-11-03_daily'
+        ]
+        payloads = s3_pool.get_data_from_s3_keys(
+            keys=keys,
+            bucket='pricing',
+            client=client,
+            workers=2)
+        self.assertEqual(
+            payloads,
+            {
+                'SPY_2018-11-01_daily': b'1',
+                'SPY_2018-11-02_daily': b'2',
+                'SPY_2018-11-03_daily': None
+            })
+        self.assertEqual(
+            len(client.gets),
+            3)
+    # end of test_get_data_from_s3_keys
+
+    def test_batch_extract_reads_through_to_s3(self):
+        """test_batch_extract_reads_through_to_s3"""
+        extract_requests = []
+        for date_str in ['2018-11-01', '2018-11-02']:
+            date_key = 'SPY_{}'.format(
+                date_str)
+            extract_requests.append({
+                'id': date_key,
+                'ticker': 'SPY',
+                'date_key': date_key,
+                'date': date_str,
+                'req': get_ds_dict(
+                    ticker='SPY',
+                    base_key=date_key,
+                    ds_id='test')})
+        daily_data = json.dumps(
+            pd.DataFrame([
+                {
+                    'date': '2018-11-01',
+                    'close': 273.73
+                }
+            ]).to_json(
+                orient='records',
+                date_format='iso')).encode('utf-8')
+        redis_client = MockRedis()
+        redis_client.set(
+            name='SPY_2018-11-01_daily',
+            value=daily_data)
+        s3_client = MockBotoS3Client(
+            objects={
+                ('pricing', 'SPY_2018-11-02_daily'): daily_data
+            })
+        with mock.patch(
+                'analysis_engine.s3_pool.get_s3_client',
+                return_value=s3_client):
+            res = extract_datasets_in_batch(
+                extract_requests=extract_requests,
+                datasets=['daily'],
+                client=redis_client,
+                s3_req={
+                    's3_enabled': True,
+                    's3_fallback': True,
+                    's3_bucket': 'pricing',
+                    's3_cache_expire': 60
+                })
+        self.assertEqual(
+            s3_client.gets,
+            [
+                ('pricing', 'SPY_2018-11-02_daily')
+            ])
+        for ticker_data in res:
+            self.assertEqual(
+                ticker_data['daily']['close'][0],
+                273.73)
+        self.assertEqual(
+            redis_client.get(name='SPY_2018-11-02_daily'),
+            daily_data)
+    # end of test_batch_extract_reads_through_to_s3
+
+# end of TestS3Pool
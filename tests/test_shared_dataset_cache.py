@@ -0,0 +1,155 @@
+"""
+Test file for:
+Host-local Shared Dataset Cache
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import pandas as pd
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.df_serializers import is_columnar_supported
+from analysis_engine.shared_dataset_cache import SharedDatasetCache
+from analysis_engine.shared_dataset_cache import build_dataset_id
+from analysis_engine.shared_dataset_cache import \
+    get_enabled_shared_dataset_cache
+
+
+class TestSharedDatasetCache(BaseTestCase):
+    """TestSharedDatasetCache"""
+
+    cache_dir = None
+
+    def setUp(
+            self):
+        """setUp"""
+        self.cache_dir = tempfile.mkdtemp()
+    # end of setUp
+
+    def tearDown(
+            self):
+        """tearDown"""
+        shutil.rmtree(
+            self.cache_dir,
+            ignore_errors=True)
+    # end of tearDown
+
+    def build_dataset(
+            self,
+            ticker):
+        """build_dataset
+
+        :param ticker: ticker symbol
+        """
+        return {
+            ticker: [
+                {
+                    'id': '{}_2018-11-0{}'.format(
+                        ticker,
+                        idx + 1),
+                    'date': '2018-11-0{}'.format(
+                        idx + 1),
+                    'data': {
+                        'daily': pd.DataFrame([
+                            {
+                                'date': '2018-11-0{}'.format(
+                                    idx + 1),
+                                'close': 270.0 + idx
+                            }
+                        ])
+                    }
+                }
+                for idx in range(3)
+            ]
+        }
+    # end of build_dataset
+
+    def test_build_dataset_id(self):
+        """test_build_dataset_id"""
+        dataset_id = build_dataset_id(
+            tickers=['SPY', 'AMZN'],
+            start_date='2018-11-01 00:00:00',
+            end_date='2018-11-05 00:00:00',
+            datasets=['daily', 'minute'])
+        self.assertEqual(
+            dataset_id,
+            build_dataset_id(
+                tickers=['AMZN', 'SPY'],
+                start_date='2018-11-01 00:00:00',
+                end_date='2018-11-05 00:00:00',
+                datasets=['minute', 'daily']))
+        self.assertNotEqual(
+            dataset_id,
+            build_dataset_id(
+                tickers=['SPY', 'AMZN'],
+                start_date='2018-11-01 00:00:00',
+                end_date='2018-11-05 00:00:00',
+                datasets=['daily', 'minute'],
+                version='2'))
+        self.assertNotEqual(
+            build_dataset_id(
+                tickers=['SPY', 'AMZN'],
+                start_date='2018-11-01 00:00:00',
+                end_date='2018-11-05 00:00:00',
+                datasets=['daily', 'minute'],
+                redis_address='localhost:6379',
+                redis_db=0),
+            build_dataset_id(
+                tickers=['SPY', 'AMZN'],
+                start_date='2018-11-01 00:00:00',
+                end_date='2018-11-05 00:00:00',
+                datasets=['daily', 'minute'],
+                redis_address='localhost:6379',
+                redis_db=1))
+        self.assertIsNone(
+            get_enabled_shared_dataset_cache(
+                enabled=False))
+    # end of test_build_dataset_id
+
+    def test_put_get_and_evict(self):
+        """test_put_get_and_evict"""
+        if not is_columnar_supported():
+            return
+        cache = SharedDatasetCache(
+            cache_dir=self.cache_dir)
+        self.assertIsNone(
+            cache.get('spy'))
+        self.assertTrue(
+            cache.put(
+                dataset_id='spy',
+                dataset=self.build_dataset('SPY')))
+        res = cache.get('spy')
+        self.assertEqual(
+            [node['id'] for node in res['SPY']],
+            ['SPY_2018-11-01', 'SPY_2018-11-02', 'SPY_2018-11-03'])
+        self.assertEqual(
+            res['SPY'][2]['data']['daily']['close'][0],
+            272.0)
+        entry_bytes = cache.get_stats()['bytes']
+
+        # only room for one entry - the least recently used goes
+        cache.max_bytes = entry_bytes + entry_bytes // 2
+        time.sleep(0.01)
+        self.assertTrue(
+            cache.put(
+                dataset_id='amzn',
+                dataset=self.build_dataset('AMZN')))
+        self.assertIsNone(
+            cache.get('spy'))
+        self.assertIsNotNone(
+            cache.get('amzn'))
+        stats = cache.get_stats()
+        self.assertEqual(
+            stats['entries'],
+            1)
+        self.assertEqual(
+            stats['evictions'],
+            1)
+        self.assertEqual(
+            [name for name in os.listdir(self.cache_dir)
+             if not name.startswith('.lock')],
+            ['amzn'])
+    # end of test_put_get_and_evict
+
+# end of TestSharedDatasetCache
@@ -0,0 +1,161 @@
+"""
+Test file for:
+Stream an Algorithm-Ready Dataset
+"""
+
+import io
+import os
+import json
+import zlib
+import tempfile
+import pandas as pd
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.mocks.mock_boto3_s3 import MockBotoS3Client
+from analysis_engine.algo import BaseAlgo
+from analysis_engine.stream_algo_dataset import AlgoDatasetStreamParser
+from analysis_engine.stream_algo_dataset import iter_algo_dataset_json
+from analysis_engine.stream_algo_dataset import stream_algo_dataset
+from analysis_engine.stream_algo_dataset import \
+    stream_algo_dataset_from_file
+from analysis_engine.stream_algo_dataset import \
+    stream_algo_dataset_from_s3
+
+
+class TestStreamAlgoDataset(BaseTestCase):
+    """TestStreamAlgoDataset"""
+
+    dataset = None
+    raw_data = None
+
+    def setUp(
+            self):
+        """setUp"""
+        self.dataset = {
+            'SPY': [],
+            'AMZN': []
+        }
+        for idx, date in enumerate(['2018-11-01', '2018-11-02']):
+            for ticker in self.dataset:
+                self.dataset[ticker].append({
+                    'id': '{}_{}'.format(
+                        ticker,
+                        date),
+                    'date': date,
+                    'data': {
+                        'daily': pd.DataFrame([
+                            {
+                                'date': date,
+                                'close': 270.0 + idx,
+                                'label': 'brace } and "quote"'
+                            }
+                        ]).to_json(
+                            orient='records',
+                            date_format='iso'),
+                        'minute': ''
+                    }
+                })
+        self.raw_data = json.dumps(
+            self.dataset,
+            indent=2).encode('utf-8')
+    # end of setUp
+
+    def test_parser_handles_any_chunk_size(self):
+        """test_parser_handles_any_chunk_size"""
+        for chunk_size in [1, 7, len(self.raw_data)]:
+            nodes = list(iter_algo_dataset_json(
+                stream=io.BytesIO(self.raw_data),
+                chunk_size=chunk_size))
+            self.assertEqual(
+                [ticker for ticker, node_json in nodes],
+                ['SPY', 'SPY', 'AMZN', 'AMZN'])
+            self.assertEqual(
+                json.loads(nodes[1][1]),
+                self.dataset['SPY'][1])
+            self.assertEqual(
+                json.loads(nodes[3][1]),
+                self.dataset['AMZN'][1])
+    # end of test_parser_handles_any_chunk_size
+
+    def test_parser_raises_on_truncated_data(self):
+        """test_parser_raises_on_truncated_data"""
+        with self.assertRaises(ValueError):
+            list(iter_algo_dataset_json(
+                stream=io.BytesIO(self.raw_data[:-10])))
+        parser = AlgoDatasetStreamParser()
+        with self.assertRaises(ValueError):
+            list(parser.feed('["SPY"]'))
+    # end of test_parser_raises_on_truncated_data
+
+    def test_stream_compressed_nodes(self):
+        """test_stream_compressed_nodes"""
+        nodes = list(stream_algo_dataset(
+            stream=io.BytesIO(zlib.compress(self.raw_data)),
+            compress=True,
+            tickers=['SPY'],
+            chunk_size=16))
+        self.assertEqual(
+            len(nodes),
+            2)
+        ticker, node = nodes[1]
+        self.assertEqual(
+            ticker,
+            'SPY')
+        self.assertEqual(
+            node['id'],
+            'SPY_2018-11-02')
+        self.assertEqual(
+            node['data']['daily']['close'][0],
+            271.0)
+        self.assertEqual(
+            node['data']['daily']['label'][0],
+            'brace } and "quote"')
+    # end of test_stream_compressed_nodes
+
+    def test_stream_from_file_and_s3(self):
+        """test_stream_from_file_and_s3"""
+        with tempfile.NamedTemporaryFile(delete=False) as cur_file:
+            cur_file.write(self.raw_data)
+        try:
+            file_nodes = list(stream_algo_dataset_from_file(
+                path_to_file=cur_file.name,
+                chunk_size=32))
+        finally:
+            os.remove(cur_file.name)
+        client = MockBotoS3Client(
+            objects={
+                ('algoready', 'stream.json'): zlib.compress(
+                    self.raw_data)
+            })
+        s3_nodes = list(stream_algo_dataset_from_s3(
+            s3_key='stream.json',
+            s3_bucket='algoready',
+            compress=True,
+            client=client))
+        self.assertEqual(
+            len(file_nodes),
+            4)
+        self.assertEqual(
+            [node['id'] for ticker, node in file_nodes],
+            [node['id'] for ticker, node in s3_nodes])
+    # end of test_stream_from_file_and_s3
+
+    def test_handle_data_consumes_stream(self):
+        """test_handle_data_consumes_stream"""
+        algo = BaseAlgo(
+            ticker='SPY',
+            balance=1000.0,
+            name='test_handle_data_consumes_stream')
+        algo.handle_data(
+            data=stream_algo_dataset(
+                stream=io.BytesIO(self.raw_data)))
+        self.assertEqual(
+            len(algo.order_history),
+            2)
+        self.assertEqual(
+            algo.today_close,
+            271.0)
+        self.assertIsNone(
+            algo.last_handle_data)
+    # end of test_handle_data_consumes_stream
+
+# end of TestStreamAlgoDataset
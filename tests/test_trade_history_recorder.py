@@ -0,0 +1,168 @@
+"""
+Test file for:
+Compact Trade History Recorder
+"""
+
+import pandas as pd
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.consts import TRADE_SHARES
+from analysis_engine.algo import BaseAlgo
+from analysis_engine.build_trade_history_entry import \
+    build_trade_history_entry
+from analysis_engine.trade_history_recorder import TradeHistoryRecorder
+
+
+class TestTradeHistoryRecorder(BaseTestCase):
+    """TestTradeHistoryRecorder"""
+
+    def build_entry(
+            self,
+            idx):
+        """build_entry
+
+        :param idx: row number
+        """
+        entry = build_trade_history_entry(
+            ticker='SPY',
+            num_owned=idx,
+            close=270.0 + idx,
+            balance=1000.0 - idx,
+            commission=6.0,
+            date='2018-11-{:02d}'.format(idx + 1),
+            trade_type=TRADE_SHARES,
+            algo_start_price=270.0,
+            original_balance=1000.0,
+            total_buys=[{}] * idx,
+            ds_id='SPY_{}'.format(idx))
+        # bool column like the vectorized backtest history
+        entry['buy_triggered'] = (idx % 2 == 0)
+        return entry
+    # end of build_entry
+
+    def test_only_populated_columns_with_growth(self):
+        """test_only_populated_columns_with_growth"""
+        recorder = TradeHistoryRecorder(
+            capacity=2)
+        entries = [
+            self.build_entry(idx)
+            for idx in range(5)
+        ]
+        recorder.extend(entries)
+        self.assertEqual(
+            len(recorder),
+            5)
+        self.assertEqual(
+            recorder.capacity,
+            8)
+        self.assertNotIn(
+            'low_strike',
+            recorder.names)
+        self.assertTrue(
+            len(recorder.names) < len(entries[0]))
+        df = recorder.to_df()
+        self.assertEqual(
+            list(df['balance']),
+            [1000.0, 999.0, 998.0, 997.0, 996.0])
+        self.assertEqual(
+            list(df['total_buys']),
+            [0, 1, 2, 3, 4])
+        self.assertEqual(
+            list(df['buy_triggered']),
+            [True, False, True, False, True])
+        self.assertEqual(
+            str(df['num_owned'].dtype),
+            'int64')
+        self.assertEqual(
+            recorder[-1]['date'],
+            '2018-11-05')
+        self.assertEqual(
+            recorder[-1]['close'],
+            274.0)
+        self.assertEqual(
+            len(recorder[1:3]),
+            2)
+        self.assertTrue(
+            recorder.get_memory_usage() > 0)
+    # end of test_only_populated_columns_with_growth
+
+    def test_columns_widen_for_new_types(self):
+        """test_columns_widen_for_new_types"""
+        recorder = TradeHistoryRecorder()
+        recorder.append({
+            'value': True,
+            'note': None
+        })
+        recorder.append({
+            'value': 3,
+            'note': 'sold'
+        })
+        recorder.append({
+            'value': 'high',
+        })
+        self.assertEqual(
+            [row['value'] for row in recorder],
+            [1, 3, 'high'])
+        self.assertEqual(
+            [row['note'] for row in recorder],
+            [None, 'sold', None])
+    # end of test_columns_widen_for_new_types
+
+    def test_algo_compact_history(self):
+        """test_algo_compact_history"""
+        data = {
+            'SPY': []
+        }
+        for idx, date in enumerate(['2018-11-01', '2018-11-02']):
+            data['SPY'].append({
+                'id': 'SPY_{}'.format(date),
+                'date': date,
+                'data': {
+                    'daily': pd.DataFrame([
+                        {
+                            'date': date,
+                            'close': 270.0 + idx
+                        }
+                    ])
+                }
+            })
+        algos = []
+        for compact_history in [False, True]:
+            algo = BaseAlgo(
+                ticker='SPY',
+                balance=1000.0,
+                compact_history=compact_history,
+                name='compact={}'.format(
+                    compact_history))
+            algo.handle_data(
+                data=data)
+            algos.append(algo)
+        list_algo, compact_algo = algos
+        self.assertTrue(
+            isinstance(
+                compact_algo.order_history,
+                TradeHistoryRecorder))
+        compact_res = compact_algo.get_result()
+        self.assertTrue(
+            isinstance(
+                compact_res['history'],
+                list))
+        self.assertEqual(
+            len(compact_res['history']),
+            2)
+        self.assertIs(
+            compact_res['history_recorder'],
+            compact_algo.order_history)
+        self.assertNotIn(
+            'history_recorder',
+            list_algo.get_result())
+        list_df = list_algo.get_history_df()
+        compact_df = compact_algo.get_history_df()
+        self.assertEqual(
+            list(compact_df['close']),
+            list(list_df['close']))
+        self.assertEqual(
+            compact_algo.order_history[0]['status'],
+            list_algo.order_history[0]['status'])
+    # end of test_algo_compact_history
+
+# end of TestTradeHistoryRecorder
@@ -0,0 +1,199 @@
+"""
+Test file for:
+Vectorized Backtest Engine
+"""
+
+import pandas as pd
+import numpy as np
+from analysis_engine.mocks.base_test import BaseTestCase
+from analysis_engine.algo import BaseAlgo
+from analysis_engine.vectorized_backtest import build_signal_frame
+from analysis_engine.vectorized_backtest import get_next_true
+
+
+class ThresholdSignalAlgo(BaseAlgo):
+    """ThresholdSignalAlgo"""
+
+    def build_signals(
+            self,
+            ticker,
+            df):
+        """build_signals
+
+        :param ticker: ticker symbol
+        :param df: signal rows
+        """
+        prev_close = df['close'].shift(1)
+        return pd.DataFrame({
+            'buy': df['close'] < 100.0,
+            'sell': (df['close'] > 110.0) & (df['close'] > prev_close)
+        })
+    # end of build_signals
+
+# end of ThresholdSignalAlgo
+
+
+class TestVectorizedBacktest(BaseTestCase):
+    """TestVectorizedBacktest"""
+
+    closes = [
+        105.0, 99.0, 98.0, 104.0, 112.0, 115.0, 97.0,
+        96.0, 111.0, 108.0, 95.0, 113.0, 120.0, 99.0
+    ]
+
+    def build_dataset(
+            self,
+            tickers):
+        """build_dataset
+
+        :param tickers: list of tickers
+        """
+        dataset = {}
+        for ticker_idx, ticker in enumerate(tickers):
+            dataset[ticker] = []
+            for idx, close in enumerate(self.closes):
+                date = '2018-11-{:02d}'.format(idx + 1)
+                minute_rows = []
+                for minute in range(3):
+                    minute_rows.append({
+                        'date': '{} 15:5{}:00'.format(
+                            date,
+                            minute),
+                        'close': close + minute - 1.0 + ticker_idx
+                    })
+                dataset[ticker].append({
+                    'id': '{}_{}'.format(
+                        ticker,
+                        date),
+                    'date': date,
+                    'data': {
+                        'daily': pd.DataFrame([
+                            {
+                                'date': date,
+                                'close': close + ticker_idx,
+                                'high': close + 1.0,
+                                'low': close - 1.0,
+                                'open': close,
+                                'volume': 1000
+                            }
+                        ]),
+                        'minute': pd.DataFrame(minute_rows)
+                    }
+                })
+        return dataset
+    # end of build_dataset
+
+    def run_both_modes(
+            self,
+            signal_dataset):
+        """run_both_modes
+
+        :param signal_dataset: dataset to trade on
+        """
+        algos = []
+        for vectorized in [False, True]:
+            algo = ThresholdSignalAlgo(
+                tickers=['SPY', 'AMZN'],
+                balance=5000.0,
+                commission=6.0,
+                vectorized=vectorized,
+                signal_dataset=signal_dataset,
+                name='vectorized={}'.format(
+                    vectorized))
+            algo.handle_data(
+                data=self.build_dataset(
+                    tickers=['SPY', 'AMZN']))
+            algos.append(algo)
+        return algos
+    # end of run_both_modes
+
+    def test_get_next_true(self):
+        """test_get_next_true"""
+        self.assertEqual(
+            list(get_next_true(
+                np.array([False, True, False, False, True, False]))),
+            [1, 1, 4, 4, 4, 6])
+    # end of test_get_next_true
+
+    def test_build_signal_frame(self):
+        """test_build_signal_frame"""
+        nodes = self.build_dataset(
+            tickers=['SPY'])['SPY'][:3]
+        nodes[1]['data']['daily'] = pd.DataFrame([])
+        frame, node_starts, node_ends = build_signal_frame(
+            nodes=nodes)
+        self.assertEqual(
+            list(frame['close']),
+            [105.0, 98.0])
+        self.assertEqual(
+            list(node_starts),
+            [0, 1, 1])
+        self.assertEqual(
+            list(node_ends),
+            [0, 0, 1])
+    # end of test_build_signal_frame
+
+    def test_vectorized_matches_loop(self):
+        """test_vectorized_matches_loop"""
+        for signal_dataset in ['daily', 'minute']:
+            loop_algo, vec_algo = self.run_both_modes(
+                signal_dataset=signal_dataset)
+            self.assertEqual(
+                vec_algo.balance,
+                loop_algo.balance)
+            self.assertEqual(
+                [order['status'] for order in vec_algo.buys],
+                [order['status'] for order in loop_algo.buys])
+            self.assertEqual(
+                [order['close'] for order in vec_algo.sells],
+                [order['close'] for order in loop_algo.sells])
+            self.assertTrue(
+                len(loop_algo.sells) > 0)
+            for ticker in ['SPY', 'AMZN']:
+                self.assertEqual(
+                    vec_algo.get_owned_shares(ticker),
+                    loop_algo.get_owned_shares(ticker))
+            self.assertEqual(
+                len(vec_algo.order_history),
+                len(loop_algo.order_history))
+            for vec_node, loop_node in zip(
+                    vec_algo.order_history,
+                    loop_algo.order_history):
+                self.assertEqual(
+                    vec_node['date'],
+                    loop_node['date'])
+                self.assertAlmostEqual(
+                    vec_node['balance'],
+                    loop_node['balance'])
+                self.assertAlmostEqual(
+                    vec_node['close'],
+                    loop_node['close'])
+                self.assertEqual(
+                    vec_node['num_owned'],
+                    loop_node['num_owned'] or 0)
+                self.assertEqual(
+                    vec_node['total_sells'],
+                    loop_node['total_sells'])
+            self.assertEqual(
+                len(vec_algo.history_df.index),
+                2 * len(self.closes))
+            self.assertEqual(
+                list(vec_algo.history_df.columns),
+                list(loop_algo.order_history[0]) + [
+                    'buy_triggered',
+                    'sell_triggered'
+                ])
+            self.assertEqual(
+                [node['status'] for node in vec_algo.order_history],
+                [node['status'] for node in loop_algo.order_history])
+            self.assertEqual(
+                [node['algo_status']
+                 for node in vec_algo.order_history],
+                [node['algo_status']
+                 for node in loop_algo.order_history])
+            self.assertEqual(
+                vec_algo.today_close,
+                loop_algo.today_close)
+    # end of test_vectorized_matches_loop
+
+# end of TestVectorizedBacktest
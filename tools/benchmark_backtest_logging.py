@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+
+"""
+Tool for benchmarking the per-node overhead of the backtest
+loop logs by running the same synthetic backtest with the
+default logging and with ``BaseAlgo(quiet=True)``
+
+The log handlers on the backtest loggers are swapped for a
+handler writing to ``/dev/null`` (or the ``-o`` file) during the
+runs so the default run still formats and emits every message
+without flooding the terminal.
+
+::
+
+    ./tools/benchmark_backtest_logging.py -n 1000 -r 3
+"""
+
+import os
+import time
+import logging
+import argparse
+import numpy as np
+import pandas as pd
+from analysis_engine.algo import BaseAlgo
+
+
+BACKTEST_LOGGERS = [
+    'analysis_engine.algo',
+    'analysis_engine.indicators.indicator_processor'
+]
+
+
+class BenchmarkAlgo(BaseAlgo):
+    """BenchmarkAlgo
+
+    buy on even nodes and sell on odd nodes so every node
+    creates an order
+    """
+
+    def process(
+            self,
+            algo_id,
+            ticker,
+            dataset):
+        """process
+
+        :param algo_id: string - algo identifier label
+        :param ticker: string - ticker
+        :param dataset: dataset node dictionary
+        """
+        row = {
+            'close': self.latest_close,
+            'date': self.trade_date
+        }
+        if len(self.order_history) % 2 == 0:
+            self.create_buy_order(
+                ticker=ticker,
+                row=row,
+                shares=1,
+                reason='benchmark')
+        else:
+            self.create_sell_order(
+                ticker=ticker,
+                row=row,
+                shares=1,
+                reason='benchmark')
+    # end of process
+
+# end of BenchmarkAlgo
+
+
+def build_nodes(
+        ticker,
+        num_nodes,
+        num_rows=30):
+    """build_nodes
+
+    :param ticker: ticker symbol
+    :param num_nodes: number of dataset nodes
+    :param num_rows: number of daily rows in each node
+    """
+    rand = np.random.RandomState(1)
+    total_rows = num_nodes + num_rows
+    close = 100.0 + np.cumsum(rand.normal(0.0, 1.0, total_rows))
+    df = pd.DataFrame({
+        'date': pd.date_range(
+            '2010-01-01',
+            periods=total_rows).strftime('%Y-%m-%d'),
+        'open': close,
+        'close': close,
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'volume': rand.randint(1000, 5000, total_rows).astype(float)
+    })
+    nodes = []
+    for idx in range(num_nodes):
+        daily = df.iloc[idx:idx + num_rows]
+        date = daily['date'].iloc[-1]
+        nodes.append({
+            'id': '{}_{}'.format(
+                ticker,
+                date),
+            'date': date,
+            'data': {
+                'daily': daily
+            }
+        })
+    return nodes
+# end of build_nodes
+
+
+def redirect_logs(
+        path):
+    """redirect_logs
+
+    replace the handlers on the backtest loggers with a
+    handler writing to ``path`` and return the old handlers
+
+    :param path: file for the log messages
+    """
+    out_file = open(path, 'a')
+    handler = logging.StreamHandler(out_file)
+    handler.setFormatter(
+        logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    old_handlers = {}
+    for name in BACKTEST_LOGGERS:
+        logger = logging.getLogger(name)
+        old_handlers[name] = logger.handlers
+        logger.handlers = [handler]
+    return out_file, old_handlers
+# end of redirect_logs
+
+
+def run_backtest(
+        nodes,
+        quiet,
+        config_dict):
+    """run_backtest
+
+    return the seconds to run ``handle_data`` and the algo
+
+    :param nodes: list of dataset nodes
+    :param quiet: run a quiet backtest
+    :param config_dict: algorithm config with indicators
+    """
+    algo = BenchmarkAlgo(
+        ticker='SPY',
+        balance=1000000.0,
+        commission=0.0,
+        config_dict=config_dict,
+        quiet=quiet)
+    start = time.time()
+    algo.handle_data(
+        data={
+            'SPY': nodes
+        })
+    return time.time() - start, algo
+# end of run_backtest
+
+
+def benchmark_backtest_logging():
+    """benchmark_backtest_logging
+
+    print the best per-node time with the default logging
+    and in quiet mode
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            'benchmark the per-node logging overhead '
+            'in the backtest loop'))
+    parser.add_argument(
+        '-n',
+        help='number of dataset nodes',
+        required=False,
+        dest='num_nodes',
+        type=int,
+        default=1000)
+    parser.add_argument(
+        '-r',
+        help='number of runs per mode',
+        required=False,
+        dest='num_runs',
+        type=int,
+        default=3)
+    parser.add_argument(
+        '-i',
+        help='number of built-in sma indicators to process',
+        required=False,
+        dest='num_indicators',
+        type=int,
+        default=2)
+    parser.add_argument(
+        '-o',
+        help='file for the log messages',
+        required=False,
+        dest='log_file',
+        default=os.devnull)
+    args = parser.parse_args()
+
+    config_dict = None
+    if args.num_indicators > 0:
+        config_dict = {
+            'name': 'benchmark',
+            'indicators': [
+                {
+                    'name': 'sma',
+                    'num_points': 5 + idx,
+                    'use_talib': False
+                }
+                for idx in range(args.num_indicators)
+            ]
+        }
+    nodes = build_nodes(
+        ticker='SPY',
+        num_nodes=args.num_nodes)
+    out_file, old_handlers = redirect_logs(
+        path=args.log_file)
+    results = {}
+    balances = {}
+    try:
+        for quiet in [False, True]:
+            best = None
+            for _ in range(args.num_runs):
+                seconds, algo = run_backtest(
+                    nodes=nodes,
+                    quiet=quiet,
+                    config_dict=config_dict)
+                if best is None or seconds < best:
+                    best = seconds
+            results[quiet] = best
+            balances[quiet] = algo.get_balance()
+        # end of for default and quiet
+    finally:
+        for name in old_handlers:
+            logging.getLogger(name).handlers = old_handlers[name]
+        out_file.close()
+    # end of try/finally for the log handlers
+
+    print(
+        'nodes={} runs={} indicators={}'.format(
+            args.num_nodes,
+            args.num_runs,
+            args.num_indicators))
+    print(
+        '{:<8} {:>12} {:>14} {:>14}'.format(
+            'mode',
+            'total_ms',
+            'per_node_us',
+            'balance'))
+    for quiet in [False, True]:
+        print(
+            '{:<8} {:>12.3f} {:>14.1f} {:>14.2f}'.format(
+                'quiet' if quiet else 'default',
+                results[quiet] * 1000.0,
+                results[quiet] * 1000000.0 / args.num_nodes,
+                balances[quiet]))
+    print(
+        'saved {:.1f} us per node ({:.1f}%)'.format(
+            (results[False] - results[True]) * 1000000.0 / args.num_nodes,
+            100.0 * (results[False] - results[True]) /
+            max(results[False], 1e-9)))
+# end of benchmark_backtest_logging
+
+
+if __name__ == '__main__':
+    benchmark_backtest_logging()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+
+"""
+Tool for benchmarking the built-in indicators in
+``analysis_engine.indicators.builtin_indicators`` against
+naive ``pandas`` implementations (``rolling().apply()`` and
+python loops over the rows)
+
+::
+
+    ./tools/benchmark_indicators.py -n 5000 -r 3
+"""
+
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import analysis_engine.indicators.builtin_indicators as builtin
+
+
+def build_prices(
+        num_rows):
+    """build_prices
+
+    :param num_rows: number of rows
+    """
+    rand = np.random.RandomState(1)
+    close = 100.0 + np.cumsum(rand.normal(0.0, 1.0, num_rows))
+    return pd.DataFrame({
+        'close': close,
+        'high': close + rand.uniform(0.1, 2.0, num_rows),
+        'low': close - rand.uniform(0.1, 2.0, num_rows),
+        'volume': rand.randint(1000, 5000, num_rows).astype(float)
+    })
+# end of build_prices
+
+
+def naive_ewm(
+        values,
+        num_points,
+        alpha):
+    """naive_ewm
+
+    :param values: ``pd.Series``
+    :param num_points: time period
+    :param alpha: smoothing factor
+    """
+    out = [np.nan] * len(values)
+    prev = None
+    for idx in range(num_points - 1, len(values)):
+        if prev is None:
+            prev = values.iloc[:num_points].mean()
+        else:
+            prev = alpha * values.iloc[idx] + (1.0 - alpha) * prev
+        out[idx] = prev
+    return pd.Series(out)
+# end of naive_ewm
+
+
+def naive_rsi(
+        df,
+        num_points=14):
+    """naive_rsi
+
+    :param df: prices
+    :param num_points: time period
+    """
+    diffs = df['close'].diff().iloc[1:].reset_index(drop=True)
+    gains = naive_ewm(diffs.clip(lower=0.0), num_points, 1.0 / num_points)
+    losses = naive_ewm(-diffs.clip(upper=0.0), num_points, 1.0 / num_points)
+    return 100.0 * gains / (gains + losses)
+# end of naive_rsi
+
+
+def naive_macd(
+        df):
+    """naive_macd
+
+    :param df: prices
+    """
+    macd = (
+        naive_ewm(df['close'], 12, 2.0 / 13.0) -
+        naive_ewm(df['close'], 26, 2.0 / 27.0))
+    signal = naive_ewm(macd.iloc[25:], 9, 0.2)
+    return macd, signal
+# end of naive_macd
+
+
+def naive_willr(
+        df,
+        num_points=14):
+    """naive_willr
+
+    :param df: prices
+    :param num_points: time period
+    """
+    highest = df['high'].rolling(num_points).apply(
+        lambda window: window.max(), raw=True)
+    lowest = df['low'].rolling(num_points).apply(
+        lambda window: window.min(), raw=True)
+    return -100.0 * (highest - df['close']) / (highest - lowest)
+# end of naive_willr
+
+
+def naive_atr(
+        df,
+        num_points=14):
+    """naive_atr
+
+    :param df: prices
+    :param num_points: time period
+    """
+    true_range = []
+    for idx in range(1, len(df.index)):
+        row = df.iloc[idx]
+        prev_close = df['close'].iloc[idx - 1]
+        true_range.append(max(
+            row['high'] - row['low'],
+            abs(row['high'] - prev_close),
+            abs(row['low'] - prev_close)))
+    return naive_ewm(pd.Series(true_range), num_points, 1.0 / num_points)
+# end of naive_atr
+
+
+def naive_bbands(
+        df,
+        num_points=20):
+    """naive_bbands
+
+    :param df: prices
+    :param num_points: time period
+    """
+    middle = df['close'].rolling(num_points).apply(
+        lambda window: window.mean(), raw=True)
+    std = df['close'].rolling(num_points).apply(
+        lambda window: window.std(), raw=True)
+    return middle + 2.0 * std, middle, middle - 2.0 * std
+# end of naive_bbands
+
+
+def naive_obv(
+        df):
+    """naive_obv
+
+    :param df: prices
+    """
+    obv = [df['volume'].iloc[0]]
+    for idx in range(1, len(df.index)):
+        change = np.sign(df['close'].iloc[idx] - df['close'].iloc[idx - 1])
+        obv.append(obv[-1] + change * df['volume'].iloc[idx])
+    return pd.Series(obv)
+# end of naive_obv
+
+
+def get_cases(
+        df,
+        use_talib):
+    """get_cases
+
+    :param df: prices
+    :param use_talib: use ``talib`` for the built-in indicators
+    """
+    return [
+        (
+            'sma',
+            lambda: builtin.compute_sma(df['close'], 30, use_talib),
+            lambda: df['close'].rolling(30).apply(
+                lambda window: window.mean(), raw=True)
+        ),
+        (
+            'ema',
+            lambda: builtin.compute_ema(df['close'], 30, use_talib),
+            lambda: naive_ewm(df['close'], 30, 2.0 / 31.0)
+        ),
+        (
+            'rsi',
+            lambda: builtin.compute_rsi(df['close'], 14, use_talib),
+            lambda: naive_rsi(df)
+        ),
+        (
+            'macd',
+            lambda: builtin.compute_macd(
+                df['close'], 12, 26, 9, use_talib),
+            lambda: naive_macd(df)
+        ),
+        (
+            'willr',
+            lambda: builtin.compute_willr(
+                df['high'], df['low'], df['close'], 14, use_talib),
+            lambda: naive_willr(df)
+        ),
+        (
+            'atr',
+            lambda: builtin.compute_atr(
+                df['high'], df['low'], df['close'], 14, use_talib),
+            lambda: naive_atr(df)
+        ),
+        (
+            'bbands',
+            lambda: builtin.compute_bbands(
+                df['close'], 20, 2.0, use_talib),
+            lambda: naive_bbands(df)
+        ),
+        (
+            'obv',
+            lambda: builtin.compute_obv(
+                df['close'], df['volume'], use_talib),
+            lambda: naive_obv(df)
+        )
+    ]
+# end of get_cases
+
+
+def get_best_seconds(
+        func,
+        num_runs):
+    """get_best_seconds
+
+    :param func: function to time
+    :param num_runs: number of runs
+    """
+    best = None
+    for _ in range(num_runs):
+        start = time.time()
+        func()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+# end of get_best_seconds
+
+
+def benchmark_indicators():
+    """benchmark_indicators
+
+    print a table of the best run time for each indicator
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            'benchmark the built-in indicators against '
+            'naive pandas implementations'))
+    parser.add_argument(
+        '-n',
+        help='number of rows',
+        required=False,
+        dest='num_rows',
+        type=int,
+        default=5000)
+    parser.add_argument(
+        '-r',
+        help='number of runs per indicator',
+        required=False,
+        dest='num_runs',
+        type=int,
+        default=3)
+    parser.add_argument(
+        '-t',
+        help='use talib for the built-in indicators if installed',
+        required=False,
+        dest='use_talib',
+        action='store_true')
+    args = parser.parse_args()
+
+    df = build_prices(
+        num_rows=args.num_rows)
+    use_talib = args.use_talib and builtin.is_talib_supported()
+    print(
+        'rows={} runs={} talib={}'.format(
+            args.num_rows,
+            args.num_runs,
+            use_talib))
+    print(
+        '{:<8} {:>12} {:>12} {:>10}'.format(
+            'name',
+            'builtin_ms',
+            'naive_ms',
+            'speedup'))
+    for name, builtin_func, naive_func in get_cases(
+            df=df,
+            use_talib=use_talib):
+        builtin_secs = get_best_seconds(
+            func=builtin_func,
+            num_runs=args.num_runs)
+        naive_secs = get_best_seconds(
+            func=naive_func,
+            num_runs=args.num_runs)
+        print(
+            '{:<8} {:>12.3f} {:>12.3f} {:>9.1f}x'.format(
+                name,
+                builtin_secs * 1000.0,
+                naive_secs * 1000.0,
+                naive_secs / max(builtin_secs, 1e-9)))
+    # end of for all indicators
+# end of benchmark_indicators
+
+
+if __name__ == '__main__':
+    benchmark_indicators()